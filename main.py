@@ -1,8 +1,220 @@
 #!/usr/bin/env python3
 """entry point of the tdd game of life
 """
-from src.MainRunner import MainRunner
+import argparse
+import sys
+
+from src.utils.benchUtils import BENCHMARK_DENSITIES
+from src.utils.benchUtils import BENCHMARK_SIZES
+from src.utils.benchUtils import BENCHMARK_TOLERANCE
+from src.utils.benchUtils import DEFAULT_BENCHMARK_PATH
+from src.core_lib.GridHistory import DEFAULT_HISTORY_BUDGET
+from src.utils.checkpointUtils import DEFAULT_CHECKPOINT_PATH
+from src.utils.patternUtils import DEFAULT_PATTERN_PATH
+from src.utils.PhaseTimer import PHASE_TIMER_DUMP_INTERVAL
 
 if __name__ == "__main__":
-    main_runner: MainRunner = MainRunner()
-    main_runner.mainLoop()
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description="Game of Life - Spicy Telescope Version"
+    )
+    parser.add_argument(
+        "--resume",
+        metavar="CHECKPOINT",
+        help="resume the simulation saved into a checkpoint file, instead of editing a new grid",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        metavar="CHECKPOINT",
+        default=DEFAULT_CHECKPOINT_PATH,
+        help=f"checkpoint file the simulation is saved to when [S] is pressed (default: {DEFAULT_CHECKPOINT_PATH})",
+    )
+    parser.add_argument(
+        "--pattern",
+        metavar="PATTERN",
+        help="pattern file (.rle, .lif, .life or .cells) placed at the centre of the grid before editing it",
+    )
+    parser.add_argument(
+        "--export",
+        metavar="PATTERN",
+        default=DEFAULT_PATTERN_PATH,
+        help=f"pattern file the cells are exported to when [E] is pressed, in the format of its extension (default: {DEFAULT_PATTERN_PATH})",
+    )
+    parser.add_argument(
+        "--history-budget",
+        type=int,
+        metavar="BYTES",
+        default=DEFAULT_HISTORY_BUDGET,
+        help=f"memory budget of the history of the generations the simulation steps back and scrubs through, 0 disables it (default: {DEFAULT_HISTORY_BUDGET})",
+    )
+
+    timing_group = parser.add_argument_group(
+        "timing", "time the phases of the main loop of the window"
+    )
+    timing_group.add_argument(
+        "--timing",
+        action="store_true",
+        help="time the step, stats, draw of each panel, blit and flip of every frame ([T] shows or hides their percentiles)",
+    )
+    timing_group.add_argument(
+        "--timing-overlay",
+        action="store_true",
+        help="show the p50 / p95 / p99 of every phase over the grid, implies --timing",
+    )
+    timing_group.add_argument(
+        "--metrics",
+        metavar="FILE",
+        help="file the percentiles of every phase are periodically appended to as JSON lines, implies --timing",
+    )
+    timing_group.add_argument(
+        "--metrics-interval",
+        type=float,
+        metavar="SECONDS",
+        default=PHASE_TIMER_DUMP_INTERVAL,
+        help=f"seconds between two dumps into the metrics file (default: {PHASE_TIMER_DUMP_INTERVAL})",
+    )
+
+    headless_group = parser.add_argument_group(
+        "headless mode", "run a batch simulation without any window"
+    )
+    headless_group.add_argument(
+        "--headless",
+        action="store_true",
+        help="compute the generations at full speed from --pattern or --resume, save the last one to --output and print a throughput summary",
+    )
+    headless_group.add_argument(
+        "--generations",
+        type=int,
+        default=1000,
+        help="number of generations to compute (default: 1000)",
+    )
+    headless_group.add_argument(
+        "--output",
+        metavar="FILE",
+        default=DEFAULT_PATTERN_PATH,
+        help=f"file the last generation is saved to, a pattern file for the pattern extensions, a checkpoint otherwise (default: {DEFAULT_PATTERN_PATH})",
+    )
+    headless_group.add_argument(
+        "--rule",
+        help="rule of the game (default: the rule of the RLE pattern, or the config one)",
+    )
+    headless_group.add_argument(
+        "--engine", help="grid engine (default: the config one)"
+    )
+    headless_group.add_argument(
+        "--grid-dim",
+        type=int,
+        nargs=2,
+        metavar=("ROWS", "COLS"),
+        help="dimensions of the grid (default: the config ones, grown to hold the pattern)",
+    )
+
+    benchmark_group = parser.add_argument_group(
+        "benchmark mode",
+        "measure the grid engines and the rendering, and compare them against a baseline",
+    )
+    benchmark_group.add_argument(
+        "--benchmark",
+        action="store_true",
+        help="benchmark every size, density and engine, save the results to --bench-output and exit with 1 on a regression against --baseline",
+    )
+    benchmark_group.add_argument(
+        "--bench-sizes",
+        type=int,
+        nargs="+",
+        metavar="SIZE",
+        default=BENCHMARK_SIZES,
+        help=f"sides of the square grids (default: {' '.join(map(str, BENCHMARK_SIZES))})",
+    )
+    benchmark_group.add_argument(
+        "--bench-densities",
+        nargs="+",
+        metavar="DENSITY",
+        choices=BENCHMARK_DENSITIES,
+        default=BENCHMARK_DENSITIES,
+        help=f"densities of the starting cells (default: {' '.join(BENCHMARK_DENSITIES)})",
+    )
+    benchmark_group.add_argument(
+        "--bench-engines",
+        nargs="+",
+        metavar="ENGINE",
+        help="grid engines (default: the config one)",
+    )
+    benchmark_group.add_argument(
+        "--bench-output",
+        metavar="FILE",
+        default=DEFAULT_BENCHMARK_PATH,
+        help=f"JSON file the results are saved to (default: {DEFAULT_BENCHMARK_PATH})",
+    )
+    benchmark_group.add_argument(
+        "--baseline",
+        metavar="FILE",
+        help="JSON file of saved results, the metrics worse than them by more than --tolerance are flagged as regressions",
+    )
+    benchmark_group.add_argument(
+        "--tolerance",
+        type=float,
+        default=BENCHMARK_TOLERANCE,
+        help=f"relative change of a metric tolerated against the baseline (default: {BENCHMARK_TOLERANCE})",
+    )
+    benchmark_group.add_argument(
+        "--min-time",
+        type=float,
+        default=0.5,
+        help="seconds spent at least computing the generations, and rendering the frames, of every case (default: 0.5)",
+    )
+    benchmark_group.add_argument(
+        "--no-render",
+        action="store_true",
+        help="skip the rendering, pygame being never imported",
+    )
+    benchmark_group.add_argument(
+        "--bench-fast-forward",
+        action="store_true",
+        help="benchmark the stable ash once more with the cycle detection on, to measure the fast-forward through the cycles",
+    )
+    args: argparse.Namespace = parser.parse_args()
+
+    if args.benchmark:
+        from src.BenchmarkRunner import BenchmarkRunner
+
+        benchmark_runner: BenchmarkRunner = BenchmarkRunner(
+            sizes=args.bench_sizes,
+            densities=args.bench_densities,
+            engines=args.bench_engines,
+            output_path=args.bench_output,
+            baseline_path=args.baseline,
+            tolerance=args.tolerance,
+            min_time=args.min_time,
+            render=not args.no_render,
+            fast_forward=args.bench_fast_forward,
+        )
+        sys.exit(1 if benchmark_runner.run() else 0)
+    elif args.headless:
+        # pygame is never imported, so that the simulation runs on servers with no display
+        from src.HeadlessRunner import HeadlessRunner
+
+        headless_runner: HeadlessRunner = HeadlessRunner(
+            args.generations,
+            args.output,
+            pattern_path=args.pattern,
+            resume_path=args.resume,
+            rule=args.rule,
+            engine=args.engine,
+            grid_dim=args.grid_dim,
+        )
+        headless_runner.run()
+    else:
+        from src.MainRunner import MainRunner
+
+        main_runner: MainRunner = MainRunner(
+            args.resume,
+            args.checkpoint,
+            args.pattern,
+            args.export,
+            history_budget=args.history_budget,
+            timing=args.timing,
+            timing_overlay=args.timing_overlay,
+            metrics_path=args.metrics,
+            metrics_interval=args.metrics_interval,
+        )
+        main_runner.mainLoop()
@@ -0,0 +1,346 @@
+"""BenchmarkRunner class definition
+"""
+# pylint: disable=too-many-arguments,too-many-instance-attributes,import-outside-toplevel
+import copy
+import platform
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+from tabulate import tabulate  # type: ignore
+from src.core_lib.gridFactory import createGrid
+from src.core_lib.gridFactory import GRID_TYPE
+from src.utils.benchUtils import BENCHMARK_CYCLE_TABLE_SIZE
+from src.utils.benchUtils import BENCHMARK_DENSITIES
+from src.utils.benchUtils import BENCHMARK_FAST_FORWARD_DENSITIES
+from src.utils.benchUtils import BENCHMARK_MAX_GENERATIONS
+from src.utils.benchUtils import BENCHMARK_RENDER_MAX_CELLS
+from src.utils.benchUtils import BENCHMARK_SIZES
+from src.utils.benchUtils import BENCHMARK_TOLERANCE
+from src.utils.benchUtils import DEFAULT_BENCHMARK_PATH
+from src.utils.benchUtils import benchmarkCase
+from src.utils.benchUtils import buildCells
+from src.utils.benchUtils import compareResults
+from src.utils.benchUtils import readResults
+from src.utils.benchUtils import writeResults
+from src.utils.confUtils import fetch_game_config
+from src.utils.ruleUtils import parseRule
+
+
+class BenchmarkRunner:
+    """Benchmark of the grid engines and of the rendering of the display panel, over square grids of several sizes and several densities of cells.
+    Every case measures :
+    - the generations per second and the nanoseconds per cell and generation, the generations being computed until min_time is reached
+      (or BENCHMARK_MAX_GENERATIONS), with the cycle detection and the history off so that every generation is stepped,
+      the fast-forward through the cycles being measured by cases of its own
+    - the startup time, creating the grid from its starting cells before the first generation
+    - the peak memory allocated by the grid, traced apart from the timings (the worker processes of the 'parallel' engine are not traced)
+    - the time of a frame of DisplayPanel.update and the nanoseconds per cell, for the grids of at most BENCHMARK_RENDER_MAX_CELLS cells
+
+    The results are saved into a JSON file, and compared against the ones of a saved baseline to flag the regressions
+    """
+
+    def __init__(
+        self,
+        sizes: List[int] = BENCHMARK_SIZES,
+        densities: List[str] = BENCHMARK_DENSITIES,
+        engines: Optional[List[str]] = None,
+        output_path: str = DEFAULT_BENCHMARK_PATH,
+        baseline_path: Optional[str] = None,
+        tolerance: float = BENCHMARK_TOLERANCE,
+        min_time: float = 0.5,
+        render: bool = True,
+        fast_forward: bool = False,
+        gameConfig: Optional[Dict] = None,
+    ) -> None:
+        """
+        Args:
+            sizes (List[int], optional): sides of the square grids. Defaults to BENCHMARK_SIZES.
+            densities (List[str], optional): densities of the starting cells ('soup', 'gliders' or 'ash'). Defaults to BENCHMARK_DENSITIES.
+            engines (Optional[List[str]], optional): grid engines. Defaults to None, the one of the config.
+            output_path (str, optional): JSON file the results are saved to. Defaults to DEFAULT_BENCHMARK_PATH.
+            baseline_path (Optional[str], optional): JSON file of the results the new ones are compared to. Defaults to None, no comparison.
+            tolerance (float, optional): relative change of a metric tolerated against the baseline. Defaults to BENCHMARK_TOLERANCE.
+            min_time (float, optional): seconds spent at least computing the generations, and rendering the frames, of every case. Defaults to 0.5.
+            render (bool, optional): benchmark the rendering too, pygame being never imported otherwise. Defaults to True.
+            fast_forward (bool, optional): benchmark the densities of BENCHMARK_FAST_FORWARD_DENSITIES once more, with the cycle detection on,
+                in cases of their own. Defaults to False.
+            gameConfig (Optional[Dict], optional): game config, its cycle detection and history being turned off by every case.
+                Defaults to None, the config file.
+        """
+        assert min_time > 0, "the time of every case must be positive"
+        assert all(
+            size % 2 == 0 for size in sizes
+        ), "grid dimensions should be even numbers"
+
+        self.sizes: List[int] = sizes
+        self.densities: List[str] = densities
+        self.output_path: str = output_path
+        self.baseline_path: Optional[str] = baseline_path
+        self.tolerance: float = tolerance
+        self.min_time: float = min_time
+        self.render: bool = render
+        self.fast_forward: bool = fast_forward
+
+        self.gameConfig: Dict = copy.deepcopy(
+            gameConfig if gameConfig is not None else fetch_game_config()
+        )
+        self.engines: List[str] = (
+            engines
+            if engines is not None
+            else [self.gameConfig["simulation"]["engine"]]
+        )
+
+        self.results: Dict = {}
+        self.regressions: List[Dict] = []
+
+    def run(self) -> List[Dict]:
+        """benchmark every case, save the results, print them, and compare them against the baseline when one is given
+
+        Returns:
+            List[Dict]: the regressions against the baseline, empty when there is no baseline
+        """
+        self.results = {
+            "metadata": {
+                "date": datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "numpy": np.__version__,
+                "platform": platform.platform(),
+                "processor": platform.processor(),
+                "min_time": self.min_time,
+            },
+            "cases": {},
+        }
+        for engine in self.engines:
+            for density in self.densities:
+                for size in self.sizes:
+                    self.results["cases"][
+                        benchmarkCase(engine, density, [size, size])
+                    ] = self.benchCase(engine, density, [size, size])
+                    if (
+                        self.fast_forward
+                        and density in BENCHMARK_FAST_FORWARD_DENSITIES
+                    ):
+                        self.results["cases"][
+                            benchmarkCase(engine, density, [size, size], True)
+                        ] = self.benchCase(engine, density, [size, size], True)
+
+        writeResults(self.output_path, self.results)
+        self.printResults()
+
+        self.regressions = []
+        if self.baseline_path is not None:
+            self.regressions = compareResults(
+                self.results, readResults(self.baseline_path), self.tolerance
+            )
+            self.printRegressions()
+
+        return self.regressions
+
+    def _caseConfig(
+        self, engine: str, grid_dim: List[int], fast_forward: bool = False
+    ) -> Dict:
+        """game config of a case, the resolution being grown so that it does not bound the grid,
+        the cycle detection being off (unless the case measures the fast-forward) so that a stable grid is stepped too,
+        and the history being off so that its recording is not timed
+
+        Args:
+            engine (str): grid engine
+            grid_dim (List[int]): dimensions of the grid
+            fast_forward (bool, optional): the case measures the fast-forward through the cycles. Defaults to False.
+
+        Returns:
+            Dict: the game config
+        """
+        gameConfig: Dict = copy.deepcopy(self.gameConfig)
+        gameConfig["simulation"]["engine"] = engine
+        gameConfig["simulation"]["cycle_table_size"] = (
+            BENCHMARK_CYCLE_TABLE_SIZE if fast_forward else 0
+        )
+        gameConfig["simulation"]["history_budget"] = 0
+        gameConfig["videoSettings"]["grid_dim"] = list(grid_dim)
+        gameConfig["videoSettings"]["res"] = [
+            max(res_dim, grid_dim)
+            for res_dim, grid_dim in zip(gameConfig["videoSettings"]["res"], grid_dim)
+        ]
+
+        return gameConfig
+
+    def benchCase(
+        self, engine: str, density: str, grid_dim: List[int], fast_forward: bool = False
+    ) -> Dict:
+        """benchmark a grid engine on a density of cells
+
+        Args:
+            engine (str): grid engine
+            density (str): density of the starting cells
+            grid_dim (List[int]): dimensions of the grid
+            fast_forward (bool, optional): measure the fast-forward through the cycles rather than the steps. Defaults to False.
+
+        Returns:
+            Dict: the metrics of the case : generations, run_time, generations_per_second, ns_per_cell, startup_time, peak_memory (bytes),
+                render_frames, render_time (seconds per frame) and render_ns_per_cell, the render metrics being None when the rendering is skipped
+        """
+        gameConfig: Dict = self._caseConfig(engine, grid_dim, fast_forward)
+        cells: np.ndarray = buildCells(density, grid_dim)
+        n_cells: int = grid_dim[0] * grid_dim[1]
+
+        # peak memory, traced apart as the tracing slows every allocation down
+        tracemalloc.start()
+        core_grid: GRID_TYPE = createGrid(gameConfig, cells.copy())
+        core_grid.advance(1)
+        peak_memory: int = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        self._closeGrid(core_grid)
+
+        start_time: float = time.perf_counter()
+        core_grid = createGrid(gameConfig, cells)
+        startup_time: float = time.perf_counter() - start_time
+
+        # the generations are computed by batches doubling in size until min_time is reached
+        generations: int = 0
+        batch: int = 1
+        run_time: float = 0.0
+        while run_time < self.min_time and generations < BENCHMARK_MAX_GENERATIONS:
+            batch = min(batch, BENCHMARK_MAX_GENERATIONS - generations)
+            start_time = time.perf_counter()
+            core_grid.advance(batch)
+            run_time += time.perf_counter() - start_time
+            generations += batch
+            batch *= 2
+
+        metrics: Dict = {
+            "generations": generations,
+            "run_time": run_time,
+            "generations_per_second": generations / run_time,
+            "ns_per_cell": run_time / (generations * n_cells) * 1e9,
+            "startup_time": startup_time,
+            "peak_memory": peak_memory,
+            "render_frames": None,
+            "render_time": None,
+            "render_ns_per_cell": None,
+        }
+        if self.render and n_cells <= BENCHMARK_RENDER_MAX_CELLS:
+            metrics.update(self.benchRender(core_grid, grid_dim))
+        self._closeGrid(core_grid)
+
+        return metrics
+
+    def benchRender(self, core_grid: GRID_TYPE, grid_dim: List[int]) -> Dict:
+        """benchmark DisplayPanel.update on the generations of a grid, the grid moves on by a generation between the frames,
+        so that every frame draws a new state as in the main loop, only the frames themselves being timed
+
+        Args:
+            core_grid (GRID_TYPE): the grid displayed
+            grid_dim (List[int]): dimensions of the grid
+
+        Returns:
+            Dict: render_frames, render_time (seconds per frame) and render_ns_per_cell
+        """
+        # pygame is only imported when the rendering is benchmarked
+        import pygame
+        from src.ui_lib.DisplayPanel import DisplayPanel
+
+        pygame.font.init()
+        res: List[int] = self.gameConfig["videoSettings"]["res"]
+        # the panel of the window of the config, as laid out by the UIRunner
+        display_panel: DisplayPanel = DisplayPanel(
+            [int(0.7 * res[0]), res[1]],
+            list(grid_dim),
+            int(res[1] * 0.03125),
+            {},
+            font=self.gameConfig["ui"]["font"],
+            background_color=self.gameConfig["ui"]["display_background_color"],
+            grid_color=self.gameConfig["ui"]["grid_color"],
+            cell_color=self.gameConfig["ui"]["cell_color"],
+            n_states=parseRule(self.gameConfig["simulation"]["rule"])[2],
+            differential=self.gameConfig["ui"]["differential_rendering"],
+        )
+
+        frames: int = 0
+        render_time: float = 0.0
+        while render_time < self.min_time:
+            core_grid.advance(1)
+            display_panel.setCellMat(core_grid.getCellMat())
+            start_time: float = time.perf_counter()
+            display_panel.update()
+            render_time += time.perf_counter() - start_time
+            frames += 1
+
+        return {
+            "render_frames": frames,
+            "render_time": render_time / frames,
+            "render_ns_per_cell": render_time
+            / (frames * grid_dim[0] * grid_dim[1])
+            * 1e9,
+        }
+
+    @staticmethod
+    def _closeGrid(core_grid: GRID_TYPE) -> None:
+        """stop the workers of the grid engines running some
+
+        Args:
+            core_grid (GRID_TYPE): the grid
+        """
+        core_grid.close()
+
+    def printResults(self) -> None:
+        """print the metrics of every case of the last run"""
+
+        rows: List[List] = [
+            [
+                case,
+                metrics["generations"],
+                f"{metrics['generations_per_second']:.1f}",
+                f"{metrics['ns_per_cell']:.3f}",
+                f"{metrics['startup_time'] * 1000:.2f}",
+                f"{metrics['peak_memory'] / 2 ** 20:.1f}",
+                "-"
+                if metrics["render_time"] is None
+                else f"{metrics['render_time'] * 1000:.2f}",
+            ]
+            for case, metrics in self.results["cases"].items()
+        ]
+        print(
+            tabulate(
+                rows,
+                headers=[
+                    "case",
+                    "generations",
+                    "generations/s",
+                    "ns/cell",
+                    "startup (ms)",
+                    "peak memory (MiB)",
+                    "frame (ms)",
+                ],
+            )
+        )
+        print(f"saved to {self.output_path}")
+
+    def printRegressions(self) -> None:
+        """print the regressions of the last run against the baseline"""
+
+        if not self.regressions:
+            print(f"no regression against {self.baseline_path}")
+            return
+
+        print(
+            f"{len(self.regressions)} regression(s) against {self.baseline_path} (tolerance : {self.tolerance:.0%})"
+        )
+        print(
+            tabulate(
+                [
+                    [
+                        regression["case"],
+                        regression["metric"],
+                        f"{regression['baseline']:.4g}",
+                        f"{regression['value']:.4g}",
+                        f"{regression['change']:+.1%}",
+                    ]
+                    for regression in self.regressions
+                ],
+                headers=["case", "metric", "baseline", "value", "worse by"],
+            )
+        )
@@ -0,0 +1,183 @@
+"""HeadlessRunner class definition
+"""
+import copy
+import os
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+from src.core_lib.CellBuffer import CellBuffer
+from src.core_lib.gridFactory import createGrid
+from src.core_lib.gridFactory import GRID_TYPE
+from src.utils.checkpointUtils import readCheckpointHeader
+from src.utils.confUtils import fetch_game_config
+from src.utils.patternUtils import PATTERN_FORMATS
+from src.utils.patternUtils import readPattern
+from src.utils.patternUtils import readPatternHeader
+from src.utils.patternUtils import writePattern
+
+
+class HeadlessRunner:
+    """Batch runner driving the grid engine directly, without any window, pygame being never imported so that it runs on servers with no display :
+    the grid starts from a pattern file or a checkpoint, computes the generations at full speed with no frame pacing,
+    saves the last generation into a pattern file or a checkpoint and prints a throughput summary
+    """
+
+    def __init__(
+        self,
+        generations: int,
+        output_path: str,
+        pattern_path: Optional[str] = None,
+        resume_path: Optional[str] = None,
+        rule: Optional[str] = None,
+        engine: Optional[str] = None,
+        grid_dim: Optional[List[int]] = None,
+        gameConfig: Optional[Dict] = None,
+    ) -> None:
+        """
+        Args:
+            generations (int): number of generations to compute
+            output_path (str): file the last generation is saved to, a pattern file for the pattern extensions, a checkpoint otherwise
+            pattern_path (Optional[str], optional): pattern file the grid starts from, centred. Defaults to None.
+            resume_path (Optional[str], optional): checkpoint file the grid starts from (its dimensions, rule and boundary override the other settings). Defaults to None.
+            rule (Optional[str], optional): rule of the game. Defaults to None, the rule of the RLE pattern, or the one of the config.
+            engine (Optional[str], optional): grid engine. Defaults to None, the one of the config.
+            grid_dim (Optional[List[int]], optional): dimensions of the grid. Defaults to None, the ones of the config, grown to hold the pattern.
+            gameConfig (Optional[Dict], optional): game config. Defaults to None, the config file.
+        """
+        assert generations >= 0, "the number of generations must be positive"
+        assert (pattern_path is None) != (
+            resume_path is None
+        ), "the grid should start from either a pattern file or a checkpoint"
+
+        self.generations: int = generations
+        self.output_path: str = output_path
+        self.pattern_path: Optional[str] = pattern_path
+        self.resume_path: Optional[str] = resume_path
+
+        self.gameConfig: Dict = copy.deepcopy(
+            gameConfig if gameConfig is not None else fetch_game_config()
+        )
+        simulation: Dict = self.gameConfig["simulation"]
+        video_settings: Dict = self.gameConfig["videoSettings"]
+        if engine is not None:
+            simulation["engine"] = engine
+
+        if self.resume_path is not None:
+            header: Dict = readCheckpointHeader(self.resume_path)
+            video_settings["grid_dim"] = list(header["grid_dim"])
+            simulation["rule"] = header["rule"]
+            simulation["boundary"] = header["boundary"]
+        else:
+            assert self.pattern_path is not None
+            header = readPatternHeader(self.pattern_path)
+            if rule is None and header["rule"] is not None:
+                simulation["rule"] = header["rule"]
+            if grid_dim is not None:
+                video_settings["grid_dim"] = list(grid_dim)
+            else:
+                # the smallest even dimensions holding both the pattern and the grid of the config
+                video_settings["grid_dim"] = [
+                    max(config_dim, pattern_dim + pattern_dim % 2)
+                    for config_dim, pattern_dim in zip(
+                        video_settings["grid_dim"], header["grid_dim"]
+                    )
+                ]
+        if rule is not None:
+            simulation["rule"] = rule
+
+        # there is no window, so the resolution does not bound the grid
+        video_settings["res"] = [
+            max(res_dim, grid_dim)
+            for res_dim, grid_dim in zip(
+                video_settings["res"], video_settings["grid_dim"]
+            )
+        ]
+
+        # the generations are computed in one call, the history would only slow them down
+        simulation["history_budget"] = 0
+
+        self.core_grid: Optional[GRID_TYPE] = None
+        self.summary: Dict = {}
+
+    def createGrid(self) -> GRID_TYPE:
+        """create the grid from the pattern file, read straight into a cell buffer the grid adopts, or from the checkpoint
+
+        Returns:
+            GRID_TYPE: the grid
+        """
+        grid_dim: List[int] = self.gameConfig["videoSettings"]["grid_dim"]
+        if self.resume_path is not None:
+            core_grid: GRID_TYPE = createGrid(
+                self.gameConfig, np.zeros(grid_dim, dtype=np.uint8)
+            )
+            core_grid.loadCheckpoint(self.resume_path)
+            return core_grid
+
+        assert self.pattern_path is not None
+        cells: CellBuffer = CellBuffer.zeros(tuple(grid_dim), owner=self)
+        readPattern(self.pattern_path, cells.writable(self))
+        return createGrid(self.gameConfig, cells.release(self))
+
+    def run(self) -> Dict:
+        """create the grid, compute the generations in one call, save the last one and print the throughput summary
+
+        Returns:
+            Dict: the summary : generations, grid_dim, engine, rule, load / run / save times in seconds, generations and cells per second, final population
+        """
+        start_time: float = time.perf_counter()
+        self.core_grid = self.createGrid()
+        load_time: float = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        self.core_grid.advance(self.generations)
+        run_time: float = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        self.saveGrid()
+        save_time: float = time.perf_counter() - start_time
+
+        grid_dim: List[int] = self.gameConfig["videoSettings"]["grid_dim"]
+        self.summary = {
+            "generations": self.generations,
+            "grid_dim": list(grid_dim),
+            "engine": self.gameConfig["simulation"]["engine"],
+            "rule": self.gameConfig["simulation"]["rule"],
+            "load_time": load_time,
+            "run_time": run_time,
+            "save_time": save_time,
+            "generations_per_second": self.generations / run_time if run_time else 0.0,
+            "cells_per_second": self.generations * grid_dim[0] * grid_dim[1] / run_time
+            if run_time
+            else 0.0,
+            "population": self.core_grid.getStats().population,
+        }
+        self.core_grid.close()
+
+        self.printSummary()
+        return self.summary
+
+    def saveGrid(self) -> None:
+        """save the last generation into the output file, as a pattern for the pattern extensions, as a checkpoint otherwise"""
+
+        assert self.core_grid is not None, "core_grid is not initialised properly"
+        if os.path.splitext(self.output_path)[1].lower() in PATTERN_FORMATS:
+            writePattern(
+                self.output_path,
+                self.core_grid.getCellMat(),
+                self.gameConfig["simulation"]["rule"],
+            )
+        else:
+            self.core_grid.saveCheckpoint(self.output_path)
+
+    def printSummary(self) -> None:
+        """print the throughput summary of the last run"""
+
+        summary: Dict = self.summary
+        print(
+            f"{summary['generations']} generations of a {summary['grid_dim'][0]}x{summary['grid_dim'][1]} grid "
+            f"({summary['engine']} engine, rule {summary['rule']}) in {summary['run_time']:.3f} s\n"
+            f"throughput : {summary['generations_per_second']:.1f} generations/s, {summary['cells_per_second']:.3e} cells/s\n"
+            f"load : {summary['load_time']:.3f} s, save : {summary['save_time']:.3f} s, final population : {summary['population']}\n"
+            f"saved to {self.output_path}"
+        )
@@ -1,29 +1,87 @@
 """MainRunner class definition
 """
 from datetime import datetime
-from typing import Union
+from typing import Dict, List, Optional, Union
 
 import numpy as np
+from src.core_lib.CellBuffer import CellBuffer
 from src.ui_lib.UiRunner import UIRunner
-from src.core_lib.CoreGrid import CoreGrid
+from src.core_lib.gridFactory import createGrid
+from src.core_lib.gridFactory import GRID_TYPE
+from src.core_lib.GridHistory import DEFAULT_HISTORY_BUDGET
+from src.utils.checkpointUtils import DEFAULT_CHECKPOINT_PATH
+from src.utils.checkpointUtils import readCheckpointHeader
 from src.utils.confUtils import fetch_game_config
+from src.utils.patternUtils import DEFAULT_PATTERN_PATH
+from src.utils.patternUtils import writePattern
+from src.utils.PhaseTimer import PHASE_TIMER_DUMP_INTERVAL
+from src.utils.PhaseTimer import PhaseTimer
 
 
 class MainRunner:
     """Main runner communicating with every components, designed to interface with the main script"""
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        resume_path: Optional[str] = None,
+        checkpoint_path: str = DEFAULT_CHECKPOINT_PATH,
+        pattern_path: Optional[str] = None,
+        export_path: str = DEFAULT_PATTERN_PATH,
+        history_budget: int = DEFAULT_HISTORY_BUDGET,
+        timing: bool = False,
+        timing_overlay: bool = False,
+        metrics_path: Optional[str] = None,
+        metrics_interval: float = PHASE_TIMER_DUMP_INTERVAL,
+    ) -> None:
+        """
+        Args:
+            resume_path (Optional[str], optional): checkpoint file to resume the simulation from, instead of editing a new grid. Defaults to None.
+            checkpoint_path (str, optional): checkpoint file the simulation is saved to. Defaults to DEFAULT_CHECKPOINT_PATH.
+            pattern_path (Optional[str], optional): pattern file (RLE, Life 1.06 or plaintext) loaded into the edit mode. Defaults to None.
+            export_path (str, optional): pattern file the cells are exported to, in the format given by its extension. Defaults to DEFAULT_PATTERN_PATH.
+            history_budget (int, optional): memory budget of the history of the generations, in bytes, 0 disables it. Defaults to DEFAULT_HISTORY_BUDGET.
+            timing (bool, optional): time the phases of the main loop, implied by the overlay and the metrics file. Defaults to False.
+            timing_overlay (bool, optional): show the percentiles of the phases over the grid. Defaults to False.
+            metrics_path (Optional[str], optional): file the percentiles of the phases are periodically appended to. Defaults to None.
+            metrics_interval (float, optional): seconds between two dumps into the metrics file. Defaults to PHASE_TIMER_DUMP_INTERVAL.
+        """
+
+        # checkpoints and patterns
+        self.resume_path: Optional[str] = resume_path
+        self.checkpoint_path: str = checkpoint_path
+        self.pattern_path: Optional[str] = pattern_path
+        self.export_path: str = export_path
 
         # components
         self.gameConfig = fetch_game_config()
-        self.core_grid: Union[None, CoreGrid] = None
+        # the history is only kept for the grid of the window, to step back and scrub through the generations
+        self.gameConfig["simulation"]["history_budget"] = history_budget
+        if self.resume_path is not None:
+            # the grid of the checkpoint replaces the one of the config
+            header: Dict = readCheckpointHeader(self.resume_path)
+            self.gameConfig["videoSettings"]["grid_dim"] = list(header["grid_dim"])
+            self.gameConfig["simulation"]["rule"] = header["rule"]
+            self.gameConfig["simulation"]["boundary"] = header["boundary"]
+        self.core_grid: Union[None, GRID_TYPE] = None
+        # timing of the phases of the main loop, a disabled timer costs a method call per phase
+        self.phase_timer: PhaseTimer = PhaseTimer(
+            enabled=timing or timing_overlay or metrics_path is not None,
+            metrics_path=metrics_path,
+            dump_interval=metrics_interval,
+        )
         self.ui_runner: UIRunner = UIRunner(
             self.gameConfig,
             gameCallbacks={
                 "START": self.startSimulation,
                 "STOP": self.stopSimulation,
+                "BACK": self.stepBackSimulation,
                 "RESET": self.resetSimulation,
+                "SCRUB": self.scrubSimulation,
+                "SAVE": self.saveSimulation,
+                "EXPORT": self.exportSimulation,
             },
+            phase_timer=self.phase_timer,
+            timing_overlay=timing_overlay,
         )
 
         # game state
@@ -39,8 +97,13 @@ class MainRunner:
     def mainLoop(self) -> None:
         """Start the main game loop"""
 
-        default_cell_mat: np.ndarray = self.ui_runner.runEditMode()
-        self.core_grid = CoreGrid(self.gameConfig, default_cell_mat)
+        if self.resume_path is not None:
+            self.resumeSimulation(self.resume_path)
+        else:
+            if self.pattern_path is not None:
+                self.ui_runner.display_panel.loadPattern(self.pattern_path)
+            default_cells: CellBuffer = self.ui_runner.runEditMode()
+            self.core_grid = createGrid(self.gameConfig, default_cells)
 
         continue_game: bool = True
 
@@ -55,8 +118,10 @@ class MainRunner:
                 self.turnTimeoutTimer = datetime.now()
                 self.addTurn()
 
-            self.ui_runner.checkEvent()
+            with self.phase_timer.phase("events"):
+                self.ui_runner.checkEvent()
             self.ui_runner.update()
+            self.phase_timer.tick()
 
     def setSimulationState(self, new_simulation_state: bool) -> None:
         """set the simulation state, pretty self explanatory
@@ -66,23 +131,30 @@ class MainRunner:
         """
         self.simulationRunning = new_simulation_state
 
-    def addTurn(self) -> None:
-        """Add a turn by :
-        - computing the next cell matrix state in core_grid
+    def addTurn(self, n_turns: int = 1) -> None:
+        """Add n turns (1 by default) by :
+        - computing the next cell matrix state in core_grid, n times in one call
         - retrieving all new informations from core_grid and transmit them to the ui_runner
+
+        Args:
+            n_turns (int, optional): number of turns to compute. Defaults to 1.
         """
 
-        self.gameTurn += 1
+        self.gameTurn += n_turns
 
         # core grid update
         assert self.core_grid is not None, "core_grid not initialised in main loop"
-        self.core_grid.applyRules()
+        with self.phase_timer.phase("step"):
+            self.core_grid.advance(n_turns)
 
         # ui update
-        self.ui_runner.info_panel.setInfos(
-            self.core_grid.getAliveCellCount(), self.gameTurn
-        )
-        self.ui_runner.display_panel.setCellMat(self.core_grid.getCellMat())
+        with self.phase_timer.phase("stats"):
+            self.ui_runner.info_panel.setInfos(
+                self.core_grid.getStats(),
+                self.gameTurn,
+                self.core_grid.getCycle(),
+            )
+            self.ui_runner.display_panel.setCellMat(self.core_grid.getCellMat())
 
     def startSimulation(self) -> None:
         """start the simulation, by starting the timer and setting the right simulation state"""
@@ -103,6 +175,78 @@ class MainRunner:
                 "label"
             ] == "STOP" else button.setClickableState(True)
 
+    def stepBackSimulation(self) -> None:
+        """stop the simulation and go back to the previous generation retained by the history of the grid"""
+        self.scrubSimulation(-1)
+
+    def scrubSimulation(self, offset: int) -> None:
+        """stop the simulation and move through the generations retained by the history of the grid, in both the core grid AND the ui
+
+        Args:
+            offset (int): number of retained generations to move by, negative to go backwards
+        """
+        if self.simulationRunning:
+            self.stopSimulation()
+
+        assert self.core_grid is not None, "core_grid is not initialised properly"
+        turns: List[int] = self.core_grid.getHistoryTurns()
+        current_turn: int = self.core_grid.getStats().turn
+        if current_turn not in turns:
+            return
+        turn: int = turns[
+            min(max(turns.index(current_turn) + offset, 0), len(turns) - 1)
+        ]
+        if turn == current_turn:
+            return
+
+        self.core_grid.seek(turn)
+        self.gameTurn += turn - current_turn
+        self.ui_runner.display_panel.setCellMat(self.core_grid.getCellMat())
+        self.ui_runner.info_panel.setInfos(
+            self.core_grid.getStats(),
+            self.gameTurn,
+            self.core_grid.getCycle(),
+        )
+
+    def saveSimulation(self) -> None:
+        """save the current generation of the core grid into the checkpoint file"""
+
+        assert self.core_grid is not None, "core_grid is not initialised properly"
+        self.core_grid.saveCheckpoint(self.checkpoint_path)
+
+    def exportSimulation(self) -> None:
+        """export the cells of the current generation of the core grid into the export pattern file"""
+
+        assert self.core_grid is not None, "core_grid is not initialised properly"
+        writePattern(
+            self.export_path,
+            self.core_grid.getCellMat(),
+            self.gameConfig["simulation"]["rule"],
+        )
+
+    def resumeSimulation(self, resume_path: str) -> None:
+        """create the core grid from a checkpoint file instead of the edit mode, and display it
+
+        Args:
+            resume_path (str): path of the checkpoint file
+        """
+        self.core_grid = createGrid(
+            self.gameConfig,
+            np.zeros(self.gameConfig["videoSettings"]["grid_dim"], dtype=np.uint8),
+        )
+        self.core_grid.loadCheckpoint(resume_path)
+        self.gameTurn = self.core_grid.getStats().turn
+
+        self.ui_runner.display_panel.setCellMat(self.core_grid.getCellMat())
+        self.ui_runner.info_panel.setInfos(
+            self.core_grid.getStats(),
+            self.gameTurn,
+            self.core_grid.getCycle(),
+        )
+        for button in list(self.ui_runner.button_panel.buttons.values()):
+            if button.ui_settings["label"] == "START":
+                button.setClickableState(True)
+
     def resetSimulation(self) -> None:
         """reset the simulation, by reseting the timer but also the cell mat to its original state in both the core grid AND the ui (display panel)
 
@@ -116,8 +260,13 @@ class MainRunner:
         # reset cell mat in every components
         assert self.core_grid is not None, "core_grid is not initialised properly"
         self.core_grid.resetCellMat()
-        self.ui_runner.display_panel.setCellMat(self.core_grid.initial_cell_mat)
+        self.ui_runner.display_panel.setCellMat(self.core_grid.getCellMat())
+        self.ui_runner.info_panel.setInfos(
+            self.core_grid.getStats(),
+            self.gameTurn,
+            self.core_grid.getCycle(),
+        )
 
         # create new default cell mat & reset infos
-        default_cell_mat: np.ndarray = self.ui_runner.runEditMode()
-        self.core_grid.initCellMat(default_cell_mat)
+        default_cells: CellBuffer = self.ui_runner.runEditMode()
+        self.core_grid.initCellMat(default_cells)
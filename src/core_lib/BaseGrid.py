@@ -0,0 +1,634 @@
+"""BaseGrid class definition, and the validation helpers of the cells written to a grid
+"""
+from collections import OrderedDict
+from typing import Dict, Generator, List, Optional, Tuple, Union
+
+import numpy as np
+from tabulate import tabulate  # type: ignore
+from src.core_lib.CellBuffer import CellBuffer
+from src.core_lib.GridDiff import CELL_INDEXES
+from src.core_lib.GridDiff import GridDiff
+from src.core_lib.GridDiff import iterDiffs
+from src.core_lib.GridHistory import GridHistory
+from src.core_lib.GridStats import GridStats
+from src.utils.checkpointUtils import checkCheckpointHeader
+from src.utils.checkpointUtils import loadCheckpoint
+from src.utils.checkpointUtils import saveCheckpoint
+from src.utils.ruleUtils import compileRule
+
+# topologies of the border of the grid :
+# - dead : the out-of-border neighbours are DEAD_CELL_STATE
+# - torus : the rows wrap around, and so do the columns
+# - mirror : the border is a mirror, the out-of-border neighbours are the border cells themselves
+# - klein : the rows wrap around like a torus, the columns wrap around with the rows flipped (Klein bottle)
+BOUNDARIES: List[str] = ["dead", "torus", "mirror", "klein"]
+
+# levels of validation of the cells written to a grid :
+# - off : nothing is checked, for production runs
+# - cheap : only the incoming cells are checked, once per call
+# - full : the whole grid is checked again after every edit
+VALIDATION_LEVELS: List[str] = ["off", "cheap", "full"]
+
+
+def checkCells(
+    rows: np.ndarray,
+    cols: np.ndarray,
+    values: np.ndarray,
+    grid_dim: Tuple[int, ...],
+    n_states: int,
+    rule: str,
+) -> None:
+    """Make sure that cells about to be written lie inside the grid and hold a state of the rule, in O(k) for k cells
+
+    Args:
+        rows (np.ndarray): row indexes of the cells
+        cols (np.ndarray): column indexes of the cells
+        values (np.ndarray): states assigned to the cells
+        grid_dim (Tuple[int, ...]): dimensions of the grid
+        n_states (int): number of states of the rule
+        rule (str): the rule, for the error message
+    """
+    assert (
+        rows.shape == cols.shape == values.shape
+    ), "there should be exactly one value per cell"
+
+    assert (
+        (rows >= 0) & (rows < grid_dim[0]) & (cols >= 0) & (cols < grid_dim[1])
+    ).all(), f"all cells should lie inside the grid ({grid_dim})"
+
+    assert (
+        (values >= 0) & (values < n_states)
+    ).all(), f"all cells should be represented by integer between 0 and {n_states - 1} (dead, alive or dying state of the rule {rule})"
+
+
+def toCells(
+    coords: np.ndarray, values: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """split the coordinates of cells into rows and columns, with one value per cell
+
+    Args:
+        coords (np.ndarray): (row, column) of every cell, of shape (k, 2)
+        values (np.ndarray): state assigned to every cell, or a single state assigned to all of them
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: row indexes, column indexes and values of the cells
+    """
+    coords = np.asarray(coords, dtype=np.intp).reshape(-1, 2)
+    values = np.asarray(values, dtype=np.int64)
+    if values.ndim == 0:
+        values = np.full(coords.shape[0], values)
+    return coords[:, 0], coords[:, 1], values
+
+
+def distinctCells(
+    rows: np.ndarray, cols: np.ndarray, values: np.ndarray, n_cols: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """keep the last occurrence of every cell, so that each cell is written once and the last value wins
+
+    Args:
+        rows (np.ndarray): row indexes of the cells, inside the grid
+        cols (np.ndarray): column indexes of the cells, inside the grid
+        values (np.ndarray): states assigned to the cells
+        n_cols (int): number of columns of the grid
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: row indexes, column indexes and values of the distinct cells
+    """
+    flat_cells, last_indexes = np.unique(
+        (rows * n_cols + cols)[::-1], return_index=True
+    )
+    distinct_rows, distinct_cols = np.divmod(flat_cells, n_cols)
+    return distinct_rows, distinct_cols, values[::-1][last_indexes]
+
+
+def checkRegion(
+    top: int,
+    left: int,
+    region: np.ndarray,
+    grid_dim: Tuple[int, ...],
+    n_states: int,
+    rule: str,
+) -> None:
+    """Make sure that a region about to be pasted lies inside the grid and holds states of the rule, in O(k) for a region of k cells
+
+    Args:
+        top (int): row of the grid receiving the first row of the region
+        left (int): column of the grid receiving the first column of the region
+        region (np.ndarray): the cells of the region
+        grid_dim (Tuple[int, ...]): dimensions of the grid
+        n_states (int): number of states of the rule
+        rule (str): the rule, for the error message
+    """
+    assert region.ndim == 2, "the region should be a 2D matrix"
+
+    assert (
+        0 <= top
+        and 0 <= left
+        and top + region.shape[0] <= grid_dim[0]
+        and left + region.shape[1] <= grid_dim[1]
+    ), f"the region ({region.shape}) pasted at ({top}, {left}) should lie inside the grid ({grid_dim})"
+
+    assert (
+        region.min(initial=0) >= 0 and region.max(initial=0) < n_states
+    ), f"all cells should be represented by integer between 0 and {n_states - 1} (dead, alive or dying state of the rule {rule})"
+
+
+def regionChanges(
+    cell_mat: np.ndarray, top: int, left: int, region: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """find the cells of the grid changed by pasting a region
+
+    Args:
+        cell_mat (np.ndarray): the current cells of the grid
+        top (int): row of the grid receiving the first row of the region
+        left (int): column of the grid receiving the first column of the region
+        region (np.ndarray): the cells of the region
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: row indexes, column indexes and new values of the changed cells
+    """
+    height, width = region.shape
+    changed_rows, changed_cols = np.nonzero(
+        cell_mat[top : top + height, left : left + width] != region
+    )
+    return (
+        changed_rows + top,
+        changed_cols + left,
+        region[changed_rows, changed_cols],
+    )
+
+
+class BaseGrid:
+    """Driver shared by the grid engines : the turn loop of advance with the cycle detection and the fast-forward, the history, the bulk edits,
+    the diffs of the generations and the checkpoints
+
+    The engines only hold the cells, and compute a generation (_nextGeneration) with its statistics (_collectStats),
+    the hooks they do not support (e.g. the step diff or the fingerprint) raise NotImplementedError
+    """
+
+    # True when the dimensions of the grid are bounded by the resolution of the UI, the engines able to simulate huge boards only have a lower bound
+    bounded_by_resolution: bool = False
+
+    def __init__(self, gameConfig: Dict):
+
+        self._turn = 0
+        self.gameConfig: Dict = gameConfig
+        self.grid_dim: Tuple[int, ...] = ()
+        self.boundary: str = self.gameConfig["simulation"]["boundary"]
+        self.validation: str = self.gameConfig["simulation"]["validation"]
+
+        # rule of the game, compiled into a lookup table : rule_table[state, alive_neighbours_count]
+        self.rule: str = self.gameConfig["simulation"]["rule"]
+        self.rule_table: np.ndarray = compileRule(self.rule)
+        # 2 for the Life-like rules, more for the Generations ones where the cells decay before dying
+        self.n_states: int = self.rule_table.shape[0]
+
+        # statistics of the current generation, collected as by-products of the step rather than by scanning the grid again
+        self.stats: GridStats = GridStats(self._turn, 0)
+
+        # fingerprint of the current state, None when it has to be computed again from scratch
+        self._fingerprint: Optional[int] = None
+        # bounded table of the fingerprints of the last generations, to detect the still lifes and the cycles
+        self.cycle_table_size: int = self.gameConfig["simulation"]["cycle_table_size"]
+        self._generations_table: OrderedDict = OrderedDict()
+        # first generation and period of the cycle the grid is stuck in, None as long as no cycle is detected
+        self.cycle: Optional[Tuple[int, int]] = None
+        # first generation, period and snapshot of the cells of a cycle found by its fingerprints, only trusted once the cells come back exactly
+        self._cycle_check: Optional[Tuple[int, int, np.ndarray]] = None
+
+        # bounded history of the generations reached, to step back and seek to any of them
+        self.history: GridHistory = GridHistory(
+            self.gameConfig["simulation"]["history_budget"],
+            self.gameConfig["simulation"]["history_keyframe_interval"],
+        )
+
+    def prettyPrintCellMat(self, tabulate_fmt="grid") -> None:
+        """Pretty print the grid using tabulate 'grid' format"""
+
+        print(f"================ #{self._turn} ================")
+        print(tabulate(self.getCellMat(), tablefmt=tabulate_fmt))
+
+    def validateGrid(self) -> None:
+        """Make sure that the grid has authorized dimensions, a known boundary topology and a known validation level"""
+
+        assert (
+            self.boundary in BOUNDARIES
+        ), f"Unknown boundary '{self.boundary}', the available ones are : {', '.join(BOUNDARIES)}"
+
+        assert (
+            self.validation in VALIDATION_LEVELS
+        ), f"Unknown validation level '{self.validation}', the available ones are : {', '.join(VALIDATION_LEVELS)}"
+
+        assert len(self.grid_dim) == 2, "the grid should be a 2D matrix"
+
+        assert (
+            np.array(self.grid_dim) % 2 == 0
+        ).all(), "grid dimensions should be even numbers"
+
+        if self.bounded_by_resolution:
+            assert np.all(
+                [
+                    low <= x <= high
+                    for low, x, high in zip(
+                        self.gameConfig["videoSettings"]["min_grid_dim"],
+                        self.grid_dim,
+                        self.gameConfig["videoSettings"]["res"],
+                    )
+                ]
+            ), f"grid_dim ({self.grid_dim}) should be between {self.gameConfig['videoSettings']['min_grid_dim']} and {self.gameConfig['videoSettings']['res']}"
+        else:
+            assert np.all(
+                [
+                    low <= x
+                    for low, x in zip(
+                        self.gameConfig["videoSettings"]["min_grid_dim"], self.grid_dim
+                    )
+                ]
+            ), f"grid_dim ({self.grid_dim}) should be greater than {self.gameConfig['videoSettings']['min_grid_dim']}"
+
+        self._validateCellMat()
+
+    def _validateCellMat(self) -> None:
+        """Make sure that every cell of the grid holds a state of the rule, nothing to check for the engines storing dead or alive cells only"""
+
+    # ===== generations =====
+
+    def applyRules(self) -> None:
+        """Apply the rules of the game once to the grid"""
+        self.advance(1)
+
+    def advance(self, n: int) -> None:
+        """Apply the rules of the game n times in a row, every generation being fingerprinted to detect a cycle
+        Once the grid is stuck in a cycle, the grid jumps straight to the last turn, computing only the turns left modulo the period
+
+        Args:
+            n (int): number of turns to compute
+        """
+        assert n >= 0, "the number of turns must be positive"
+
+        if self.history.edited:
+            self._recordHistory()
+        if not self._generations_table and self.cycle is None:
+            self._recordGeneration()
+
+        last_turn: int = self._turn + n
+        first_turn: int = self._turn
+        while self._turn < last_turn and self.cycle is None:
+            self._turn += 1
+            self._nextGeneration()
+            self._recordGeneration()
+
+        if self.cycle is not None:
+            for _ in range((last_turn - self._turn) % self.cycle[1]):
+                self._nextGeneration()
+            self._turn = last_turn
+
+        # within a cycle, the last generation computed was born the same way as the current one
+        if self._turn > first_turn:
+            self._collectStats()
+            self._recordHistory()
+
+    def _nextGeneration(self) -> None:
+        """compute the next generation of the cells, the turn being counted by the caller"""
+        raise NotImplementedError
+
+    def _collectStats(self) -> None:
+        """collect the statistics of the current generation from what the last step left behind"""
+        raise NotImplementedError
+
+    def _scanStats(self) -> None:
+        """collect the statistics of the current generation by scanning the cells, when there is no step to take them from"""
+        raise NotImplementedError
+
+    def getStats(self) -> GridStats:
+        """return the statistics of the current generation : population, births and deaths of the last generation and live bounding box
+
+        Returns:
+            GridStats: the statistics, kept up to date without scanning the grid
+        """
+        return self.stats
+
+    def iterGenerations(
+        self, n: Optional[int] = None, sample_every: int = 1
+    ) -> Generator[GridDiff, Optional[int], None]:
+        """return a generator advancing the grid lazily and yielding the diff of every generation reached : the cells born, the cells dead and the turn,
+        a generation is only computed when the consumer asks for its diff, and a consumer falling behind can send() the number of generations the next diff spans
+
+        Args:
+            n (Optional[int], optional): number of generations to compute. Defaults to None, going on forever.
+            sample_every (int, optional): number of generations spanned by every diff. Defaults to 1.
+
+        Returns:
+            Generator[GridDiff, Optional[int], None]: the generator of the diffs
+        """
+        return iterDiffs(self, n, sample_every, self._stepDiff)
+
+    def _stepDiff(self) -> Tuple[CELL_INDEXES, CELL_INDEXES]:
+        """return the cells born and dead during the last generation computed
+
+        Returns:
+            Tuple[CELL_INDEXES, CELL_INDEXES]: (rows, cols) of the cells born, and of the cells dead
+        """
+        raise NotImplementedError
+
+    # ===== cycle detection =====
+
+    def _recordGeneration(self) -> None:
+        """fingerprint the current generation and look for it in the table of the last generations, to detect a cycle
+        As 2 states may share a fingerprint, a generation found in the table is snapshotted, and the cycle is only trusted
+        once the cells are back to the snapshot one period later"""
+
+        if self.cycle_table_size <= 0:
+            return
+
+        if self._cycle_check is not None:
+            first_turn, period, snapshot = self._cycle_check
+            if self._turn >= first_turn + 2 * period:
+                self._cycle_check = None
+                if self._turn == first_turn + 2 * period and np.array_equal(
+                    self._snapshotCells(), snapshot
+                ):
+                    self.cycle = (first_turn, period)
+                    return
+
+        self._fingerprint = self.getFingerprint()
+        recorded_turn: Optional[int] = self._generations_table.get(self._fingerprint)
+        if recorded_turn is not None:
+            if self._cycle_check is None:
+                self._cycle_check = (
+                    recorded_turn,
+                    self._turn - recorded_turn,
+                    self._snapshotCells(),
+                )
+            return
+
+        self._generations_table[self._fingerprint] = self._turn
+        if len(self._generations_table) > self.cycle_table_size:
+            self._generations_table.popitem(last=False)
+
+    def _turnsBeforeCycleCheck(self) -> Optional[int]:
+        """return the number of turns left before the cells are compared with the snapshot of the cycle found by its fingerprints
+
+        Returns:
+            Optional[int]: the number of turns, None if no cycle is being checked
+        """
+        if self._cycle_check is None:
+            return None
+        first_turn, period, _ = self._cycle_check
+        return first_turn + 2 * period - self._turn
+
+    def _snapshotCells(self) -> np.ndarray:
+        """return a copy of the cells of the current generation, compared with the one of a later generation to confirm a cycle
+
+        Returns:
+            np.ndarray: the copy of the cells
+        """
+        return np.array(self.getCellMat())
+
+    def _resetCycleDetection(self) -> None:
+        """forget the generations recorded and the cycle detected, used when the cells are changed by hand"""
+
+        self._generations_table.clear()
+        self._cycle_check = None
+        self.cycle = None
+
+    def getCycle(self) -> Optional[Tuple[int, int]]:
+        """return the cycle the grid is stuck in (a still life being a cycle of period 1)
+
+        Returns:
+            Optional[Tuple[int, int]]: the first generation of the cycle and its period, None if no cycle has been detected
+        """
+        return self.cycle
+
+    def getFingerprint(self) -> int:
+        """return the fingerprint of the current state, 2 grids of the same engine and shape in the same state have the same fingerprint
+
+        Returns:
+            int: the 64 bits fingerprint
+        """
+        if self._fingerprint is None:
+            self._fingerprint = self._computeFingerprint()
+        return self._fingerprint
+
+    def _computeFingerprint(self) -> int:
+        """compute the fingerprint of the current state from scratch
+
+        Returns:
+            int: the 64 bits fingerprint
+        """
+        raise NotImplementedError
+
+    # ===== history =====
+
+    def _recordHistory(self) -> None:
+        """record the current generation into the history"""
+        self.history.record(self._turn, self.getCellMat())
+
+    def getHistoryTurns(self) -> List[int]:
+        """return the turns of the generations retained by the history, oldest first
+
+        Returns:
+            List[int]: the turns, empty if the history is disabled
+        """
+        return list(self.history.turns)
+
+    def stepBack(self) -> None:
+        """go back to the previous generation retained by the history, nothing is done from the oldest one"""
+
+        if self.history.edited:
+            self._recordHistory()
+        previous_turn: Optional[int] = self.history.getOffsetTurn(-1)
+        if previous_turn is not None and previous_turn != self._turn:
+            self.seek(previous_turn)
+
+    def seek(self, turn: int) -> None:
+        """move the grid to a generation retained by the history, backwards or forwards, only the cells which differ from the current generation are written
+
+        Args:
+            turn (int): turn of the generation
+        """
+        if self.history.edited:
+            self._recordHistory()
+        indexes, values = self.history.seek(turn)
+
+        self._turn = turn
+        self._writeHistoryCells(indexes, values)
+
+    def _writeHistoryCells(self, indexes: np.ndarray, values: np.ndarray) -> None:
+        """write the cells given by the history to move to another generation, the turn being already set
+
+        Args:
+            indexes (np.ndarray): flat indexes of the cells in the matrix recorded by the history
+            values (np.ndarray): new states of the cells
+        """
+        rows, cols = np.divmod(indexes, self.grid_dim[1])
+        self._writeCells(rows, cols, values)
+        self.stats.turn = self._turn
+
+    # ===== cells =====
+
+    def getCellMat(self) -> np.ndarray:
+        """Return the grid, representing the cells on the form of nest np array
+
+        Returns:
+            np.ndarray: the grid containing the cells
+        """
+        raise NotImplementedError
+
+    def setCell(self, i: int, j: int, value: int) -> None:
+        """Set the cell of the grid to a value passed in, only the cell is validated (unless the validation level is off),
+        and the grid is not scanned again (unless the validation level is full)
+
+        Args:
+            i (int): row index of the cell
+            j (int): column index of the cell
+            value (int): state assigned to the cell, DEAD_CELL_STATE, ALIVE_CELL_STATE or a dying state with the Generations rules
+        """
+        if self.validation != "off":
+            checkCells(
+                np.array([i]),
+                np.array([j]),
+                np.array([value]),
+                self.grid_dim,
+                self.n_states,
+                self.rule,
+            )
+
+        self._writeCell(i, j, value)
+        self.history.markEdited()
+        self._validateCellMat()
+
+    def _writeCell(self, i: int, j: int, value: int) -> None:
+        """write a cell already validated, and update the statistics, the engines having a cheaper path for a single cell override it
+
+        Args:
+            i (int): row index of the cell
+            j (int): column index of the cell
+            value (int): state assigned to the cell
+        """
+        self._writeCells(np.array([i]), np.array([j]), np.array([value]))
+
+    def setCells(self, coords: np.ndarray, values: np.ndarray) -> None:
+        """Set many cells of the grid at once, the incoming cells are validated once (unless the validation level is off), and the grid is not scanned again
+        (unless the validation level is full), when a cell appears several times, the last value wins
+
+        Args:
+            coords (np.ndarray): (row, column) of every cell, of shape (k, 2)
+            values (np.ndarray): state assigned to every cell, or a single state assigned to all of them
+        """
+        rows, cols, values = toCells(coords, values)
+        if self.validation != "off":
+            checkCells(rows, cols, values, self.grid_dim, self.n_states, self.rule)
+
+        self._writeCells(*distinctCells(rows, cols, values, self.grid_dim[1]))
+        self.history.markEdited()
+        self._validateCellMat()
+
+    def pasteRegion(self, top: int, left: int, region: np.ndarray) -> None:
+        """Paste a rectangular region of cells into the grid, its top-left corner at row top and column left, the region is validated once
+        (unless the validation level is off), and only the cells it changes are written
+
+        Args:
+            top (int): row of the grid receiving the first row of the region
+            left (int): column of the grid receiving the first column of the region
+            region (np.ndarray): the cells of the region
+        """
+        region = CellBuffer.asArray(region)
+        if self.validation != "off":
+            checkRegion(top, left, region, self.grid_dim, self.n_states, self.rule)
+
+        self._writeCells(*regionChanges(self.getCellMat(), top, left, region))
+        self.history.markEdited()
+        self._validateCellMat()
+
+    def _writeCells(
+        self, rows: np.ndarray, cols: np.ndarray, values: np.ndarray
+    ) -> None:
+        """write distinct cells already validated, and update the statistics
+
+        Args:
+            rows (np.ndarray): row indexes of the cells
+            cols (np.ndarray): column indexes of the cells
+            values (np.ndarray): states assigned to the cells
+        """
+        raise NotImplementedError
+
+    def initCellMat(self, new_cell_mat: Union[np.ndarray, CellBuffer]) -> None:
+        """set the grid to a completely new cell matrix passed in, used mainly when the grid is reset, to start over
+
+        Args:
+            new_cell_mat (Union[np.ndarray, CellBuffer]): the new cell matrix
+        """
+        raise NotImplementedError
+
+    def resetCellMat(self) -> None:
+        """Reset the grid to its initial state, in place, and start counting the turns over"""
+        raise NotImplementedError
+
+    def _startOver(self) -> None:
+        """start counting the turns over from the cells the grid holds now, the statistics, the cycle detection and the history starting over too"""
+
+        self._turn = 0
+        self._fingerprint = None
+        self._resetCycleDetection()
+        self._scanStats()
+        self.history.clear()
+        self._recordHistory()
+
+    # ===== checkpoints =====
+
+    def saveCheckpoint(self, checkpoint_path: str) -> None:
+        """save the current generation into a checkpoint file, to resume the simulation later on
+
+        Args:
+            checkpoint_path (str): path of the checkpoint file
+        """
+        saveCheckpoint(
+            checkpoint_path, self.getCellMat(), self.rule, self.boundary, self._turn
+        )
+
+    def loadCheckpoint(self, checkpoint_path: str) -> None:
+        """resume the generation saved into a checkpoint file, which becomes the initial state of the grid
+        The checkpoint must hold a grid of the same dimensions, rule and boundary
+
+        Args:
+            checkpoint_path (str): path of the checkpoint file
+        """
+        header, payload = loadCheckpoint(checkpoint_path)
+        checkCheckpointHeader(header, self.grid_dim, self.rule, self.boundary)
+
+        self._resumeCheckpoint(header, payload)
+        self._turn = header["turn"]
+        self.stats.turn = self._turn
+        self.history.clear()
+        self._recordHistory()
+
+    def _resumeCheckpoint(self, header: Dict, payload: np.ndarray) -> None:
+        """make the generation saved into a checkpoint the initial state of the grid, the turn being restored by the caller
+
+        Args:
+            header (Dict): the header of the checkpoint
+            payload (np.ndarray): the memory map of the payload of the checkpoint, to be copied
+        """
+        raise NotImplementedError
+
+    # ===== counts =====
+
+    def getAliveCellCount(self) -> int:
+        """return the number of alive cells in the grid
+
+        Returns:
+            int: number of alive cells in the grid
+        """
+        return self.stats.population
+
+    def getDeadCellCount(self) -> int:
+        """return the number of dead cells in the grid
+
+        Returns:
+            int: number of dead cells in the grid
+        """
+        return self.grid_dim[0] * self.grid_dim[1] - self.getAliveCellCount()
+
+    def close(self) -> None:
+        """release the resources held by the engine (processes, threads or shared memory), nothing to release by default"""
@@ -0,0 +1,461 @@
+"""BitPackedGrid class definition
+"""
+from math import ceil
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+from src.core_lib.BaseGrid import BaseGrid
+from src.core_lib.CellBuffer import CellBuffer
+from src.core_lib.GridDiff import CELL_INDEXES
+from src.core_lib.GridStats import GridStats
+from src.utils.checkpointUtils import isWindowCheckpoint
+from src.utils.checkpointUtils import savePackedCheckpoint
+from src.utils.checkpointUtils import unpackCheckpointWindow
+from src.utils.confUtils import fetch_game_config
+from src.utils.CustomTypes import ALIVE_CELL_STATE
+from src.utils.CustomTypes import DEAD_CELL_STATE
+from src.utils.fingerprintUtils import wordsFingerprint
+from src.utils.ruleUtils import MAX_NEIGHBOURS
+
+WORD_SIZE: int = 64
+ROWS_PER_BLOCK: int = (
+    256  # rows processed at once, bounds the memory used by the temporary bitboards
+)
+
+# number of set bits for every possible byte value, used to count the alive cells
+POPCOUNT_TABLE: np.ndarray = np.array(
+    [bin(byte).count("1") for byte in range(256)], dtype=np.uint8
+)
+
+ONE: np.uint64 = np.uint64(1)
+LAST_BIT: np.uint64 = np.uint64(WORD_SIZE - 1)
+
+
+def _fullAdd(
+    a: np.ndarray, b: np.ndarray, c: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """bit-parallel full adder, add 3 bitboards of weight 1
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: the sum bitboard (weight 1) and the carry bitboard (weight 2)
+    """
+    a_xor_b: np.ndarray = a ^ b
+    return a_xor_b ^ c, (a & b) | (c & a_xor_b)
+
+
+def _halfAdd(a: np.ndarray, b: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """bit-parallel half adder, add 2 bitboards of weight 1
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: the sum bitboard (weight 1) and the carry bitboard (weight 2)
+    """
+    return a ^ b, a & b
+
+
+class BitPackedGrid(BaseGrid):
+    """Alternative backend of the CoreGrid, each row of the grid is packed into uint64 words (64 cells per word, 1 bit per cell) and the next generation is computed with bit-parallel full-adder logic
+
+    Bit k of the word w of a row holds the cell of column w * 64 + k, the padding bits of the last word of each row always remain dead.
+    """
+
+    def __init__(self, gameConfig: Dict, default_cell_mat: np.ndarray):
+        super().__init__(gameConfig)
+
+        self.grid_dim = default_cell_mat.shape
+        self.validateGrid()
+
+        # counts of alive neighbours making a dead cell born or keeping an alive cell alive
+        rule_table: np.ndarray = self.rule_table
+        self._rule_counts: List[Tuple[int, bool, bool]] = [
+            (
+                neighbours_count,
+                rule_table[DEAD_CELL_STATE, neighbours_count] == ALIVE_CELL_STATE,
+                rule_table[ALIVE_CELL_STATE, neighbours_count] == ALIVE_CELL_STATE,
+            )
+            for neighbours_count in range(MAX_NEIGHBOURS + 1)
+            if rule_table[:, neighbours_count].any()
+        ]
+
+        self.n_words: int = ceil(self.grid_dim[1] / WORD_SIZE)
+
+        self.initial_words: np.ndarray = np.zeros((0, 0), dtype=np.uint64)
+        self.words: np.ndarray = np.zeros((0, 0), dtype=np.uint64)
+        self.next_words: np.ndarray = np.zeros((0, 0), dtype=np.uint64)
+        self.initCellMat(default_cell_mat)
+
+    def validateGrid(self) -> None:
+        """Make sure that the grid has authorized dimensions, the packed grid is not bounded by the resolution of the UI so that huge boards can be simulated
+
+        The cells values are checked when the grid is packed (unless the validation level is off), as the packed representation can only hold dead or alive cells
+        """
+
+        assert (
+            self.rule_table.shape[0] == 2
+        ), f"the packed grid holds one bit per cell, multi-state rules ({self.rule}) are not supported"
+
+        assert (
+            self.boundary == "dead"
+        ), f"the packed grid only supports the 'dead' boundary, not '{self.boundary}'"
+
+        super().validateGrid()
+
+    def _pack(self, cell_mat: np.ndarray) -> np.ndarray:
+        """pack a dense cell matrix into rows of uint64 words, one block of rows at a time straight into the words,
+        the cells being checked on the way unless the validation level is off
+
+        Args:
+            cell_mat (np.ndarray): the dense cell matrix
+
+        Returns:
+            np.ndarray: the packed grid, of shape (rows, n_words)
+        """
+        # little-endian words, so that the byte k of a row holds the columns 8k to 8k + 7
+        words: np.ndarray = np.zeros((self.grid_dim[0], self.n_words), dtype="<u8")
+        row_bytes: np.ndarray = words.view(np.uint8)
+
+        for start_row in range(0, self.grid_dim[0], ROWS_PER_BLOCK):
+            block: np.ndarray = cell_mat[start_row : start_row + ROWS_PER_BLOCK]
+            assert self.validation == "off" or (
+                block.min(initial=DEAD_CELL_STATE) >= DEAD_CELL_STATE
+                and block.max(initial=DEAD_CELL_STATE) <= ALIVE_CELL_STATE
+            ), "all cells should be represented by integer of 0 or 1 (dead or alive state)"
+
+            packed_block: np.ndarray = np.packbits(
+                block == ALIVE_CELL_STATE, axis=1, bitorder="little"
+            )
+            row_bytes[
+                start_row : start_row + packed_block.shape[0], : packed_block.shape[1]
+            ] = packed_block
+
+        return words.astype(np.uint64, copy=False)
+
+    def _unpack(self, words: np.ndarray) -> np.ndarray:
+        """unpack rows of uint64 words into a dense cell matrix
+
+        Args:
+            words (np.ndarray): the packed grid
+
+        Returns:
+            np.ndarray: the dense cell matrix, of dtype uint8
+        """
+        return np.unpackbits(
+            words.astype("<u8").view(np.uint8), axis=1, bitorder="little"
+        )[:, : self.grid_dim[1]]
+
+    def _nextGeneration(self) -> None:
+        """compute the next generation of the packed grid, block of rows by block of rows, the fingerprint being updated with the words which changed"""
+
+        for start_row in range(0, self.grid_dim[0], ROWS_PER_BLOCK):
+            end_row: int = min(start_row + ROWS_PER_BLOCK, self.grid_dim[0])
+            self.next_words[start_row:end_row] = self._nextBlock(start_row, end_row)
+
+        # the west shifts may have pushed cells into the padding bits of the last word
+        padding_bits: int = self.n_words * WORD_SIZE - self.grid_dim[1]
+        if padding_bits:
+            self.next_words[:, -1] &= np.uint64((1 << (WORD_SIZE - padding_bits)) - 1)
+
+        self.words, self.next_words = self.next_words, self.words
+        if self._fingerprint is not None:
+            self._fingerprint ^= self._stepFingerprint()
+
+    def _stepFingerprint(self) -> int:
+        """return the change of the fingerprint made by the last step, the previous generation being still held by the swapped next_words,
+        the words which changed are hashed as they are, without unpacking their bits
+
+        Returns:
+            int: the 64 bits change, to XOR into the fingerprint of the previous generation
+        """
+        word_indexes: np.ndarray = np.flatnonzero(self.words != self.next_words)
+        return wordsFingerprint(
+            word_indexes, self.next_words.reshape(-1)[word_indexes]
+        ) ^ self._wordsFingerprint(word_indexes)
+
+    def _stepDiff(self) -> Tuple[CELL_INDEXES, CELL_INDEXES]:
+        """return the cells born and dead during the last generation computed, the previous one being still held by the swapped next_words,
+        only the words holding a change are unpacked
+
+        Returns:
+            Tuple[CELL_INDEXES, CELL_INDEXES]: (rows, cols) of the cells born, and of the cells dead
+        """
+        return self._setBits(self.words & ~self.next_words), self._setBits(
+            self.next_words & ~self.words
+        )
+
+    def _setBits(self, words: np.ndarray) -> CELL_INDEXES:
+        """find the cells of the set bits of packed words
+
+        Args:
+            words (np.ndarray): the packed grid
+
+        Returns:
+            CELL_INDEXES: (rows, cols) of the cells, row by row
+        """
+        rows, word_cols = np.nonzero(words)
+        bits: np.ndarray = np.unpackbits(
+            words[rows, word_cols].astype("<u8").view(np.uint8).reshape(-1, 8),
+            axis=1,
+            bitorder="little",
+        )
+        set_words, set_bits = np.nonzero(bits)
+        return rows[set_words], word_cols[set_words] * WORD_SIZE + set_bits
+
+    def _recordHistory(self) -> None:
+        """record the current generation into the history, packed"""
+        self.history.record(self._turn, self.words.view(np.uint8))
+
+    def _writeHistoryCells(self, indexes: np.ndarray, values: np.ndarray) -> None:
+        """write the bytes of the packed words given by the history, only the bytes which differ from the current generation are written
+
+        Args:
+            indexes (np.ndarray): flat indexes of the bytes of the packed words
+            values (np.ndarray): new values of the bytes
+        """
+        self.words.reshape(-1).view(np.uint8)[indexes] = values
+        self._fingerprint = None
+        self._resetCycleDetection()
+        self._scanStats()
+
+    def _popcount(self, words: np.ndarray) -> int:
+        """count the set bits of packed words
+
+        Args:
+            words (np.ndarray): the packed words
+
+        Returns:
+            int: number of set bits
+        """
+        return int(POPCOUNT_TABLE[words.view(np.uint8)].sum(dtype=np.int64))
+
+    def _collectStats(self) -> None:
+        """collect the statistics of the current generation, the previous one being still held by the swapped next_words"""
+
+        self._setStats(
+            self._popcount(self.words & ~self.next_words),
+            self._popcount(self.next_words & ~self.words),
+        )
+
+    def _scanStats(self) -> None:
+        """collect the statistics of the current generation from the packed grid, when there is no step to take them from"""
+        self._setStats(None, None)
+
+    def _setStats(self, births: Optional[int], deaths: Optional[int]) -> None:
+        """set the statistics of the current generation from the packed grid, the alive columns are found by or-ing the rows of words together
+
+        Args:
+            births (Optional[int]): number of cells born during the last generation, None if unknown
+            deaths (Optional[int]): number of cells dead during the last generation, None if unknown
+        """
+        self.stats = GridStats(
+            self._turn,
+            self._popcount(self.words),
+            births,
+            deaths,
+            GridStats.boundingBox(
+                self.words.any(axis=1),
+                self._unpack(np.bitwise_or.reduce(self.words, axis=0)[None, :])[0],
+            ),
+        )
+
+    def _nextBlock(self, start_row: int, end_row: int) -> np.ndarray:
+        """compute the next state of the rows between start_row and end_row
+
+        Args:
+            start_row (int): index of the first row of the block
+            end_row (int): index of the row following the last row of the block
+
+        Returns:
+            np.ndarray: the packed next state of the block
+        """
+        n_rows: int = end_row - start_row
+
+        # block surrounded by one row above and one below, the out-of-border rows are dead
+        rows: np.ndarray = np.zeros((n_rows + 2, self.n_words), dtype=np.uint64)
+        src_start: int = max(0, start_row - 1)
+        src_end: int = min(self.grid_dim[0], end_row + 1)
+        dst_start: int = src_start - (start_row - 1)
+        rows[dst_start : dst_start + src_end - src_start] = self.words[
+            src_start:src_end
+        ]
+
+        # every cell receives the state of its west (column - 1) and east (column + 1) neighbours
+        west: np.ndarray = rows << ONE
+        west[:, 1:] |= rows[:, :-1] >> LAST_BIT
+        east: np.ndarray = rows >> ONE
+        east[:, :-1] |= rows[:, 1:] << LAST_BIT
+
+        # carry-save addition of the 8 neighbours bitboards into a 4 bits count
+        sum_north, carry_north = _fullAdd(west[:-2], rows[:-2], east[:-2])
+        sum_south, carry_south = _fullAdd(west[2:], rows[2:], east[2:])
+        sum_side, carry_side = _halfAdd(west[1:-1], east[1:-1])
+
+        count_bit0, carry_ones = _fullAdd(sum_north, sum_south, sum_side)
+        sum_twos, carry_twos = _fullAdd(carry_north, carry_south, carry_side)
+        count_bit1, carry_fours = _halfAdd(sum_twos, carry_ones)
+        count_bit2: np.ndarray = carry_twos ^ carry_fours
+        count_bit3: np.ndarray = carry_twos & carry_fours
+
+        count_bits: List[np.ndarray] = [count_bit0, count_bit1, count_bit2, count_bit3]
+        alive_words: np.ndarray = rows[1:-1]
+
+        # the rule is applied as a union of the cells having each count of neighbours making them born or surviving
+        next_words: np.ndarray = np.zeros_like(alive_words)
+        for neighbours_count, is_birth, is_survival in self._rule_counts:
+            count_mask: np.ndarray = ~np.zeros_like(alive_words)
+            for bit, count_bit in enumerate(count_bits):
+                count_mask &= count_bit if (neighbours_count >> bit) & 1 else ~count_bit
+
+            if is_birth and is_survival:
+                next_words |= count_mask
+            elif is_birth:
+                next_words |= count_mask & ~alive_words
+            else:
+                next_words |= count_mask & alive_words
+
+        return next_words
+
+    def _computeFingerprint(self) -> int:
+        """compute the Zobrist fingerprint of the current state from scratch, from the packed words which are not empty
+
+        Returns:
+            int: the 64 bits fingerprint
+        """
+        return self._wordsFingerprint(np.flatnonzero(self.words))
+
+    def _wordsFingerprint(self, word_indexes: np.ndarray) -> int:
+        """return the contribution of distinct packed words to the fingerprint, in their current value, so that a word is hashed out of it
+        before being written and hashed in again afterward
+
+        Args:
+            word_indexes (np.ndarray): flat indexes of the words (row * n_words + word column)
+
+        Returns:
+            int: the 64 bits contribution of the words
+        """
+        return wordsFingerprint(word_indexes, self.words.reshape(-1)[word_indexes])
+
+    def _snapshotCells(self) -> np.ndarray:
+        """return a copy of the packed words of the current generation, compared with the ones of a later generation to confirm a cycle
+
+        Returns:
+            np.ndarray: the copy of the packed words
+        """
+        return self.words.copy()
+
+    def getCellMat(self) -> np.ndarray:
+        """Return the grid, unpacked into a dense matrix of cells
+
+        Returns:
+            np.ndarray: the grid containing the cells
+        """
+        return self._unpack(self.words)
+
+    def _writeCell(self, i: int, j: int, value: int) -> None:
+        """write a cell already validated into its packed word, and update the statistics and the fingerprint
+
+        Args:
+            i (int): row index of the cell
+            j (int): column index of the cell
+            value (int): state assigned to the cell
+        """
+        bit: np.uint64 = np.uint64(1 << (j % WORD_SIZE))
+        word_index: np.ndarray = np.array([i * self.n_words + j // WORD_SIZE])
+        was_alive: bool = bool(self.words[i, j // WORD_SIZE] & bit)
+        if self._fingerprint is not None:
+            self._fingerprint ^= self._wordsFingerprint(word_index)
+        if value == ALIVE_CELL_STATE:
+            self.words[i, j // WORD_SIZE] |= bit
+        else:
+            self.words[i, j // WORD_SIZE] &= ~bit
+        if self._fingerprint is not None:
+            self._fingerprint ^= self._wordsFingerprint(word_index)
+        self._resetCycleDetection()
+        if not self.stats.updateCell(i, j, was_alive, value == ALIVE_CELL_STATE):
+            self._scanStats()
+
+    def _writeCells(
+        self, rows: np.ndarray, cols: np.ndarray, values: np.ndarray
+    ) -> None:
+        """write distinct cells already validated into the packed words, and update the statistics and the fingerprint
+
+        Args:
+            rows (np.ndarray): row indexes of the cells
+            cols (np.ndarray): column indexes of the cells
+            values (np.ndarray): states assigned to the cells
+        """
+        word_cols: np.ndarray = cols // WORD_SIZE
+        bits: np.ndarray = np.left_shift(ONE, (cols % WORD_SIZE).astype(np.uint64))
+        was_alive: np.ndarray = (self.words[rows, word_cols] & bits) != 0
+        is_alive: np.ndarray = np.asarray(values) == ALIVE_CELL_STATE
+        word_indexes: np.ndarray = np.unique(rows * self.n_words + word_cols)
+        if self._fingerprint is not None:
+            self._fingerprint ^= self._wordsFingerprint(word_indexes)
+
+        # the cells are distinct, but several of them may share a word
+        np.bitwise_or.at(
+            self.words, (rows[is_alive], word_cols[is_alive]), bits[is_alive]
+        )
+        np.bitwise_and.at(
+            self.words, (rows[~is_alive], word_cols[~is_alive]), ~bits[~is_alive]
+        )
+        if self._fingerprint is not None:
+            self._fingerprint ^= self._wordsFingerprint(word_indexes)
+        self._resetCycleDetection()
+
+        if not self.stats.updateCells(rows, cols, was_alive, is_alive):
+            self._scanStats()
+
+    def resetCellMat(self) -> None:
+        """Reset the grid internal state to the initial one, in place, and start counting the turns over, the history starting over too"""
+        np.copyto(self.words, self.initial_words)
+        self._startOver()
+
+    def initCellMat(self, new_cell_mat: Union[np.ndarray, CellBuffer]) -> None:
+        """set the grid to a completely new cell matrix passed in, used mainly when the grid is reset, to start over
+
+        Args:
+            new_cell_mat (Union[np.ndarray, CellBuffer]): the new cell matrix, read without taking its ownership
+        """
+        new_cell_mat = CellBuffer.asArray(new_cell_mat)
+        self.initial_words = self._pack(new_cell_mat)
+        self.words = self.initial_words.copy()
+        self.next_words = np.zeros_like(self.words)
+        self._startOver()
+
+    def saveCheckpoint(self, checkpoint_path: str) -> None:
+        """save the current generation into a checkpoint file, the packed words being written as they are
+
+        Args:
+            checkpoint_path (str): path of the checkpoint file
+        """
+        savePackedCheckpoint(
+            checkpoint_path,
+            self.words,
+            self.grid_dim[1],
+            self.rule,
+            self.boundary,
+            self._turn,
+        )
+
+    def _resumeCheckpoint(self, header: Dict, payload: np.ndarray) -> None:
+        """make the generation saved into a checkpoint the initial state of the grid, the payload already holds the packed words,
+        they are copied from the memory map without being unpacked, unless the payload is a box of a plane
+
+        Args:
+            header (Dict): the header of the checkpoint
+            payload (np.ndarray): the memory map of the payload of the checkpoint, to be copied
+        """
+        if not isWindowCheckpoint(header):
+            self.initCellMat(unpackCheckpointWindow(header, payload))
+            return
+
+        # copied, so that the file can be overwritten by the next checkpoint
+        self.initial_words = np.array(payload).view("<u8").astype(np.uint64, copy=False)
+        self.words = self.initial_words.copy()
+        self.next_words = np.zeros_like(self.words)
+        self._startOver()
+
+
+if __name__ == "__main__":
+
+    grid: BitPackedGrid = BitPackedGrid(fetch_game_config(), np.zeros((24, 24)))
+    grid.prettyPrintCellMat()
@@ -0,0 +1,111 @@
+"""CellBuffer class definition
+"""
+from typing import Optional, Tuple, Union
+
+import numpy as np
+from src.utils.CustomTypes import CELL_STATE_DTYPE
+
+
+def readOnlyView(cells: np.ndarray) -> np.ndarray:
+    """return a view of a cell matrix that cannot be written, without copying it
+
+    Args:
+        cells (np.ndarray): the cell matrix
+
+    Returns:
+        np.ndarray: read-only view sharing the memory of the matrix
+    """
+    view: np.ndarray = cells.view()
+    view.flags.writeable = False
+    return view
+
+
+class CellBuffer:
+    """Matrix of cells stored as CELL_STATE_DTYPE (one byte per cell), shared between the components without copy
+
+    A buffer has at most one owner, the only component allowed to write it, every other component reads it through a read-only view.
+    The owner releases the buffer to hand it over, and the next owner acquires it : e.g. the DisplayPanel edits the initial cells, then releases
+    the buffer so that the grid adopts it as its initial state.
+    """
+
+    def __init__(self, cells: np.ndarray, owner: Optional[object] = None):
+        # adopted as is when it already has the right dtype and layout, converted once otherwise
+        self.cells: np.ndarray = np.ascontiguousarray(cells, dtype=CELL_STATE_DTYPE)
+        self.owner: Optional[object] = owner
+        self._view: np.ndarray = readOnlyView(self.cells)
+
+    @classmethod
+    def zeros(
+        cls, shape: Tuple[int, ...], owner: Optional[object] = None
+    ) -> "CellBuffer":
+        """create a buffer of dead cells
+
+        Args:
+            shape (Tuple[int, ...]): shape of the matrix
+            owner (Optional[object], optional): component owning the buffer. Defaults to None.
+
+        Returns:
+            CellBuffer: the new buffer
+        """
+        return cls(np.zeros(shape, dtype=CELL_STATE_DTYPE), owner)
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        """shape of the matrix of cells"""
+        return self.cells.shape
+
+    def view(self) -> np.ndarray:
+        """return the cells for reading, available to every component
+
+        Returns:
+            np.ndarray: read-only view of the cells
+        """
+        return self._view
+
+    def writable(self, owner: object) -> np.ndarray:
+        """return the cells for writing, available to the owner only
+
+        Args:
+            owner (object): component asking for the cells
+
+        Returns:
+            np.ndarray: the cells matrix itself
+        """
+        assert owner is self.owner, "only the owner of a cell buffer can write it"
+        return self.cells
+
+    def release(self, owner: object) -> "CellBuffer":
+        """give up the ownership of the buffer, so that another component can acquire it
+
+        Args:
+            owner (object): current owner of the buffer
+
+        Returns:
+            CellBuffer: the buffer itself
+        """
+        assert owner is self.owner, "only the owner of a cell buffer can release it"
+        self.owner = None
+        return self
+
+    def acquire(self, owner: object) -> None:
+        """take the ownership of a released buffer
+
+        Args:
+            owner (object): new owner of the buffer
+        """
+        assert (
+            self.owner is None or self.owner is owner
+        ), "the cell buffer is still owned by another component"
+        self.owner = owner
+
+    @staticmethod
+    def asArray(cells: Union[np.ndarray, "CellBuffer"]) -> np.ndarray:
+        """return the cells of a buffer for reading, or the matrix passed in as is, for the engines which build their own representation
+
+        Args:
+            cells (Union[np.ndarray, CellBuffer]): a cell matrix or a cell buffer
+
+        Returns:
+            np.ndarray: the cells matrix
+        """
+        return cells.view() if isinstance(cells, CellBuffer) else np.asarray(cells)
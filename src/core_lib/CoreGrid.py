@@ -1,173 +1,465 @@
 """CoreGric class definition
 """
-from typing import Dict
+from typing import Dict, List, Optional, Tuple, Union
 
-import copy
 import numpy as np
-from numpy.typing import _Shape
-from tabulate import tabulate  # type: ignore
+from src.core_lib.BaseGrid import BaseGrid
+from src.core_lib.CellBuffer import CellBuffer
+from src.core_lib.CellBuffer import readOnlyView
+from src.core_lib.GridDiff import CELL_INDEXES
+from src.core_lib.GridStats import GridStats
+from src.utils.checkpointUtils import unpackCheckpointWindow
 from src.utils.confUtils import fetch_game_config
 from src.utils.CustomTypes import ALIVE_CELL_STATE
+from src.utils.CustomTypes import CELL_STATE_DTYPE
 from src.utils.CustomTypes import DEAD_CELL_STATE
-from src.utils.CustomTypes import GRID_CELL_STATE_TYPE
-
-
-class CoreGrid:
+from src.utils.fingerprintUtils import cellsFingerprint
+from src.utils.fingerprintUtils import matFingerprint
+from src.utils.fingerprintUtils import stepFingerprint
+from src.utils.ruleUtils import MAX_NEIGHBOURS
+from src.utils.ruleUtils import RULE_INDEX_BLOCK_SIZE
+from src.utils.ruleUtils import applyRuleTable
+from src.utils.ruleUtils import countTransitions
+from src.utils.ruleUtils import ruleIndexDtype
+
+
+def fillBoundary(padded_alive: np.ndarray, boundary: str) -> None:
+    """fill the ring of a padded alive mask with the out-of-border neighbours, according to the boundary topology, by copying whole rows and columns
+    The leading axes, if any, index independent grids (e.g. the boards of an ensemble)
+
+    Args:
+        padded_alive (np.ndarray): alive mask surrounded by a ring of one cell, of shape (..., rows + 2, cols + 2)
+        boundary (str): boundary topology, one of BOUNDARIES
+    """
+    if boundary == "dead":
+        return  # the ring is never written, and remains dead
+
+    # rows first, then the columns on the whole height so that the corners are filled too
+    if boundary in ["torus", "klein"]:
+        np.copyto(padded_alive[..., 0, 1:-1], padded_alive[..., -2, 1:-1])
+        np.copyto(padded_alive[..., -1, 1:-1], padded_alive[..., 1, 1:-1])
+    else:
+        np.copyto(padded_alive[..., 0, 1:-1], padded_alive[..., 1, 1:-1])
+        np.copyto(padded_alive[..., -1, 1:-1], padded_alive[..., -2, 1:-1])
+
+    if boundary == "torus":
+        np.copyto(padded_alive[..., 0], padded_alive[..., -2])
+        np.copyto(padded_alive[..., -1], padded_alive[..., 1])
+    elif boundary == "klein":
+        np.copyto(padded_alive[..., 0], padded_alive[..., ::-1, -2])
+        np.copyto(padded_alive[..., -1], padded_alive[..., ::-1, 1])
+    else:
+        np.copyto(padded_alive[..., 0], padded_alive[..., 1])
+        np.copyto(padded_alive[..., -1], padded_alive[..., -2])
+
+
+def stepCells(
+    src_cell_mat: np.ndarray,
+    dst_cell_mat: np.ndarray,
+    neighbours_views: List[np.ndarray],
+    neighbours_count: np.ndarray,
+    rule_index: np.ndarray,
+    index_block: np.ndarray,
+    flat_rule_table: np.ndarray,
+) -> None:
+    """compute the next state of src_cell_mat into dst_cell_mat, once its alive mask and the boundary ring are filled, using only the buffers passed in
+    The leading axes, if any, index independent grids (e.g. the boards of an ensemble)
+
+    Args:
+        src_cell_mat (np.ndarray): the current cells
+        dst_cell_mat (np.ndarray): contiguous cells receiving the next state
+        neighbours_views (List[np.ndarray]): the 8 shifted views of the padded alive mask, each one holding one neighbour of every cell
+        neighbours_count (np.ndarray): buffer of the alive neighbours count of every cell, overwritten
+        rule_index (np.ndarray): contiguous buffer of the rule indexes of the cells, of dtype ruleIndexDtype(n_states), overwritten
+        index_block (np.ndarray): intp buffer of RULE_INDEX_BLOCK_SIZE indexes (or less), overwritten
+        flat_rule_table (np.ndarray): the rule table, flattened, of the dtype of dst_cell_mat
+    """
+    np.add(neighbours_views[0], neighbours_views[1], out=neighbours_count)
+    for neighbours_view in neighbours_views[2:]:
+        np.add(neighbours_count, neighbours_view, out=neighbours_count)
+
+    # the rule table gives the next state of every cell from its state and its number of alive neighbours, in one gather,
+    # so that births, survivals and the decay of the dying cells are all computed at once
+    np.multiply(
+        src_cell_mat, MAX_NEIGHBOURS + 1, out=rule_index, dtype=rule_index.dtype
+    )
+    np.add(rule_index, neighbours_count, out=rule_index)
+    applyRuleTable(rule_index, flat_rule_table, index_block, dst_cell_mat)
+
+
+class CoreGrid(BaseGrid):
     """Handle the main grid which keep tracks of the current state of the game's cells, core functions for the grid processing"""
 
-    def __init__(self, gameConfig: Dict, default_cell_mat: np.ndarray):
+    bounded_by_resolution: bool = True
 
-        self._turn = 0
+    def __init__(
+        self, gameConfig: Dict, default_cell_mat: Union[np.ndarray, CellBuffer]
+    ):
+        super().__init__(gameConfig)
 
-        self.initial_cell_mat: np.ndarray = np.array([[]])
+        # the initial state is owned by the grid and never written, the two cell matrices are its working copies
+        self.initial_buffer: CellBuffer = CellBuffer.zeros((0, 0), owner=self)
+        self.initial_cell_mat: np.ndarray = self.initial_buffer.view()
         self.old_cell_mat: np.ndarray = np.array([[]])
         self.cell_mat: np.ndarray = np.array([[]])
+
+        # buffers of the step, allocated once for the shape of the grid
+        self._neighbours_count: np.ndarray = np.array([[]], dtype=np.uint8)
+        self._rule_index: np.ndarray = np.array([[]], dtype=np.uint8)
+        self._index_block: np.ndarray = np.array([], dtype=np.intp)
+        self._flat_rule_table: np.ndarray = self.rule_table.reshape(-1)
+        self._padded_alive: np.ndarray = np.array([[]], dtype=np.uint8)
+        self._alive_view: np.ndarray = self._padded_alive
+        self._neighbours_views: List[np.ndarray] = []
+
+        # buffers of the statistics, collected from the buffers left by the step rather than by scanning the grid again
+        self._next_alive: np.ndarray = np.array([[]], dtype=bool)
+        self._changed: np.ndarray = np.array([[]], dtype=bool)
+        self._alive_rows: np.ndarray = np.array([], dtype=bool)
+        self._alive_cols: np.ndarray = np.array([], dtype=bool)
+
         self.initCellMat(default_cell_mat)
-        self.grid_dim: _Shape = default_cell_mat.shape
-        self.gameConfig: Dict = gameConfig
+        self.grid_dim = default_cell_mat.shape
         self.validateGrid()
 
-    def prettyPrintCellMat(self, tabulate_fmt="grid") -> None:
-        """Pretty print the grid using tabulate 'grid' format"""
+    def _stepDiff(self) -> Tuple[CELL_INDEXES, CELL_INDEXES]:
+        """return the cells born and dead during the last generation computed, the previous generation being still held by the old cell mat
 
-        print(f"================ #{self._turn} ================")
-        print(tabulate(self.cell_mat, tablefmt=tabulate_fmt))
+        Returns:
+            Tuple[CELL_INDEXES, CELL_INDEXES]: (rows, cols) of the cells born, and of the cells dead
+        """
+        np.equal(self.old_cell_mat, ALIVE_CELL_STATE, out=self._changed)
+        np.equal(self.cell_mat, ALIVE_CELL_STATE, out=self._next_alive)
+        born_rows, born_cols = np.nonzero(self._next_alive > self._changed)
+        died_rows, died_cols = np.nonzero(self._next_alive < self._changed)
+        return (born_rows, born_cols), (died_rows, died_cols)
 
-    def applyRules(
-        self,
-    ) -> None:
-        """Apply the 3 main rules of the Game of Life to the main matrix"""
+    def _computeFingerprint(self) -> int:
+        """compute the Zobrist fingerprint of the current state from scratch : the XOR of the random keys of the position and state of every cell which is not dead
+
+        Returns:
+            int: the 64 bits fingerprint
+        """
+        return matFingerprint(self.cell_mat)
 
-        self._turn += 1
-        self.old_cell_mat = copy.deepcopy(self.cell_mat)
+    def _cellsFingerprint(self, rows: np.ndarray, cols: np.ndarray) -> int:
+        """return the contribution to the fingerprint of some distinct cells in their current state, so that changing k cells updates the fingerprint in O(k)
 
-        for i in range(self.grid_dim[0]):
-            for j in range(self.grid_dim[1]):
-                self.setCell(i, j, self._applyRulesOnCell(i, j))
-        # self.prettyPrintCellMat()
+        Args:
+            rows (np.ndarray): row indexes of the cells
+            cols (np.ndarray): column indexes of the cells
 
-    def _applyRulesOnCell(self, i: int, j: int) -> GRID_CELL_STATE_TYPE:
-        """apply the rules on one cell, selected by its indexes on the grid
+        Returns:
+            int: the contribution of the cells
+        """
+        return cellsFingerprint(
+            rows * self.cell_mat.shape[1] + cols, self.cell_mat[rows, cols]
+        )
+
+    def _stepFingerprint(self) -> int:
+        """return the change of the fingerprint made by the last step, from the cells which changed, the previous generation being still held by the old cell mat
+
+        Returns:
+            int: the 64 bits change, to XOR into the fingerprint of the previous generation
+        """
+        return self._stripeFingerprint(0, self.cell_mat.shape[0])
+
+    def _stripeFingerprint(self, start_row: int, end_row: int) -> int:
+        """return the change of the fingerprint made by the last step on the rows between start_row and end_row
 
         Args:
-            i (int): row index of the cell
-            j (int): column index of the cell
+            start_row (int): index of the first row of the stripe
+            end_row (int): index of the row following the last row of the stripe
 
         Returns:
-            GRID_CELL_STATE_TYPE: the next state on the cell after 1 turn
+            int: the 64 bits change of the stripe
         """
-        cell_state: GRID_CELL_STATE_TYPE = self.old_cell_mat[i][j]
-        next_state: GRID_CELL_STATE_TYPE = DEAD_CELL_STATE
-
-        cell_surrounding: np.ndarray = self.__getCurrentNeighbors(i, j)
-        if cell_state == ALIVE_CELL_STATE:
-            # substracting one because the current cell tested is alrady on the 'alive' state
-            if sum(
-                np.count_nonzero(x == ALIVE_CELL_STATE) for x in cell_surrounding
-            ) - 1 in [2, 3]:
-                next_state = ALIVE_CELL_STATE  # alive cell surviving, rule #1
-        else:
-            if (
-                sum(np.count_nonzero(x == ALIVE_CELL_STATE) for x in cell_surrounding)
-                == 3
-            ):
-                next_state = ALIVE_CELL_STATE  # dead cell becoming alive, rule #2
+        return stepFingerprint(
+            self.old_cell_mat[start_row:end_row],
+            self.cell_mat[start_row:end_row],
+            self._changed[start_row:end_row],
+            self.n_states,
+            start_row * self.cell_mat.shape[1],
+        )
 
-        return next_state
+    def _nextGeneration(self) -> None:
+        """compute the next generation, the current cell mat becomes the old one and the old one receives the next state,
+        the fingerprint being updated with the cells which changed"""
 
-    def __getCurrentNeighbors(self, i: int, j: int) -> np.ndarray:
-        """Return the current neighborhood of the cell at row i and column j, regardless of the border of the grid, set the out-of-border neighbour to DEAD_CELL_STATE.
+        self.old_cell_mat, self.cell_mat = self.cell_mat, self.old_cell_mat
+        self._step(self.old_cell_mat, self.cell_mat)
+        if self._fingerprint is not None:
+            self._fingerprint ^= self._stepFingerprint()
+
+    def _step(self, src_cell_mat: np.ndarray, dst_cell_mat: np.ndarray) -> None:
+        """compute the next state of src_cell_mat into dst_cell_mat, using only the preallocated buffers
 
         Args:
-            i (int): row index of the cell
-            j (int): column index of the cell
+            src_cell_mat (np.ndarray): the current cell matrix
+            dst_cell_mat (np.ndarray): the cell matrix receiving the next state
+        """
+        np.equal(src_cell_mat, ALIVE_CELL_STATE, out=self._alive_view)
+        self._fillBoundary()
+        stepCells(
+            src_cell_mat,
+            dst_cell_mat,
+            self._neighbours_views,
+            self._neighbours_count,
+            self._rule_index,
+            self._index_block,
+            self._flat_rule_table,
+        )
+
+    def _collectStats(self) -> None:
+        """collect the statistics of the current generation as by-products of the last step : the births, deaths and population are counted
+        on the rule indexes left by the step, and both the counts and the bounding box only look at the region where a cell may have lived"""
+
+        region: Optional[Tuple[int, int, int, int]] = self._liveRegion()
+        if region is None:
+            self.stats = GridStats(self._turn, 0, 0, 0)
+            return
+
+        # the rows of the region are contiguous in the rule indexes, the cells of the other columns being dead without alive neighbours
+        births, deaths, population = countTransitions(
+            self._rule_index[region[0] : region[2] + 1],
+            self._flat_rule_table,
+            self._index_block,
+        )
+        self.stats = GridStats(
+            self._turn, population, births, deaths, self._searchBoundingBox(region)
+        )
+
+    def _liveRegion(self) -> Optional[Tuple[int, int, int, int]]:
+        """return a region of the grid holding every cell alive since the statistics were last collected : without B0 rules,
+        a cell is only born next to an alive one, so the previous bounding box grows by one cell per generation at most
 
         Returns:
-            np.ndarray: neighborhood of the cell at row i and column j of the grid
+            Optional[Tuple[int, int, int, int]]: first row, first column, last row and last column of the region, None if no cell was alive
         """
-        surr_neighbours: np.ndarray = np.full((3, 3), DEAD_CELL_STATE)
-
-        for offset_i in [-1, 0, 1]:
-            for offset_j in [-1, 0, 1]:
-                # checking only cells inside the grid, the other will remain set to DEAD_CELL_STATE
-                if not (
-                    i + offset_i < 0
-                    or j + offset_j < 0
-                    or i + offset_i > self.grid_dim[0] - 1
-                    or j + offset_j > self.grid_dim[1] - 1
-                ):
-                    # retrieving cell mat value to create the neighbours
-                    surr_neighbours[offset_i + 1][offset_j + 1] = self.old_cell_mat[
-                        i + offset_i
-                    ][j + offset_j]
-
-        return surr_neighbours
-
-    def validateGrid(self) -> None:
-        """Make sure that the grid has authorized dimensions in regards to the resolution of the UI, and correct values for the cells too"""
+        n_rows, n_cols = self.cell_mat.shape
+        whole_grid: Tuple[int, int, int, int] = (0, 0, n_rows - 1, n_cols - 1)
+        if self.rule_table[DEAD_CELL_STATE, 0] != DEAD_CELL_STATE:
+            return whole_grid
+        if self.stats.bounding_box is None:
+            return None
+
+        growth: int = self._turn - self.stats.turn
+        top, left, bottom, right = self.stats.bounding_box
+        top, left, bottom, right = (
+            top - growth,
+            left - growth,
+            bottom + growth,
+            right + growth,
+        )
+        # the cells on the border have neighbours on the other side of the grid with the wrapping boundaries
+        if self.boundary in ["torus", "klein"] and (
+            top < 0 or left < 0 or bottom >= n_rows or right >= n_cols
+        ):
+            return whole_grid
+        return (
+            max(top, 0),
+            max(left, 0),
+            min(bottom, n_rows - 1),
+            min(right, n_cols - 1),
+        )
 
-        assert (
-            np.array(self.grid_dim) % 2 == 0
-        ).all(), "grid dimensions should be even numbers"
-
-        assert np.all(
-            [
-                low <= x <= high
-                for low, x, high in zip(
-                    self.gameConfig["videoSettings"]["min_grid_dim"],
-                    self.grid_dim,
-                    self.gameConfig["videoSettings"]["res"],
-                )
-            ]
-        ), f"grid_dim ({self.grid_dim}) should be between {self.gameConfig['videoSettings']['min_grid_dim']} and {self.gameConfig['videoSettings']['res']}"
+    def _searchBoundingBox(
+        self, region: Tuple[int, int, int, int]
+    ) -> Optional[Tuple[int, int, int, int]]:
+        """search the live bounding box within a region of the grid holding every alive cell, the rest of the grid being skipped,
+        the alive mask of the region is left in the _next_alive buffer
 
-        assert (
-            (self.cell_mat == DEAD_CELL_STATE) | (self.cell_mat == ALIVE_CELL_STATE)
-        ).all(), (
-            "all cells should be represented by integer of 0 or 1 (dead or alive state)"
+        Args:
+            region (Tuple[int, int, int, int]): first row, first column, last row and last column of the region
+
+        Returns:
+            Optional[Tuple[int, int, int, int]]: the live bounding box, None if there is no alive cell
+        """
+        top, left, bottom, right = region
+        alive_mask: np.ndarray = self._next_alive[top : bottom + 1, left : right + 1]
+        alive_rows: np.ndarray = self._alive_rows[top : bottom + 1]
+        alive_cols: np.ndarray = self._alive_cols[left : right + 1]
+
+        np.equal(
+            self.cell_mat[top : bottom + 1, left : right + 1],
+            ALIVE_CELL_STATE,
+            out=alive_mask,
+        )
+        np.logical_or.reduce(alive_mask, axis=1, out=alive_rows)
+        np.logical_or.reduce(alive_mask, axis=0, out=alive_cols)
+        bounding_box: Optional[Tuple[int, int, int, int]] = GridStats.boundingBox(
+            alive_rows, alive_cols
+        )
+        if bounding_box is None:
+            return None
+        return (
+            bounding_box[0] + top,
+            bounding_box[1] + left,
+            bounding_box[2] + top,
+            bounding_box[3] + left,
+        )
+
+    def _scanStats(self) -> None:
+        """collect the statistics of the current generation by scanning the grid, when there is no step to take them from"""
+
+        n_rows, n_cols = self.cell_mat.shape
+        bounding_box: Optional[Tuple[int, int, int, int]] = self._searchBoundingBox(
+            (0, 0, n_rows - 1, n_cols - 1)
+        )
+        self.stats = GridStats(
+            self._turn,
+            int(np.count_nonzero(self._next_alive)),
+            bounding_box=bounding_box,
+        )
+
+    def _allocateStatsBuffers(self) -> None:
+        """allocate once the buffers used to collect the statistics of a grid of this shape"""
+
+        rows, cols = self.cell_mat.shape
+        self._next_alive = np.zeros((rows, cols), dtype=bool)
+        self._changed = np.zeros((rows, cols), dtype=bool)
+        self._alive_rows = np.zeros(rows, dtype=bool)
+        self._alive_cols = np.zeros(cols, dtype=bool)
+
+    def _fillBoundary(self) -> None:
+        """fill the ring of the padded grid with the out-of-border neighbours, according to the boundary topology"""
+        fillBoundary(self._padded_alive, self.boundary)
+
+    def _allocateStepBuffers(self) -> None:
+        """allocate once the buffers used to compute every generation of a grid of this shape"""
+
+        rows, cols = self.cell_mat.shape
+        self._neighbours_count = np.zeros((rows, cols), dtype=np.uint8)
+        # the rule indexes are kept compact, and only converted into the intp ones np.take needs one block at a time
+        self._rule_index = np.zeros((rows, cols), dtype=ruleIndexDtype(self.n_states))
+        self._index_block = np.zeros(
+            min(RULE_INDEX_BLOCK_SIZE, max(1, rows * cols)), dtype=np.intp
         )
+        # the next states are gathered straight into the cell matrix, so the table takes its dtype
+        self._flat_rule_table = self.rule_table.astype(self.cell_mat.dtype).reshape(-1)
+        self._padded_alive = np.zeros((rows + 2, cols + 2), dtype=np.uint8)
+        self._alive_view = self._padded_alive[1:-1, 1:-1]
+        # the 8 shifted views of the padded grid, each one holding one neighbour of every cell
+        self._neighbours_views = [
+            self._padded_alive[offset_i : offset_i + rows, offset_j : offset_j + cols]
+            for offset_i in [0, 1, 2]
+            for offset_j in [0, 1, 2]
+            if offset_i != 1 or offset_j != 1
+        ]
+
+    def _validateCellMat(self) -> None:
+        """Make sure that every cell of the grid holds a state of the rule, the whole grid is only scanned with the full validation level,
+        as the cheap one already checked the cells on their way in"""
+
+        if self.validation != "full":
+            return
+        assert (
+            self.cell_mat.max(initial=0) < self.n_states
+        ), f"all cells should be represented by integer between 0 and {self.n_states - 1} (dead, alive or dying state of the rule {self.rule})"
 
     def getCellMat(self) -> np.ndarray:
-        """Return the grid, representing the cells on the form of nest np array
+        """Return the grid, representing the cells on the form of nest np array, the matrix is shared with the grid and cannot be written
 
         Returns:
-            np.ndarray: the grid containing the cells
+            np.ndarray: read-only view of the grid containing the cells
         """
-        return self.cell_mat
+        return readOnlyView(self.cell_mat)
 
-    def setCell(self, i: int, j: int, value: GRID_CELL_STATE_TYPE) -> None:
-        """Set the cell of the grid to a value passed in
+    def _writeCell(self, i: int, j: int, value: int) -> None:
+        """write a cell already validated, and update the statistics and the fingerprint
 
         Args:
             i (int): row index of the cell
             j (int): column index of the cell
-            value (Union[DEAD_CELL_STATE, ALIVE_CELL_STATE]): state assigned to the cell
+            value (int): state assigned to the cell
         """
-        self.cell_mat[i][j] = value
-        self.validateGrid()
+        was_alive: bool = self.cell_mat[i][j] == ALIVE_CELL_STATE
+        if self._fingerprint is not None:
+            cell: Tuple[np.ndarray, np.ndarray] = (np.array([i]), np.array([j]))
+            self._fingerprint ^= self._cellsFingerprint(*cell)
+            self.cell_mat[i][j] = value
+            self._fingerprint ^= self._cellsFingerprint(*cell)
+        else:
+            self.cell_mat[i][j] = value
+        self._resetCycleDetection()
+        if not self.stats.updateCell(i, j, was_alive, value == ALIVE_CELL_STATE):
+            self._scanStats()
+
+    def _writeCells(
+        self, rows: np.ndarray, cols: np.ndarray, values: np.ndarray
+    ) -> None:
+        """write distinct cells already validated, and update the statistics and the fingerprint from the cells written
+
+        Args:
+            rows (np.ndarray): row indexes of the cells
+            cols (np.ndarray): column indexes of the cells
+            values (np.ndarray): states assigned to the cells
+        """
+        was_alive: np.ndarray = self.cell_mat[rows, cols] == ALIVE_CELL_STATE
+        if self._fingerprint is not None:
+            self._fingerprint ^= self._cellsFingerprint(rows, cols)
+            self.cell_mat[rows, cols] = values
+            self._fingerprint ^= self._cellsFingerprint(rows, cols)
+        else:
+            self.cell_mat[rows, cols] = values
+        self._resetCycleDetection()
+        if not self.stats.updateCells(
+            rows, cols, was_alive, np.asarray(values) == ALIVE_CELL_STATE
+        ):
+            self._scanStats()
 
     def resetCellMat(self) -> None:
-        """Reset the grid internal state (and it's previous state too)"""
-        self.cell_mat = copy.deepcopy(self.initial_cell_mat)
-        self.old_cell_mat = copy.deepcopy(self.initial_cell_mat)
+        """Reset the grid internal state, in place, and start counting the turns over, the history starting over too
+        The old cell mat is left as is, as it is only ever read after the step wrote it"""
+        np.copyto(self.cell_mat, self.initial_cell_mat)
+        self._startOver()
 
-    def initCellMat(self, new_cell_mat: np.ndarray) -> None:
+    def initCellMat(self, new_cell_mat: Union[np.ndarray, CellBuffer]) -> None:
         """set the old and new cell mat to a completely new cell matrix passed in, used mainly when the grid is reset, to start over
+        The cells are stored as CELL_STATE_DTYPE (one byte per cell) : a CellBuffer released by its owner is adopted as the initial state without copy,
+        any other matrix is converted once
 
         Args:
-            new_cell_mat (np.ndarray): the new cell matrix
+            new_cell_mat (Union[np.ndarray, CellBuffer]): the new cell matrix
         """
-        self.initial_cell_mat = copy.deepcopy(new_cell_mat)
-        self.cell_mat = copy.deepcopy(new_cell_mat)
-        self.old_cell_mat = copy.deepcopy(new_cell_mat)
-
-    def getAliveCellCount(self) -> int:
-        """return the number of alive cells in the grid
+        if isinstance(new_cell_mat, CellBuffer):
+            new_cell_mat.acquire(self)
+            assert (
+                self.validation == "off"
+                or new_cell_mat.cells.max(initial=0) < self.n_states
+            ), f"all cells should be represented by integer between 0 and {self.n_states - 1} (dead, alive or dying state of the rule {self.rule})"
+            self.initial_buffer = new_cell_mat
+        else:
+            # checked before the cast, which would silently truncate or wrap bad values
+            assert (
+                self.validation == "off"
+                or np.isin(new_cell_mat, np.arange(self.n_states)).all()
+            ), f"all cells should be represented by integer between 0 and {self.n_states - 1} (dead, alive or dying state of the rule {self.rule})"
+            self.initial_buffer = CellBuffer(
+                np.array(new_cell_mat, dtype=CELL_STATE_DTYPE), owner=self
+            )
+
+        self.initial_cell_mat = self.initial_buffer.view()
+        self._allocateCellMats()
+        self._allocateStepBuffers()
+        self._allocateStatsBuffers()
+        self._startOver()
+
+    def _resumeCheckpoint(self, header: Dict, payload: np.ndarray) -> None:
+        """make the generation saved into a checkpoint the initial state of the grid, the turn being restored by the caller,
+        only the cells of a plane lying in the grid are kept
 
-        Returns:
-            int: number of alive cells in the grid
+        Args:
+            header (Dict): the header of the checkpoint
+            payload (np.ndarray): the memory map of the payload of the checkpoint, to be copied
         """
-        return sum(np.count_nonzero(row == ALIVE_CELL_STATE) for row in self.cell_mat)
+        self.initCellMat(CellBuffer(unpackCheckpointWindow(header, payload)))
+
+    def _allocateCellMats(self) -> None:
+        """allocate the two cell matrices from the initial state, the old one is only ever read after the step wrote it"""
+
+        self.cell_mat = self.initial_cell_mat.copy()
+        self.old_cell_mat = np.zeros_like(self.cell_mat)
 
     def getDeadCellCount(self) -> int:
         """return the number of dead cells in the grid
@@ -175,7 +467,10 @@ class CoreGrid:
         Returns:
             int: number of dead cells in the grid
         """
-        return sum(np.count_nonzero(row == DEAD_CELL_STATE) for row in self.cell_mat)
+        if self.n_states == 2:
+            return self.cell_mat.size - self.stats.population
+        # the dying cells are neither alive nor dead
+        return int(np.count_nonzero(self.cell_mat == DEAD_CELL_STATE))
 
 
 if __name__ == "__main__":
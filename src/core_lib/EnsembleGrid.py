@@ -0,0 +1,288 @@
+"""EnsembleGrid class definition
+"""
+from typing import Dict, List
+
+import numpy as np
+from src.core_lib.BaseGrid import BOUNDARIES
+from src.core_lib.CoreGrid import fillBoundary
+from src.core_lib.CoreGrid import stepCells
+from src.utils.confUtils import fetch_game_config
+from src.utils.CustomTypes import ALIVE_CELL_STATE
+from src.utils.CustomTypes import CELL_STATE_DTYPE
+from src.utils.CustomTypes import DEAD_CELL_STATE
+from src.utils.ruleUtils import RULE_INDEX_BLOCK_SIZE
+from src.utils.ruleUtils import compileRule
+from src.utils.ruleUtils import ruleIndexDtype
+
+NOT_YET: int = -1  # turn of the boards which have not died or stabilized (yet)
+
+
+class EnsembleGrid:
+    """Simulate a batch of independent boards of the same shape, held in a single (N, rows, cols) array and stepped all together by one vectorized step
+
+    After every turn, the population of every board is counted, and the boards which died (unless a B0 rule brings the cells back to life)
+    or stabilized (into still lifes and period 2 oscillators) drop out of the active batch, so that the remaining ones step faster.
+    A board which dropped out keeps the state it had on the turn it stopped.
+    """
+
+    def __init__(self, gameConfig: Dict, cell_mats: np.ndarray):
+
+        self._turn = 0
+
+        self.gameConfig: Dict = gameConfig
+        self.boundary: str = self.gameConfig["simulation"]["boundary"]
+        self.rule: str = self.gameConfig["simulation"]["rule"]
+        self.rule_table: np.ndarray = compileRule(self.rule)
+        self.n_states: int = self.rule_table.shape[0]
+        # the next states are gathered straight into the boards, so the table takes their dtype
+        self._flat_rule_table: np.ndarray = self.rule_table.astype(
+            CELL_STATE_DTYPE
+        ).reshape(-1)
+        # with a B0 rule, a cell without alive neighbours is born, so a board without alive cells is not extinct
+        self._b0: bool = bool(self.rule_table[DEAD_CELL_STATE, 0] != DEAD_CELL_STATE)
+
+        self.cell_mats: np.ndarray = np.array(cell_mats)
+        self.validateGrid()
+        self.cell_mats = self.cell_mats.astype(CELL_STATE_DTYPE)
+        n_boards: int = self.cell_mats.shape[0]
+
+        # statistics of every board of the ensemble
+        self.populations: np.ndarray = self._countPopulations(self.cell_mats)
+        self.extinction_turns: np.ndarray = np.full(n_boards, NOT_YET)
+        # first turn of the cycle of the boards which stabilized
+        self.stabilization_turns: np.ndarray = np.full(n_boards, NOT_YET)
+
+        # the active batch : indexes of the boards still simulated, their current state and their state 1 and 2 turns ago
+        self.active_boards: np.ndarray = np.arange(n_boards)
+        self._active_cell_mats: np.ndarray = self.cell_mats.copy()
+        self._previous_cell_mats: List[np.ndarray] = []
+        self._allocateStepBuffers()
+        extinct_mask: np.ndarray = self._extinctMask(self.populations)
+        self.extinction_turns[extinct_mask] = self._turn
+        self._dropBoards(extinct_mask)
+
+    def validateGrid(self) -> None:
+        """Make sure that the boards have authorized dimensions, correct values for the cells too, and a known boundary topology"""
+
+        assert (
+            self.boundary in BOUNDARIES
+        ), f"Unknown boundary '{self.boundary}', the available ones are : {', '.join(BOUNDARIES)}"
+
+        assert (
+            self.cell_mats.ndim == 3
+        ), "the boards should be stacked into a (N, rows, cols) matrix"
+
+        assert (
+            np.array(self.cell_mats.shape[1:]) % 2 == 0
+        ).all(), "grid dimensions should be even numbers"
+
+        assert np.all(
+            [
+                low <= x
+                for low, x in zip(
+                    self.gameConfig["videoSettings"]["min_grid_dim"],
+                    self.cell_mats.shape[1:],
+                )
+            ]
+        ), f"grid_dim ({self.cell_mats.shape[1:]}) should be greater than {self.gameConfig['videoSettings']['min_grid_dim']}"
+
+        assert np.isin(
+            self.cell_mats, np.arange(self.n_states)
+        ).all(), f"all cells should be represented by integer between 0 and {self.n_states - 1} (dead, alive or dying state of the rule {self.rule})"
+
+    def advance(self, n: int) -> None:
+        """Apply the rules of the game n times in a row to every active board, stopping early if every board dropped out
+
+        Args:
+            n (int): number of turns to compute
+        """
+        assert n >= 0, "the number of turns must be positive"
+
+        for _ in range(n):
+            if self.active_boards.size == 0:
+                break
+            self._turn += 1
+            self._nextGeneration()
+
+    def applyRules(self) -> None:
+        """Apply the rules of the game once to every active board"""
+        self.advance(1)
+
+    def _nextGeneration(self) -> None:
+        """step the active batch, update the populations and drop the boards which died or stabilized"""
+
+        # the state of 2 turns ago receives the next state, as it is only needed to detect the period 2 oscillators
+        next_cell_mats: np.ndarray = (
+            self._previous_cell_mats.pop(0)
+            if len(self._previous_cell_mats) == 2
+            else np.empty_like(self._active_cell_mats)
+        )
+        self._step(self._active_cell_mats, next_cell_mats)
+        self._previous_cell_mats.append(self._active_cell_mats)
+        self._active_cell_mats = next_cell_mats
+
+        active_populations: np.ndarray = self._countPopulations(next_cell_mats)
+        self.populations[self.active_boards] = active_populations
+
+        # turn on which the cycle of every board starts, the state of 2 turns ago coming first so that the earliest one is kept
+        cycle_start_turns: np.ndarray = np.full(self.active_boards.size, NOT_YET)
+        for lag, previous_cell_mats in zip(
+            range(len(self._previous_cell_mats), 0, -1), self._previous_cell_mats
+        ):
+            repeated_mask: np.ndarray = (previous_cell_mats == next_cell_mats).all(
+                axis=(1, 2)
+            )
+            cycle_start_turns[repeated_mask & (cycle_start_turns == NOT_YET)] = (
+                self._turn - lag
+            )
+        stabilized_mask: np.ndarray = cycle_start_turns != NOT_YET
+
+        extinct_mask: np.ndarray = self._extinctMask(active_populations)
+        self.extinction_turns[self.active_boards[extinct_mask]] = self._turn
+        self.stabilization_turns[
+            self.active_boards[stabilized_mask & ~extinct_mask]
+        ] = cycle_start_turns[stabilized_mask & ~extinct_mask]
+        self._dropBoards(extinct_mask | stabilized_mask)
+
+    def _step(self, src_cell_mats: np.ndarray, dst_cell_mats: np.ndarray) -> None:
+        """compute the next state of every board of src_cell_mats into dst_cell_mats, using only the preallocated buffers
+
+        Args:
+            src_cell_mats (np.ndarray): the current boards of the active batch
+            dst_cell_mats (np.ndarray): the boards receiving the next state
+        """
+        np.equal(src_cell_mats, ALIVE_CELL_STATE, out=self._alive_view)
+        fillBoundary(self._padded_alive, self.boundary)
+        stepCells(
+            src_cell_mats,
+            dst_cell_mats,
+            self._neighbours_views,
+            self._neighbours_count,
+            self._rule_index,
+            self._index_block,
+            self._flat_rule_table,
+        )
+
+    def _allocateStepBuffers(self) -> None:
+        """allocate the buffers used to compute every generation of the active batch, again each time it shrinks"""
+
+        n_boards, rows, cols = self._active_cell_mats.shape
+        self._neighbours_count = np.zeros((n_boards, rows, cols), dtype=np.uint8)
+        self._rule_index = np.zeros(
+            (n_boards, rows, cols), dtype=ruleIndexDtype(self.n_states)
+        )
+        self._index_block = np.zeros(
+            min(RULE_INDEX_BLOCK_SIZE, max(1, n_boards * rows * cols)), dtype=np.intp
+        )
+        self._padded_alive = np.zeros((n_boards, rows + 2, cols + 2), dtype=np.uint8)
+        self._alive_view = self._padded_alive[:, 1:-1, 1:-1]
+        self._neighbours_views = [
+            self._padded_alive[
+                :, offset_i : offset_i + rows, offset_j : offset_j + cols
+            ]
+            for offset_i in [0, 1, 2]
+            for offset_j in [0, 1, 2]
+            if offset_i != 1 or offset_j != 1
+        ]
+
+    def _extinctMask(self, populations: np.ndarray) -> np.ndarray:
+        """select the boards without alive cells, which stay so unless a B0 rule brings the cells back to life
+
+        Args:
+            populations (np.ndarray): the number of alive cells of every board
+
+        Returns:
+            np.ndarray: boolean array over the boards, True for the extinct ones
+        """
+        if self._b0:
+            return np.zeros(populations.shape, dtype=bool)
+        return populations == 0
+
+    def _dropBoards(self, drop_mask: np.ndarray) -> None:
+        """remove the boards of the active batch selected by the mask, their state is saved into the whole ensemble
+
+        Args:
+            drop_mask (np.ndarray): boolean array over the active batch, True for the boards to remove
+        """
+        if not drop_mask.any():
+            return
+
+        dropped_boards: np.ndarray = self.active_boards[drop_mask]
+        self.cell_mats[dropped_boards] = self._active_cell_mats[drop_mask]
+
+        keep_mask: np.ndarray = ~drop_mask
+        self.active_boards = self.active_boards[keep_mask]
+        self._active_cell_mats = self._active_cell_mats[keep_mask]
+        self._previous_cell_mats = [
+            previous_cell_mats[keep_mask]
+            for previous_cell_mats in self._previous_cell_mats
+        ]
+        self._allocateStepBuffers()
+
+    @staticmethod
+    def _countPopulations(cell_mats: np.ndarray) -> np.ndarray:
+        """count the alive cells of every board
+
+        Args:
+            cell_mats (np.ndarray): the boards, of shape (N, rows, cols)
+
+        Returns:
+            np.ndarray: the number of alive cells of every board
+        """
+        return np.count_nonzero(cell_mats == ALIVE_CELL_STATE, axis=(1, 2))
+
+    def getCellMats(self) -> np.ndarray:
+        """Return the current state of every board, the boards which dropped out of the active batch keeping the state they had on the turn they stopped
+
+        Returns:
+            np.ndarray: the boards, of shape (N, rows, cols)
+        """
+        self.cell_mats[self.active_boards] = self._active_cell_mats
+        return self.cell_mats
+
+    def getPopulations(self) -> np.ndarray:
+        """return the number of alive cells of every board
+
+        Returns:
+            np.ndarray: the population of every board
+        """
+        return self.populations.copy()
+
+    def getExtinctionTurns(self) -> np.ndarray:
+        """return the turn on which every board lost its last alive cell
+
+        Returns:
+            np.ndarray: the turn of every board, NOT_YET for the ones still alive
+        """
+        return self.extinction_turns.copy()
+
+    def getStabilizationTurns(self) -> np.ndarray:
+        """return the turn from which every board repeats itself (still lifes and period 2 oscillators), without being extinct,
+        that is the first turn of its cycle and not the turn on which the cycle was detected, 1 or 2 turns later
+
+        Returns:
+            np.ndarray: the turn of every board, NOT_YET for the ones still evolving or extinct
+        """
+        return self.stabilization_turns.copy()
+
+    def getActiveBoards(self) -> np.ndarray:
+        """return the indexes of the boards still simulated
+
+        Returns:
+            np.ndarray: indexes of the active boards
+        """
+        return self.active_boards.copy()
+
+
+if __name__ == "__main__":
+
+    ensemble: EnsembleGrid = EnsembleGrid(
+        fetch_game_config(),
+        (np.random.default_rng().random((1000, 64, 64)) < 0.3).astype(np.uint8),
+    )
+    ensemble.advance(1000)
+    print(f"still evolving after 1000 turns : {ensemble.getActiveBoards().size}")
+    print(f"extinct : {np.count_nonzero(ensemble.getExtinctionTurns() != NOT_YET)}")
+    print(
+        f"stabilized : {np.count_nonzero(ensemble.getStabilizationTurns() != NOT_YET)}"
+    )
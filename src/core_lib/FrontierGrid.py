@@ -0,0 +1,315 @@
+"""FrontierGrid class definition
+"""
+from typing import Dict, Optional, Tuple, Union
+
+import numpy as np
+from src.core_lib.CellBuffer import CellBuffer
+from src.core_lib.CoreGrid import CoreGrid
+from src.core_lib.GridDiff import CELL_INDEXES
+from src.core_lib.GridStats import GridStats
+from src.utils.confUtils import fetch_game_config
+from src.utils.CustomTypes import ALIVE_CELL_STATE
+from src.utils.CustomTypes import DEAD_CELL_STATE
+from src.utils.fingerprintUtils import cellsFingerprint
+
+
+class FrontierGrid(CoreGrid):
+    """CoreGrid mode evaluating only the cells that changed during the last generation and their neighbours, the cost of a turn scales with the activity of the grid rather than its area
+
+    The cells are stored in a grid surrounded by a ring of dead cells, so that the neighbours of any cell can be reached with flat index offsets without bounds check,
+    and the number of alive neighbours of every cell is kept in a persistent matrix updated incrementally with the births and deaths of each turn
+    """
+
+    def __init__(self, gameConfig: Dict, default_cell_mat: np.ndarray):
+
+        self.padded_cell_mat: np.ndarray = np.array([[]])
+        self.neighbours_count: np.ndarray = np.array([[]], dtype=np.int8)
+        # flat indexes (in the padded grid) of the cells that changed during the last turn
+        self.frontier: np.ndarray = np.array([], dtype=np.intp)
+        self.neighbours_offsets: np.ndarray = np.array([], dtype=np.intp)
+        # births and deaths of the last generation, counted on the frontier
+        self._last_changes: Tuple[int, int] = (0, 0)
+        # variation of the population since the statistics were last collected
+        self._population_change: int = 0
+        # box holding every alive cell, grown with the cells born on the frontier, and searched again within itself when they are read
+        # after a cell of its border died
+        self._bounding_box: Optional[Tuple[int, int, int, int]] = None
+        self._bounding_box_stale: bool = False
+        super().__init__(gameConfig, default_cell_mat)
+
+    def _nextGeneration(self) -> None:
+        """Apply the rules of the game to the cells of the frontier and their neighbours only, the fingerprint being updated with the keys of the cells which changed"""
+
+        flat_cell_mat: np.ndarray = self.padded_cell_mat.reshape(-1)
+        flat_neighbours_count: np.ndarray = self.neighbours_count.reshape(-1)
+
+        # cells that may change : the frontier and its neighbours, without the dead ring
+        candidates: np.ndarray = np.unique(
+            (
+                self.frontier[:, None] + np.append(self.neighbours_offsets, 0)[None, :]
+            ).reshape(-1)
+        )
+        rows, cols = np.divmod(candidates, self.padded_cell_mat.shape[1])
+        candidates = candidates[
+            (rows >= 1)
+            & (rows <= self.padded_cell_mat.shape[0] - 2)
+            & (cols >= 1)
+            & (cols <= self.padded_cell_mat.shape[1] - 2)
+        ]
+
+        alive_mask: np.ndarray = flat_cell_mat[candidates] == ALIVE_CELL_STATE
+        neighbours_count: np.ndarray = flat_neighbours_count[candidates]
+        next_alive_mask: np.ndarray = (
+            self.rule_table[alive_mask.astype(np.uint8), neighbours_count]
+            == ALIVE_CELL_STATE
+        )
+
+        changed_mask: np.ndarray = next_alive_mask != alive_mask
+        self.frontier = candidates[changed_mask]
+        born_mask: np.ndarray = next_alive_mask[changed_mask]
+
+        flat_cell_mat[self.frontier] = np.where(
+            born_mask, ALIVE_CELL_STATE, DEAD_CELL_STATE
+        )
+        # the frontier holds flat indexes of the padded grid
+        changed_rows, changed_cols = np.divmod(
+            self.frontier, self.padded_cell_mat.shape[1]
+        )
+        changed_rows -= 1
+        changed_cols -= 1
+        # every cell which changed was alive before or is alive now, so its key toggles in or out of the fingerprint
+        if self._fingerprint is not None:
+            self._fingerprint ^= cellsFingerprint(
+                changed_rows * self.cell_mat.shape[1] + changed_cols,
+                np.full(self.frontier.size, ALIVE_CELL_STATE),
+            )
+        self._updateBoundingBox(changed_rows, changed_cols, born_mask)
+
+        self._updateNeighboursCount(self.frontier, np.where(born_mask, 1, -1))
+
+        births: int = int(np.count_nonzero(born_mask))
+        self._last_changes = (births, born_mask.size - births)
+        self._population_change += 2 * births - born_mask.size
+
+    def _updateBoundingBox(
+        self, rows: np.ndarray, cols: np.ndarray, born_mask: np.ndarray
+    ) -> None:
+        """grow the bounding box with the cells of the frontier which were born, and mark it stale when one which died lay on its border
+
+        Args:
+            rows (np.ndarray): row indexes of the cells of the frontier
+            cols (np.ndarray): column indexes of the cells of the frontier
+            born_mask (np.ndarray): boolean array, True where the cell was born, False where it died
+        """
+        if born_mask.any():
+            born_rows: np.ndarray = rows[born_mask]
+            born_cols: np.ndarray = cols[born_mask]
+            top, left, bottom, right = self._bounding_box or (
+                int(born_rows[0]),
+                int(born_cols[0]),
+                int(born_rows[0]),
+                int(born_cols[0]),
+            )
+            self._bounding_box = (
+                min(top, int(born_rows.min())),
+                min(left, int(born_cols.min())),
+                max(bottom, int(born_rows.max())),
+                max(right, int(born_cols.max())),
+            )
+
+        if self._bounding_box_stale or self._bounding_box is None or born_mask.all():
+            return
+        top, left, bottom, right = self._bounding_box
+        self._bounding_box_stale = bool(
+            np.isin(rows[~born_mask], [top, bottom]).any()
+            or np.isin(cols[~born_mask], [left, right]).any()
+        )
+
+    def _collectStats(self) -> None:
+        """collect the statistics of the current generation without scanning the grid : the births and deaths are the ones counted on the frontier,
+        the population is updated with the ones of every generation computed, and the bounding box is left to getStats"""
+
+        self.stats = GridStats(
+            self._turn,
+            self.stats.population + self._population_change,
+            *self._last_changes,
+        )
+        self._population_change = 0
+
+    def getStats(self) -> GridStats:
+        """return the statistics of the current generation : population, births and deaths of the last generation and live bounding box,
+        the bounding box being derived from the frontier, and only searched again within itself after a cell of its border died
+
+        Returns:
+            GridStats: the statistics
+        """
+        if self._bounding_box_stale and self._bounding_box is not None:
+            self._bounding_box = self._searchBoundingBox(self._bounding_box)
+        self._bounding_box_stale = False
+        self.stats.bounding_box = self._bounding_box
+        return self.stats
+
+    def _stepDiff(self) -> Tuple[CELL_INDEXES, CELL_INDEXES]:
+        """return the cells born and dead during the last generation computed, read from the frontier so that the cost scales with the changes
+
+        Returns:
+            Tuple[CELL_INDEXES, CELL_INDEXES]: (rows, cols) of the cells born, and of the cells dead
+        """
+        rows, cols = np.divmod(self.frontier, self.padded_cell_mat.shape[1])
+        born_mask: np.ndarray = (
+            self.padded_cell_mat.reshape(-1)[self.frontier] == ALIVE_CELL_STATE
+        )
+        # the frontier holds flat indexes of the padded grid
+        return (rows[born_mask] - 1, cols[born_mask] - 1), (
+            rows[~born_mask] - 1,
+            cols[~born_mask] - 1,
+        )
+
+    def _updateNeighboursCount(self, cells: np.ndarray, deltas: np.ndarray) -> None:
+        """add the deltas to the neighbours count of the neighbours of each cell
+
+        Args:
+            cells (np.ndarray): flat indexes of the cells in the padded grid
+            deltas (np.ndarray): +1 for a birth, -1 for a death
+        """
+        np.add.at(
+            self.neighbours_count.reshape(-1),
+            (cells[:, None] + self.neighbours_offsets[None, :]).reshape(-1),
+            np.repeat(deltas.astype(np.int8), len(self.neighbours_offsets)),
+        )
+
+    def validateGrid(self) -> None:
+        """Make sure that the grid is valid, the frontier engine only supports dead borders, and 2-state rules where a cell without alive neighbours cannot be born"""
+
+        assert (
+            self.boundary == "dead"
+        ), f"the frontier engine only supports the 'dead' boundary, not '{self.boundary}'"
+        assert (
+            self.rule_table[DEAD_CELL_STATE, 0] == DEAD_CELL_STATE
+        ), f"the frontier engine does not support B0 rules ({self.rule})"
+        assert (
+            self.n_states == 2
+        ), f"the frontier engine does not support multi-state rules ({self.rule})"
+        super().validateGrid()
+
+    def _allocateStepBuffers(self) -> None:
+        """the frontier engine does not use the buffers of the whole grid step, its own ones are built by _rebuildFrontier"""
+
+    def _allocateCellMats(self) -> None:
+        """allocate the grid surrounded by a ring of dead cells, the cell mat being a view of it, the old cell mat is never used"""
+
+        self.padded_cell_mat = np.pad(self.initial_cell_mat, 1)
+        self.cell_mat = self.padded_cell_mat[1:-1, 1:-1]
+        self.old_cell_mat = np.zeros_like(self.cell_mat)
+
+    @staticmethod
+    def _countAliveNeighbours(alive_mask: np.ndarray) -> np.ndarray:
+        """Count the alive neighbours of every cell of the grid at once, by summing the 8 shifted views of the grid, the out-of-border neighbours are considered as DEAD_CELL_STATE
+
+        Args:
+            alive_mask (np.ndarray): boolean matrix, True where the cell is alive
+
+        Returns:
+            np.ndarray: matrix of the same shape containing the number of alive neighbours of each cell
+        """
+        padded_mat: np.ndarray = np.pad(alive_mask.astype(np.uint8), 1)
+        rows, cols = alive_mask.shape
+
+        neighbours_count: np.ndarray = np.zeros((rows, cols), dtype=np.uint8)
+        for offset_i in [0, 1, 2]:
+            for offset_j in [0, 1, 2]:
+                if offset_i == 1 and offset_j == 1:
+                    continue  # the cell itself is not a neighbour
+                neighbours_count += padded_mat[
+                    offset_i : offset_i + rows, offset_j : offset_j + cols
+                ]
+
+        return neighbours_count
+
+    def _rebuildFrontier(self) -> None:
+        """recount every neighbours from scratch and put every alive cell in the frontier, the statistics having been scanned"""
+
+        alive_mask: np.ndarray = self.cell_mat == ALIVE_CELL_STATE
+        self.neighbours_count = np.pad(
+            self._countAliveNeighbours(alive_mask).astype(np.int8), 1
+        )
+        self.frontier = np.flatnonzero(self.padded_cell_mat == ALIVE_CELL_STATE)
+        self._population_change = 0
+        self._bounding_box = self.stats.bounding_box
+        self._bounding_box_stale = False
+
+        n_cols: int = self.padded_cell_mat.shape[1]
+        self.neighbours_offsets = np.array(
+            [
+                offset_i * n_cols + offset_j
+                for offset_i in [-1, 0, 1]
+                for offset_j in [-1, 0, 1]
+                if offset_i != 0 or offset_j != 0
+            ],
+            dtype=np.intp,
+        )
+
+    def _writeCell(self, i: int, j: int, value: int) -> None:
+        """write a cell already validated, update the neighbours count of its neighbours if it changed of alive state and add it to the frontier
+
+        Args:
+            i (int): row index of the cell
+            j (int): column index of the cell
+            value (int): state assigned to the cell
+        """
+        was_alive: bool = self.cell_mat[i][j] == ALIVE_CELL_STATE
+        # the statistics are updated from their bounding box
+        self.getStats()
+        super()._writeCell(i, j, value)
+
+        if was_alive != (value == ALIVE_CELL_STATE):
+            cell: np.ndarray = np.array(
+                [(i + 1) * self.padded_cell_mat.shape[1] + j + 1], dtype=np.intp
+            )
+            self._updateNeighboursCount(cell, np.array([-1 if was_alive else 1]))
+            self.frontier = np.append(self.frontier, cell)
+        self._bounding_box = self.stats.bounding_box
+
+    def _writeCells(
+        self, rows: np.ndarray, cols: np.ndarray, values: np.ndarray
+    ) -> None:
+        """write distinct cells already validated, update the neighbours count of the ones which changed of alive state and add them to the frontier
+
+        Args:
+            rows (np.ndarray): row indexes of the cells
+            cols (np.ndarray): column indexes of the cells
+            values (np.ndarray): states assigned to the cells
+        """
+        was_alive: np.ndarray = self.cell_mat[rows, cols] == ALIVE_CELL_STATE
+        self.getStats()
+        super()._writeCells(rows, cols, values)
+
+        changed_mask: np.ndarray = was_alive != (np.asarray(values) == ALIVE_CELL_STATE)
+        cells: np.ndarray = (
+            (rows[changed_mask] + 1) * self.padded_cell_mat.shape[1]
+            + cols[changed_mask]
+            + 1
+        )
+        self._updateNeighboursCount(cells, np.where(was_alive[changed_mask], -1, 1))
+        self.frontier = np.append(self.frontier, cells)
+        self._bounding_box = self.stats.bounding_box
+
+    def resetCellMat(self) -> None:
+        """Reset the grid internal state, and rebuild the frontier"""
+        super().resetCellMat()
+        self._rebuildFrontier()
+
+    def initCellMat(self, new_cell_mat: Union[np.ndarray, CellBuffer]) -> None:
+        """set the old and new cell mat to a completely new cell matrix passed in, and rebuild the frontier
+
+        Args:
+            new_cell_mat (Union[np.ndarray, CellBuffer]): the new cell matrix
+        """
+        super().initCellMat(new_cell_mat)
+        self._rebuildFrontier()
+
+
+if __name__ == "__main__":
+
+    grid: FrontierGrid = FrontierGrid(fetch_game_config(), np.zeros((24, 24)))
+    grid.prettyPrintCellMat()
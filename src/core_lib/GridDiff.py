@@ -0,0 +1,110 @@
+"""GridDiff class definition, and the generator of the diffs of the generations shared by the grid engines
+"""
+from typing import Callable, Generator, Optional, Tuple
+
+import numpy as np
+from src.utils.CustomTypes import ALIVE_CELL_STATE
+
+# (rows, cols) index arrays of cells, as returned by np.nonzero
+CELL_INDEXES = Tuple[np.ndarray, np.ndarray]
+
+
+class GridDiff:
+    """Changes of the alive cells of a grid between two generations, so that the consumers only handle what changed instead of the whole cell matrix :
+    - the turn of the generation reached
+    - the span, number of generations since the previous diff (more than 1 when the generations are sampled)
+    - the cells born (alive now, not alive before) and the cells dead (alive before, not alive now), as (rows, cols) index arrays
+      usable as is to index a cell matrix, e.g. cells[diff.born], so the engines simulating a plane only give the cells of their window
+
+    The arrays belong to the diff, they can be kept while the grid moves on
+    """
+
+    def __init__(self, turn: int, span: int, born: CELL_INDEXES, died: CELL_INDEXES):
+        self.turn: int = turn
+        self.span: int = span
+        self.born: CELL_INDEXES = born
+        self.died: CELL_INDEXES = died
+
+    def __repr__(self) -> str:
+        return f"GridDiff(turn={self.turn}, span={self.span}, births={self.births}, deaths={self.deaths})"
+
+    @property
+    def births(self) -> int:
+        """number of cells born"""
+        return int(self.born[0].size)
+
+    @property
+    def deaths(self) -> int:
+        """number of cells dead"""
+        return int(self.died[0].size)
+
+    @staticmethod
+    def fromAliveMasks(
+        turn: int, span: int, previous_alive: np.ndarray, alive: np.ndarray
+    ) -> "GridDiff":
+        """build the diff between the alive masks of two generations
+
+        Args:
+            turn (int): turn of the generation reached
+            span (int): number of generations between the two masks
+            previous_alive (np.ndarray): boolean matrix, True where the cell was alive
+            alive (np.ndarray): boolean matrix, True where the cell is alive
+
+        Returns:
+            GridDiff: the diff
+        """
+        born_rows, born_cols = np.nonzero(alive > previous_alive)
+        died_rows, died_cols = np.nonzero(alive < previous_alive)
+        return GridDiff(turn, span, (born_rows, born_cols), (died_rows, died_cols))
+
+
+def iterDiffs(
+    grid,
+    n: Optional[int],
+    sample_every: int,
+    step_diff: Optional[Callable[[], Tuple[CELL_INDEXES, CELL_INDEXES]]] = None,
+) -> Generator[GridDiff, Optional[int], None]:
+    """advance a grid lazily and yield the diff of every generation reached, a generation is only computed when the consumer asks for the next diff,
+    so that a slow consumer holds the simulation back instead of piling up diffs. A consumer falling behind can also send() a number of generations,
+    the next diff then spans that many generations at once
+
+    The diffs of the sampled generations are taken between the alive masks of two diffs, the cells set by hand in between being part of the next diff,
+    the diffs of single generations are taken from the step itself when the engine gives a step_diff
+
+    Args:
+        grid: the grid engine, exposing advance, getCellMat and getStats
+        n (Optional[int]): number of generations to compute, None to go on forever
+        sample_every (int): number of generations spanned by every diff, the last one spanning the generations left
+        step_diff (Optional[Callable[[], Tuple[CELL_INDEXES, CELL_INDEXES]]], optional): returns the cells born and dead during the last generation computed,
+            cheaper than comparing the whole masks. Defaults to None.
+
+    Yields:
+        GridDiff: the diff of every generation reached
+    """
+    assert sample_every >= 1, "the diffs should span at least 1 generation"
+    assert n is None or n >= 0, "the number of turns must be positive"
+
+    last_turn: Optional[int] = None if n is None else grid.getStats().turn + n
+    span: int = sample_every
+    while last_turn is None or grid.getStats().turn < last_turn:
+        if last_turn is not None:
+            span = min(span, last_turn - grid.getStats().turn)
+
+        if span == 1 and step_diff is not None:
+            grid.advance(1)
+            diff: GridDiff = GridDiff(grid.getStats().turn, 1, *step_diff())
+        else:
+            previous_alive: np.ndarray = grid.getCellMat() == ALIVE_CELL_STATE
+            grid.advance(span)
+            diff = GridDiff.fromAliveMasks(
+                grid.getStats().turn,
+                span,
+                previous_alive,
+                grid.getCellMat() == ALIVE_CELL_STATE,
+            )
+
+        requested_span: Optional[int] = yield diff
+        assert (
+            requested_span is None or requested_span >= 1
+        ), "the diffs should span at least 1 generation"
+        span = sample_every if requested_span is None else requested_span
@@ -0,0 +1,342 @@
+"""GridHistory class definition
+"""
+from bisect import bisect_left
+from typing import List, Optional, Tuple
+
+import numpy as np
+from src.utils.CustomTypes import CELL_STATE_DTYPE
+
+# memory budget of the history of the grid of the window, in bytes, the other grids keep no history unless the config gives them a budget
+DEFAULT_HISTORY_BUDGET: int = 16 * 2**20
+
+# bytes taken by a changed cell in a sparse diff : its flat index (uint32) and the XOR of its old and new states (uint8)
+SPARSE_CELL_BYTES: int = 5
+
+# XOR of a generation with the previous one : (flat indexes, XOR of the changed cells) when sparse, (None, XOR of every cell) when dense
+DIFF_TYPE = Tuple[Optional[np.ndarray], np.ndarray]
+
+
+class GridHistory:
+    """Bounded history of the generations reached by a grid, to step back and seek to any retained generation
+
+    Every generation is stored as the XOR of its cells with the ones of the previous retained generation, either sparse (flat indexes of the changed cells
+    and their XOR) or dense (XOR of every cell) when too many cells changed. As XOR is its own inverse, the same diffs go backwards and forwards, so that
+    seeking from the current generation only touches the cells of the diffs in between.
+    Every keyframe_interval records, a full copy of the cells (keyframe) is kept too, so that seeking far away never costs more than one copy of the grid.
+    The diffs and keyframes take at most budget bytes, the oldest generations being evicted first.
+    """
+
+    def __init__(self, budget: int, keyframe_interval: int):
+        # memory budget in bytes, 0 disables the history
+        self.budget: int = budget
+        # 0 disables the keyframes
+        self.keyframe_interval: int = keyframe_interval
+
+        # the retained generations, oldest first
+        self.turns: List[int] = []
+        self._diffs: List[DIFF_TYPE] = []
+        self._keyframes: List[Optional[np.ndarray]] = []
+        self._diff_bytes: List[int] = []
+        self.bytes: int = 0
+        # index of the generation the grid is in
+        self._cursor: int = -1
+        self._n_records: int = 0
+
+        # cells of the generation the grid is in, and buffer receiving their XOR with a new generation
+        self._cells: np.ndarray = np.zeros((0, 0), dtype=CELL_STATE_DTYPE)
+        self._xor: np.ndarray = np.zeros((0, 0), dtype=CELL_STATE_DTYPE)
+        # True when the cells of the grid were changed by hand since the last record
+        self.edited: bool = False
+
+    def clear(self) -> None:
+        """forget every generation and release the working copies of the cells, used when the grid is reset"""
+
+        self.turns.clear()
+        self._diffs.clear()
+        self._keyframes.clear()
+        self._diff_bytes.clear()
+        self.bytes = 0
+        self._cursor = -1
+        self._n_records = 0
+        self._cells = np.zeros((0, 0), dtype=CELL_STATE_DTYPE)
+        self._xor = np.zeros((0, 0), dtype=CELL_STATE_DTYPE)
+        self.edited = False
+
+    def markEdited(self) -> None:
+        """flag that the cells of the grid were changed by hand, they have to be recorded again before the grid moves to another generation"""
+        self.edited = True
+
+    def getOffsetTurn(self, offset: int) -> Optional[int]:
+        """return the turn of the retained generation offset positions away from the current one, negative offsets going backwards
+
+        Args:
+            offset (int): number of retained generations to move by
+
+        Returns:
+            Optional[int]: the turn, clamped to the oldest and newest retained generations, None if no generation is retained
+        """
+        if not self.turns:
+            return None
+        return self.turns[min(max(self._cursor + offset, 0), len(self.turns) - 1)]
+
+    def record(self, turn: int, cells: np.ndarray) -> None:
+        """record the generation the grid is in, the generations after the current one are forgotten as the grid went on differently,
+        recording the turn of the current generation again replaces it (e.g. after cells were changed by hand)
+        Nothing is retained when a single copy of the cells does not fit in the budget
+
+        Args:
+            turn (int): turn of the generation
+            cells (np.ndarray): the cells of the generation, or the bytes of the packed words of a packed grid
+        """
+        if self.budget <= 0 or cells.nbytes > self.budget:
+            self.clear()
+            return
+        self.edited = False
+
+        if not self.turns or self._cells.shape != cells.shape:
+            self.clear()
+            self._cells = np.array(cells, dtype=CELL_STATE_DTYPE)
+            self._xor = np.zeros_like(self._cells)
+            self._append(turn, (None, np.zeros(0, dtype=CELL_STATE_DTYPE)))
+            return
+
+        self._truncate()
+        np.bitwise_xor(cells, self._cells, out=self._xor)
+        np.copyto(self._cells, cells)
+        flat_xor: np.ndarray = self._xor.reshape(-1)
+        diff: DIFF_TYPE = (None, flat_xor.copy())
+        if np.count_nonzero(flat_xor) * SPARSE_CELL_BYTES < flat_xor.size:
+            indexes: np.ndarray = np.flatnonzero(flat_xor)
+            diff = self._packDiff(indexes, flat_xor[indexes])
+
+        if turn == self.turns[-1]:
+            self._replaceLast(diff)
+        else:
+            self._append(turn, diff)
+        self._evict()
+
+    def seek(self, turn: int) -> Tuple[np.ndarray, np.ndarray]:
+        """move to a retained generation, from the current one or from the closest keyframe, whichever touches fewer cells
+
+        Args:
+            turn (int): turn of the generation
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: flat indexes and new states of the cells to write into the grid
+        """
+        target: int = bisect_left(self.turns, turn)
+        assert (
+            target < len(self.turns) and self.turns[target] == turn
+        ), f"the generation #{turn} is not retained by the history"
+
+        cursor: int = self._cursor
+        self._cursor = target
+        flat_cells: np.ndarray = self._cells.reshape(-1)
+
+        # a keyframe costs a copy of the grid, it is only looked for when the diffs in between are larger than that
+        keyframe: Optional[int] = None
+        if self._diffsBytes(cursor, target) > flat_cells.nbytes:
+            keyframe = self._closestKeyframe(target)
+
+        if keyframe is None:
+            indexes, xor = self._mergeDiffs(cursor, target)
+            flat_cells[indexes] ^= xor
+            return indexes, flat_cells[indexes]
+
+        cells: np.ndarray = self._keyframes[keyframe].copy()  # type: ignore
+        indexes, xor = self._mergeDiffs(keyframe, target)
+        cells.reshape(-1)[indexes] ^= xor
+        changed: np.ndarray = np.flatnonzero(cells.reshape(-1) != flat_cells)
+        self._cells = cells
+        return changed, cells.reshape(-1)[changed]
+
+    def _append(self, turn: int, diff: DIFF_TYPE) -> None:
+        """append a generation after the current one, with a keyframe every keyframe_interval records
+
+        Args:
+            turn (int): turn of the generation
+            diff (DIFF_TYPE): XOR of the generation with the previous one
+        """
+        keyframe: Optional[np.ndarray] = None
+        if self.keyframe_interval > 0 and self._n_records % self.keyframe_interval == 0:
+            keyframe = self._cells.copy()
+            self.bytes += keyframe.nbytes
+
+        self.turns.append(turn)
+        self._diffs.append(diff)
+        self._keyframes.append(keyframe)
+        self._diff_bytes.append(self._diffNbytes(diff))
+        self.bytes += self._diff_bytes[-1]
+        self._cursor = len(self.turns) - 1
+        self._n_records += 1
+
+    def _replaceLast(self, diff: DIFF_TYPE) -> None:
+        """replace the last generation by the current cells, their XOR with it being folded into its diff and its keyframe
+
+        Args:
+            diff (DIFF_TYPE): XOR of the current cells with the last generation
+        """
+        keyframe: Optional[np.ndarray] = self._keyframes[-1]
+        if keyframe is not None:
+            self._applyDiff(keyframe.reshape(-1), diff)
+
+        # the diff of the oldest generation is never read
+        if len(self.turns) > 1:
+            self._diffs[-1] = self._packDiff(
+                *self._mergeDiffs(len(self.turns) - 2, len(self.turns) - 1, diff)
+            )
+            self.bytes -= self._diff_bytes[-1]
+            self._diff_bytes[-1] = self._diffNbytes(self._diffs[-1])
+            self.bytes += self._diff_bytes[-1]
+
+    def _truncate(self) -> None:
+        """forget the generations after the current one"""
+
+        for index in range(self._cursor + 1, len(self.turns)):
+            self.bytes -= self._diff_bytes[index] + self._keyframeNbytes(index)
+        del self.turns[self._cursor + 1 :]
+        del self._diffs[self._cursor + 1 :]
+        del self._keyframes[self._cursor + 1 :]
+        del self._diff_bytes[self._cursor + 1 :]
+
+    def _evict(self) -> None:
+        """evict the oldest generations until the history fits in its budget, the current generation is always retained"""
+
+        while self.bytes > self.budget and len(self.turns) > 1:
+            self.bytes -= self._diff_bytes[0] + self._keyframeNbytes(0)
+            del self.turns[0], self._diffs[0], self._keyframes[0], self._diff_bytes[0]
+            self._cursor -= 1
+
+            # the new oldest generation has no previous one left
+            self.bytes -= self._diff_bytes[0]
+            self._diffs[0] = (None, np.zeros(0, dtype=CELL_STATE_DTYPE))
+            self._diff_bytes[0] = 0
+
+    def _closestKeyframe(self, target: int) -> Optional[int]:
+        """find the keyframe the closest to a generation, on each side of it, in number of bytes of the diffs in between
+
+        Args:
+            target (int): index of the generation
+
+        Returns:
+            Optional[int]: index of the keyframe, None if there is none
+        """
+        candidates: List[int] = []
+        for indexes in [range(target, -1, -1), range(target + 1, len(self.turns))]:
+            candidates += [
+                index for index in indexes if self._keyframes[index] is not None
+            ][:1]
+
+        if not candidates:
+            return None
+        return min(candidates, key=lambda index: self._diffsBytes(index, target))
+
+    def _diffsBytes(self, first: int, last: int) -> int:
+        """return the number of bytes of the diffs to apply to go from a generation to another one
+
+        Args:
+            first (int): index of the generation to start from
+            last (int): index of the generation to reach
+
+        Returns:
+            int: number of bytes of the diffs in between
+        """
+        return sum(self._diff_bytes[min(first, last) + 1 : max(first, last) + 1])
+
+    def _mergeDiffs(
+        self, first: int, last: int, extra_diff: Optional[DIFF_TYPE] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """merge the diffs to apply to go from a generation to another one into a single sparse diff, the XOR of a cell changed several times being
+        accumulated and the cells going back to their state being dropped
+        The sparse diffs are merged by sorting their indexes, as soon as the diffs are larger than the grid they are accumulated into a dense XOR matrix instead
+
+        Args:
+            first (int): index of the generation to start from
+            last (int): index of the generation to reach
+            extra_diff (Optional[DIFF_TYPE], optional): diff merged after them. Defaults to None.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: flat indexes and XOR of the changed cells
+        """
+        diffs: List[DIFF_TYPE] = self._diffs[
+            min(first, last) + 1 : max(first, last) + 1
+        ]
+        if extra_diff is not None:
+            diffs = diffs + [extra_diff]
+
+        if not diffs:
+            return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=CELL_STATE_DTYPE)
+
+        if (
+            any(diff[0] is None for diff in diffs)
+            or sum(self._diffNbytes(diff) for diff in diffs) > self._cells.nbytes
+        ):
+            dense_xor: np.ndarray = np.zeros(self._cells.size, dtype=CELL_STATE_DTYPE)
+            for diff in diffs:
+                self._applyDiff(dense_xor, diff)
+            indexes: np.ndarray = np.flatnonzero(dense_xor)
+            return indexes, dense_xor[indexes]
+
+        if len(diffs) == 1:
+            return diffs[0][0].astype(np.intp), diffs[0][1]  # type: ignore
+
+        # the XOR of the occurrences of every cell, reduced between the first occurrences once the cells are sorted
+        all_indexes: np.ndarray = np.concatenate([diff[0] for diff in diffs]).astype(np.intp)  # type: ignore
+        order: np.ndarray = np.argsort(all_indexes, kind="stable")
+        all_indexes = all_indexes[order]
+        starts: np.ndarray = np.flatnonzero(
+            np.concatenate([[True], all_indexes[1:] != all_indexes[:-1]])
+        )
+        xor: np.ndarray = np.bitwise_xor.reduceat(
+            np.concatenate([diff[1] for diff in diffs])[order], starts
+        )
+        changed: np.ndarray = np.flatnonzero(xor)
+        return all_indexes[starts][changed], xor[changed]
+
+    @staticmethod
+    def _applyDiff(flat_cells: np.ndarray, diff: DIFF_TYPE) -> None:
+        """apply a diff in place, to flat cells or to a flat XOR matrix
+
+        Args:
+            flat_cells (np.ndarray): the flat matrix
+            diff (DIFF_TYPE): the diff
+        """
+        indexes, xor = diff
+        if indexes is None:
+            # the oldest generation keeps an empty diff
+            if xor.size:
+                np.bitwise_xor(flat_cells, xor, out=flat_cells)
+        else:
+            # the indexes of a diff are distinct
+            flat_cells[indexes] ^= xor
+
+    def _packDiff(self, indexes: np.ndarray, xor: np.ndarray) -> DIFF_TYPE:
+        """store a diff sparse, or dense when it would take more bytes than a copy of the grid
+
+        Args:
+            indexes (np.ndarray): flat indexes of the changed cells
+            xor (np.ndarray): XOR of their old and new states
+
+        Returns:
+            DIFF_TYPE: the stored diff
+        """
+        if indexes.size * SPARSE_CELL_BYTES < self._cells.size:
+            # 4 bytes indexes are enough for grids of up to 2^32 cells
+            index_dtype = (
+                np.uint32 if self._cells.size <= np.iinfo(np.uint32).max else np.intp
+            )
+            return indexes.astype(index_dtype), xor
+
+        dense_xor: np.ndarray = np.zeros(self._cells.size, dtype=CELL_STATE_DTYPE)
+        dense_xor[indexes] = xor
+        return None, dense_xor
+
+    @staticmethod
+    def _diffNbytes(diff: DIFF_TYPE) -> int:
+        """return the number of bytes taken by a diff"""
+        return (0 if diff[0] is None else diff[0].nbytes) + diff[1].nbytes
+
+    def _keyframeNbytes(self, index: int) -> int:
+        """return the number of bytes taken by the keyframe of a generation, 0 if it has none"""
+        keyframe: Optional[np.ndarray] = self._keyframes[index]
+        return 0 if keyframe is None else keyframe.nbytes
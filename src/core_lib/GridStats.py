@@ -0,0 +1,156 @@
+"""GridStats class definition
+"""
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+class GridStats:
+    """Statistics of a generation of a grid, produced by the grid engines as by-products of their step so that nobody has to scan the cell matrix again :
+    - the turn of the generation
+    - the population (number of alive cells, on the whole plane for the engines simulating an unbounded plane, see PlaneGrid)
+    - the births and deaths of the last generation computed, None when they are unknown (before the first turn, after a cell was set by hand, or after a jump of several generations)
+    - the live bounding box : first row, first column, last row and last column holding an alive cell, None if there is no alive cell
+    """
+
+    def __init__(
+        self,
+        turn: int,
+        population: int,
+        births: Optional[int] = None,
+        deaths: Optional[int] = None,
+        bounding_box: Optional[Tuple[int, int, int, int]] = None,
+    ):
+        self.turn: int = turn
+        self.population: int = population
+        self.births: Optional[int] = births
+        self.deaths: Optional[int] = deaths
+        self.bounding_box: Optional[Tuple[int, int, int, int]] = bounding_box
+
+    def __repr__(self) -> str:
+        return (
+            f"GridStats(turn={self.turn}, population={self.population}, births={self.births}, "
+            f"deaths={self.deaths}, bounding_box={self.bounding_box})"
+        )
+
+    @staticmethod
+    def boundingBox(
+        alive_rows: np.ndarray, alive_cols: np.ndarray
+    ) -> Optional[Tuple[int, int, int, int]]:
+        """build the live bounding box from the rows and the columns holding at least one alive cell
+
+        Args:
+            alive_rows (np.ndarray): boolean array, True for the rows holding an alive cell
+            alive_cols (np.ndarray): boolean array, True for the columns holding an alive cell
+
+        Returns:
+            Optional[Tuple[int, int, int, int]]: first row, first column, last row and last column of the box, None if there is no alive cell
+        """
+        rows: np.ndarray = np.flatnonzero(alive_rows)
+        cols: np.ndarray = np.flatnonzero(alive_cols)
+        if rows.size == 0:
+            return None
+        return int(rows[0]), int(cols[0]), int(rows[-1]), int(cols[-1])
+
+    def updateCell(self, i: int, j: int, was_alive: bool, is_alive: bool) -> bool:
+        """update the statistics when a cell is set by hand, see updateCells
+
+        Args:
+            i (int): row index of the cell
+            j (int): column index of the cell
+            was_alive (bool): True if the cell was alive before
+            is_alive (bool): True if the cell is alive now
+
+        Returns:
+            bool: False if the bounding box has to be computed again, as a cell of its border died
+        """
+        return self.updateCells(
+            np.array([i]), np.array([j]), np.array([was_alive]), np.array([is_alive])
+        )
+
+    def updateCells(
+        self,
+        rows: np.ndarray,
+        cols: np.ndarray,
+        was_alive: np.ndarray,
+        is_alive: np.ndarray,
+    ) -> bool:
+        """update the statistics in O(k) when k distinct cells are set by hand, the births and deaths are not the ones of a generation anymore
+
+        Args:
+            rows (np.ndarray): row indexes of the cells
+            cols (np.ndarray): column indexes of the cells
+            was_alive (np.ndarray): boolean array, True where the cell was alive before
+            is_alive (np.ndarray): boolean array, True where the cell is alive now
+
+        Returns:
+            bool: False if the bounding box has to be computed again, as a cell of its border died
+        """
+        self.births, self.deaths = None, None
+        born_mask: np.ndarray = is_alive & ~was_alive
+        died_mask: np.ndarray = was_alive & ~is_alive
+        self.population += int(np.count_nonzero(born_mask)) - int(
+            np.count_nonzero(died_mask)
+        )
+
+        if born_mask.any():
+            born_rows: np.ndarray = rows[born_mask]
+            born_cols: np.ndarray = cols[born_mask]
+            top, left, bottom, right = self.bounding_box or (
+                int(born_rows[0]),
+                int(born_cols[0]),
+                int(born_rows[0]),
+                int(born_cols[0]),
+            )
+            self.bounding_box = (
+                min(top, int(born_rows.min())),
+                min(left, int(born_cols.min())),
+                max(bottom, int(born_rows.max())),
+                max(right, int(born_cols.max())),
+            )
+
+        if not died_mask.any() or self.bounding_box is None:
+            return True
+        top, left, bottom, right = self.bounding_box
+        return not (
+            np.isin(rows[died_mask], [top, bottom]).any()
+            or np.isin(cols[died_mask], [left, right]).any()
+        )
+
+    @classmethod
+    def fromAliveMasks(
+        cls,
+        turn: int,
+        alive_mask: np.ndarray,
+        previous_alive_mask: Optional[np.ndarray] = None,
+    ) -> "GridStats":
+        """build the statistics of a generation from its alive mask, and the one of the previous generation to count the births and deaths
+
+        Args:
+            turn (int): turn of the generation
+            alive_mask (np.ndarray): matrix, non zero where the cell is alive
+            previous_alive_mask (Optional[np.ndarray], optional): the same matrix for the previous generation. Defaults to None.
+
+        Returns:
+            GridStats: the statistics of the generation
+        """
+        population: int = int(np.count_nonzero(alive_mask))
+        births: Optional[int] = None
+        deaths: Optional[int] = None
+        if previous_alive_mask is not None:
+            # every cell changing of alive state is either born or dead, and the population varies by their difference
+            changes: int = int(
+                np.count_nonzero(
+                    np.not_equal(alive_mask.astype(bool), previous_alive_mask)
+                )
+            )
+            variation: int = population - int(np.count_nonzero(previous_alive_mask))
+            births, deaths = (changes + variation) // 2, (changes - variation) // 2
+
+        return cls(
+            turn,
+            population,
+            births,
+            deaths,
+            cls.boundingBox(alive_mask.any(axis=1), alive_mask.any(axis=0)),
+        )
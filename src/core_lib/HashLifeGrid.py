@@ -0,0 +1,556 @@
+"""HashLifeGrid class definition
+"""
+# pylint: disable=too-many-instance-attributes
+from collections import OrderedDict
+from typing import Dict, Generator, List, Optional, Tuple
+import weakref
+
+import numpy as np
+from src.core_lib.GridDiff import GridDiff
+from src.core_lib.GridDiff import iterDiffs
+from src.core_lib.GridStats import GridStats
+from src.core_lib.PlaneGrid import PlaneGrid
+from src.utils.confUtils import fetch_game_config
+from src.utils.CustomTypes import ALIVE_CELL_STATE
+from src.utils.CustomTypes import DEAD_CELL_STATE
+
+
+class QuadNode:
+    """Canonical node of the quadtree, a node of level k represents a square of 2^k x 2^k cells made of 4 nodes of level k - 1
+
+    Nodes are hash-consed by the HashLifeGrid : two nodes representing the same square are the same object, so that they can be compared and hashed by identity
+    """
+
+    __slots__ = ("level", "nw", "ne", "sw", "se", "population", "__weakref__")
+
+    def __init__(
+        self,
+        level: int,
+        nw: Optional["QuadNode"],
+        ne: Optional["QuadNode"],
+        sw: Optional["QuadNode"],
+        se: Optional["QuadNode"],
+        population: int,
+    ):
+        self.level: int = level
+        # a leaf (level 0) is its own children, so that the children of a node are never None, they are never read as every descent stops at level 0
+        self.nw: QuadNode = self if nw is None else nw
+        self.ne: QuadNode = self if ne is None else ne
+        self.sw: QuadNode = self if sw is None else sw
+        self.se: QuadNode = self if se is None else se
+        self.population: int = population
+
+
+class HashLifeGrid(PlaneGrid):
+    """Grid engine based on the HashLife algorithm, able to advance the game by 2^k generations in one call by memoizing the future of every quadtree node
+
+    The cells live on an unbounded plane : the cell matrix passed in is placed around the origin of the plane, and the cell matrix returned is the window of the plane covering the same area.
+    Unlike the CoreGrid, cells crossing the border of this window do not die, they can come back later.
+    """
+
+    def __init__(self, gameConfig: Dict, default_cell_mat: np.ndarray):
+        super().__init__(gameConfig, default_cell_mat)
+
+        # canonical nodes, indexed by their 4 children, released as soon as nothing refers to them anymore
+        self._nodes: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+        self._leaves: List[QuadNode] = [
+            QuadNode(0, None, None, None, None, 0),
+            QuadNode(0, None, None, None, None, 1),
+        ]
+        self._zero_nodes: List[QuadNode] = [self._leaves[DEAD_CELL_STATE]]
+
+        # memoized RESULT of the nodes, indexed by (node, j) for an advance of 2^j generations, least recently used are evicted first
+        self.cache_size: int = self.gameConfig["simulation"]["hashlife_cache_size"]
+        assert self.cache_size > 0, "hashlife cache size must be greater than 0"
+        self._results: OrderedDict = OrderedDict()
+        # memoized bounding box of the alive cells of the nodes, relatively to their top-left corner
+        self._bounding_boxes: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+        self.initial_root: QuadNode = self._leaves[DEAD_CELL_STATE]
+        self.root: QuadNode = self._leaves[DEAD_CELL_STATE]
+        self.initCellMat(default_cell_mat)
+
+    # ===== quadtree =====
+
+    def _join(self, nw: QuadNode, ne: QuadNode, sw: QuadNode, se: QuadNode) -> QuadNode:
+        """return the canonical node made of the 4 nodes passed in
+
+        Returns:
+            QuadNode: node of one level above its children
+        """
+        key: Tuple[QuadNode, ...] = (nw, ne, sw, se)
+        node: Optional[QuadNode] = self._nodes.get(key)
+        if node is None:
+            node = QuadNode(
+                nw.level + 1,
+                nw,
+                ne,
+                sw,
+                se,
+                nw.population + ne.population + sw.population + se.population,
+            )
+            self._nodes[key] = node
+        return node
+
+    def _zero(self, level: int) -> QuadNode:
+        """return the empty node of the level passed in"""
+        while len(self._zero_nodes) <= level:
+            zero_node: QuadNode = self._zero_nodes[-1]
+            self._zero_nodes.append(
+                self._join(zero_node, zero_node, zero_node, zero_node)
+            )
+        return self._zero_nodes[level]
+
+    def _centre(self, node: QuadNode) -> QuadNode:
+        """return the node of one level above, having the node passed in at its center and surrounded by dead cells"""
+        zero_node: QuadNode = self._zero(node.level - 1)
+        return self._join(
+            self._join(zero_node, zero_node, zero_node, node.nw),
+            self._join(zero_node, zero_node, node.ne, zero_node),
+            self._join(zero_node, node.sw, zero_node, zero_node),
+            self._join(node.se, zero_node, zero_node, zero_node),
+        )
+
+    def _isPadded(self, node: QuadNode) -> bool:
+        """check that every alive cell of the node lies in its central half, so that the node can be advanced without losing any cell"""
+        if node.level < 3:
+            return False
+        inner_node: QuadNode = self._join(
+            node.nw.se, node.ne.sw, node.sw.ne, node.se.nw
+        )
+        return inner_node.population == node.population
+
+    def _life4x4(self, node: QuadNode) -> QuadNode:
+        """base case, compute the central 2x2 cells of a 4x4 node after one generation
+
+        Args:
+            node (QuadNode): node of level 2
+
+        Returns:
+            QuadNode: node of level 1
+        """
+        cells: List[List[int]] = [[0] * 4 for _ in range(4)]
+        for quad_i, quad_j, quad in [
+            (0, 0, node.nw),
+            (0, 2, node.ne),
+            (2, 0, node.sw),
+            (2, 2, node.se),
+        ]:
+            for i, j, leaf in [
+                (0, 0, quad.nw),
+                (0, 1, quad.ne),
+                (1, 0, quad.sw),
+                (1, 1, quad.se),
+            ]:
+                cells[quad_i + i][quad_j + j] = leaf.population
+
+        next_leaves: List[QuadNode] = []
+        for i in [1, 2]:
+            for j in [1, 2]:
+                neighbours_count: int = (
+                    sum(sum(row[j - 1 : j + 2]) for row in cells[i - 1 : i + 2])
+                    - cells[i][j]
+                )
+                next_leaves.append(
+                    self._leaves[self.rule_table[cells[i][j], neighbours_count]]
+                )
+
+        return self._join(*next_leaves)
+
+    def _successor(self, node: QuadNode, j: int) -> QuadNode:
+        """return the central node of one level below, advanced by 2^j generations
+
+        Args:
+            node (QuadNode): node of level k >= 2
+            j (int): log2 of the number of generations, at most k - 2
+
+        Returns:
+            QuadNode: central node of level k - 1 after 2^j generations
+        """
+        if node.population == 0:
+            return node.nw
+
+        key: Tuple[QuadNode, int] = (node, j)
+        result: Optional[QuadNode] = self._results.get(key)
+        if result is not None:
+            self._results.move_to_end(key)
+            return result
+
+        if node.level == 2:
+            result = self._life4x4(node)
+        else:
+            nw, ne, sw, se = node.nw, node.ne, node.sw, node.se
+
+            # 9 overlapping sub-nodes of level k - 1, advanced to their centers
+            c1 = self._successor(self._join(nw.nw, nw.ne, nw.sw, nw.se), j)
+            c2 = self._successor(self._join(nw.ne, ne.nw, nw.se, ne.sw), j)
+            c3 = self._successor(self._join(ne.nw, ne.ne, ne.sw, ne.se), j)
+            c4 = self._successor(self._join(nw.sw, nw.se, sw.nw, sw.ne), j)
+            c5 = self._successor(self._join(nw.se, ne.sw, sw.ne, se.nw), j)
+            c6 = self._successor(self._join(ne.sw, ne.se, se.nw, se.ne), j)
+            c7 = self._successor(self._join(sw.nw, sw.ne, sw.sw, sw.se), j)
+            c8 = self._successor(self._join(sw.ne, se.nw, sw.se, se.sw), j)
+            c9 = self._successor(self._join(se.nw, se.ne, se.sw, se.se), j)
+
+            if j < node.level - 2:
+                # the 2^j generations are already done, only keep the centers
+                result = self._join(
+                    self._join(c1.se, c2.sw, c4.ne, c5.nw),
+                    self._join(c2.se, c3.sw, c5.ne, c6.nw),
+                    self._join(c4.se, c5.sw, c7.ne, c8.nw),
+                    self._join(c5.se, c6.sw, c8.ne, c9.nw),
+                )
+            else:
+                # half of the generations are done, advance the 4 recombined nodes by the other half
+                result = self._join(
+                    self._successor(self._join(c1, c2, c4, c5), j),
+                    self._successor(self._join(c2, c3, c5, c6), j),
+                    self._successor(self._join(c4, c5, c7, c8), j),
+                    self._successor(self._join(c5, c6, c8, c9), j),
+                )
+
+        self._results[key] = result
+        if len(self._results) > self.cache_size:
+            self._results.popitem(last=False)
+
+        return result
+
+    # ===== dense cell matrix conversion =====
+
+    def _buildNode(
+        self, cell_mat: np.ndarray, top: int, left: int, level: int
+    ) -> QuadNode:
+        """build the node of the square of cells of the (square) cell matrix starting at row top and column left"""
+        if level == 0:
+            return self._leaves[int(cell_mat[top, left] == ALIVE_CELL_STATE)]
+
+        size: int = 1 << level
+        if not (
+            cell_mat[top : top + size, left : left + size] == ALIVE_CELL_STATE
+        ).any():
+            return self._zero(level)
+
+        half: int = size >> 1
+        return self._join(
+            self._buildNode(cell_mat, top, left, level - 1),
+            self._buildNode(cell_mat, top, left + half, level - 1),
+            self._buildNode(cell_mat, top + half, left, level - 1),
+            self._buildNode(cell_mat, top + half, left + half, level - 1),
+        )
+
+    def _fillCellMat(
+        self, node: QuadNode, cell_mat: np.ndarray, top: int, left: int
+    ) -> None:
+        """write the alive cells of the node to the cell matrix, the node covering the cells from row top and column left (possibly outside the matrix)"""
+        size: int = 1 << node.level
+        if (
+            node.population == 0
+            or top >= cell_mat.shape[0]
+            or left >= cell_mat.shape[1]
+            or top + size <= 0
+            or left + size <= 0
+        ):
+            return
+
+        if node.level == 0:
+            cell_mat[top, left] = ALIVE_CELL_STATE
+            return
+
+        half: int = size >> 1
+        self._fillCellMat(node.nw, cell_mat, top, left)
+        self._fillCellMat(node.ne, cell_mat, top, left + half)
+        self._fillCellMat(node.sw, cell_mat, top + half, left)
+        self._fillCellMat(node.se, cell_mat, top + half, left + half)
+
+    def _countInWindow(self, node: QuadNode, top: int, left: int) -> int:
+        """count the alive cells of the node lying inside the window of the grid, the node covering the cells from row top and column left"""
+        size: int = 1 << node.level
+        if (
+            node.population == 0
+            or top >= self.grid_dim[0]
+            or left >= self.grid_dim[1]
+            or top + size <= 0
+            or left + size <= 0
+        ):
+            return 0
+
+        if (
+            top >= 0
+            and left >= 0
+            and top + size <= self.grid_dim[0]
+            and left + size <= self.grid_dim[1]
+        ):
+            return node.population
+
+        half: int = size >> 1
+        return (
+            self._countInWindow(node.nw, top, left)
+            + self._countInWindow(node.ne, top, left + half)
+            + self._countInWindow(node.sw, top + half, left)
+            + self._countInWindow(node.se, top + half, left + half)
+        )
+
+    def _nodeBoundingBox(self, node: QuadNode) -> Optional[Tuple[int, int, int, int]]:
+        """return the bounding box of the alive cells of the node, relatively to its top-left corner, memoized as the nodes are canonical
+
+        Returns:
+            Optional[Tuple[int, int, int, int]]: first row, first column, last row and last column of the box, None if the node is empty
+        """
+        if node.population == 0:
+            return None
+        if node.level == 0:
+            return 0, 0, 0, 0
+
+        bounding_box: Optional[Tuple[int, int, int, int]] = self._bounding_boxes.get(
+            node
+        )
+        if bounding_box is None:
+            half: int = 1 << (node.level - 1)
+            corners: List[Tuple[int, int, int, int]] = []
+            for child, offset_i, offset_j in [
+                (node.nw, 0, 0),
+                (node.ne, 0, half),
+                (node.sw, half, 0),
+                (node.se, half, half),
+            ]:
+                child_box = self._nodeBoundingBox(child)
+                if child_box is not None:
+                    top, left, bottom, right = child_box
+                    corners.append(
+                        (
+                            top + offset_i,
+                            left + offset_j,
+                            bottom + offset_i,
+                            right + offset_j,
+                        )
+                    )
+            bounding_box = (
+                min(corner[0] for corner in corners),
+                min(corner[1] for corner in corners),
+                max(corner[2] for corner in corners),
+                max(corner[3] for corner in corners),
+            )
+            self._bounding_boxes[node] = bounding_box
+        return bounding_box
+
+    def _windowOrigin(self) -> Tuple[int, int]:
+        """return the row and column of the top-left corner of the root node, relatively to the window of the grid
+
+        The root node is always centered on the origin of the plane, and the window starts at (-grid_dim[0] // 2, -grid_dim[1] // 2)
+        """
+        half: int = 1 << (self.root.level - 1)
+        return self.grid_dim[0] // 2 - half, self.grid_dim[1] // 2 - half
+
+    # ===== grid surface =====
+
+    def advancePow2(self, k: int) -> None:
+        """advance the game by 2^k generations in one call
+
+        Args:
+            k (int): log2 of the number of generations
+        """
+        assert k >= 0, "the number of generations must be a power of 2"
+
+        self._advancePow2(k)
+        self._scanStats()
+
+    def _advancePow2(self, k: int) -> None:
+        """advance the root by 2^k generations, without collecting the statistics
+
+        Args:
+            k (int): log2 of the number of generations
+        """
+        while self.root.level < k + 2 or not self._isPadded(self.root):
+            self.root = self._centre(self.root)
+        self.root = self._successor(self._centre(self.root), k)
+        self._turn += 1 << k
+
+    def advance(self, n: int) -> None:
+        """advance the game by n generations, as a sum of powers of 2, the statistics being collected once at the end
+
+        Args:
+            n (int): number of generations
+        """
+        assert n >= 0, "the number of generations must be positive"
+
+        stepped: bool = n > 0
+        k: int = 0
+        while n:
+            if n & 1:
+                self._advancePow2(k)
+            n >>= 1
+            k += 1
+
+        if stepped:
+            self._collectStats()
+
+    def iterGenerations(
+        self, n: Optional[int] = None, sample_every: int = 1
+    ) -> Generator[GridDiff, Optional[int], None]:
+        """return a generator advancing the grid lazily and yielding the diff of every generation reached : the cells born, the cells dead and the turn,
+        a generation is only computed when the consumer asks for its diff, and a consumer falling behind can send() the number of generations the next diff spans
+
+        Args:
+            n (Optional[int], optional): number of generations to compute. Defaults to None, going on forever.
+            sample_every (int, optional): number of generations spanned by every diff. Defaults to 1.
+
+        Returns:
+            Generator[GridDiff, Optional[int], None]: the generator of the diffs, taken between the windows of two generations
+            as the quadtree keeps no step, a large sample_every letting the engine jump through the generations
+        """
+        return iterDiffs(self, n, sample_every)
+
+    def _collectStats(self) -> None:
+        """collect the statistics of the current generation, the births and deaths are unknown as the generations are jumped over"""
+        self._scanStats()
+
+    def _scanStats(self) -> None:
+        """set the statistics of the current generation from the root node, the bounding box being in the coordinates of the window"""
+
+        bounding_box: Optional[Tuple[int, int, int, int]] = self._nodeBoundingBox(
+            self.root
+        )
+        if bounding_box is not None:
+            origin_i, origin_j = self._windowOrigin()
+            top, left, bottom, right = bounding_box
+            bounding_box = (
+                top + origin_i,
+                left + origin_j,
+                bottom + origin_i,
+                right + origin_j,
+            )
+        self.stats = GridStats(
+            self._turn, self.root.population, None, None, bounding_box
+        )
+
+    def getWindow(self, top: int, left: int, height: int, width: int) -> np.ndarray:
+        """return a window of the plane on the form of a dense matrix
+
+        Args:
+            top (int): row of the first row of the window, in the coordinates of the grid
+            left (int): column of the first column of the window, in the coordinates of the grid
+            height (int): number of rows of the window
+            width (int): number of columns of the window
+
+        Returns:
+            np.ndarray: the dense matrix of the cells of the window
+        """
+        cell_mat: np.ndarray = np.zeros((height, width), dtype=np.uint8)
+        origin_i, origin_j = self._windowOrigin()
+        self._fillCellMat(self.root, cell_mat, origin_i - top, origin_j - left)
+        return cell_mat
+
+    def _writeCell(self, i: int, j: int, value: int) -> None:
+        """write a cell of the window already validated, by rebuilding the path from the root to the cell, and update the statistics
+
+        Args:
+            i (int): row index of the cell
+            j (int): column index of the cell
+            value (int): state assigned to the cell
+        """
+        origin_i, origin_j = self._windowOrigin()
+        population: int = self.root.population
+        self.root = self._setCellNode(
+            self.root, i - origin_i, j - origin_j, self._leaves[value]
+        )
+
+        # the cell was alive if setting it to alive did not change the population
+        was_alive: bool = (
+            population == self.root.population
+            if value == ALIVE_CELL_STATE
+            else population != self.root.population
+        )
+        if not self.stats.updateCell(i, j, was_alive, value == ALIVE_CELL_STATE):
+            self._scanStats()
+
+    def _setCellNode(self, node: QuadNode, i: int, j: int, leaf: QuadNode) -> QuadNode:
+        """return the node with the cell at row i and column j (relatively to the node) replaced by the leaf"""
+        if node.level == 0:
+            return leaf
+
+        half: int = 1 << (node.level - 1)
+        nw, ne, sw, se = node.nw, node.ne, node.sw, node.se
+        if i < half and j < half:
+            nw = self._setCellNode(nw, i, j, leaf)
+        elif i < half:
+            ne = self._setCellNode(ne, i, j - half, leaf)
+        elif j < half:
+            sw = self._setCellNode(sw, i - half, j, leaf)
+        else:
+            se = self._setCellNode(se, i - half, j - half, leaf)
+        return self._join(nw, ne, sw, se)
+
+    def _writeCells(
+        self, rows: np.ndarray, cols: np.ndarray, values: np.ndarray
+    ) -> None:
+        """write distinct cells already validated, one path of the quadtree after the other
+
+        Args:
+            rows (np.ndarray): row indexes of the cells
+            cols (np.ndarray): column indexes of the cells
+            values (np.ndarray): states assigned to the cells
+        """
+        for i, j, value in zip(rows.tolist(), cols.tolist(), values.tolist()):
+            self._writeCell(i, j, value)
+
+    def resetCellMat(self) -> None:
+        """Reset the plane to its initial state, and start counting the turns over"""
+        self.root = self.initial_root
+        self._startOver()
+
+    def _initPlane(self, cells: np.ndarray, top: int, left: int) -> None:
+        """set the plane to dense cells lying anywhere on it, the window of the grid being centered on the origin of the plane, and start counting the turns over
+
+        Args:
+            cells (np.ndarray): the dense matrix of the cells, already validated
+            top (int): row of the first row of the cells, in the coordinates of the grid
+            left (int): column of the first column of the cells, in the coordinates of the grid
+        """
+        # position of the cells relatively to the origin of the plane
+        top -= self.grid_dim[0] // 2
+        left -= self.grid_dim[1] // 2
+
+        # smallest root of at least level 3, whose half is larger than the window and holds the cells
+        level: int = 3
+        while (1 << (level - 1)) < max(
+            *self.grid_dim,
+            -top,
+            -left,
+            top + cells.shape[0],
+            left + cells.shape[1],
+        ):
+            level += 1
+
+        size: int = 1 << level
+        square_cell_mat: np.ndarray = np.zeros((size, size), dtype=np.uint8)
+        top += size // 2
+        left += size // 2
+        square_cell_mat[
+            top : top + cells.shape[0], left : left + cells.shape[1]
+        ] = cells
+
+        self.initial_root = self._buildNode(square_cell_mat, 0, 0, level)
+        self.root = self.initial_root
+        self._startOver()
+
+    def getPlanePopulation(self) -> int:
+        """return the number of alive cells on the whole plane, including the ones outside the window
+
+        Returns:
+            int: number of alive cells on the plane
+        """
+        return self.root.population
+
+    def getWindowPopulation(self) -> int:
+        """return the number of alive cells in the window of the grid, counted on the quadtree without building the window
+
+        Returns:
+            int: number of alive cells in the window
+        """
+        return self._countInWindow(self.root, *self._windowOrigin())
+
+
+if __name__ == "__main__":
+
+    grid: HashLifeGrid = HashLifeGrid(fetch_game_config(), np.zeros((24, 24)))
+    grid.prettyPrintCellMat()
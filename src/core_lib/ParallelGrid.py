@@ -0,0 +1,541 @@
+"""ParallelGrid class definition
+"""
+import multiprocessing
+import os
+import time
+import weakref
+from multiprocessing import shared_memory
+from multiprocessing import synchronize
+from multiprocessing.connection import Connection
+from multiprocessing.context import ForkServerContext
+from multiprocessing.context import SpawnContext
+from multiprocessing.process import BaseProcess
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+from src.core_lib.CoreGrid import CoreGrid
+from src.core_lib.CoreGrid import stepCells
+from src.core_lib.GridStats import GridStats
+from src.utils.confUtils import fetch_game_config
+from src.utils.CustomTypes import ALIVE_CELL_STATE
+from src.utils.CustomTypes import CELL_STATE_DTYPE
+from src.utils.fingerprintUtils import stepFingerprint
+from src.utils.ruleUtils import MAX_NEIGHBOURS
+from src.utils.ruleUtils import RULE_INDEX_BLOCK_SIZE
+from src.utils.ruleUtils import countTransitions
+from src.utils.ruleUtils import ruleIndexDtype
+
+
+def _haloRow(row: int, n_rows: int, boundary: str) -> Optional[int]:
+    """return the row of the grid holding the out-of-border neighbours of the row passed in, according to the boundary topology
+
+    Args:
+        row (int): row index, possibly -1 or n_rows (out of the grid)
+        n_rows (int): number of rows of the grid
+        boundary (str): boundary topology
+
+    Returns:
+        Optional[int]: the row of the grid, None if the out-of-border neighbours are dead
+    """
+    if 0 <= row < n_rows:
+        return row
+    if boundary == "dead":
+        return None
+    if boundary == "mirror":
+        return min(max(row, 0), n_rows - 1)
+    return row % n_rows  # torus and klein
+
+
+class _BandWorker:
+    """Step one horizontal band of a grid held in shared memory, run in its own process by ParallelGrid
+
+    The band reads its one-row halos straight from the shared cell matrix, so that nothing is pickled between the processes.
+    """
+
+    def __init__(
+        self,
+        shared_names: List[str],
+        grid_dim: Tuple[int, int],
+        band: Tuple[int, int],
+        boundary: str,
+        flat_rule_table: np.ndarray,
+    ):
+        self.shared_buffers: List[shared_memory.SharedMemory] = [
+            shared_memory.SharedMemory(name=name) for name in shared_names
+        ]
+        self.cell_mats: List[np.ndarray] = [
+            np.ndarray(grid_dim, dtype=CELL_STATE_DTYPE, buffer=shared_buffer.buf)
+            for shared_buffer in self.shared_buffers
+        ]
+        self.start_row, self.end_row = band
+        self.boundary: str = boundary
+        self.flat_rule_table: np.ndarray = flat_rule_table
+
+        n_rows, n_cols = grid_dim
+        band_rows: int = self.end_row - self.start_row
+
+        # rows of the grid copied into the halo rows, and into the halo columns of every row of the padded band
+        self.halo_rows: List[Optional[int]] = [
+            _haloRow(self.start_row - 1, n_rows, boundary),
+            _haloRow(self.end_row, n_rows, boundary),
+        ]
+        # with the klein boundary, the columns wrap around with the rows flipped
+        self.halo_cols_rows: Optional[np.ndarray] = (
+            np.array(
+                [
+                    _haloRow(
+                        n_rows - 1 - row if boundary == "klein" else row,
+                        n_rows,
+                        boundary,
+                    )
+                    for row in range(self.start_row - 1, self.end_row + 1)
+                ],
+                dtype=np.intp,
+            )
+            if boundary != "dead"
+            else None
+        )
+        self.halo_cols: Tuple[int, int] = (
+            (0, n_cols - 1) if boundary == "mirror" else (n_cols - 1, 0)
+        )
+
+        # buffers of the step, allocated once for the shape of the band
+        self.padded_alive: np.ndarray = np.zeros(
+            (band_rows + 2, n_cols + 2), dtype=np.uint8
+        )
+        self.neighbours_count: np.ndarray = np.zeros((band_rows, n_cols), np.uint8)
+        self.n_states: int = flat_rule_table.size // (MAX_NEIGHBOURS + 1)
+        self.rule_index: np.ndarray = np.zeros(
+            (band_rows, n_cols), dtype=ruleIndexDtype(self.n_states)
+        )
+        self.index_block: np.ndarray = np.zeros(
+            min(RULE_INDEX_BLOCK_SIZE, max(1, band_rows * n_cols)), dtype=np.intp
+        )
+        self.neighbours_views: List[np.ndarray] = [
+            self.padded_alive[
+                offset_i : offset_i + band_rows, offset_j : offset_j + n_cols
+            ]
+            for offset_i in [0, 1, 2]
+            for offset_j in [0, 1, 2]
+            if offset_i != 1 or offset_j != 1
+        ]
+        self.next_alive: np.ndarray = np.zeros((band_rows, n_cols), dtype=bool)
+        self.changed: np.ndarray = np.zeros((band_rows, n_cols), dtype=bool)
+        # flat index of the first cell of the band, to update the fingerprint of the grid from the cells changed by every step
+        self.first_index: int = self.start_row * n_cols
+
+    def step(self, src_cell_mat: np.ndarray, dst_cell_mat: np.ndarray) -> None:
+        """compute the next state of the band of src_cell_mat into the band of dst_cell_mat
+
+        Args:
+            src_cell_mat (np.ndarray): the whole current cell matrix
+            dst_cell_mat (np.ndarray): the whole cell matrix receiving the next state
+        """
+        padded_alive: np.ndarray = self.padded_alive
+        src_band: np.ndarray = src_cell_mat[self.start_row : self.end_row]
+
+        np.equal(src_band, ALIVE_CELL_STATE, out=padded_alive[1:-1, 1:-1])
+        for padded_row, halo_row in zip([0, -1], self.halo_rows):
+            if halo_row is not None:
+                np.equal(
+                    src_cell_mat[halo_row],
+                    ALIVE_CELL_STATE,
+                    out=padded_alive[padded_row, 1:-1],
+                )
+        if self.halo_cols_rows is not None:
+            for padded_col, halo_col in zip([0, -1], self.halo_cols):
+                padded_alive[:, padded_col] = (
+                    src_cell_mat[self.halo_cols_rows, halo_col] == ALIVE_CELL_STATE
+                )
+
+        stepCells(
+            src_band,
+            dst_cell_mat[self.start_row : self.end_row],
+            self.neighbours_views,
+            self.neighbours_count,
+            self.rule_index,
+            self.index_block,
+            self.flat_rule_table,
+        )
+
+    def stepFingerprint(
+        self, src_cell_mat: np.ndarray, dst_cell_mat: np.ndarray
+    ) -> int:
+        """return the change of the fingerprint made by the last step on the band
+
+        Args:
+            src_cell_mat (np.ndarray): the whole cell matrix before the step
+            dst_cell_mat (np.ndarray): the whole cell matrix computed by the step
+
+        Returns:
+            int: the 64 bits change of the band
+        """
+        return stepFingerprint(
+            src_cell_mat[self.start_row : self.end_row],
+            dst_cell_mat[self.start_row : self.end_row],
+            self.changed,
+            self.n_states,
+            self.first_index,
+        )
+
+    def collectStats(
+        self, cell_mat: np.ndarray
+    ) -> Tuple[int, int, int, np.ndarray, np.ndarray]:
+        """collect the statistics of the band after its last step, the births, deaths and population being counted on the rule indexes of the step
+
+        Args:
+            cell_mat (np.ndarray): the whole cell matrix computed by the last step
+
+        Returns:
+            Tuple[int, int, int, np.ndarray, np.ndarray]: births, deaths and population of the band, its rows and its columns holding an alive cell
+        """
+        births, deaths, population = countTransitions(
+            self.rule_index, self.flat_rule_table, self.index_block
+        )
+        np.equal(
+            cell_mat[self.start_row : self.end_row],
+            ALIVE_CELL_STATE,
+            out=self.next_alive,
+        )
+        return (
+            births,
+            deaths,
+            population,
+            self.next_alive.any(axis=1),
+            self.next_alive.any(axis=0),
+        )
+
+    def run(self, connection: Connection, barrier) -> None:
+        """serve the commands of the ParallelGrid until it closes the connection :
+        - ("advance", n, src_index, track_fingerprint) : compute n generations, waiting for the other bands between two generations,
+        and reply the time spent computing with the statistics of the band, and the change of the fingerprint of the band if it is tracked
+        - ("close",) : stop the worker
+
+        Args:
+            connection (Connection): end of the pipe connected to the ParallelGrid
+            barrier (multiprocessing.Barrier): barrier shared by every band
+        """
+        try:
+            while True:
+                command: Tuple = connection.recv()
+                if command[0] == "close":
+                    break
+
+                _, n_turns, src_index, track_fingerprint = command
+                elapsed: float = 0.0
+                fingerprint: int = 0
+                try:
+                    for turn in range(n_turns):
+                        start_time: float = time.perf_counter()
+                        src_cell_mat: np.ndarray = self.cell_mats[
+                            (src_index + turn) % 2
+                        ]
+                        dst_cell_mat: np.ndarray = self.cell_mats[
+                            (src_index + turn + 1) % 2
+                        ]
+                        self.step(src_cell_mat, dst_cell_mat)
+                        if track_fingerprint:
+                            fingerprint ^= self.stepFingerprint(
+                                src_cell_mat, dst_cell_mat
+                            )
+                        elapsed += time.perf_counter() - start_time
+                        # the next generation reads the halos written by the other bands
+                        barrier.wait()
+                    connection.send(
+                        (
+                            "done",
+                            elapsed,
+                            self.collectStats(
+                                self.cell_mats[(src_index + n_turns) % 2]
+                            ),
+                            fingerprint,
+                        )
+                    )
+                except Exception as error:  # pylint: disable=broad-except
+                    barrier.abort()
+                    connection.send(("error", repr(error)))
+        finally:
+            self.cell_mats = []
+            for shared_buffer in self.shared_buffers:
+                shared_buffer.close()
+
+
+def _runBandWorker(connection: Connection, barrier, *worker_args) -> None:
+    """entry point of the process of a band worker"""
+    _BandWorker(*worker_args).run(connection, barrier)
+
+
+def _shutdown(
+    owner_pid: int,
+    processes: List[BaseProcess],
+    connections: List[Connection],
+    shared_buffers: List[shared_memory.SharedMemory],
+) -> None:
+    """stop the band workers and release the shared memory, also called when the grid is garbage collected
+    Only the process which created the grid releases them, a copy of the grid collected in another process (e.g. a forked one) leaves them alone
+
+    Args:
+        owner_pid (int): pid of the process which created the grid
+        processes (List[BaseProcess]): processes of the band workers
+        connections (List[Connection]): ends of the pipes connected to the workers
+        shared_buffers (List[shared_memory.SharedMemory]): shared memory holding the two cell matrices
+    """
+    if os.getpid() != owner_pid:
+        return
+
+    for connection in connections:
+        try:
+            connection.send(("close",))
+        except (BrokenPipeError, OSError):
+            pass
+    for process in processes:
+        process.join(timeout=5)
+        if process.is_alive():
+            process.terminate()
+    for shared_buffer in shared_buffers:
+        shared_buffer.close()
+        try:
+            shared_buffer.unlink()
+        except FileNotFoundError:
+            pass  # already released
+
+
+class ParallelGrid(CoreGrid):
+    """CoreGrid mode splitting the grid into horizontal bands, each one stepped by its own persistent process
+
+    The two cell matrices live in shared memory, each worker reads the halo rows of its band from the current matrix and writes its band of the next one,
+    the workers wait for each other once per generation so that the halos are always up to date. As nothing is copied between the processes,
+    the grid is not bounded by the resolution of the UI so that huge boards can be simulated.
+    The cell matrix returned by getCellMat is a view of the shared memory, released by close (or when the grid is garbage collected).
+    The workers are not forked, so a script using this engine must start the simulation under an if __name__ == "__main__" guard.
+    """
+
+    bounded_by_resolution: bool = False
+
+    def __init__(self, gameConfig: Dict, default_cell_mat: np.ndarray):
+
+        # 0 workers means one per core
+        self.n_workers: int = gameConfig["simulation"]["workers"] or os.cpu_count() or 1
+        self.shared_buffers: List[shared_memory.SharedMemory] = []
+        self.bands: List[Tuple[int, int]] = []
+        self.processes: List[BaseProcess] = []
+        self.connections: List[Connection] = []
+        self._barrier: Optional[synchronize.Barrier] = None
+        # time spent computing by every worker during the last call to advance, in seconds
+        self.worker_timings: List[float] = []
+        # statistics of every band after the last call to advance
+        self.band_stats: List[Tuple[int, int, int, np.ndarray, np.ndarray]] = []
+        self._finalizer: Optional[weakref.finalize] = None
+        # index of the shared buffer holding the current cell matrix
+        self._src_index: int = 0
+        self.cell_mats_shape: Tuple[int, ...] = ()
+        super().__init__(gameConfig, default_cell_mat)
+
+    def advance(self, n: int) -> None:
+        """Apply the rules of the game n times in a row, every band being stepped by its worker, in parallel
+        The workers compute the generations by chunks, fingerprinted at their end, the chunks doubling from 1 generation up to cycle_table_size ones,
+        so that a cycle of up to cycle_table_size generations is detected within a call too. As only the ends of the chunks are fingerprinted,
+        the cycle found may start after the first generation of the actual one and have a multiple of its period, which fast-forwards the same way,
+        and a chunk is cut short to end on the generation where the cells of the cycle found are checked
+
+        Args:
+            n (int): number of turns to compute
+        """
+        assert n >= 0, "the number of turns must be positive"
+
+        if self.history.edited:
+            self._recordHistory()
+        if not self._generations_table and self.cycle is None:
+            self._recordGeneration()
+
+        last_turn: int = self._turn + n
+        first_turn: int = self._turn
+        stepped: bool = False
+        chunk: int = 1 if self.cycle_table_size > 0 else n
+        while self._turn < last_turn and self.cycle is None:
+            n_steps: int = min(chunk, last_turn - self._turn)
+            # a cycle found by its fingerprints is checked on the exact generation one period later
+            turns_before_check: Optional[int] = self._turnsBeforeCycleCheck()
+            if turns_before_check is not None:
+                n_steps = min(n_steps, turns_before_check)
+            self._stepBands(n_steps)
+            stepped = True
+            self._turn += n_steps
+            self._recordGeneration()
+            chunk = min(2 * chunk, max(self.cycle_table_size, 1))
+
+        # once the grid is stuck in a cycle, only the turns left modulo the period are computed
+        if self.cycle is not None:
+            n_steps = (last_turn - self._turn) % self.cycle[1]
+            if n_steps:
+                self._stepBands(n_steps)
+                stepped = True
+            self._turn = last_turn
+
+        # within a cycle, the last generation computed was born the same way as the current one
+        if stepped:
+            self._collectStats()
+        else:
+            self.stats.turn = self._turn
+        if self._turn > first_turn:
+            self._recordHistory()
+
+    def _stepBands(self, n: int) -> None:
+        """make every worker compute n generations of its band, the fingerprint being updated from the changes of every band
+
+        Args:
+            n (int): number of turns to compute
+        """
+        if not self.processes:
+            self._startWorkers()
+
+        for connection in self.connections:
+            connection.send(
+                ("advance", n, self._src_index, self._fingerprint is not None)
+            )
+        replies: List[Tuple] = [connection.recv() for connection in self.connections]
+        errors: List[str] = [str(reply[1]) for reply in replies if reply[0] == "error"]
+        assert not errors, f"a band worker failed : {', '.join(errors)}"
+
+        self.worker_timings = [float(reply[1]) for reply in replies]
+        self.band_stats = [reply[2] for reply in replies]
+        if self._fingerprint is not None:
+            for reply in replies:
+                self._fingerprint ^= reply[3]
+        if n % 2:
+            self._src_index = 1 - self._src_index
+            self.old_cell_mat, self.cell_mat = self.cell_mat, self.old_cell_mat
+
+    def _collectStats(self) -> None:
+        """merge the statistics collected by every worker on its band, the bands being in the order of the rows"""
+
+        births, deaths, population = (
+            int(sum(band_stats[index] for band_stats in self.band_stats))
+            for index in range(3)
+        )
+        self.stats = GridStats(
+            self._turn,
+            population,
+            births,
+            deaths,
+            GridStats.boundingBox(
+                np.concatenate([band_stats[3] for band_stats in self.band_stats]),
+                np.logical_or.reduce([band_stats[4] for band_stats in self.band_stats]),
+            ),
+        )
+
+    def getWorkerTimings(self) -> List[float]:
+        """return the time spent computing by every worker during the last call to advance, the rest being spent waiting for the other bands
+
+        Returns:
+            List[float]: time in seconds of every worker, in the order of the bands
+        """
+        return list(self.worker_timings)
+
+    def _allocateStepBuffers(self) -> None:
+        """the parallel engine does not use the buffers of the whole grid step, each worker allocates the ones of its band"""
+
+    def _computeFingerprint(self) -> int:
+        """compute the fingerprint of the current generation from scratch, from its cells which are not dead
+
+        Returns:
+            int: 64 bits fingerprint of the cells
+        """
+        rows, cols = np.nonzero(self.cell_mat)
+        return self._cellsFingerprint(rows, cols)
+
+    def _splitBands(self) -> List[Tuple[int, int]]:
+        """split the rows of the grid into one band per worker, of (almost) equal heights
+
+        Returns:
+            List[Tuple[int, int]]: first row and row following the last row of every band
+        """
+        n_rows: int = self.cell_mat.shape[0]
+        limits: np.ndarray = np.linspace(
+            0, n_rows, min(self.n_workers, n_rows) + 1
+        ).astype(int)
+        return list(zip(limits[:-1].tolist(), limits[1:].tolist()))
+
+    def _startWorkers(self) -> None:
+        """start one persistent process per band, attached to the shared cell matrices
+        The workers are started from a fresh process (forkserver, or spawn where it is not available) rather than forked from this one,
+        so that they neither inherit its threads nor a copy of its other grids"""
+
+        context: Union[ForkServerContext, SpawnContext] = (
+            multiprocessing.get_context("forkserver")
+            if "forkserver" in multiprocessing.get_all_start_methods()
+            else multiprocessing.get_context("spawn")
+        )
+        self.bands = self._splitBands()
+        # kept by the grid, its semaphore is released as soon as the parent drops it, even before the workers attach to it
+        self._barrier = context.Barrier(len(self.bands))
+        flat_rule_table: np.ndarray = self.rule_table.reshape(-1)
+
+        for band in self.bands:
+            parent_connection, child_connection = context.Pipe()
+            process: BaseProcess = context.Process(
+                target=_runBandWorker,
+                args=(
+                    child_connection,
+                    self._barrier,
+                    [shared_buffer.name for shared_buffer in self.shared_buffers],
+                    self.cell_mat.shape,
+                    band,
+                    self.boundary,
+                    flat_rule_table,
+                ),
+                daemon=True,
+            )
+            process.start()
+            self.processes.append(process)
+            self.connections.append(parent_connection)
+
+    def close(self) -> None:
+        """stop the workers and release the shared memory, the cell matrices of the grid are copied out of it beforehand,
+        but the ones returned by getCellMat before must not be used anymore"""
+
+        self.cell_mat = np.array(self.cell_mat)
+        self.old_cell_mat = np.array(self.old_cell_mat)
+        if self._finalizer is not None:
+            self._finalizer()
+        self.processes, self.connections, self.shared_buffers = [], [], []
+        self._barrier = None
+
+    def _allocateCellMats(self) -> None:
+        """allocate the two cell matrices in shared memory, the shared buffers being kept as long as the shape of the grid does not change,
+        the workers are restarted on the first turn computed otherwise"""
+
+        shape: Tuple[int, ...] = self.initial_cell_mat.shape
+        if not self.shared_buffers or self.cell_mats_shape != shape:
+            self.close()
+            self.shared_buffers = [
+                shared_memory.SharedMemory(
+                    create=True, size=max(1, self.initial_cell_mat.nbytes)
+                )
+                for _ in range(2)
+            ]
+            self._finalizer = weakref.finalize(
+                self,
+                _shutdown,
+                os.getpid(),
+                self.processes,
+                self.connections,
+                self.shared_buffers,
+            )
+
+        self.cell_mats_shape = shape
+        shared_cell_mats: List[np.ndarray] = [
+            np.ndarray(shape, dtype=CELL_STATE_DTYPE, buffer=shared_buffer.buf)
+            for shared_buffer in self.shared_buffers
+        ]
+        self._src_index = 0
+        self.cell_mat, self.old_cell_mat = shared_cell_mats
+        np.copyto(self.cell_mat, self.initial_cell_mat)
+
+
+if __name__ == "__main__":
+
+    grid: ParallelGrid = ParallelGrid(fetch_game_config(), np.zeros((24, 24)))
+    grid.advance(1)
+    grid.prettyPrintCellMat()
+    grid.close()
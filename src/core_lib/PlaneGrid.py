@@ -0,0 +1,158 @@
+"""PlaneGrid class definition
+"""
+from typing import Dict, Optional, Tuple, Union
+
+import numpy as np
+from src.core_lib.BaseGrid import BaseGrid
+from src.core_lib.CellBuffer import CellBuffer
+from src.utils.checkpointUtils import saveCheckpoint
+from src.utils.checkpointUtils import unpackCheckpoint
+from src.utils.CustomTypes import ALIVE_CELL_STATE
+from src.utils.CustomTypes import DEAD_CELL_STATE
+
+
+class PlaneGrid(BaseGrid):
+    """Driver shared by the engines simulating an unbounded plane, the grid only showing the window of the plane covering the cell matrix passed in
+
+    As the cells leaving the window are still alive, the generations are neither fingerprinted nor recorded by the history,
+    and the checkpoints hold the live bounding box of the whole plane rather than the window
+
+    The counts of the grid (getAliveCellCount and getDeadCellCount) cover the window, as getCellMat does, and are also given by getWindowPopulation,
+    while the statistics (getStats) cover the whole plane, whose population is also given by getPlanePopulation
+    """
+
+    def __init__(self, gameConfig: Dict, default_cell_mat: np.ndarray):
+        super().__init__(gameConfig)
+
+        self.grid_dim = default_cell_mat.shape
+        self.cycle_table_size = 0
+        self.validateGrid()
+
+    def validateGrid(self) -> None:
+        """Make sure that the window of the grid has authorized dimensions, the plane itself is unbounded, so B0 rules (where a cell without alive neighbours is born) are not supported"""
+
+        assert (
+            self.n_states == 2
+        ), f"the plane only holds dead or alive cells, multi-state rules ({self.rule}) are not supported"
+
+        assert (
+            self.rule_table[DEAD_CELL_STATE, 0] == DEAD_CELL_STATE
+        ), f"B0 rules ({self.rule}) are not supported on an unbounded plane"
+
+        assert (
+            self.boundary == "dead"
+        ), "the plane has no border, only the 'dead' boundary is supported"
+
+        super().validateGrid()
+
+    def _recordHistory(self) -> None:
+        """the history is not supported by the plane, as the grid only shows a window of it"""
+
+    def getWindow(self, top: int, left: int, height: int, width: int) -> np.ndarray:
+        """return a window of the plane on the form of a dense matrix
+
+        Args:
+            top (int): row of the first row of the window, in the coordinates of the grid
+            left (int): column of the first column of the window, in the coordinates of the grid
+            height (int): number of rows of the window
+            width (int): number of columns of the window
+
+        Returns:
+            np.ndarray: the dense matrix of the cells of the window
+        """
+        raise NotImplementedError
+
+    def getCellMat(self) -> np.ndarray:
+        """Return the window of the plane covered by the grid, on the form of a dense matrix
+
+        Returns:
+            np.ndarray: the grid containing the cells
+        """
+        return self.getWindow(0, 0, self.grid_dim[0], self.grid_dim[1])
+
+    def initCellMat(self, new_cell_mat: Union[np.ndarray, CellBuffer]) -> None:
+        """set the plane to a completely new cell matrix passed in, covering the window of the grid, and start counting the turns over
+
+        Args:
+            new_cell_mat (Union[np.ndarray, CellBuffer]): the new cell matrix, read without taking its ownership
+        """
+        new_cell_mat = CellBuffer.asArray(new_cell_mat)
+        assert (
+            (new_cell_mat == DEAD_CELL_STATE) | (new_cell_mat == ALIVE_CELL_STATE)
+        ).all(), (
+            "all cells should be represented by integer of 0 or 1 (dead or alive state)"
+        )
+        self._initPlane(new_cell_mat, 0, 0)
+
+    def _initPlane(self, cells: np.ndarray, top: int, left: int) -> None:
+        """set the plane to dense cells lying anywhere on it, the rest of the plane being dead, and start counting the turns over
+
+        Args:
+            cells (np.ndarray): the dense matrix of the cells, already validated
+            top (int): row of the first row of the cells, in the coordinates of the grid
+            left (int): column of the first column of the cells, in the coordinates of the grid
+        """
+        raise NotImplementedError
+
+    def saveCheckpoint(self, checkpoint_path: str) -> None:
+        """save the current generation into a checkpoint file, the payload holding the live bounding box of the whole plane,
+        so that the cells which left the window are saved too
+
+        Args:
+            checkpoint_path (str): path of the checkpoint file
+        """
+        bounding_box: Optional[Tuple[int, int, int, int]] = self.stats.bounding_box
+        top, left, bottom, right = bounding_box or (0, 0, -1, -1)
+        saveCheckpoint(
+            checkpoint_path,
+            self.getWindow(top, left, bottom - top + 1, right - left + 1),
+            self.rule,
+            self.boundary,
+            self._turn,
+            self.grid_dim,
+            (top, left),
+        )
+
+    def _resumeCheckpoint(self, header: Dict, payload: np.ndarray) -> None:
+        """make the generation saved into a checkpoint the initial state of the plane, the cells of the payload being put back at its origin,
+        the turn being restored by the caller
+
+        Args:
+            header (Dict): the header of the checkpoint
+            payload (np.ndarray): the memory map of the payload of the checkpoint, to be copied
+        """
+        self._initPlane(unpackCheckpoint(header, payload), *header["origin"])
+
+    # ===== counts =====
+
+    def getPlanePopulation(self) -> int:
+        """return the number of alive cells on the whole plane, including the ones outside the window, as counted by the statistics
+
+        Returns:
+            int: number of alive cells on the plane
+        """
+        raise NotImplementedError
+
+    def getWindowPopulation(self) -> int:
+        """return the number of alive cells in the window of the grid
+
+        Returns:
+            int: number of alive cells in the window
+        """
+        return int(np.count_nonzero(self.getCellMat()))
+
+    def getAliveCellCount(self) -> int:
+        """return the number of alive cells in the window of the grid, see getPlanePopulation for the whole plane
+
+        Returns:
+            int: number of alive cells in the window
+        """
+        return self.getWindowPopulation()
+
+    def getDeadCellCount(self) -> int:
+        """return the number of dead cells in the window of the grid, the plane itself being unbounded
+
+        Returns:
+            int: number of dead cells in the window
+        """
+        return self.grid_dim[0] * self.grid_dim[1] - self.getWindowPopulation()
@@ -0,0 +1,271 @@
+"""SparseGrid class definition
+"""
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from src.core_lib.GridDiff import CELL_INDEXES
+from src.core_lib.GridStats import GridStats
+from src.core_lib.PlaneGrid import PlaneGrid
+from src.utils.confUtils import fetch_game_config
+from src.utils.CustomTypes import ALIVE_CELL_STATE
+
+# a cell at row y and column x of the plane is stored as the int64 key y * 2^32 + (x + 2^31),
+# so that sorting the keys sorts the cells row by row, and moving a cell is adding an offset to its key
+ROW_SHIFT: int = 32
+COL_BIAS: int = 1 << 31
+COL_MASK: int = (1 << ROW_SHIFT) - 1
+
+NEIGHBOURS_OFFSETS: np.ndarray = np.array(
+    [
+        (offset_i << ROW_SHIFT) + offset_j
+        for offset_i in [-1, 0, 1]
+        for offset_j in [-1, 0, 1]
+        if offset_i != 0 or offset_j != 0
+    ],
+    dtype=np.int64,
+)
+
+
+def encodeCells(rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+    """encode the coordinates of cells of the plane into int64 keys
+
+    Args:
+        rows (np.ndarray): row indexes of the cells
+        cols (np.ndarray): column indexes of the cells
+
+    Returns:
+        np.ndarray: the keys of the cells
+    """
+    return (np.asarray(rows, dtype=np.int64) << ROW_SHIFT) + (
+        np.asarray(cols, dtype=np.int64) + COL_BIAS
+    )
+
+
+def decodeCells(keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """decode int64 keys into the coordinates of the cells of the plane
+
+    Args:
+        keys (np.ndarray): the keys of the cells
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: row indexes and column indexes of the cells
+    """
+    return keys >> ROW_SHIFT, (keys & COL_MASK) - COL_BIAS
+
+
+class SparseGrid(PlaneGrid):
+    """Grid engine storing only the alive cells of an unbounded plane, as a sorted set of int64 keys, so that the memory used is proportional to the population
+
+    The cell (i, j) of the cell matrix passed in is the cell (i, j) of the plane, and the cell matrix returned is the window of the plane covering the same area.
+    Unlike the CoreGrid, cells crossing the border of this window do not die, the plane spans 2^32 cells in each direction.
+    """
+
+    def __init__(self, gameConfig: Dict, default_cell_mat: np.ndarray):
+        super().__init__(gameConfig, default_cell_mat)
+
+        self.initial_keys: np.ndarray = np.array([], dtype=np.int64)
+        self.keys: np.ndarray = np.array([], dtype=np.int64)
+        # births and deaths of the last generation, the statistics being collected on the whole plane
+        self._last_changes: Tuple[int, int] = (0, 0)
+        # keys of the cells born and dead during the last generation
+        self._last_born: np.ndarray = np.array([], dtype=np.int64)
+        self._last_died: np.ndarray = np.array([], dtype=np.int64)
+        self.initCellMat(default_cell_mat)
+
+    def _nextGeneration(self) -> None:
+        """compute the next generation of the plane, only the alive cells and their neighbours are evaluated"""
+
+        # every alive cell once, and every neighbour of an alive cell as many times as it has alive neighbours
+        candidates, occurrences_count = np.unique(
+            np.concatenate(
+                [
+                    (self.keys[:, None] + NEIGHBOURS_OFFSETS[None, :]).reshape(-1),
+                    self.keys,
+                ]
+            ),
+            return_counts=True,
+        )
+        alive_mask: np.ndarray = self._isAlive(candidates)
+        neighbours_count: np.ndarray = occurrences_count - alive_mask
+
+        next_alive_mask: np.ndarray = (
+            self.rule_table[alive_mask.astype(np.uint8), neighbours_count]
+            == ALIVE_CELL_STATE
+        )
+        self.keys = candidates[next_alive_mask]
+
+        # every alive cell is a candidate, so the births and deaths are found on the candidates
+        self._last_born = candidates[next_alive_mask & ~alive_mask]
+        self._last_died = candidates[alive_mask & ~next_alive_mask]
+        self._last_changes = (self._last_born.size, self._last_died.size)
+
+    def _stepDiff(self) -> Tuple[CELL_INDEXES, CELL_INDEXES]:
+        """return the cells of the window born and dead during the last generation computed, kept by the step,
+        so that the diffs of single generations are in the coordinates of the window like the sampled ones, and index the cell matrix as is
+
+        Returns:
+            Tuple[CELL_INDEXES, CELL_INDEXES]: (rows, cols) of the cells born, and of the cells dead
+        """
+        return self._windowCells(self._last_born), self._windowCells(self._last_died)
+
+    def _windowCells(self, keys: np.ndarray) -> CELL_INDEXES:
+        """decode the keys of the cells lying in the window of the grid, the other ones being dropped
+
+        Args:
+            keys (np.ndarray): the keys of the cells
+
+        Returns:
+            CELL_INDEXES: (rows, cols) of the cells of the window
+        """
+        rows, cols = decodeCells(keys)
+        inside_mask: np.ndarray = (
+            (rows >= 0)
+            & (rows < self.grid_dim[0])
+            & (cols >= 0)
+            & (cols < self.grid_dim[1])
+        )
+        return rows[inside_mask], cols[inside_mask]
+
+    def _collectStats(self) -> None:
+        """collect the statistics of the current generation on the whole plane, with the births and deaths kept by the step"""
+        self._setStats(*self._last_changes)
+
+    def _scanStats(self) -> None:
+        """collect the statistics of the current generation on the whole plane, when there is no step to take them from"""
+        self._setStats(None, None)
+
+    def _setStats(self, births: Optional[int], deaths: Optional[int]) -> None:
+        """set the statistics of the current generation on the whole plane, the bounding box being read from the sorted keys
+
+        Args:
+            births (Optional[int]): number of cells born during the last generation, None if unknown
+            deaths (Optional[int]): number of cells dead during the last generation, None if unknown
+        """
+        self.stats = GridStats(
+            self._turn, self.getPlanePopulation(), births, deaths, self.getBoundingBox()
+        )
+
+    def _isAlive(self, keys: np.ndarray) -> np.ndarray:
+        """check which cells are alive, by binary search in the sorted keys
+
+        Args:
+            keys (np.ndarray): the keys of the cells tested
+
+        Returns:
+            np.ndarray: boolean array, True where the cell is alive
+        """
+        if self.keys.size == 0:
+            return np.zeros(keys.shape, dtype=bool)
+        positions: np.ndarray = np.minimum(
+            np.searchsorted(self.keys, keys), self.keys.size - 1
+        )
+        return self.keys[positions] == keys
+
+    def getBoundingBox(self) -> Optional[Tuple[int, int, int, int]]:
+        """return the smallest box of the plane containing every alive cell
+
+        Returns:
+            Optional[Tuple[int, int, int, int]]: first row, first column, last row and last column of the box, None if there is no alive cell
+        """
+        if self.keys.size == 0:
+            return None
+        rows, cols = decodeCells(self.keys)
+        # the keys are sorted row by row
+        return int(rows[0]), int(cols.min()), int(rows[-1]), int(cols.max())
+
+    def getWindow(self, top: int, left: int, height: int, width: int) -> np.ndarray:
+        """return a window of the plane on the form of a dense matrix
+
+        Args:
+            top (int): row of the plane of the first row of the window
+            left (int): column of the plane of the first column of the window
+            height (int): number of rows of the window
+            width (int): number of columns of the window
+
+        Returns:
+            np.ndarray: the dense matrix of the cells of the window
+        """
+        window: np.ndarray = np.zeros((height, width), dtype=np.uint8)
+
+        # the keys of the rows of the window are contiguous
+        first, last = np.searchsorted(
+            self.keys, encodeCells(np.array([top, top + height]), np.full(2, -COL_BIAS))
+        )
+        rows, cols = decodeCells(self.keys[first:last])
+        inside_mask: np.ndarray = (cols >= left) & (cols < left + width)
+        window[rows[inside_mask] - top, cols[inside_mask] - left] = ALIVE_CELL_STATE
+
+        return window
+
+    def _writeCell(self, i: int, j: int, value: int) -> None:
+        """write a cell already validated into the keys, and update the statistics
+
+        Args:
+            i (int): row index of the cell
+            j (int): column index of the cell
+            value (int): state assigned to the cell
+        """
+        key: np.ndarray = encodeCells(np.array([i]), np.array([j]))
+        was_alive: bool = bool(self._isAlive(key)[0])
+        if value == ALIVE_CELL_STATE:
+            self.keys = np.union1d(self.keys, key)
+        else:
+            self.keys = np.setdiff1d(self.keys, key, assume_unique=True)
+
+        if not self.stats.updateCell(i, j, was_alive, value == ALIVE_CELL_STATE):
+            self._scanStats()
+
+    def _writeCells(
+        self, rows: np.ndarray, cols: np.ndarray, values: np.ndarray
+    ) -> None:
+        """write distinct cells already validated into the keys, and update the statistics
+
+        Args:
+            rows (np.ndarray): row indexes of the cells
+            cols (np.ndarray): column indexes of the cells
+            values (np.ndarray): states assigned to the cells
+        """
+        keys: np.ndarray = encodeCells(rows, cols)
+        was_alive: np.ndarray = self._isAlive(keys)
+        is_alive: np.ndarray = np.asarray(values) == ALIVE_CELL_STATE
+
+        self.keys = np.union1d(
+            np.setdiff1d(self.keys, keys[~is_alive], assume_unique=True),
+            keys[is_alive],
+        )
+
+        if not self.stats.updateCells(rows, cols, was_alive, is_alive):
+            self._scanStats()
+
+    def resetCellMat(self) -> None:
+        """Reset the plane to its initial state, and start counting the turns over"""
+        self.keys = self.initial_keys
+        self._startOver()
+
+    def _initPlane(self, cells: np.ndarray, top: int, left: int) -> None:
+        """set the plane to dense cells lying anywhere on it, the rest of the plane being dead, and start counting the turns over
+
+        Args:
+            cells (np.ndarray): the dense matrix of the cells, already validated
+            top (int): row of the plane of the first row of the cells
+            left (int): column of the plane of the first column of the cells
+        """
+        # np.nonzero yields the cells row by row, so the keys are already sorted
+        rows, cols = np.nonzero(cells == ALIVE_CELL_STATE)
+        self.initial_keys = encodeCells(rows + top, cols + left)
+        self.keys = self.initial_keys
+        self._startOver()
+
+    def getPlanePopulation(self) -> int:
+        """return the number of alive cells on the whole plane, including the ones outside the window
+
+        Returns:
+            int: number of alive cells on the plane
+        """
+        return int(self.keys.size)
+
+
+if __name__ == "__main__":
+
+    grid: SparseGrid = SparseGrid(fetch_game_config(), np.zeros((24, 24)))
+    grid.prettyPrintCellMat()
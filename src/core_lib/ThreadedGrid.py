@@ -0,0 +1,194 @@
+"""ThreadedGrid class definition
+"""
+import glob
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+
+import numpy as np
+from src.core_lib.CoreGrid import CoreGrid
+from src.core_lib.CoreGrid import stepCells
+from src.utils.confUtils import fetch_game_config
+from src.utils.CustomTypes import ALIVE_CELL_STATE
+from src.utils.ruleUtils import RULE_INDEX_BLOCK_SIZE
+
+DEFAULT_CACHE_SIZE: int = 1 << 20  # used when the size of the L2 cache cannot be read
+# bytes of the step buffers touched per cell : src and dst cells, padded alive mask, neighbours count and the rule index (one byte for most rules)
+STEP_BYTES_PER_CELL: int = 5
+
+
+def fetchCacheSize(level: int = 2) -> int:
+    """return the size of the data cache of the level passed in, read from the sysfs of linux
+
+    Args:
+        level (int, optional): level of the cache. Defaults to 2.
+
+    Returns:
+        int: size of the cache in bytes, DEFAULT_CACHE_SIZE if it cannot be read
+    """
+    units: Dict[str, int] = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+
+    for cache_dir in sorted(glob.glob("/sys/devices/system/cpu/cpu0/cache/index*")):
+        try:
+            with open(f"{cache_dir}/level", encoding="utf-8") as level_file, open(
+                f"{cache_dir}/type", encoding="utf-8"
+            ) as type_file, open(f"{cache_dir}/size", encoding="utf-8") as size_file:
+                if (
+                    int(level_file.read()) == level
+                    and type_file.read().strip() != "Instruction"
+                ):
+                    size: str = size_file.read().strip()
+                    return int(size.rstrip("KMG")) * units.get(size[-1], 1)
+        except (OSError, ValueError):
+            continue
+
+    return DEFAULT_CACHE_SIZE
+
+
+class ThreadedGrid(CoreGrid):
+    """CoreGrid mode splitting the vectorized step into row stripes, computed by a pool of threads as NumPy releases the GIL inside its kernels
+
+    The stripes are sized so that their step buffers fit in the L2 cache, and each thread computes a contiguous group of stripes, one after the other.
+    Unlike the ParallelGrid, the threads share the buffers of the grid, so that there is no inter-process cost.
+    Like the ParallelGrid, the grid is not bounded by the resolution of the UI so that huge boards can be simulated.
+    """
+
+    bounded_by_resolution: bool = False
+
+    def __init__(self, gameConfig: Dict, default_cell_mat: np.ndarray):
+
+        # 0 workers means one per core
+        self.n_workers: int = gameConfig["simulation"]["workers"] or os.cpu_count() or 1
+        self.stripe_height: int = 1
+        # row ranges of the stripes computed by every thread
+        self.stripe_groups: List[List[Tuple[int, int]]] = []
+        # intp buffer converting the rule indexes of every thread
+        self.index_blocks: List[np.ndarray] = []
+        self.executor: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=self.n_workers, thread_name_prefix="ThreadedGrid"
+        )
+        super().__init__(gameConfig, default_cell_mat)
+
+    def _step(self, src_cell_mat: np.ndarray, dst_cell_mat: np.ndarray) -> None:
+        """compute the next state of src_cell_mat into dst_cell_mat, stripe by stripe on the threads of the pool
+
+        The alive mask of every stripe has to be written before the neighbours of the adjacent stripes are counted, so the step has 2 phases
+
+        Args:
+            src_cell_mat (np.ndarray): the current cell matrix
+            dst_cell_mat (np.ndarray): the cell matrix receiving the next state
+        """
+        for future in [
+            self.executor.submit(self._fillAliveStripes, stripes, src_cell_mat)
+            for stripes in self.stripe_groups
+        ]:
+            future.result()
+
+        self._fillBoundary()
+
+        for future in [
+            self.executor.submit(
+                self._stepStripes, stripes, src_cell_mat, dst_cell_mat, index_block
+            )
+            for stripes, index_block in zip(self.stripe_groups, self.index_blocks)
+        ]:
+            future.result()
+
+    def _fillAliveStripes(
+        self, stripes: List[Tuple[int, int]], src_cell_mat: np.ndarray
+    ) -> None:
+        """fill the alive mask of the stripes passed in
+
+        Args:
+            stripes (List[Tuple[int, int]]): first row and row following the last row of every stripe
+            src_cell_mat (np.ndarray): the current cell matrix
+        """
+        for start_row, end_row in stripes:
+            np.equal(
+                src_cell_mat[start_row:end_row],
+                ALIVE_CELL_STATE,
+                out=self._alive_view[start_row:end_row],
+            )
+
+    def _stepStripes(
+        self,
+        stripes: List[Tuple[int, int]],
+        src_cell_mat: np.ndarray,
+        dst_cell_mat: np.ndarray,
+        index_block: np.ndarray,
+    ) -> None:
+        """count the alive neighbours of the cells of the stripes passed in, and gather their next state from the rule table
+
+        Args:
+            stripes (List[Tuple[int, int]]): first row and row following the last row of every stripe
+            src_cell_mat (np.ndarray): the current cell matrix
+            dst_cell_mat (np.ndarray): the cell matrix receiving the next state
+            index_block (np.ndarray): intp buffer of the thread, converting the rule indexes
+        """
+        for start_row, end_row in stripes:
+            stepCells(
+                src_cell_mat[start_row:end_row],
+                dst_cell_mat[start_row:end_row],
+                [
+                    neighbours_view[start_row:end_row]
+                    for neighbours_view in self._neighbours_views
+                ],
+                self._neighbours_count[start_row:end_row],
+                self._rule_index[start_row:end_row],
+                index_block,
+                self._flat_rule_table,
+            )
+
+    def _stepFingerprint(self) -> int:
+        """return the change of the fingerprint made by the last step, each thread hashing the cells which changed in its stripes
+
+        Returns:
+            int: the 64 bits change, to XOR into the fingerprint of the previous generation
+        """
+        fingerprint: int = 0
+        for future in [
+            self.executor.submit(self._stripeFingerprint, stripes[0][0], stripes[-1][1])
+            for stripes in self.stripe_groups
+        ]:
+            fingerprint ^= future.result()
+        return fingerprint
+
+    def _allocateStepBuffers(self) -> None:
+        """allocate the buffers of the whole grid step, and split the rows into stripes fitting in the L2 cache, grouped by thread"""
+
+        super()._allocateStepBuffers()
+
+        rows, cols = self.cell_mat.shape
+        self.stripe_height = max(
+            1, fetchCacheSize() // max(1, cols * STEP_BYTES_PER_CELL)
+        )
+        stripes: List[Tuple[int, int]] = [
+            (start_row, min(start_row + self.stripe_height, rows))
+            for start_row in range(0, rows, self.stripe_height)
+        ]
+        self.stripe_groups = [
+            group.tolist()
+            for group in np.array_split(
+                np.array(stripes, dtype=int).reshape(-1, 2),
+                max(1, min(self.n_workers, len(stripes))),
+            )
+        ]
+        self.index_blocks = [
+            np.zeros(
+                min(RULE_INDEX_BLOCK_SIZE, max(1, self.stripe_height * cols)),
+                dtype=np.intp,
+            )
+            for _ in self.stripe_groups
+        ]
+
+    def close(self) -> None:
+        """stop the threads of the pool, the grid cannot compute new turns afterward"""
+        self.executor.shutdown(wait=True)
+
+
+if __name__ == "__main__":
+
+    grid: ThreadedGrid = ThreadedGrid(fetch_game_config(), np.zeros((24, 24)))
+    grid.advance(1)
+    grid.prettyPrintCellMat()
+    grid.close()
@@ -0,0 +1,47 @@
+"""Registry of the grid engines, create the grid backend selected in the game config
+"""
+from typing import Dict, Union
+
+import numpy as np
+from src.core_lib.BaseGrid import BaseGrid
+from src.core_lib.BitPackedGrid import BitPackedGrid
+from src.core_lib.CellBuffer import CellBuffer
+from src.core_lib.CoreGrid import CoreGrid
+from src.core_lib.FrontierGrid import FrontierGrid
+from src.core_lib.HashLifeGrid import HashLifeGrid
+from src.core_lib.ParallelGrid import ParallelGrid
+from src.core_lib.SparseGrid import SparseGrid
+from src.core_lib.ThreadedGrid import ThreadedGrid
+
+# every engine shares the surface of the BaseGrid
+GRID_TYPE = BaseGrid
+
+GRID_ENGINES: Dict = {
+    "dense": CoreGrid,
+    "bitpacked": BitPackedGrid,
+    "frontier": FrontierGrid,
+    "hashlife": HashLifeGrid,
+    "parallel": ParallelGrid,
+    "sparse": SparseGrid,
+    "threaded": ThreadedGrid,
+}
+
+
+def createGrid(
+    gameConfig: Dict, default_cell_mat: Union[np.ndarray, CellBuffer]
+) -> GRID_TYPE:
+    """create the grid backend selected by the 'engine' field of the simulation settings
+
+    Args:
+        gameConfig (Dict): the game config
+        default_cell_mat (Union[np.ndarray, CellBuffer]): the initial cell matrix of the grid, a released CellBuffer is adopted without copy by the dense engines
+
+    Returns:
+        GRID_TYPE: the grid, exposing the applyRules / getCellMat / getAliveCellCount / getStats surface
+    """
+    engine: str = gameConfig["simulation"]["engine"]
+    assert (
+        engine in GRID_ENGINES
+    ), f"Unknown grid engine '{engine}', the available ones are : {', '.join(GRID_ENGINES.keys())}"
+
+    return GRID_ENGINES[engine](gameConfig, default_cell_mat)
@@ -7,9 +7,10 @@ from src.ui_lib.UIButton import UIButton
 
 
 class ButtonPanel:
-    """pannel display to the screen 3 buttons for the user to interact with :
+    """pannel display to the screen 4 buttons for the user to interact with :
     - start button
     - pause button
+    - step back button, going back to the previous generation
     - reset button"""
 
     def __init__(
@@ -27,7 +28,7 @@ class ButtonPanel:
         self.surface: pygame.surface.Surface = pygame.surface.Surface(size)
 
         # components
-        self.labels: List[str] = ["START", "STOP", "RESET"]
+        self.labels: List[str] = ["START", "STOP", "BACK", "RESET"]
         self.callbacks: Dict = callbacks
         assert all(
             label in callbacks.keys() for label in self.labels
@@ -4,15 +4,26 @@
 
 from math import ceil
 import sys
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 import numpy as np
 import pygame
+from src.core_lib.CellBuffer import CellBuffer
 from src.utils.CustomTypes import ALIVE_CELL_STATE, DEAD_CELL_STATE
+from src.utils.patternUtils import readPattern
+
+# below that many pixels per cell the grid lines are not drawn, they would cover most of the cells while being hardly visible
+GRID_LINES_MIN_CELL_SIZE: int = 4
 
 
 class DisplayPanel:
     """Handle the display of the grid, represent the real time state of the core grid
     Furthermore, before the game begins, it let the user place the first cells (create the inital game state)
+
+    With the differential rendering, the panel keeps the cells of the frame drawn on its surface and only repaints the cells
+    that changed since then, an update without new cells leaving the surface as is
+
+    The background and the grid lines are rendered once into a cached layer, rebuilt only when the size or the colours change,
+    a full redraw blitting that layer before drawing the cells
     """
 
     def __init__(
@@ -26,6 +37,8 @@ class DisplayPanel:
         background_color: List[int] = [0, 0, 0],
         grid_color: List[int] = [255, 255, 255],
         cell_color: List[int] = [255, 0, 0],
+        n_states: int = 2,
+        differential: bool = True,
     ):
         # surface
         self.size: List[int] = size
@@ -39,68 +52,253 @@ class DisplayPanel:
             "grid_color": grid_color,
             "cell_color": cell_color,
         }
+        # colour of each state of the cells, the dying states of the Generations rules fade from the cell colour to the background one
+        self.n_states: int = n_states
+        self.cell_palette: List[List[int]] = self._buildPalette()
 
         # grid handling
         self.grid_dim: List[int] = grid_dim
-        self.cell_mat: np.ndarray = np.array(np.zeros(self.grid_dim))
-        self.CELL_SHAPE: List[int] = [
-            ceil(res_dim / grid_dim)
-            for res_dim, grid_dim in zip(self.size, self.grid_dim)
-        ]
+        # cells edited before the simulation starts, owned by the panel until they are handed over to the grid
+        self.edit_buffer: CellBuffer = CellBuffer.zeros(
+            tuple(self.grid_dim), owner=self
+        )
+        # cells displayed, a read-only view of the edit buffer or of the cell matrix of the grid
+        self.cell_mat: np.ndarray = self.edit_buffer.view()
+        self.CELL_SHAPE: List[int] = self._cellShape()
+        # the grid lines are not drawn when the cells are smaller than GRID_LINES_MIN_CELL_SIZE pixels, the cells then fill their whole rectangle
+        self.show_grid_lines: bool = min(self.CELL_SHAPE) >= GRID_LINES_MIN_CELL_SIZE
         self.editModeCallbacks = editModeCallbacks
 
+        # background and grid lines layer, with the settings it was rendered for, None until the first full redraw
+        self.grid_layer: Optional[pygame.surface.Surface] = None
+        self._grid_layer_key: Optional[Tuple] = None
+
+        # differential rendering : cells of the frame on the surface, None until a full redraw is done,
+        # and whether the cells displayed changed since then (setCellMat, edit mode, pattern loaded)
+        self.differential: bool = differential
+        self._drawn_cell_mat: Optional[np.ndarray] = None
+        self._changed: np.ndarray = np.zeros(self.grid_dim, dtype=bool)
+        self._cells_changed: bool = True
+        # number of cells painted by the last update, for the benchmarks and the tests
+        self.repainted_cells: int = 0
+
     def update(self) -> None:
-        """draw the new internal state of the grid to the surface"""
+        """draw the new internal state of the grid to the surface, with the differential rendering only the cells that changed
+        since the last frame are repainted, or none at all when the cells displayed did not change"""
 
         assert self.surface is not None, "display panel has not been initialised yet"
-        self.surface.fill(self.ui_settings["background_color"])
-        self._draw()
+        if not self.differential:
+            self._redraw()
+        elif self._drawn_cell_mat is None:
+            self._redraw()
+            self._drawn_cell_mat = np.array(self.cell_mat)
+        elif self._cells_changed:
+            self._drawChanges()
+        else:
+            self.repainted_cells = 0
+        self._cells_changed = False
+
+    def resize(self, size: List[int]) -> None:
+        """resize the surface of the panel, the cells being stretched to fill it
+
+        Args:
+            size (List[int]): the new size of the panel
+        """
+        self.size = size
+        self.surface = pygame.surface.Surface(size)
+        self.CELL_SHAPE = self._cellShape()
+        self.show_grid_lines = min(self.CELL_SHAPE) >= GRID_LINES_MIN_CELL_SIZE
+        self.requestFullRedraw()
+
+    def setColors(
+        self,
+        background_color: Optional[List[int]] = None,
+        grid_color: Optional[List[int]] = None,
+        cell_color: Optional[List[int]] = None,
+    ) -> None:
+        """change the colours of the panel, the ones left to None are kept
+
+        Args:
+            background_color (Optional[List[int]], optional): colour of the background and of the dead cells. Defaults to None.
+            grid_color (Optional[List[int]], optional): colour of the grid lines. Defaults to None.
+            cell_color (Optional[List[int]], optional): colour of the alive cells. Defaults to None.
+        """
+        for setting, color in [
+            ("background_color", background_color),
+            ("grid_color", grid_color),
+            ("cell_color", cell_color),
+        ]:
+            if color is not None:
+                self.ui_settings[setting] = color
+        self.cell_palette = self._buildPalette()
+        self.requestFullRedraw()
+
+    def requestFullRedraw(self) -> None:
+        """make the next update redraw the whole surface instead of the changed cells only"""
+        self._drawn_cell_mat = None
 
     def setCellMat(self, new_cell_mat: np.ndarray) -> None:
         """set the cell mat, this function is called each time a new state of the internal grid is coming and needs to be displayed
+        The matrix is shared with the grid, it is neither copied nor converted, it has to be set again each time the grid moves on
+        for the differential rendering to repaint the cells
 
         Args:
-            new_cell_mat (np.ndarray): the new cell mat
+            new_cell_mat (np.ndarray): the new cell mat, a read-only view of the grid
         """
         self.cell_mat = new_cell_mat
+        self._cells_changed = True
 
-    def _draw(self) -> None:
-        """draw the interal core grid state to the surface, according to the ui colors inputed"""
-        # draw the grid
+    def _buildPalette(self) -> List[List[int]]:
+        """build the colour of every state of the cells, the dead state takes the background colour and the alive one the cell colour
+
+        Returns:
+            List[List[int]]: the colour of each state, indexed by the state
+        """
+        fading: np.ndarray = np.linspace(0, 1, self.n_states)[:0:-1, None]
+        palette: np.ndarray = np.rint(
+            fading * np.array(self.ui_settings["cell_color"])
+            + (1 - fading) * np.array(self.ui_settings["background_color"])
+        ).astype(int)
+
+        return [list(self.ui_settings["background_color"])] + palette.tolist()
+
+    def _cellShape(self) -> List[int]:
+        """size of a cell in pixels, the cells covering the whole surface
+
+        Returns:
+            List[int]: width and height of a cell
+        """
+        return [
+            ceil(res_dim / grid_dim)
+            for res_dim, grid_dim in zip(self.size, self.grid_dim)
+        ]
+
+    def _cellRect(self, i: int, j: int) -> List[int]:
+        """rectangle of a cell on the surface, inside the grid lines when they are drawn
+
+        Args:
+            i (int): row of the cell
+            j (int): column of the cell
+
+        Returns:
+            List[int]: left, top, width and height of the rectangle
+        """
+        # note that the "+1" and "-1" are here to highlight the grid by putting constraint on the cell display
+        inset: int = 1 if self.show_grid_lines else 0
+        return [
+            j * self.CELL_SHAPE[0] + inset,
+            i * self.CELL_SHAPE[1] + inset,
+            self.CELL_SHAPE[0] - inset,
+            self.CELL_SHAPE[1] - inset,
+        ]
+
+    def _gridLayer(self) -> pygame.surface.Surface:
+        """layer of the background and of the grid lines, rendered again only when the size or the colours changed
+
+        Returns:
+            pygame.surface.Surface: the layer, of the size of the panel
+        """
+        key: Tuple = (
+            tuple(self.size),
+            tuple(self.CELL_SHAPE),
+            tuple(self.ui_settings["background_color"]),
+            tuple(self.ui_settings["grid_color"]),
+        )
+        if self.grid_layer is None or key != self._grid_layer_key:
+            self.grid_layer = self._buildGridLayer()
+            self._grid_layer_key = key
+
+        return self.grid_layer
+
+    def _buildGridLayer(self) -> pygame.surface.Surface:
+        """render the background and the grid lines into a new layer
+
+        Returns:
+            pygame.surface.Surface: the layer
+        """
+        grid_layer: pygame.surface.Surface = pygame.surface.Surface(self.size)
+        grid_layer.fill(self.ui_settings["background_color"])
+        if not self.show_grid_lines:
+            return grid_layer
 
         for i in range(self.grid_dim[1]):
             start_point: List[int] = [0, i * self.CELL_SHAPE[1]]
             end_point: List[int] = [self.size[0], i * self.CELL_SHAPE[1]]
             pygame.draw.aaline(
-                self.surface, self.ui_settings["grid_color"], start_point, end_point
+                grid_layer, self.ui_settings["grid_color"], start_point, end_point
             )
 
         for j in range(self.grid_dim[0]):
             start_point = [j * self.CELL_SHAPE[0], 0]
             end_point = [j * self.CELL_SHAPE[0], self.size[1]]
             pygame.draw.aaline(
-                self.surface, self.ui_settings["grid_color"], start_point, end_point
+                grid_layer, self.ui_settings["grid_color"], start_point, end_point
             )
 
-        # fill the grid according to cell_matrix
-        for i in range(self.grid_dim[1]):
-            for j in range(self.grid_dim[1]):
-                if self.cell_mat[i][j] == ALIVE_CELL_STATE:
-
-                    # note that the "+1" and "-1" are here to highlight the grid by putting constraint on the cell display
-                    pygame.draw.rect(
-                        self.surface,
-                        self.ui_settings["cell_color"],
-                        [
-                            j * self.CELL_SHAPE[0] + 1,
-                            i * self.CELL_SHAPE[1] + 1,
-                            self.CELL_SHAPE[0] - 1,
-                            self.CELL_SHAPE[1] - 1,
-                        ],
-                    )
+        return grid_layer
+
+    def _redraw(self) -> None:
+        """clear the surface with the grid layer, in a single blit, and draw every cell"""
+
+        self.surface.blit(self._gridLayer(), [0, 0])
+        self._draw()
+        self.repainted_cells = int(np.count_nonzero(self.cell_mat))
 
-    def runEditMode(self) -> None:
-        """create a custom game loop to edit and create an initial grid before running the simulation"""
+    def _drawChanges(self) -> None:
+        """repaint the cells whose state differs from the frame on the surface, found in a single vectorized comparison,
+        so that the cost of a frame grows with the number of changes rather than with the size of the grid.
+        When more cells changed than a full redraw would paint, the whole grid is redrawn instead"""
+
+        assert self._drawn_cell_mat is not None, "no frame drawn yet"
+        np.not_equal(self.cell_mat, self._drawn_cell_mat, out=self._changed)
+        changed_i, changed_j = np.nonzero(self._changed)
+        if changed_i.size > np.count_nonzero(self.cell_mat) + sum(self.grid_dim):
+            self._redraw()
+            np.copyto(self._drawn_cell_mat, self.cell_mat)
+            return
+
+        states: np.ndarray = self.cell_mat[changed_i, changed_j]
+        self._drawn_cell_mat[changed_i, changed_j] = states
+        # the dead cells are painted with the background colour, the grid lines around the cells are left as is
+        for i, j, state in zip(changed_i.tolist(), changed_j.tolist(), states.tolist()):
+            pygame.draw.rect(
+                self.surface, self.cell_palette[state], self._cellRect(i, j)
+            )
+        self.repainted_cells = changed_i.size
+
+    def _draw(self) -> None:
+        """draw the interal core grid state to the surface, according to the ui colors inputed, the grid lines being already there"""
+
+        # fill the grid according to cell_matrix, state by state with the colour of the palette, only the non dead cells are visited
+        for state in range(ALIVE_CELL_STATE, self.n_states):
+            for i, j in np.argwhere(self.cell_mat == state).tolist():
+                pygame.draw.rect(
+                    self.surface, self.cell_palette[state], self._cellRect(i, j)
+                )
+
+    def loadPattern(self, pattern_path: str) -> None:
+        """write a pattern file (RLE, Life 1.06 or plaintext) straight into the edit buffer, centred on the grid, the other cells are left as is
+
+        Args:
+            pattern_path (str): path of the pattern file
+        """
+        if self.edit_buffer.owner is not self:
+            self.edit_buffer = CellBuffer(np.array(self.cell_mat), owner=self)
+        readPattern(pattern_path, self.edit_buffer.writable(self))
+        self.setCellMat(self.edit_buffer.view())
+
+    def runEditMode(self) -> CellBuffer:
+        """create a custom game loop to edit and create an initial grid before running the simulation, starting from the cells displayed
+
+        Returns:
+            CellBuffer: the initial cells, released by the panel so that the grid can adopt them without copy
+        """
+
+        # the previous edit buffer belongs to the grid now, the cells displayed are copied into a new one
+        if self.edit_buffer.owner is not self:
+            self.edit_buffer = CellBuffer(np.array(self.cell_mat), owner=self)
+        cells: np.ndarray = self.edit_buffer.writable(self)
+        self.setCellMat(self.edit_buffer.view())
 
         # this function triggers its own internal game loop
         edit_mode_running = True
@@ -112,18 +310,21 @@ class DisplayPanel:
                     cell_coor_selected = [
                         event.pos[x] // self.CELL_SHAPE[x] for x in [0, 1]
                     ]
-                    self.cell_mat[cell_coor_selected[1]][cell_coor_selected[0]] = (
+                    cells[cell_coor_selected[1]][cell_coor_selected[0]] = (
                         ALIVE_CELL_STATE
-                        if self.cell_mat[cell_coor_selected[1]][cell_coor_selected[0]]
+                        if cells[cell_coor_selected[1]][cell_coor_selected[0]]
                         == DEAD_CELL_STATE
                         else DEAD_CELL_STATE
                     )
+                    self._cells_changed = True
 
                 elif event.type == pygame.KEYDOWN and event.key == pygame.K_RETURN:
                     edit_mode_running = False
                 elif event.type == pygame.QUIT:
                     sys.exit()
 
+            # the screen, this panel included, is drawn by the callback
             self.editModeCallbacks["refresh_screen"]()
-            self._draw()
             pygame.display.flip()
+
+        return self.edit_buffer.release(self)
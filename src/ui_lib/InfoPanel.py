@@ -2,15 +2,18 @@
 """
 # pylint: disable=dangerous-default-value,too-many-arguments,too-many-instance-attributes
 from datetime import datetime
-from typing import Dict, List, Union
+from typing import Dict, List, Optional, Tuple, Union
 import pygame
+from src.core_lib.GridStats import GridStats
 
 
 class InfoPanel:
     """panel displaying to the screen the current infos for the turn :
     - the index of the turn itself
     - the number of alive cells
+    - the births and deaths of the last generation
     - the elapsed time
+    - the cycle the grid is stuck in, once detected
     """
 
     def __init__(
@@ -23,7 +26,7 @@ class InfoPanel:
     ):
         self.size = size
         self.surface: pygame.surface.Surface = pygame.surface.Surface(size)
-        self.infos: Dict = {"alive_cells": 0, "turn": 1}
+        self.infos: Dict = {"stats": GridStats(0, 0), "turn": 1, "cycle": None}
         self.ui_settings = {
             "font": pygame.font.SysFont(font, font_size),
             "text_color": text_color,
@@ -62,10 +65,13 @@ class InfoPanel:
         self.surface.fill(self.ui_settings["background_color"])
         surfs = [
             self.ui_settings["font"].render(
-                f"Alive cells : {self.infos['alive_cells']}",
+                f"Alive cells : {self.infos['stats'].population}",
                 True,
                 self.ui_settings["text_color"],
             ),
+            self.ui_settings["font"].render(
+                self._getFormattedChanges(), True, self.ui_settings["text_color"]
+            ),
             self.ui_settings["font"].render(
                 f"Turn #{self.infos['turn']}", True, self.ui_settings["text_color"]
             ),
@@ -74,6 +80,9 @@ class InfoPanel:
                 True,
                 self.ui_settings["text_color"],
             ),
+            self.ui_settings["font"].render(
+                self._getFormattedCycle(), True, self.ui_settings["text_color"]
+            ),
         ]
 
         if self.displayEditMode:
@@ -89,8 +98,7 @@ class InfoPanel:
                     ),
                 )
         else:
-            for i in range(len(self.infos.keys()) + 1):
-                surf = surfs[i]
+            for i, surf in enumerate(surfs):
                 self.surface.blit(
                     surf,
                     surf.get_rect(
@@ -147,16 +155,45 @@ class InfoPanel:
 
         return f"{'0' if num_hour < 10 else ''}{num_hour}:{'0' if num_min < 10 else ''}{num_min}:{'0' if remaining_sec < 10 else ''}{remaining_sec}"
 
-    def setInfos(self, alive_cells_number: int, turn_number: int) -> None:
+    def _getFormattedChanges(self) -> str:
+        """return the births and deaths of the last generation, as a string
+
+        Returns:
+            str: 'Births : b / Deaths : d', or an empty string if they are unknown
+        """
+        stats: GridStats = self.infos["stats"]
+        if stats.births is None or stats.deaths is None:
+            return ""
+        return f"Births : {stats.births} / Deaths : {stats.deaths}"
+
+    def _getFormattedCycle(self) -> str:
+        """return the cycle the grid is stuck in, as a string
+
+        Returns:
+            str: 'Period p since #g', or an empty string if no cycle has been detected
+        """
+        if self.infos["cycle"] is None:
+            return ""
+        first_turn, period = self.infos["cycle"]
+        return f"Period {period} since #{first_turn}"
+
+    def setInfos(
+        self,
+        stats: GridStats,
+        turn_number: int,
+        cycle: Optional[Tuple[int, int]] = None,
+    ) -> None:
         """set the infos regarding the current turn that will be displayed
 
         Args:
-            alive_cells (int): number of cell alive for the turn
+            stats (GridStats): statistics of the turn collected by the grid (population, births and deaths)
             turn_number (int): index of the turn
+            cycle (Optional[Tuple[int, int]], optional): first generation and period of the cycle the grid is stuck in. Defaults to None.
         """
 
-        self.infos["alive_cells"] = alive_cells_number
+        self.infos["stats"] = stats
         self.infos["turn"] = turn_number
+        self.infos["cycle"] = cycle
 
     def setEditMode(self, state: bool) -> None:
         """set the state of the displayEditMode flag
@@ -2,13 +2,20 @@
 """
 # pylint: disable=too-many-arguments,too-many-instance-attributes,dangerous-default-value
 import sys
-from typing import Dict, List, Union
+import time
+from typing import Dict, List, Optional, Union
 import numpy as np
 import pygame
+from src.core_lib.CellBuffer import CellBuffer
 from src.ui_lib.DisplayPanel import DisplayPanel
 from src.ui_lib.InfoPanel import InfoPanel
 from src.ui_lib.ButtonPanel import ButtonPanel
 from src.utils.confUtils import fetch_game_config
+from src.utils.PhaseTimer import PhaseTimer
+from src.utils.ruleUtils import parseRule
+
+# seconds between two refreshes of the text of the timing overlay, so that the overlay barely weighs on the frames it times
+TIMING_OVERLAY_REFRESH: float = 0.5
 
 
 class UIRunner:
@@ -20,6 +27,7 @@ class UIRunner:
         gameCallbacks: Dict = {
             "START": lambda: None,
             "STOP": lambda: None,
+            "BACK": lambda: None,
             "RESET": lambda: None,
         },
         res: Union[List[int], None] = None,
@@ -28,6 +36,8 @@ class UIRunner:
         cell_color: Union[List[int], None] = None,
         grid_color: Union[List[int], None] = None,
         text_color: Union[List[int], None] = None,
+        phase_timer: Optional[PhaseTimer] = None,
+        timing_overlay: bool = False,
     ) -> None:
 
         # parameters
@@ -68,6 +78,18 @@ class UIRunner:
         # interactions
         self.gameCallbacks = gameCallbacks
 
+        # timing of the phases of the frames, the overlay showing their percentiles over the display panel ([T] toggles it)
+        self.phase_timer: PhaseTimer = (
+            phase_timer if phase_timer is not None else PhaseTimer()
+        )
+        self.timing_overlay: bool = timing_overlay and self.phase_timer.enabled
+        self.timing_overlay_font: pygame.font.Font = pygame.font.SysFont(
+            str(self.videoSettings["font"]),
+            int(self.videoSettings["res"][1] * self.videoSettings["font_size_ratio"]),
+        )
+        self.timing_overlay_surface: Optional[pygame.surface.Surface] = None
+        self._last_overlay_refresh: float = 0.0
+
         # ui elements
         self.panel_blit_points: Dict = {
             "display": [0, 0],
@@ -119,6 +141,8 @@ class UIRunner:
             },
             cell_color=self.videoSettings["cell_color"],
             background_color=self.videoSettings["display_background_color"],
+            n_states=parseRule(self.gameConfig["simulation"]["rule"])[2],
+            differential=self.gameConfig["ui"]["differential_rendering"],
         )
 
     def __refreshComponents(self) -> None:
@@ -126,9 +150,12 @@ class UIRunner:
         - the display panel draws the new core grid internal state
         - the info panel draw the metrics
         """
-        self.button_panel.update()
-        self.display_panel.update()
-        self.info_panel.update()
+        with self.phase_timer.phase("draw_button"):
+            self.button_panel.update()
+        with self.phase_timer.phase("draw_display"):
+            self.display_panel.update()
+        with self.phase_timer.phase("draw_info"):
+            self.info_panel.update()
 
     def draw(self) -> None:
         """Draw each ui components on the main window"""
@@ -143,31 +170,97 @@ class UIRunner:
             self.info_panel.surface is not None
         ), "info panel has not been initialised yet"
 
-        pygame.surface.Surface.fill(
-            self.main_window, tuple(self.gameConfig["ui"]["display_background_color"])
-        )
-
+        # the panels draw to their own surfaces, the main window is only cleared once they are done
         self.__refreshComponents()
+
+        with self.phase_timer.phase("blit"):
+            pygame.surface.Surface.fill(
+                self.main_window,
+                tuple(self.gameConfig["ui"]["display_background_color"]),
+            )
+            self.main_window.blit(
+                self.display_panel.surface, self.panel_blit_points["display"]
+            )
+            self.main_window.blit(
+                self.button_panel.surface, self.panel_blit_points["button"]
+            )
+            self.main_window.blit(
+                self.info_panel.surface, self.panel_blit_points["info"]
+            )
+
+    def drawTimingOverlay(self) -> None:
+        """draw the percentiles of the phases over the display panel, their text being rendered again every TIMING_OVERLAY_REFRESH seconds only"""
+
+        if time.monotonic() - self._last_overlay_refresh >= TIMING_OVERLAY_REFRESH:
+            self._last_overlay_refresh = time.monotonic()
+            lines: List[pygame.surface.Surface] = [
+                self.timing_overlay_font.render(
+                    line, True, self.gameConfig["ui"]["text_color"]
+                )
+                for line in self.phase_timer.summaryLines()
+            ]
+            self.timing_overlay_surface = pygame.surface.Surface(
+                [
+                    max(line.get_width() for line in lines),
+                    sum(line.get_height() for line in lines),
+                ]
+            )
+            self.timing_overlay_surface.fill(
+                self.gameConfig["ui"]["side_panel_background_color"]
+            )
+            self.timing_overlay_surface.set_alpha(200)
+            height: int = 0
+            for line in lines:
+                self.timing_overlay_surface.blit(line, [0, height])
+                height += line.get_height()
+
+        assert self.timing_overlay_surface is not None
         self.main_window.blit(
-            self.display_panel.surface, self.panel_blit_points["display"]
-        )
-        self.main_window.blit(
-            self.button_panel.surface, self.panel_blit_points["button"]
+            self.timing_overlay_surface, self.panel_blit_points["display"]
         )
-        self.main_window.blit(self.info_panel.surface, self.panel_blit_points["info"])
 
     def update(self) -> None:
-        """update the main screen"""
+        """update the main screen, with the timing overlay on top when it is shown"""
 
         self.draw()
-        pygame.display.flip()
+        if self.timing_overlay:
+            with self.phase_timer.phase("overlay"):
+                self.drawTimingOverlay()
+        with self.phase_timer.phase("flip"):
+            pygame.display.flip()
         # self.graphicClock.tick(self.gameConfig["videoSettings"]["framerate"])
 
     def checkEvent(self) -> None:
-        """Check for any pygame event and custom event from the button panel"""
+        """Check for any pygame event and custom event from the button panel, the left and right arrows scrub through the generations
+        when a 'SCRUB' callback is given, the [S] key saves the simulation when a 'SAVE' one is given, and the [E] key exports the cells
+        when an 'EXPORT' one is given, and the [T] key shows or hides the timing overlay when the phases are timed"""
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 sys.exit()
+            if (
+                event.type == pygame.KEYDOWN
+                and event.key in [pygame.K_LEFT, pygame.K_RIGHT]
+                and "SCRUB" in self.gameCallbacks
+            ):
+                self.gameCallbacks["SCRUB"](-1 if event.key == pygame.K_LEFT else 1)
+            if (
+                event.type == pygame.KEYDOWN
+                and event.key == pygame.K_s
+                and "SAVE" in self.gameCallbacks
+            ):
+                self.gameCallbacks["SAVE"]()
+            if (
+                event.type == pygame.KEYDOWN
+                and event.key == pygame.K_e
+                and "EXPORT" in self.gameCallbacks
+            ):
+                self.gameCallbacks["EXPORT"]()
+            if (
+                event.type == pygame.KEYDOWN
+                and event.key == pygame.K_t
+                and self.phase_timer.enabled
+            ):
+                self.timing_overlay = not self.timing_overlay
             if event.type == pygame.MOUSEBUTTONDOWN:
                 # button handling
                 self.button_panel.checkEvents(
@@ -179,25 +272,25 @@ class UIRunner:
                     ]
                 )
 
-    def runEditMode(self) -> np.ndarray:
+    def runEditMode(self) -> CellBuffer:
         """Handle the edit mode
 
         Returns:
-            np.ndarray: the default cell matrix state for the game
+            CellBuffer: the default cell matrix state for the game, released by the display panel for the grid to adopt
         """
         for button in list(self.button_panel.buttons.values()):
             button.setClickableState(False)
 
         self.update()
         self.info_panel.setEditMode(True)
-        self.display_panel.runEditMode()
+        default_cells: CellBuffer = self.display_panel.runEditMode()
         self.info_panel.setEditMode(False)
 
         for button in list(self.button_panel.buttons.values()):
             if button.ui_settings["label"] == "START":
                 button.setClickableState(True)
 
-        return self.display_panel.cell_mat
+        return default_cells
 
     def validateUIParams(self) -> None:
         """Make sure that the grid has authorized dimensions in regards to the resolution of the UI, and correct values for the cells too, make sure that the res has values within limits, and on the right type"""
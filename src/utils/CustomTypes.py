@@ -3,9 +3,15 @@
 from typing import get_args
 from typing import Literal
 
+import numpy as np
+
 DEAD_CELL_STATE_TYPE = Literal[0]
 ALIVE_CELL_STATE_TYPE = Literal[1]
 GRID_CELL_STATE_TYPE = Literal[DEAD_CELL_STATE_TYPE, ALIVE_CELL_STATE_TYPE]
 
 DEAD_CELL_STATE: DEAD_CELL_STATE_TYPE = get_args(DEAD_CELL_STATE_TYPE)[0]
 ALIVE_CELL_STATE: ALIVE_CELL_STATE_TYPE = get_args(ALIVE_CELL_STATE_TYPE)[0]
+
+# with the Generations rules, the cells which do not survive decay through the states 2, 3, ... before dying
+FIRST_DYING_CELL_STATE: int = 2
+CELL_STATE_DTYPE = np.uint8
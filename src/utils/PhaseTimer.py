@@ -0,0 +1,211 @@
+"""PhaseTimer class definition
+"""
+import json
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# number of last samples of every phase the percentiles are computed over
+PHASE_TIMER_WINDOW: int = 1024
+PHASE_TIMER_PERCENTILES: List[int] = [50, 95, 99]
+# seconds between two dumps into the metrics file
+PHASE_TIMER_DUMP_INTERVAL: float = 5.0
+
+
+class _NullPhase:
+    """Phase of a disabled timer, shared by every phase so that timing nothing allocates nothing"""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullPhase":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+
+_NULL_PHASE: _NullPhase = _NullPhase()
+
+
+class _Phase:
+    """Phase of an enabled timer, timing the block of its with statement into the rolling window of the phase"""
+
+    __slots__ = ("samples", "count", "_start")
+
+    def __init__(self, window: int) -> None:
+        # seconds of the last samples, the sample n being at n % window
+        self.samples: np.ndarray = np.zeros(window, dtype=np.float64)
+        self.count: int = 0
+        self._start: float = 0.0
+
+    def __enter__(self) -> "_Phase":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.record(time.perf_counter() - self._start)
+
+    def record(self, seconds: float) -> None:
+        """add a sample to the rolling window, in place of the oldest one once the window is full
+
+        Args:
+            seconds (float): duration of the phase
+        """
+        self.samples[self.count % self.samples.size] = seconds
+        self.count += 1
+
+    def window(self) -> np.ndarray:
+        """samples of the rolling window, in no particular order"""
+        return self.samples[: min(self.count, self.samples.size)]
+
+
+class PhaseTimer:
+    """Time the phases of the main loop (step, stats, draw of each panel, blit, flip...) with a monotonic clock,
+    each phase keeping a rolling window of its last samples to compute its p50 / p95 / p99. The frames are counted by tick,
+    which also dumps the percentiles into the metrics file periodically
+
+    A disabled timer hands out a shared no-op context for every phase, timing a phase then only costs a method call
+    """
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        window: int = PHASE_TIMER_WINDOW,
+        metrics_path: Optional[str] = None,
+        dump_interval: float = PHASE_TIMER_DUMP_INTERVAL,
+    ) -> None:
+        """
+        Args:
+            enabled (bool, optional): time the phases, a disabled timer records nothing. Defaults to False.
+            window (int, optional): number of last samples of every phase the percentiles are computed over. Defaults to PHASE_TIMER_WINDOW.
+            metrics_path (Optional[str], optional): file the percentiles are appended to as JSON lines. Defaults to None, no dump.
+            dump_interval (float, optional): seconds between two dumps into the metrics file. Defaults to PHASE_TIMER_DUMP_INTERVAL.
+        """
+        assert window >= 1, "the window should hold at least 1 sample"
+        assert dump_interval >= 0, "the interval between the dumps must be positive"
+
+        self.enabled: bool = enabled
+        self.window: int = window
+        self.metrics_path: Optional[str] = metrics_path
+        self.dump_interval: float = dump_interval
+
+        # phases in the order they were first timed
+        self.phases: Dict[str, _Phase] = {}
+        self.frames: int = 0
+        self._last_tick: Optional[float] = None
+        self._last_dump: float = time.monotonic()
+
+    def phase(self, name: str):
+        """context timing the block of a with statement as a sample of a phase
+
+        Args:
+            name (str): name of the phase
+
+        Returns:
+            the context of the phase, a shared no-op one when the timer is disabled
+        """
+        if not self.enabled:
+            return _NULL_PHASE
+
+        phase: Optional[_Phase] = self.phases.get(name)
+        if phase is None:
+            phase = self.phases[name] = _Phase(self.window)
+        return phase
+
+    def record(self, name: str, seconds: float) -> None:
+        """add a sample measured elsewhere to a phase
+
+        Args:
+            name (str): name of the phase
+            seconds (float): duration of the phase
+        """
+        if self.enabled:
+            self.phase(name).record(seconds)
+
+    def tick(self) -> None:
+        """end a frame : the time since the previous tick is recorded into the 'frame' phase, and the percentiles are dumped
+        into the metrics file when the dump interval has elapsed"""
+
+        if not self.enabled:
+            return
+
+        now: float = time.perf_counter()
+        if self._last_tick is not None:
+            self.record("frame", now - self._last_tick)
+        self._last_tick = now
+        self.frames += 1
+
+        if (
+            self.metrics_path is not None
+            and time.monotonic() - self._last_dump >= self.dump_interval
+        ):
+            self.dump()
+
+    def getPercentiles(self) -> Dict[str, Dict[str, float]]:
+        """percentiles of the rolling window of every phase timed
+
+        Returns:
+            Dict[str, Dict[str, float]]: for every phase, the number of samples ever recorded ('count') and the mean, p50, p95, p99 and max
+                of its window, in milliseconds
+        """
+        percentiles: Dict[str, Dict[str, float]] = {}
+        for name, phase in self.phases.items():
+            samples: np.ndarray = phase.window() * 1000
+            if not samples.size:
+                continue
+            percentiles[name] = {
+                "count": phase.count,
+                "mean": float(samples.mean()),
+                **{
+                    f"p{percentile}": float(value)
+                    for percentile, value in zip(
+                        PHASE_TIMER_PERCENTILES,
+                        np.percentile(samples, PHASE_TIMER_PERCENTILES),
+                    )
+                },
+                "max": float(samples.max()),
+            }
+
+        return percentiles
+
+    def summaryLines(self) -> List[str]:
+        """lines of text summing the percentiles up, one per phase, for the overlay
+
+        Returns:
+            List[str]: the header then a line per phase : name, p50, p95 and p99 in milliseconds
+        """
+        lines: List[str] = [
+            f"{'phase':<14}"
+            + "".join(
+                f"{f'p{percentile}':>8}" for percentile in PHASE_TIMER_PERCENTILES
+            )
+        ]
+        for name, percentiles in self.getPercentiles().items():
+            lines.append(
+                f"{name:<14}"
+                + "".join(
+                    f"{percentiles[f'p{percentile}']:>8.2f}"
+                    for percentile in PHASE_TIMER_PERCENTILES
+                )
+            )
+
+        return lines
+
+    def dump(self) -> None:
+        """append the percentiles of every phase to the metrics file, as a JSON line with the date and the number of frames"""
+
+        assert self.metrics_path is not None, "no metrics file to dump the timings to"
+        self._last_dump = time.monotonic()
+        with open(self.metrics_path, "a", encoding="utf8") as f:
+            f.write(
+                json.dumps(
+                    {
+                        "date": datetime.now().isoformat(timespec="milliseconds"),
+                        "frames": self.frames,
+                        "phases": self.getPercentiles(),
+                    }
+                )
+                + "\n"
+            )
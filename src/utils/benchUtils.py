@@ -0,0 +1,192 @@
+"""utils regarding the benchmarks : the starting cells of every density benchmarked, and the JSON results compared against a saved baseline
+"""
+import json
+from typing import Dict, List
+
+import numpy as np
+from src.utils.CustomTypes import ALIVE_CELL_STATE
+
+DEFAULT_BENCHMARK_PATH: str = "benchmark.json"
+
+# sides of the square grids benchmarked, from the default grid of the config up to the largest grids of the headless mode
+BENCHMARK_SIZES: List[int] = [24, 128, 512, 2048, 8192]
+BENCHMARK_DENSITIES: List[str] = ["soup", "gliders", "ash"]
+# densities whose grids are stuck in a cycle from the start, benchmarked once more with the cycle detection on to measure the fast-forward
+BENCHMARK_FAST_FORWARD_DENSITIES: List[str] = ["ash"]
+# size of the table of the fingerprints of the fast-forward cases, every other case computing every generation
+BENCHMARK_CYCLE_TABLE_SIZE: int = 4096
+# the rendering of the larger grids takes seconds per frame, it is skipped above that many cells
+BENCHMARK_RENDER_MAX_CELLS: int = 2048 * 2048
+# generations computed at most by a case, for the engines skipping the generations of the stable grids
+BENCHMARK_MAX_GENERATIONS: int = 1 << 20
+# relative slowdown tolerated against the baseline before a metric is flagged as a regression
+BENCHMARK_TOLERANCE: float = 0.2
+# metrics compared against the baseline, True when the higher value is the better one
+BENCHMARK_METRICS: Dict[str, bool] = {
+    "generations_per_second": True,
+    "ns_per_cell": False,
+    "peak_memory": False,
+    "startup_time": False,
+    "render_time": False,
+    "render_ns_per_cell": False,
+}
+
+# probability of a cell to be alive in the random soup
+SOUP_DENSITY: float = 0.5
+# side of the tiles holding one glider each
+GLIDER_TILE: int = 32
+GLIDER: np.ndarray = np.array([[0, 1, 0], [0, 0, 1], [1, 1, 1]], dtype=np.uint8)
+# side of the tiles holding at most one still life each, the still lifes fit in 4x4 at the centre of the tile,
+# at least 4 dead cells away from each other so that they never interact
+ASH_TILE: int = 8
+ASH_FILL: float = 0.5
+ASH_STILL_LIFES: List[np.ndarray] = [
+    np.array(still_life, dtype=np.uint8)
+    for still_life in [
+        [[1, 1], [1, 1]],  # block
+        [[0, 1, 1, 0], [1, 0, 0, 1], [0, 1, 1, 0]],  # beehive
+        [[0, 1, 1, 0], [1, 0, 0, 1], [0, 1, 0, 1], [0, 0, 1, 0]],  # loaf
+        [[1, 1, 0], [1, 0, 1], [0, 1, 0]],  # boat
+        [[0, 1, 0], [1, 0, 1], [0, 1, 0]],  # tub
+    ]
+]
+
+
+def benchmarkCase(
+    engine: str, density: str, grid_dim: List[int], fast_forward: bool = False
+) -> str:
+    """name of a benchmark case, the key of its metrics in the results
+
+    Args:
+        engine (str): grid engine
+        density (str): density of the starting cells
+        grid_dim (List[int]): dimensions of the grid
+        fast_forward (bool, optional): the case measures the fast-forward through the cycles. Defaults to False.
+
+    Returns:
+        str: the name of the case, e.g. 'dense/soup/512x512' or 'dense/ash/512x512/fast-forward'
+    """
+    name: str = f"{engine}/{density}/{grid_dim[0]}x{grid_dim[1]}"
+    return f"{name}/fast-forward" if fast_forward else name
+
+
+def buildCells(density: str, grid_dim: List[int], seed: int = 0) -> np.ndarray:
+    """build the starting cells of a benchmark, the same ones for a given seed :
+    - 'soup' : random soup, every cell alive with a probability of SOUP_DENSITY, the busiest grid
+    - 'gliders' : sparse gliders, one per tile of GLIDER_TILE cells at a random place of the tile, mostly dead cells and a few moving ones
+    - 'ash' : stable ash, the still lifes left when a soup settles, on a lattice of ASH_TILE cells, where nothing changes at all
+
+    Args:
+        density (str): density of the cells
+        grid_dim (List[int]): dimensions of the grid
+        seed (int, optional): seed of the random places. Defaults to 0.
+
+    Returns:
+        np.ndarray: the cell matrix
+    """
+    assert (
+        density in BENCHMARK_DENSITIES
+    ), f"Unknown density '{density}', the available ones are : {', '.join(BENCHMARK_DENSITIES)}"
+
+    rng: np.random.Generator = np.random.default_rng(seed)
+    if density == "soup":
+        return (rng.random(grid_dim) < SOUP_DENSITY).astype(np.uint8)
+
+    cells: np.ndarray = np.zeros(grid_dim, dtype=np.uint8)
+    if density == "gliders":
+        n_tiles: List[int] = [max(1, dim // GLIDER_TILE) for dim in grid_dim]
+        tile_dim: List[int] = [dim // n for dim, n in zip(grid_dim, n_tiles)]
+        # top left corner of the glider of every tile
+        tops: np.ndarray = np.arange(n_tiles[0])[:, None] * tile_dim[0] + rng.integers(
+            0, tile_dim[0] - GLIDER.shape[0] + 1, n_tiles
+        )
+        lefts: np.ndarray = np.arange(n_tiles[1])[None, :] * tile_dim[1] + rng.integers(
+            0, tile_dim[1] - GLIDER.shape[1] + 1, n_tiles
+        )
+        for di, dj in np.argwhere(GLIDER):
+            cells[tops + di, lefts + dj] = ALIVE_CELL_STATE
+        return cells
+
+    n_tiles = [dim // ASH_TILE for dim in grid_dim]
+    # still life of every tile, len(ASH_STILL_LIFES) for the empty ones
+    still_lifes: np.ndarray = np.where(
+        rng.random(n_tiles) < ASH_FILL,
+        rng.integers(0, len(ASH_STILL_LIFES), n_tiles),
+        len(ASH_STILL_LIFES),
+    )
+    for index, still_life in enumerate(ASH_STILL_LIFES):
+        tiles_i, tiles_j = np.nonzero(still_lifes == index)
+        for di, dj in np.argwhere(still_life):
+            cells[
+                tiles_i * ASH_TILE + 2 + di, tiles_j * ASH_TILE + 2 + dj
+            ] = ALIVE_CELL_STATE
+    return cells
+
+
+def writeResults(results_path: str, results: Dict) -> None:
+    """write the results of a benchmark into a JSON file
+
+    Args:
+        results_path (str): path of the JSON file
+        results (Dict): the results, their 'cases' mapping every case to its metrics
+    """
+    with open(results_path, "w", encoding="utf8") as f:
+        json.dump(results, f, indent=2)
+
+
+def readResults(results_path: str) -> Dict:
+    """read the results of a benchmark from a JSON file
+
+    Args:
+        results_path (str): path of the JSON file
+
+    Returns:
+        Dict: the results
+    """
+    with open(results_path, encoding="utf8") as f:
+        results: Dict = json.load(f)
+    assert "cases" in results, f"{results_path} does not hold benchmark results"
+
+    return results
+
+
+def compareResults(
+    results: Dict, baseline: Dict, tolerance: float = BENCHMARK_TOLERANCE
+) -> List[Dict]:
+    """compare the metrics of the cases benchmarked in both results, a metric worse than the baseline by more than the tolerance is a regression,
+    the cases and metrics missing from either results are left out
+
+    Args:
+        results (Dict): the new results
+        baseline (Dict): the saved results they are compared to
+        tolerance (float, optional): relative change tolerated. Defaults to BENCHMARK_TOLERANCE.
+
+    Returns:
+        List[Dict]: the regressions : case, metric, baseline and new values, and relative change (positive when worse)
+    """
+    assert tolerance >= 0, "the tolerance must be positive"
+
+    regressions: List[Dict] = []
+    for case, metrics in results["cases"].items():
+        baseline_metrics: Dict = baseline["cases"].get(case, {})
+        for metric, higher_is_better in BENCHMARK_METRICS.items():
+            value = metrics.get(metric)
+            baseline_value = baseline_metrics.get(metric)
+            if value is None or not baseline_value:
+                continue
+
+            change: float = (value - baseline_value) / baseline_value
+            if higher_is_better:
+                change = -change
+            if change > tolerance:
+                regressions.append(
+                    {
+                        "case": case,
+                        "metric": metric,
+                        "baseline": baseline_value,
+                        "value": value,
+                        "change": change,
+                    }
+                )
+
+    return regressions
@@ -0,0 +1,330 @@
+"""utils regarding the checkpoint files, saving a grid and its generation to resume the simulation later on
+
+A checkpoint is a header of CHECKPOINT_HEADER_SIZE bytes (dimensions of the grid, rule, generation, boundary, and origin and dimensions of the payload)
+followed by the payload, the cells of a box whose first cell lies at the origin, in the coordinates of the grid :
+the dense engines save their whole grid (origin (0, 0)), the plane engines the live bounding box of the whole plane, which may lie partly outside the grid.
+The cells are stored with :
+- 1 bit per cell for the Life-like rules, each row packed into little endian uint64 words (bit k of the word w holds the cell of column w * 64 + k),
+  which is the layout of the BitPackedGrid
+- 1 byte per cell for the Generations rules, whose cells have more than 2 states
+The payload is written by blocks of rows with bulk I/O and read back through np.memmap, so that nothing has to be parsed
+"""
+from math import ceil
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from src.utils.CustomTypes import CELL_STATE_DTYPE
+from src.utils.ruleUtils import parseRule
+
+DEFAULT_CHECKPOINT_PATH: str = "checkpoint.gol"
+CHECKPOINT_MAGIC: bytes = b"GOLCKPT"
+CHECKPOINT_VERSION: int = 2
+CHECKPOINT_HEADER_DTYPE: np.dtype = np.dtype(
+    [
+        ("magic", "S8"),
+        ("version", "<u4"),
+        ("bits_per_cell", "<u4"),
+        ("rows", "<u8"),
+        ("cols", "<u8"),
+        ("turn", "<u8"),
+        ("rule", "S64"),
+        ("boundary", "S16"),
+        ("origin_row", "<i8"),
+        ("origin_col", "<i8"),
+        ("payload_rows", "<u8"),
+        ("payload_cols", "<u8"),
+    ]
+)
+# the payload starts on a 64 bytes boundary, so that its words are aligned in the memory map
+CHECKPOINT_HEADER_SIZE: int = 192
+# rows packed and written at once, bounds the memory used to save a huge grid
+CHECKPOINT_ROWS_PER_BLOCK: int = 1024
+WORD_BYTES: int = 8
+
+
+def checkpointRowBytes(cols: int, bits_per_cell: int) -> int:
+    """return the number of bytes of a row of the payload
+
+    Args:
+        cols (int): number of columns of the grid
+        bits_per_cell (int): 1 for the Life-like rules, 8 for the Generations ones
+
+    Returns:
+        int: number of bytes of a row, rounded up to whole uint64 words for the packed rows
+    """
+    if bits_per_cell == 1:
+        return ceil(cols / (WORD_BYTES * 8)) * WORD_BYTES
+    return cols
+
+
+def packCheckpointRows(cells: np.ndarray) -> np.ndarray:
+    """pack rows of dead or alive cells into the layout of the payload
+
+    Args:
+        cells (np.ndarray): the rows of cells
+
+    Returns:
+        np.ndarray: the packed rows, of dtype uint8
+    """
+    packed: np.ndarray = np.zeros(
+        (cells.shape[0], checkpointRowBytes(cells.shape[1], 1)), dtype=np.uint8
+    )
+    bytes_per_row: int = ceil(cells.shape[1] / 8)
+    packed[:, :bytes_per_row] = np.packbits(cells, axis=1, bitorder="little")
+    return packed
+
+
+def saveCheckpoint(
+    checkpoint_path: str,
+    cells: np.ndarray,
+    rule: str,
+    boundary: str,
+    turn: int,
+    grid_dim: Optional[Tuple[int, ...]] = None,
+    origin: Tuple[int, int] = (0, 0),
+) -> None:
+    """save a grid and its generation into a checkpoint file
+
+    Args:
+        checkpoint_path (str): path of the checkpoint file
+        cells (np.ndarray): the cells of the payload, the whole grid or a box of the plane
+        rule (str): the rule of the grid
+        boundary (str): the boundary topology of the grid
+        turn (int): the generation of the grid
+        grid_dim (Optional[Tuple[int, ...]], optional): dimensions of the grid, None if the payload is the whole grid. Defaults to None.
+        origin (Tuple[int, int], optional): row and column of the grid of the first cell of the payload. Defaults to (0, 0).
+    """
+    bits_per_cell: int = 1 if parseRule(rule)[2] == 2 else 8
+    with open(checkpoint_path, "wb") as checkpoint_file:
+        _writeHeader(
+            checkpoint_file,
+            cells.shape if grid_dim is None else grid_dim,
+            rule,
+            boundary,
+            turn,
+            bits_per_cell,
+            origin,
+            cells.shape,
+        )
+        for start_row in range(0, cells.shape[0], CHECKPOINT_ROWS_PER_BLOCK):
+            block: np.ndarray = cells[start_row : start_row + CHECKPOINT_ROWS_PER_BLOCK]
+            if bits_per_cell == 1:
+                packCheckpointRows(block).tofile(checkpoint_file)
+            else:
+                np.ascontiguousarray(block, dtype=CELL_STATE_DTYPE).tofile(
+                    checkpoint_file
+                )
+
+
+def savePackedCheckpoint(
+    checkpoint_path: str,
+    words: np.ndarray,
+    cols: int,
+    rule: str,
+    boundary: str,
+    turn: int,
+) -> None:
+    """save a grid already packed into rows of uint64 words (the layout of the payload) into a checkpoint file, without repacking it
+
+    Args:
+        checkpoint_path (str): path of the checkpoint file
+        words (np.ndarray): the packed grid, of shape (rows, ceil(cols / 64))
+        cols (int): number of columns of the grid
+        rule (str): the rule of the grid, a Life-like one
+        boundary (str): the boundary topology of the grid
+        turn (int): the generation of the grid
+    """
+    with open(checkpoint_path, "wb") as checkpoint_file:
+        _writeHeader(
+            checkpoint_file,
+            (words.shape[0], cols),
+            rule,
+            boundary,
+            turn,
+            1,
+            (0, 0),
+            (words.shape[0], cols),
+        )
+        words.astype("<u8", copy=False).tofile(checkpoint_file)
+
+
+def _writeHeader(
+    checkpoint_file,
+    grid_dim: Tuple[int, ...],
+    rule: str,
+    boundary: str,
+    turn: int,
+    bits_per_cell: int,
+    origin: Tuple[int, int],
+    payload_dim: Tuple[int, ...],
+) -> None:
+    """write the header of a checkpoint, padded to CHECKPOINT_HEADER_SIZE bytes
+
+    Args:
+        checkpoint_file: the checkpoint file, opened for binary writing
+        grid_dim (Tuple[int, ...]): dimensions of the grid
+        rule (str): the rule of the grid
+        boundary (str): the boundary topology of the grid
+        turn (int): the generation of the grid
+        bits_per_cell (int): 1 for the Life-like rules, 8 for the Generations ones
+        origin (Tuple[int, int]): row and column of the grid of the first cell of the payload
+        payload_dim (Tuple[int, ...]): dimensions of the payload
+    """
+    assert (
+        len(rule.encode()) <= CHECKPOINT_HEADER_DTYPE["rule"].itemsize
+    ), f"the rule '{rule}' is too long to be saved"
+
+    header: np.ndarray = np.zeros(1, dtype=CHECKPOINT_HEADER_DTYPE)
+    header[0] = (
+        CHECKPOINT_MAGIC,
+        CHECKPOINT_VERSION,
+        bits_per_cell,
+        grid_dim[0],
+        grid_dim[1],
+        turn,
+        rule.encode(),
+        boundary.encode(),
+        origin[0],
+        origin[1],
+        payload_dim[0],
+        payload_dim[1],
+    )
+    checkpoint_file.write(header.tobytes().ljust(CHECKPOINT_HEADER_SIZE, b"\x00"))
+
+
+def readCheckpointHeader(checkpoint_path: str) -> Dict:
+    """read the header of a checkpoint file
+
+    Args:
+        checkpoint_path (str): path of the checkpoint file
+
+    Returns:
+        Dict: grid_dim, rule, boundary, turn, bits_per_cell, origin and payload_dim of the checkpoint
+    """
+    header: np.ndarray = np.fromfile(
+        checkpoint_path, dtype=CHECKPOINT_HEADER_DTYPE, count=1
+    )
+    assert (
+        header.size == 1 and header[0]["magic"] == CHECKPOINT_MAGIC
+    ), f"{checkpoint_path} is not a checkpoint file"
+    assert (
+        header[0]["version"] == CHECKPOINT_VERSION
+    ), f"unsupported checkpoint version {header[0]['version']}, the supported one is {CHECKPOINT_VERSION}"
+
+    return {
+        "grid_dim": (int(header[0]["rows"]), int(header[0]["cols"])),
+        "rule": header[0]["rule"].decode(),
+        "boundary": header[0]["boundary"].decode(),
+        "turn": int(header[0]["turn"]),
+        "bits_per_cell": int(header[0]["bits_per_cell"]),
+        "origin": (int(header[0]["origin_row"]), int(header[0]["origin_col"])),
+        "payload_dim": (int(header[0]["payload_rows"]), int(header[0]["payload_cols"])),
+    }
+
+
+def checkCheckpointHeader(
+    header: Dict, grid_dim: Tuple[int, ...], rule: str, boundary: str
+) -> None:
+    """Make sure that a checkpoint holds a grid of the expected dimensions, rule and boundary
+
+    Args:
+        header (Dict): the header of the checkpoint
+        grid_dim (Tuple[int, ...]): dimensions of the grid resuming the checkpoint
+        rule (str): rule of the grid resuming the checkpoint
+        boundary (str): boundary topology of the grid resuming the checkpoint
+    """
+    assert tuple(header["grid_dim"]) == tuple(
+        grid_dim
+    ), f"the checkpoint holds a grid of dimensions {header['grid_dim']}, not {tuple(grid_dim)}"
+    assert (
+        header["rule"] == rule and header["boundary"] == boundary
+    ), f"the checkpoint follows the rule {header['rule']} with the '{header['boundary']}' boundary, not {rule} with the '{boundary}' one"
+
+
+def loadCheckpoint(checkpoint_path: str) -> Tuple[Dict, np.ndarray]:
+    """map the payload of a checkpoint file into memory, without reading it
+
+    Args:
+        checkpoint_path (str): path of the checkpoint file
+
+    Returns:
+        Tuple[Dict, np.ndarray]: the header (see readCheckpointHeader) and the read-only memory map of the payload, of shape (rows, row bytes)
+    """
+    header: Dict = readCheckpointHeader(checkpoint_path)
+    rows, cols = header["payload_dim"]
+    # an empty plane saves an empty payload, which cannot be mapped
+    if rows * cols == 0:
+        return header, np.zeros((rows, 0), dtype=np.uint8)
+    payload: np.ndarray = np.memmap(
+        checkpoint_path,
+        dtype=np.uint8,
+        mode="r",
+        offset=CHECKPOINT_HEADER_SIZE,
+        shape=(rows, checkpointRowBytes(cols, header["bits_per_cell"])),
+    )
+    return header, payload
+
+
+def isWindowCheckpoint(header: Dict) -> bool:
+    """check whether the payload of a checkpoint covers exactly its grid, as the ones of the dense engines do
+
+    Args:
+        header (Dict): the header of the checkpoint
+
+    Returns:
+        bool: True if the payload is the whole grid
+    """
+    return header["origin"] == (0, 0) and tuple(header["payload_dim"]) == tuple(
+        header["grid_dim"]
+    )
+
+
+def unpackCheckpoint(header: Dict, payload: np.ndarray) -> np.ndarray:
+    """unpack the payload of a checkpoint into a dense cell matrix, by blocks of rows
+
+    Args:
+        header (Dict): the header of the checkpoint
+        payload (np.ndarray): the payload of the checkpoint
+
+    Returns:
+        np.ndarray: the cells of the payload, of CELL_STATE_DTYPE, the first one lying at the origin of the checkpoint
+    """
+    rows, cols = header["payload_dim"]
+    if header["bits_per_cell"] != 1:
+        return np.array(payload, dtype=CELL_STATE_DTYPE)
+
+    cells: np.ndarray = np.empty((rows, cols), dtype=CELL_STATE_DTYPE)
+    for start_row in range(0, rows, CHECKPOINT_ROWS_PER_BLOCK):
+        end_row: int = min(start_row + CHECKPOINT_ROWS_PER_BLOCK, rows)
+        cells[start_row:end_row] = np.unpackbits(
+            payload[start_row:end_row], axis=1, count=cols, bitorder="little"
+        )
+    return cells
+
+
+def unpackCheckpointWindow(header: Dict, payload: np.ndarray) -> np.ndarray:
+    """unpack the cells of a checkpoint lying in its grid into a dense cell matrix, the cells of a plane saved outside of the grid being dropped
+
+    Args:
+        header (Dict): the header of the checkpoint
+        payload (np.ndarray): the payload of the checkpoint
+
+    Returns:
+        np.ndarray: the cells of the grid, of CELL_STATE_DTYPE
+    """
+    cells: np.ndarray = unpackCheckpoint(header, payload)
+    if isWindowCheckpoint(header):
+        return cells
+
+    rows, cols = header["grid_dim"]
+    window: np.ndarray = np.zeros((rows, cols), dtype=CELL_STATE_DTYPE)
+    top, left = header["origin"]
+    # the part of the payload overlapping the grid
+    first_row, first_col = max(top, 0), max(left, 0)
+    last_row: int = min(top + cells.shape[0], rows)
+    last_col: int = min(left + cells.shape[1], cols)
+    if first_row < last_row and first_col < last_col:
+        window[first_row:last_row, first_col:last_col] = cells[
+            first_row - top : last_row - top, first_col - left : last_col - left
+        ]
+    return window
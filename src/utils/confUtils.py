@@ -13,7 +13,18 @@ REQUIRED_CONF_FIELDS: Dict = {
         "min_grid_dim",
         "framerate",
     ],
-    "simulation": ["turn_timeout"],
+    "simulation": [
+        "turn_timeout",
+        "engine",
+        "boundary",
+        "rule",
+        "hashlife_cache_size",
+        "workers",
+        "cycle_table_size",
+        "validation",
+        "history_budget",
+        "history_keyframe_interval",
+    ],
     "ui": [
         "side_panel_background_color",
         "display_background_color",
@@ -21,6 +32,7 @@ REQUIRED_CONF_FIELDS: Dict = {
         "grid_color",
         "text_color",
         "font",
+        "differential_rendering",
     ],
 }
 
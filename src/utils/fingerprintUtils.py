@@ -0,0 +1,144 @@
+"""Zobrist fingerprints of the grids : the XOR of the random keys of the position and state of every cell which is not dead,
+or of the position and value of every packed word which is not empty for the bit-packed grids
+"""
+import numpy as np
+from src.utils.CustomTypes import ALIVE_CELL_STATE
+
+# seed of the keys of the fingerprints, fixed so that the fingerprints of 2 grids of the same shape can be compared
+FINGERPRINT_SEED: int = 0x5EED
+
+# bits of the key of a cell holding its state, the other ones its flat index
+STATE_BITS: np.uint64 = np.uint64(8)
+
+SPLITMIX_GAMMA: np.uint64 = np.uint64(0x9E3779B97F4A7C15)
+SPLITMIX_MUL_1: np.uint64 = np.uint64(0xBF58476D1CE4E5B9)
+SPLITMIX_MUL_2: np.uint64 = np.uint64(0x94D049BB133111EB)
+
+
+def splitMix64(values: np.ndarray) -> np.ndarray:
+    """mix 64 bits integers with the finalizer of splitmix64, every input bit flipping about half of the output bits
+
+    Args:
+        values (np.ndarray): the integers, of dtype uint64
+
+    Returns:
+        np.ndarray: the mixed integers, of dtype uint64
+    """
+    # the arithmetic wraps around silently on arrays, and is done in place so that only 2 arrays are allocated
+    mixed: np.ndarray = values + SPLITMIX_GAMMA
+    shifted: np.ndarray = mixed >> np.uint64(30)
+    mixed ^= shifted
+    mixed *= SPLITMIX_MUL_1
+    np.right_shift(mixed, np.uint64(27), out=shifted)
+    mixed ^= shifted
+    mixed *= SPLITMIX_MUL_2
+    np.right_shift(mixed, np.uint64(31), out=shifted)
+    mixed ^= shifted
+    return mixed
+
+
+def cellKeys(flat_indexes: np.ndarray, states: np.ndarray) -> np.ndarray:
+    """return the random keys of cells in some states
+
+    Args:
+        flat_indexes (np.ndarray): flat indexes of the cells in the grid (row * columns + column)
+        states (np.ndarray): states of the cells
+
+    Returns:
+        np.ndarray: the 64 bits keys, of dtype uint64
+    """
+    flat_indexes = np.asarray(flat_indexes, dtype=np.uint64).reshape(-1)
+    states = np.asarray(states, dtype=np.uint64).reshape(-1)
+    return splitMix64(
+        ((flat_indexes << STATE_BITS) | states) ^ np.uint64(FINGERPRINT_SEED)
+    )
+
+
+def cellsFingerprint(flat_indexes: np.ndarray, states: np.ndarray) -> int:
+    """return the contribution of some distinct cells to the fingerprint, the dead cells contributing nothing, so that changing k cells updates the fingerprint in O(k)
+
+    Args:
+        flat_indexes (np.ndarray): flat indexes of the cells in the grid (row * columns + column)
+        states (np.ndarray): states of the cells
+
+    Returns:
+        int: the 64 bits contribution of the cells
+    """
+    states = np.asarray(states).reshape(-1)
+    return int(
+        np.bitwise_xor.reduce(
+            cellKeys(flat_indexes, states)[states != 0], initial=np.uint64(0)
+        )
+    )
+
+
+def matFingerprint(cell_mat: np.ndarray, first_index: int = 0) -> int:
+    """return the contribution of a block of rows of a grid to the fingerprint, computed from scratch from its cells which are not dead
+
+    Args:
+        cell_mat (np.ndarray): the cells of the block
+        first_index (int, optional): flat index in the grid of the first cell of the block. Defaults to 0.
+
+    Returns:
+        int: the 64 bits contribution of the block
+    """
+    flat_indexes: np.ndarray = np.flatnonzero(cell_mat)
+    return cellsFingerprint(
+        first_index + flat_indexes, cell_mat.reshape(-1)[flat_indexes]
+    )
+
+
+def stepFingerprint(
+    old_cell_mat: np.ndarray,
+    cell_mat: np.ndarray,
+    changed: np.ndarray,
+    n_states: int,
+    first_index: int = 0,
+) -> int:
+    """return the change of the fingerprint of a block of rows of a grid made by a step, the keys being computed for the cells which changed only,
+    so that no table of keys is kept for every cell
+
+    Args:
+        old_cell_mat (np.ndarray): the cells of the block before the step
+        cell_mat (np.ndarray): the cells of the block after the step
+        changed (np.ndarray): boolean buffer of the shape of the block, overwritten
+        n_states (int): number of states of the rule
+        first_index (int, optional): flat index in the grid of the first cell of the block. Defaults to 0.
+
+    Returns:
+        int: the 64 bits change, to XOR into the fingerprint of the previous generation
+    """
+    np.not_equal(old_cell_mat, cell_mat, out=changed)
+    flat_indexes: np.ndarray = np.flatnonzero(changed)
+    if n_states == 2:
+        # every cell which changed was alive before or is alive now, so its key toggles in or out of the fingerprint
+        return cellsFingerprint(
+            first_index + flat_indexes, np.full(flat_indexes.size, ALIVE_CELL_STATE)
+        )
+
+    return cellsFingerprint(
+        first_index + flat_indexes, old_cell_mat.reshape(-1)[flat_indexes]
+    ) ^ cellsFingerprint(first_index + flat_indexes, cell_mat.reshape(-1)[flat_indexes])
+
+
+def wordsFingerprint(word_indexes: np.ndarray, words: np.ndarray) -> int:
+    """return the contribution of some distinct packed words to the fingerprint of a bit-packed grid, the empty words contributing nothing,
+    so that a step is hashed from the words which changed, without unpacking their bits
+
+    Args:
+        word_indexes (np.ndarray): flat indexes of the words in the packed grid (row * words per row + word column)
+        words (np.ndarray): values of the words, of dtype uint64
+
+    Returns:
+        int: the 64 bits contribution of the words
+    """
+    words = np.asarray(words, dtype=np.uint64).reshape(-1)
+    # the key of the position is mixed again with the value, so that 2 words differing by a few bits get unrelated keys
+    keys: np.ndarray = splitMix64(
+        splitMix64(
+            np.asarray(word_indexes, dtype=np.uint64).reshape(-1)
+            ^ np.uint64(FINGERPRINT_SEED)
+        )
+        ^ words
+    )
+    return int(np.bitwise_xor.reduce(keys[words != 0], initial=np.uint64(0)))
@@ -0,0 +1,594 @@
+"""utils regarding the pattern files, importing and exporting the cells of a grid in the standard formats :
+- RLE (.rle) : a header 'x = <cols>, y = <rows>, rule = <rule>' followed by runs of cells, e.g. 'bo$2bo$3o!' for a glider,
+  'b' / 'o' for the dead and alive cells of the Life-like rules, '.' / 'A' / 'B' ... for the states of the Generations ones
+- Life 1.06 (.lif, .life) : a '#Life 1.06' header followed by the 'x y' coordinates of every alive cell
+- plaintext (.cells) : '!' comment lines followed by one line per row, '.' for the dead cells and 'O' for the alive ones
+
+The RLE and plaintext files are read by chunks of PATTERN_CHUNK_BYTES, each chunk is parsed with vectorized operations and its runs are written
+straight into the cell matrix, and the cells are written back by blocks of rows, so that multi-megabyte patterns load and save without building
+a Python object per cell
+"""
+import os
+import re
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+from src.utils.CustomTypes import ALIVE_CELL_STATE
+from src.utils.CustomTypes import CELL_STATE_DTYPE
+from src.utils.CustomTypes import DEAD_CELL_STATE
+
+DEFAULT_PATTERN_PATH: str = "pattern.rle"
+# file extensions of every format
+PATTERN_FORMATS: Dict[str, str] = {
+    ".rle": "rle",
+    ".lif": "life106",
+    ".life": "life106",
+    ".cells": "plaintext",
+}
+# bytes read and parsed at once, bounds the memory used to read a huge pattern
+PATTERN_CHUNK_BYTES: int = 1 << 20
+# rows written at once, bounds the memory used to save a huge grid
+PATTERN_ROWS_PER_BLOCK: int = 1024
+# the RLE lines should not be longer than 70 characters
+RLE_LINE_LENGTH: int = 70
+# one letter per state after the dead one with the Generations rules ('A' alive, 'B' the first dying state, ...)
+RLE_MAX_STATES: int = 25
+RLE_HEADER_PATTERN: re.Pattern = re.compile(
+    r"^x\s*=\s*(?P<cols>\d+)\s*,\s*y\s*=\s*(?P<rows>\d+)(\s*,\s*rule\s*=\s*(?P<rule>\S+))?",
+    re.IGNORECASE,
+)
+LIFE_106_HEADER: str = "#Life 1.06"
+
+# codes of the characters of the RLE runs, a state for the tags of the cells
+RLE_DIGIT: int = -1
+RLE_ROW_END: int = -2
+RLE_IGNORED: int = -3
+RLE_INVALID: int = -4
+RLE_CODES: np.ndarray = np.full(256, RLE_INVALID, dtype=np.int16)
+RLE_CODES[np.frombuffer(b"0123456789", dtype=np.uint8)] = RLE_DIGIT
+RLE_CODES[np.frombuffer(b" \t\r\n", dtype=np.uint8)] = RLE_IGNORED
+RLE_CODES[ord("$")] = RLE_ROW_END
+RLE_CODES[ord("b")] = RLE_CODES[ord(".")] = DEAD_CELL_STATE
+RLE_CODES[ord("o")] = ALIVE_CELL_STATE
+RLE_CODES[ord("A") : ord("A") + RLE_MAX_STATES - 1] = np.arange(
+    ALIVE_CELL_STATE, RLE_MAX_STATES
+)
+
+
+def patternFormat(pattern_path: str) -> str:
+    """return the format of a pattern file from its extension
+
+    Args:
+        pattern_path (str): path of the pattern file
+
+    Returns:
+        str: 'rle', 'life106' or 'plaintext'
+    """
+    extension: str = os.path.splitext(pattern_path)[1].lower()
+    assert (
+        extension in PATTERN_FORMATS
+    ), f"Unknown pattern extension '{extension}', the supported ones are : {', '.join(PATTERN_FORMATS.keys())}"
+    return PATTERN_FORMATS[extension]
+
+
+def readPatternHeader(pattern_path: str) -> Dict:
+    """read the dimensions and the rule of a pattern file, without reading its cells (but for the plaintext files, whose rows are counted)
+
+    Args:
+        pattern_path (str): path of the pattern file
+
+    Returns:
+        Dict: grid_dim (rows, cols) of the pattern, its rule (None when the format has none) and its format
+    """
+    pattern_format: str = patternFormat(pattern_path)
+    with open(pattern_path, "rb") as pattern_file:
+        if pattern_format == "rle":
+            header: Dict = _readRleHeader(pattern_file)
+        elif pattern_format == "plaintext":
+            header = {
+                "grid_dim": _plaintextDim(pattern_file),
+                "rule": None,
+            }
+        else:
+            coords: np.ndarray = _readLife106Coords(pattern_file)
+            header = {"grid_dim": _coordsDim(coords), "rule": None}
+    header["format"] = pattern_format
+    return header
+
+
+def readPattern(
+    pattern_path: str,
+    cells: Optional[np.ndarray] = None,
+    top: Optional[int] = None,
+    left: Optional[int] = None,
+) -> np.ndarray:
+    """read the cells of a pattern file, written straight into a cell matrix
+
+    Args:
+        pattern_path (str): path of the pattern file
+        cells (Optional[np.ndarray], optional): contiguous matrix receiving the pattern, the other cells are left as is.
+            Defaults to None, a dead matrix of the dimensions of the pattern.
+        top (Optional[int], optional): row receiving the first row of the pattern. Defaults to None, the pattern being centred.
+        left (Optional[int], optional): column receiving the first column of the pattern. Defaults to None, the pattern being centred.
+
+    Returns:
+        np.ndarray: the cell matrix holding the pattern
+    """
+    pattern_format: str = patternFormat(pattern_path)
+    with open(pattern_path, "rb") as pattern_file:
+        if pattern_format == "life106":
+            coords: np.ndarray = _readLife106Coords(pattern_file)
+            cells, top, left = _placePattern(_coordsDim(coords), cells, top, left)
+            cells[coords[:, 0] + top, coords[:, 1] + left] = ALIVE_CELL_STATE
+            return cells
+
+        if pattern_format == "rle":
+            grid_dim: Tuple[int, int] = _readRleHeader(pattern_file)["grid_dim"]
+        else:
+            grid_dim = _plaintextDim(pattern_file)
+            pattern_file.seek(0)
+        cells, top, left = _placePattern(grid_dim, cells, top, left)
+        if pattern_format == "rle":
+            _streamRle(pattern_file, cells, top, left, grid_dim)
+        else:
+            _streamPlaintext(pattern_file, cells, top, left)
+    return cells
+
+
+def writePattern(pattern_path: str, cells: np.ndarray, rule: str = "B3/S23") -> None:
+    """write the cells of a grid into a pattern file, in the format given by its extension
+
+    Args:
+        pattern_path (str): path of the pattern file
+        cells (np.ndarray): the cells of the grid
+        rule (str, optional): the rule of the grid, saved in the header of the RLE files. Defaults to "B3/S23".
+    """
+    pattern_format: str = patternFormat(pattern_path)
+    n_states: int = int(cells.max(initial=0)) + 1
+    assert (
+        pattern_format == "rle" or n_states <= 2
+    ), f"the {pattern_format} format only holds dead and alive cells, the dying cells of the Generations rules need the RLE one"
+    assert (
+        n_states <= RLE_MAX_STATES
+    ), f"the RLE format holds at most {RLE_MAX_STATES} states"
+
+    with open(pattern_path, "w", encoding="ascii", newline="\n") as pattern_file:
+        if pattern_format == "rle":
+            _writeRle(pattern_file, cells, rule)
+        elif pattern_format == "plaintext":
+            _writePlaintext(pattern_file, cells, os.path.basename(pattern_path))
+        else:
+            _writeLife106(pattern_file, cells)
+
+
+def _placePattern(
+    grid_dim: Tuple[int, int],
+    cells: Optional[np.ndarray],
+    top: Optional[int],
+    left: Optional[int],
+) -> Tuple[np.ndarray, int, int]:
+    """allocate the cell matrix receiving a pattern, or make sure that the pattern fits in the one given
+
+    Args:
+        grid_dim (Tuple[int, int]): dimensions of the pattern
+        cells (Optional[np.ndarray]): matrix receiving the pattern, None to allocate one of the dimensions of the pattern
+        top (Optional[int]): row receiving the first row of the pattern, None to centre it
+        left (Optional[int]): column receiving the first column of the pattern, None to centre it
+
+    Returns:
+        Tuple[np.ndarray, int, int]: the matrix, and the row and column receiving the first cell of the pattern
+    """
+    if cells is None:
+        cells = np.zeros(grid_dim, dtype=CELL_STATE_DTYPE)
+    assert cells.flags.c_contiguous, "the cells should be a contiguous matrix"
+
+    top = (cells.shape[0] - grid_dim[0]) // 2 if top is None else top
+    left = (cells.shape[1] - grid_dim[1]) // 2 if left is None else left
+    assert (
+        0 <= top
+        and 0 <= left
+        and top + grid_dim[0] <= cells.shape[0]
+        and left + grid_dim[1] <= cells.shape[1]
+    ), f"the pattern ({grid_dim}) placed at ({top}, {left}) should lie inside the grid ({cells.shape})"
+    return cells, top, left
+
+
+def _readRleHeader(pattern_file: BinaryIO) -> Dict:
+    """read the header of a RLE file, skipping the comment lines, the file is left at the first byte of the runs
+
+    Args:
+        pattern_file (BinaryIO): the RLE file, opened for binary reading
+
+    Returns:
+        Dict: grid_dim (rows, cols) and rule of the pattern, None when the header has no rule
+    """
+    for line in pattern_file:
+        text: str = line.decode("ascii", errors="replace").strip()
+        if not text or text.startswith("#"):
+            continue
+        match = RLE_HEADER_PATTERN.match(text)
+        assert (
+            match is not None
+        ), f"Bad RLE header '{text}', it should be 'x = <cols>, y = <rows>, rule = <rule>'"
+        return {
+            "grid_dim": (int(match.group("rows")), int(match.group("cols"))),
+            "rule": match.group("rule"),
+        }
+    raise AssertionError("the RLE file has no header line")
+
+
+def _streamRle(
+    pattern_file: BinaryIO,
+    cells: np.ndarray,
+    top: int,
+    left: int,
+    grid_dim: Tuple[int, int],
+) -> None:
+    """parse the runs of a RLE file chunk by chunk, writing the runs of non dead cells straight into the cell matrix
+
+    Args:
+        pattern_file (BinaryIO): the RLE file, at the first byte of the runs
+        cells (np.ndarray): contiguous matrix receiving the pattern
+        top (int): row receiving the first row of the pattern
+        left (int): column receiving the first column of the pattern
+        grid_dim (Tuple[int, int]): dimensions of the pattern given by its header
+    """
+    flat_cells: np.ndarray = cells.reshape(-1)
+    row, col = 0, 0
+    # digits of a run count cut by the end of the previous chunk
+    pending: np.ndarray = np.array([], dtype=np.uint8)
+
+    while True:
+        chunk: bytes = pattern_file.read(PATTERN_CHUNK_BYTES)
+        end: int = chunk.find(b"!")
+        last_chunk: bool = end >= 0 or not chunk
+        data: np.ndarray = np.frombuffer(chunk[:end] if end >= 0 else chunk, np.uint8)
+        data = np.concatenate((pending, data[RLE_CODES[data] != RLE_IGNORED]))
+        codes: np.ndarray = RLE_CODES[data]
+        assert not (
+            codes == RLE_INVALID
+        ).any(), f"Bad RLE run character '{chr(data[np.argmax(codes == RLE_INVALID)])}'"
+
+        tags: np.ndarray = np.flatnonzero(codes != RLE_DIGIT)
+        cut: int = int(tags[-1]) + 1 if tags.size else 0
+        pending = data[cut:]
+        assert not (last_chunk and pending.size), "the RLE runs end with a run count"
+
+        if tags.size:
+            row, col = _writeRleRuns(
+                flat_cells,
+                cells.shape[1],
+                data[:cut],
+                codes[:cut],
+                tags,
+                (row, col),
+                (top, left),
+                grid_dim,
+            )
+        if last_chunk:
+            return
+
+
+def _writeRleRuns(
+    flat_cells: np.ndarray,
+    n_cols: int,
+    data: np.ndarray,
+    data_codes: np.ndarray,
+    tags: np.ndarray,
+    position: Tuple[int, int],
+    corner: Tuple[int, int],
+    grid_dim: Tuple[int, int],
+) -> Tuple[int, int]:
+    """write the runs of a chunk of RLE, ending with a tag, into the cell matrix
+
+    Args:
+        flat_cells (np.ndarray): flat view of the matrix receiving the pattern
+        n_cols (int): number of columns of the matrix
+        data (np.ndarray): the characters of the chunk, without whitespaces
+        data_codes (np.ndarray): the RLE_CODES of the characters
+        tags (np.ndarray): positions of the tags ('$' or a state) in the chunk, the other characters being digits
+        position (Tuple[int, int]): row and column of the pattern reached by the previous chunks
+        corner (Tuple[int, int]): row and column receiving the first cell of the pattern
+        grid_dim (Tuple[int, int]): dimensions of the pattern given by its header
+
+    Returns:
+        Tuple[int, int]: row and column of the pattern reached at the end of the chunk
+    """
+    row, col = position
+    top, left = corner
+    codes: np.ndarray = data_codes[tags]
+
+    # count of every run, the number written before its tag (1 when there is none), its digits are added one place value at a time,
+    # every count having a few digits only
+    digits: np.ndarray = (data - ord("0")).astype(np.int64)
+    is_digit: np.ndarray = data_codes == RLE_DIGIT
+    counts: np.ndarray = np.zeros(tags.size, dtype=np.int64)
+    in_count: np.ndarray = np.ones(tags.size, dtype=bool)
+    place_value, distance = 1, 1
+    while True:
+        positions: np.ndarray = tags - distance
+        in_count &= (positions >= 0) & is_digit[np.maximum(positions, 0)]
+        if not in_count.any():
+            break
+        counts += np.where(in_count, digits[np.maximum(positions, 0)], 0) * place_value
+        place_value, distance = place_value * 10, distance + 1
+    counts[~is_digit[np.maximum(tags - 1, 0)] | (tags == 0)] = 1
+
+    # every '$' moves down by its count and back to the first column, every other tag moves right by its count
+    row_ends: np.ndarray = codes == RLE_ROW_END
+    run_rows: np.ndarray = (
+        row + np.cumsum(np.where(row_ends, counts, 0)) - np.where(row_ends, counts, 0)
+    )
+    moves: np.ndarray = np.where(row_ends, 0, counts)
+    ends: np.ndarray = np.cumsum(moves)
+    row_starts: np.ndarray = np.maximum.accumulate(np.where(row_ends, ends, -col))
+    run_cols: np.ndarray = ends - moves - row_starts
+
+    cell_runs: np.ndarray = ~row_ends & (codes != DEAD_CELL_STATE)
+    assert (run_cols + moves)[~row_ends].max(initial=0) <= grid_dim[1] and run_rows[
+        cell_runs
+    ].max(initial=0) < grid_dim[
+        0
+    ], f"the RLE runs go beyond the dimensions of the pattern ({grid_dim})"
+
+    # every cell of the runs of non dead cells is written at once, through the flat indexes of the runs repeated along their counts
+    lengths: np.ndarray = counts[cell_runs]
+    starts: np.ndarray = (
+        (run_rows[cell_runs] + top) * n_cols + run_cols[cell_runs] + left
+    )
+    indexes: np.ndarray = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+    indexes += np.arange(indexes.size)
+    states: np.ndarray = codes[cell_runs]
+    # the Life-like patterns only hold alive cells
+    flat_cells[indexes] = (
+        states[0]
+        if states.size and states.min() == states.max()
+        else np.repeat(states, lengths)
+    )
+
+    last_row: int = (
+        int(run_rows[-1] + counts[-1]) if row_ends[-1] else int(run_rows[-1])
+    )
+    last_col: int = 0 if row_ends[-1] else int(run_cols[-1] + counts[-1])
+    return last_row, last_col
+
+
+def _writeRle(pattern_file, cells: np.ndarray, rule: str) -> None:
+    """write the cells of a grid as RLE runs, by blocks of rows, the dead cells ending a row and the rows ending the grid are left out
+
+    Args:
+        pattern_file: the RLE file, opened for text writing
+        cells (np.ndarray): the cells of the grid
+        rule (str): the rule of the grid
+    """
+    n_states: int = int(cells.max(initial=0)) + 1
+    tag_letters: str = (
+        "bo"
+        if n_states <= 2
+        else "." + "".join(chr(ord("A") + state) for state in range(RLE_MAX_STATES - 1))
+    )
+    pattern_file.write(f"x = {cells.shape[1]}, y = {cells.shape[0]}, rule = {rule}\n")
+
+    line: List[str] = []
+    line_length: int = 0
+    # '$' ending the previous block, only written once a non dead cell follows them
+    pending_row_ends: int = 0
+    for start_row in range(0, cells.shape[0], PATTERN_ROWS_PER_BLOCK):
+        values, lengths = _rleRuns(
+            cells[start_row : start_row + PATTERN_ROWS_PER_BLOCK]
+        )
+        if values.size and values[0] == RLE_ROW_END:
+            lengths[0] += pending_row_ends
+        elif pending_row_ends:
+            values = np.concatenate(
+                (np.array([RLE_ROW_END], dtype=values.dtype), values)
+            )
+            lengths = np.concatenate(
+                (np.array([pending_row_ends], dtype=lengths.dtype), lengths)
+            )
+        pending_row_ends = 0
+        if values.size and values[-1] == RLE_ROW_END:
+            pending_row_ends = int(lengths[-1])
+            values, lengths = values[:-1], lengths[:-1]
+
+        for value, length in zip(values.tolist(), lengths.tolist()):
+            token: str = (str(length) if length > 1 else "") + (
+                "$" if value == RLE_ROW_END else tag_letters[value]
+            )
+            if line_length + len(token) > RLE_LINE_LENGTH:
+                pattern_file.write("".join(line) + "\n")
+                line, line_length = [], 0
+            line.append(token)
+            line_length += len(token)
+
+    pattern_file.write("".join(line) + "!\n")
+
+
+def _rleRuns(block: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """split a block of rows into runs, every row ending with a run of RLE_ROW_END, the dead cells ending a row are left out
+    and the consecutive row ends are merged
+
+    Args:
+        block (np.ndarray): the rows of cells
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: the value (a state, or RLE_ROW_END) and the length of every run
+    """
+    rows: np.ndarray = np.full(
+        (block.shape[0], block.shape[1] + 1), RLE_ROW_END, dtype=np.int16
+    )
+    rows[:, :-1] = block
+    flat_rows: np.ndarray = rows.reshape(-1)
+
+    starts: np.ndarray = np.flatnonzero(
+        np.concatenate(([True], flat_rows[1:] != flat_rows[:-1]))
+    )
+    lengths: np.ndarray = np.diff(np.append(starts, flat_rows.size))
+    # the row ends of consecutive rows without cells (a grid without columns) are already merged into a single run
+    values: np.ndarray = flat_rows[starts]
+
+    kept: np.ndarray = ~(
+        (values == DEAD_CELL_STATE)
+        & (np.append(values[1:], RLE_ROW_END) == RLE_ROW_END)
+    )
+    values, lengths = values[kept], lengths[kept]
+
+    merged: np.ndarray = np.concatenate(
+        ([True], (values[1:] != RLE_ROW_END) | (values[:-1] != RLE_ROW_END))
+    )
+    first_runs: np.ndarray = np.flatnonzero(merged)
+    return (
+        values[first_runs],
+        np.add.reduceat(lengths, first_runs) if lengths.size else lengths,
+    )
+
+
+def _plaintextLines(
+    pattern_file: BinaryIO,
+) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """read the lines of a plaintext file chunk by chunk, each chunk ending with a whole line
+
+    Args:
+        pattern_file (BinaryIO): the plaintext file, opened for binary reading
+
+    Yields:
+        Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray]]: the characters of the chunk, the start and the end (carriage return excluded)
+        of every line of cells, the comment lines being left out
+    """
+    pending: bytes = b""
+    while True:
+        chunk: bytes = pattern_file.read(PATTERN_CHUNK_BYTES)
+        if not chunk:
+            if not pending:
+                return
+            chunk = b"\n"
+        last_line_end: int = chunk.rfind(b"\n")
+        if last_line_end < 0:
+            pending += chunk
+            continue
+        data: np.ndarray = np.frombuffer(pending + chunk[: last_line_end + 1], np.uint8)
+        pending = chunk[last_line_end + 1 :]
+
+        line_ends: np.ndarray = np.flatnonzero(data == ord("\n"))
+        line_starts: np.ndarray = np.concatenate(
+            (np.array([0], dtype=line_ends.dtype), line_ends[:-1] + 1)
+        )
+        line_ends -= (line_ends > line_starts) & (data[line_ends - 1] == ord("\r"))
+        cell_lines: np.ndarray = (line_ends == line_starts) | (
+            data[line_starts] != ord("!")
+        )
+        yield data, line_starts[cell_lines], line_ends[cell_lines]
+
+
+def _plaintextDim(pattern_file: BinaryIO) -> Tuple[int, int]:
+    """count the rows and the columns of a plaintext file, its longest row giving the number of columns
+
+    Args:
+        pattern_file (BinaryIO): the plaintext file, opened for binary reading
+
+    Returns:
+        Tuple[int, int]: the dimensions of the pattern
+    """
+    rows, cols = 0, 0
+    for _, line_starts, line_ends in _plaintextLines(pattern_file):
+        rows += line_starts.size
+        cols = max(cols, int((line_ends - line_starts).max(initial=0)))
+    return rows, cols
+
+
+def _streamPlaintext(
+    pattern_file: BinaryIO, cells: np.ndarray, top: int, left: int
+) -> None:
+    """parse a plaintext file chunk by chunk, writing the alive cells of every chunk at once into the cell matrix
+
+    Args:
+        pattern_file (BinaryIO): the plaintext file, opened for binary reading
+        cells (np.ndarray): contiguous matrix receiving the pattern
+        top (int): row receiving the first row of the pattern
+        left (int): column receiving the first column of the pattern
+    """
+    row: int = 0
+    for data, line_starts, line_ends in _plaintextLines(pattern_file):
+        alive: np.ndarray = np.flatnonzero((data == ord("O")) | (data == ord("*")))
+        lines: np.ndarray = np.searchsorted(line_starts, alive, side="right") - 1
+        # the cells of the comment lines belong to no line of cells, or lie after the end of the previous one
+        in_line: np.ndarray = (lines >= 0) & (alive < line_ends[lines])
+        alive, lines = alive[in_line], lines[in_line]
+        cells[lines + row + top, alive - line_starts[lines] + left] = ALIVE_CELL_STATE
+        row += line_starts.size
+
+
+def _writePlaintext(pattern_file, cells: np.ndarray, name: str) -> None:
+    """write the cells of a grid as plaintext rows, by blocks of rows translated at once
+
+    Args:
+        pattern_file: the plaintext file, opened for text writing
+        cells (np.ndarray): the cells of the grid
+        name (str): name of the pattern, written in the first comment line
+    """
+    pattern_file.write(f"!Name: {name}\n")
+    characters: np.ndarray = np.frombuffer(b".O", dtype=np.uint8)
+    for start_row in range(0, cells.shape[0], PATTERN_ROWS_PER_BLOCK):
+        block: np.ndarray = cells[start_row : start_row + PATTERN_ROWS_PER_BLOCK]
+        rows: np.ndarray = np.full(
+            (block.shape[0], block.shape[1] + 1), ord("\n"), dtype=np.uint8
+        )
+        rows[:, :-1] = characters[block]
+        pattern_file.write(rows.tobytes().decode("ascii"))
+
+
+def _readLife106Coords(pattern_file: BinaryIO) -> np.ndarray:
+    """read the coordinates of the alive cells of a Life 1.06 file, all the numbers being parsed at once
+
+    Args:
+        pattern_file (BinaryIO): the Life 1.06 file, opened for binary reading
+
+    Returns:
+        np.ndarray: (row, column) of every alive cell, of shape (k, 2), moved so that the top-left cell of the pattern is (0, 0)
+    """
+    text: str = pattern_file.read().decode("ascii")
+    assert text.startswith(
+        LIFE_106_HEADER
+    ), f"the Life 1.06 file should start with '{LIFE_106_HEADER}'"
+
+    body: str = re.sub(r"^#.*$", "", text, flags=re.MULTILINE)
+    numbers: np.ndarray = (
+        np.fromstring(body, dtype=np.int64, sep=" ")
+        if body.strip()
+        else np.array([], dtype=np.int64)
+    )
+    assert numbers.size % 2 == 0, "every cell of a Life 1.06 file should be 'x y'"
+
+    # the cells are written as x (column) then y (row)
+    coords: np.ndarray = numbers.reshape(-1, 2)[:, ::-1]
+    return coords - coords.min(axis=0) if coords.size else coords
+
+
+def _coordsDim(coords: np.ndarray) -> Tuple[int, int]:
+    """return the dimensions of the bounding box of cells moved to (0, 0)
+
+    Args:
+        coords (np.ndarray): (row, column) of every cell, of shape (k, 2)
+
+    Returns:
+        Tuple[int, int]: the dimensions of the pattern
+    """
+    if not coords.size:
+        return 0, 0
+    rows, cols = coords.max(axis=0) + 1
+    return int(rows), int(cols)
+
+
+def _writeLife106(pattern_file, cells: np.ndarray) -> None:
+    """write the coordinates of the alive cells of a grid, by blocks of rows
+
+    Args:
+        pattern_file: the Life 1.06 file, opened for text writing
+        cells (np.ndarray): the cells of the grid
+    """
+    pattern_file.write(f"{LIFE_106_HEADER}\n")
+    for start_row in range(0, cells.shape[0], PATTERN_ROWS_PER_BLOCK):
+        rows, cols = np.nonzero(
+            cells[start_row : start_row + PATTERN_ROWS_PER_BLOCK] == ALIVE_CELL_STATE
+        )
+        np.savetxt(pattern_file, np.column_stack((cols, rows + start_row)), fmt="%d")
@@ -0,0 +1,150 @@
+"""utils regarding the rules of the game, written in the B/S notation (e.g. B3/S23 for the Game of Life),
+or in the Generations notations S/B/C (e.g. /2/3 for Brian's Brain) and B/S/C (e.g. B2/S/C3)
+"""
+import re
+from typing import List, Tuple
+
+import numpy as np
+from src.utils.CustomTypes import ALIVE_CELL_STATE
+from src.utils.CustomTypes import CELL_STATE_DTYPE
+from src.utils.CustomTypes import DEAD_CELL_STATE
+from src.utils.CustomTypes import FIRST_DYING_CELL_STATE
+
+RULE_PATTERN: re.Pattern = re.compile(
+    r"^B(?P<birth>[0-8]*)/S(?P<survival>[0-8]*)(/C?(?P<states>\d+))?$", re.IGNORECASE
+)
+GENERATIONS_RULE_PATTERN: re.Pattern = re.compile(
+    r"^(?P<survival>[0-8]*)/(?P<birth>[0-8]*)/(?P<states>\d+)$"
+)
+MAX_NEIGHBOURS: int = 8
+MAX_STATES: int = 256  # the cells are stored as uint8
+# rule indexes converted at once into the intp ones np.take and np.bincount need, bounds the buffer holding them
+RULE_INDEX_BLOCK_SIZE: int = 1 << 16
+
+
+def parseRule(rulestring: str) -> Tuple[List[int], List[int], int]:
+    """parse a rulestring, e.g. B36/S23 for HighLife, B2/S for Seeds, /2/3 for Brian's Brain or 345/2/4 for Star Wars
+
+    Args:
+        rulestring (str): the rulestring
+
+    Returns:
+        Tuple[List[int], List[int], int]: the numbers of alive neighbours making a dead cell born, the ones keeping an alive cell alive, and the number of states of the cells (2 for Life-like rules)
+    """
+    match = RULE_PATTERN.match(
+        rulestring.replace(" ", "")
+    ) or GENERATIONS_RULE_PATTERN.match(rulestring.replace(" ", ""))
+    assert (
+        match is not None
+    ), f"Bad rulestring '{rulestring}', the rule should follow the B/S notation (e.g. B3/S23) or the Generations one (e.g. /2/3)"
+
+    birth, survival = (
+        sorted({int(count) for count in match.group(group)})
+        for group in ["birth", "survival"]
+    )
+    n_states: int = int(match.group("states") or 2)
+    assert (
+        2 <= n_states <= MAX_STATES
+    ), f"Bad rulestring '{rulestring}', the number of states should be between 2 and {MAX_STATES}"
+
+    return birth, survival, n_states
+
+
+def compileRule(rulestring: str) -> np.ndarray:
+    """compile a rulestring into a lookup table, giving the next state of a cell from its state and its number of alive neighbours
+
+    With the Generations rules, an alive cell which does not survive starts to decay through the states 2, 3, ... and dies after the last one,
+    a decaying cell is not counted as an alive neighbour and cannot be born again before dying
+
+    Args:
+        rulestring (str): the rulestring
+
+    Returns:
+        np.ndarray: table of shape (n_states, 9), the next state of a cell is table[state, alive_neighbours_count]
+    """
+    birth, survival, n_states = parseRule(rulestring)
+
+    rule_table: np.ndarray = np.full(
+        (n_states, MAX_NEIGHBOURS + 1), DEAD_CELL_STATE, dtype=CELL_STATE_DTYPE
+    )
+    rule_table[DEAD_CELL_STATE, birth] = ALIVE_CELL_STATE
+    if n_states > FIRST_DYING_CELL_STATE:
+        rule_table[ALIVE_CELL_STATE, :] = FIRST_DYING_CELL_STATE
+        rule_table[FIRST_DYING_CELL_STATE:-1, :] = np.arange(
+            FIRST_DYING_CELL_STATE + 1, n_states, dtype=CELL_STATE_DTYPE
+        )[:, None]
+    rule_table[ALIVE_CELL_STATE, survival] = ALIVE_CELL_STATE
+
+    return rule_table
+
+
+def ruleIndexDtype(n_states: int) -> np.dtype:
+    """return the smallest dtype holding the rule indexes (state * (MAX_NEIGHBOURS + 1) + alive neighbours count) of a rule,
+    one byte for the rules of up to 28 states
+
+    Args:
+        n_states (int): number of states of the rule
+
+    Returns:
+        np.dtype: uint8 or uint16
+    """
+    return np.dtype(np.uint8 if n_states * (MAX_NEIGHBOURS + 1) <= 256 else np.uint16)
+
+
+def applyRuleTable(
+    rule_index: np.ndarray,
+    flat_rule_table: np.ndarray,
+    index_block: np.ndarray,
+    dst_cell_mat: np.ndarray,
+) -> None:
+    """gather the next state of every cell from the rule table, the compact rule indexes being converted block by block into index_block,
+    as np.take would convert all of them at once into a temporary intp array otherwise
+
+    Args:
+        rule_index (np.ndarray): contiguous rule indexes of the cells
+        flat_rule_table (np.ndarray): the rule table, flattened
+        index_block (np.ndarray): intp buffer of RULE_INDEX_BLOCK_SIZE indexes (or less), overwritten
+        dst_cell_mat (np.ndarray): contiguous cells receiving their next state, of the shape of rule_index
+    """
+    flat_index: np.ndarray = rule_index.reshape(-1)
+    flat_dst: np.ndarray = dst_cell_mat.reshape(-1)
+    for start in range(0, flat_index.size, index_block.size):
+        end: int = min(start + index_block.size, flat_index.size)
+        block: np.ndarray = index_block[: end - start]
+        np.copyto(block, flat_index[start:end])
+        np.take(flat_rule_table, block, out=flat_dst[start:end], mode="clip")
+
+
+def countTransitions(
+    rule_index: np.ndarray, flat_rule_table: np.ndarray, index_block: np.ndarray
+) -> Tuple[int, int, int]:
+    """count the cells born, dead and alive in a generation from the rule indexes (state * (MAX_NEIGHBOURS + 1) + alive neighbours count) of the step which computed it,
+    in one pass over the indexes, the transition of every entry of the rule table being known beforehand
+
+    Args:
+        rule_index (np.ndarray): contiguous rule indexes of the cells
+        flat_rule_table (np.ndarray): the rule table, flattened
+        index_block (np.ndarray): intp buffer of RULE_INDEX_BLOCK_SIZE indexes (or less), overwritten, as np.bincount would convert the compact indexes otherwise
+
+    Returns:
+        Tuple[int, int, int]: births, deaths and population
+    """
+    flat_index: np.ndarray = rule_index.reshape(-1)
+    counts: np.ndarray = np.zeros(flat_rule_table.size, dtype=np.int64)
+    for start in range(0, flat_index.size, index_block.size):
+        end: int = min(start + index_block.size, flat_index.size)
+        block: np.ndarray = index_block[: end - start]
+        np.copyto(block, flat_index[start:end])
+        counts += np.bincount(block, minlength=flat_rule_table.size)
+    states: np.ndarray = np.arange(flat_rule_table.size) // (MAX_NEIGHBOURS + 1)
+    next_alive: np.ndarray = flat_rule_table == ALIVE_CELL_STATE
+    return (
+        int(counts[next_alive & (states == DEAD_CELL_STATE)].sum()),
+        int(counts[~next_alive & (states == ALIVE_CELL_STATE)].sum()),
+        int(counts[next_alive].sum()),
+    )
+
+
+if __name__ == "__main__":
+    print(compileRule("B3/S23"))
+    print(compileRule("/2/3"))
@@ -0,0 +1,127 @@
+"""
+Tests regarding the BenchmarkRunner and the benchmark utils
+"""
+# pylint: disable=unused-variable,unused-argument, redefined-outer-name
+import numpy as np
+import pytest
+from numpy.testing import assert_array_equal
+from src.BenchmarkRunner import BenchmarkRunner
+from src.core_lib.CoreGrid import CoreGrid
+from src.utils.benchUtils import BENCHMARK_DENSITIES
+from src.utils.benchUtils import benchmarkCase
+from src.utils.benchUtils import buildCells
+from src.utils.benchUtils import compareResults
+from src.utils.benchUtils import readResults
+from src.utils.benchUtils import writeResults
+from src.utils.confUtils import fetch_game_config
+from tests.core_lib_tests.test_config import BENCHMARK_ASH_N_TURN
+from tests.core_lib_tests.test_config import BENCHMARK_CYCLE_CONFIG
+from tests.core_lib_tests.test_config import BENCHMARK_MIN_TIME
+from tests.core_lib_tests.test_config import BENCHMARK_SIZES
+from tests.core_lib_tests.test_config import BENCHMARK_SLOWDOWN
+
+
+def test_benchmark_cells() -> None:
+    """checking that the starting cells of the benchmarks are the same for a given seed, and that the stable ash never changes"""
+
+    for density in BENCHMARK_DENSITIES:
+        assert_array_equal(
+            buildCells(density, BENCHMARK_SIZES),
+            buildCells(density, BENCHMARK_SIZES),
+            err_msg="Grids aren't matching",
+        )
+    with pytest.raises(AssertionError):
+        buildCells("some_bad_density", BENCHMARK_SIZES)
+
+    ash_cells: np.ndarray = buildCells("ash", BENCHMARK_SIZES)
+    gameConfig = fetch_game_config()
+    gameConfig["simulation"]["boundary"] = "torus"
+    grid: CoreGrid = CoreGrid(gameConfig, ash_cells)
+    grid.advance(BENCHMARK_ASH_N_TURN)
+    assert ash_cells.any()
+    assert_array_equal(grid.getCellMat(), ash_cells, err_msg="Grids aren't matching")
+
+
+def test_benchmark_runner(tmp_path) -> None:
+    """checking that the benchmark measures and saves every case of the default config, and flags the regressions against a baseline"""
+
+    baseline_path = str(tmp_path / "baseline.json")
+    runner = BenchmarkRunner(
+        sizes=BENCHMARK_SIZES, output_path=baseline_path, min_time=BENCHMARK_MIN_TIME
+    )
+    # the config is left as it is, every case turning the cycle detection and the history off
+    assert runner.gameConfig == fetch_game_config()
+    assert runner.run() == []
+
+    baseline = readResults(baseline_path)
+    assert len(baseline["cases"]) == len(BENCHMARK_SIZES) * len(BENCHMARK_DENSITIES)
+    for density in BENCHMARK_DENSITIES:
+        for size in BENCHMARK_SIZES:
+            metrics = baseline["cases"][benchmarkCase("dense", density, [size, size])]
+            assert metrics["generations"] >= 1
+            assert metrics["generations_per_second"] > 0
+            assert metrics["peak_memory"] > 0
+            assert metrics["render_frames"] >= 1
+    assert compareResults(baseline, baseline) == []
+
+    # a baseline much faster flags the generations per second and the ns per cell of every case,
+    # the other metrics being left out as the timings of such small grids are noisy
+    for metrics in baseline["cases"].values():
+        metrics["generations_per_second"] *= BENCHMARK_SLOWDOWN
+        metrics["ns_per_cell"] /= BENCHMARK_SLOWDOWN
+    writeResults(baseline_path, baseline)
+    regressions = BenchmarkRunner(
+        sizes=BENCHMARK_SIZES[:1],
+        densities=["ash"],
+        output_path=str(tmp_path / "results.json"),
+        baseline_path=baseline_path,
+        tolerance=float("inf"),
+        min_time=BENCHMARK_MIN_TIME,
+        render=False,
+    ).run()
+    assert regressions == []
+
+    results = readResults(str(tmp_path / "results.json"))
+    assert (
+        results["cases"][benchmarkCase("dense", "ash", BENCHMARK_SIZES[:1] * 2)][
+            "render_time"
+        ]
+        is None
+    )
+    assert {
+        (regression["case"], regression["metric"])
+        for regression in compareResults(results, baseline)
+        if regression["metric"] in ["generations_per_second", "ns_per_cell"]
+    } == {
+        (case, metric)
+        for case in results["cases"]
+        for metric in ["generations_per_second", "ns_per_cell"]
+    }
+
+
+def test_benchmark_fast_forward(tmp_path) -> None:
+    """checking that the cases step every generation whatever the config, and that the fast-forward is measured by cases of its own"""
+
+    gameConfig = fetch_game_config()
+    gameConfig["simulation"].update(BENCHMARK_CYCLE_CONFIG)
+    runner = BenchmarkRunner(
+        sizes=BENCHMARK_SIZES[:1],
+        densities=["soup", "ash"],
+        output_path=str(tmp_path / "results.json"),
+        min_time=BENCHMARK_MIN_TIME,
+        render=False,
+        fast_forward=True,
+        gameConfig=gameConfig,
+    )
+    for fast_forward in [False, True]:
+        case_config = runner._caseConfig("dense", BENCHMARK_SIZES[:1] * 2, fast_forward)
+        assert (case_config["simulation"]["cycle_table_size"] > 0) == fast_forward
+        assert case_config["simulation"]["history_budget"] == 0
+    assert runner.run() == []
+
+    results = readResults(str(tmp_path / "results.json"))
+    assert set(results["cases"]) == {
+        benchmarkCase("dense", "soup", BENCHMARK_SIZES[:1] * 2),
+        benchmarkCase("dense", "ash", BENCHMARK_SIZES[:1] * 2),
+        benchmarkCase("dense", "ash", BENCHMARK_SIZES[:1] * 2, True),
+    }
@@ -1,6 +1,8 @@
 """
 Configuration for core lib tests
 """
+from typing import Dict, List
+
 import numpy as np
 
 # ===== Unit testing =====
@@ -86,3 +88,390 @@ NO_LIVING_EXPECTED_GRID: np.ndarray = np.zeros((6, 6))
 
 # checking if trying to add incorrect value (e.g. not in 0 or 1 to the grid using setCell method raise error)
 INCORRECT_VALUE_SET_CELL: int = 3
+
+# checking that a glider keeps its shape and moves one cell diagonally every 4 turns
+GLIDER_INIT_GRID: np.ndarray = np.array(
+    [
+        [0, 1, 0, 0, 0, 0],
+        [0, 0, 1, 0, 0, 0],
+        [1, 1, 1, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0],
+    ]
+)
+GLIDER_EXPECTED_GRID: np.ndarray = np.array(
+    [
+        [0, 0, 0, 0, 0, 0],
+        [0, 0, 1, 0, 0, 0],
+        [0, 0, 0, 1, 0, 0],
+        [0, 1, 1, 1, 0, 0],
+        [0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0],
+    ]
+)
+GLIDER_N_TURN: int = 4
+
+# checking that every grid engine yields the same grids as the dense one, the soup is wider than 64 cells to cross the packed words boundaries
+ENGINES: List[str] = ["dense", "bitpacked", "frontier", "parallel", "threaded"]
+ENGINES_SOUP_GRID: np.ndarray = (
+    np.random.default_rng(seed=0).random((40, 200)) < 0.35
+).astype(np.uint8)
+ENGINES_SOUP_N_TURN: int = 50
+
+# checking that the frontier of a board settled into still lifes (a block and a beehive) becomes empty
+STILL_LIFE_INIT_GRID: np.ndarray = np.array(
+    [
+        [0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 1, 1, 0, 0, 0, 0, 0],
+        [0, 1, 1, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 1, 1, 0, 0],
+        [0, 0, 0, 1, 0, 0, 1, 0],
+        [0, 0, 0, 0, 1, 1, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0],
+    ]
+)
+
+# checking that the hashlife engine matches the dense one on a methuselah (the R-pentomino) placed far from the borders
+R_PENTOMINO_GRID: np.ndarray = np.zeros((120, 120), dtype=np.uint8)
+R_PENTOMINO_GRID[59:62, 59:62] = [[0, 1, 1], [1, 1, 0], [0, 1, 0]]
+R_PENTOMINO_N_TURN: int = 100
+R_PENTOMINO_FINAL_POPULATION: int = 116  # population once stabilised, after 1103 turns
+
+# checking that the hashlife engine can jump 2^k generations, the glider leaves the window but stays on the plane
+HASHLIFE_JUMP_POW2: int = 40
+HASHLIFE_SMALL_CACHE_SIZE: int = 64
+
+# checking that a glider travels on the unbounded plane of the sparse engine, 1 cell diagonally every 4 turns
+SPARSE_GLIDER_N_TURN: int = 40_000
+SPARSE_GLIDER_EXPECTED_BOUNDING_BOX = (10_000, 10_000, 10_002, 10_002)
+
+# checking that advancing n turns in one call allocates no memory per turn, on a soup big enough for any copy (160 kB) to show up
+ADVANCE_SOUP_GRID: np.ndarray = (
+    np.random.default_rng(seed=1).random((400, 400)) < 0.35
+).astype(np.uint8)
+ADVANCE_N_TURN: int = 200
+# less than one byte per cell, numpy only keeps a constant casting buffer (8192 elements)
+ADVANCE_MAX_ALLOCATED_BYTES: int = ADVANCE_SOUP_GRID.size
+
+# checking every boundary topology with a vertical blinker lying on the left border
+BOUNDARY_INIT_GRID: np.ndarray = np.array(
+    [
+        [0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0],
+        [1, 0, 0, 0, 0, 0],
+        [1, 0, 0, 0, 0, 0],
+        [1, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0],
+    ]
+)
+BOUNDARY_EXPECTED_GRIDS: Dict[str, np.ndarray] = {
+    "dead": np.array(
+        [
+            [0, 0, 0, 0, 0, 0],
+            [0, 0, 0, 0, 0, 0],
+            [0, 0, 0, 0, 0, 0],
+            [1, 1, 0, 0, 0, 0],
+            [0, 0, 0, 0, 0, 0],
+            [0, 0, 0, 0, 0, 0],
+        ]
+    ),
+    "torus": np.array(
+        [
+            [0, 0, 0, 0, 0, 0],
+            [0, 0, 0, 0, 0, 0],
+            [0, 0, 0, 0, 0, 0],
+            [1, 1, 0, 0, 0, 1],
+            [0, 0, 0, 0, 0, 0],
+            [0, 0, 0, 0, 0, 0],
+        ]
+    ),
+    "mirror": np.array(
+        [
+            [0, 0, 0, 0, 0, 0],
+            [0, 0, 0, 0, 0, 0],
+            [1, 0, 0, 0, 0, 0],
+            [0, 1, 0, 0, 0, 0],
+            [1, 0, 0, 0, 0, 0],
+            [0, 0, 0, 0, 0, 0],
+        ]
+    ),
+    # the cell crossing the left border comes back on the right border, on the flipped row
+    "klein": np.array(
+        [
+            [0, 0, 0, 0, 0, 0],
+            [0, 0, 0, 0, 0, 0],
+            [0, 0, 0, 0, 0, 1],
+            [1, 1, 0, 0, 0, 0],
+            [0, 0, 0, 0, 0, 0],
+            [0, 0, 0, 0, 0, 0],
+        ]
+    ),
+}
+
+# checking that a glider on a torus comes back to its initial position, after crossing both borders
+TORUS_GLIDER_N_TURN: int = 24
+BAD_BOUNDARY: str = "some_bad_boundary"
+
+# checking a rule other than the Game of Life one, with Seeds (B2/S) : every alive cell dies, the dead cells having 2 alive neighbours are born
+SEEDS_RULE: str = "B2/S"
+SEEDS_INIT_GRID: np.ndarray = np.array(
+    [
+        [0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0],
+        [0, 0, 1, 1, 0, 0],
+        [0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0],
+    ]
+)
+SEEDS_EXPECTED_GRID: np.ndarray = np.array(
+    [
+        [0, 0, 0, 0, 0, 0],
+        [0, 0, 1, 1, 0, 0],
+        [0, 0, 0, 0, 0, 0],
+        [0, 0, 1, 1, 0, 0],
+        [0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0],
+    ]
+)
+
+# checking that every engine yields the same grids as the dense one with the HighLife rule
+HIGHLIFE_RULE: str = "B36/S23"
+
+# checking that bad rulestrings, or B0 rules on the engines that cannot handle them, raise expected error
+BAD_RULES: List[str] = ["B9/S23", "S23/B3", "B3S23", "some_bad_rule"]
+B0_RULE: str = "B03/S23"
+B0_UNSUPPORTED_ENGINES: List[str] = ["frontier", "hashlife", "sparse"]
+
+# checking the Generations rules, with Brian's Brain (/2/3) : every alive cell starts dying, the dead cells having 2 alive neighbours are born, and the dying cells die
+BRIANS_BRAIN_RULE: str = "/2/3"
+BRIANS_BRAIN_INIT_GRID: np.ndarray = SEEDS_INIT_GRID
+BRIANS_BRAIN_EXPECTED_GRIDS: List[np.ndarray] = [
+    np.array(
+        [
+            [0, 0, 0, 0, 0, 0],
+            [0, 0, 1, 1, 0, 0],
+            [0, 0, 2, 2, 0, 0],
+            [0, 0, 1, 1, 0, 0],
+            [0, 0, 0, 0, 0, 0],
+            [0, 0, 0, 0, 0, 0],
+        ]
+    ),
+    # the dying cells are not counted as alive neighbours, and cannot be born again
+    np.array(
+        [
+            [0, 0, 1, 1, 0, 0],
+            [0, 0, 2, 2, 0, 0],
+            [0, 1, 0, 0, 1, 0],
+            [0, 0, 2, 2, 0, 0],
+            [0, 0, 1, 1, 0, 0],
+            [0, 0, 0, 0, 0, 0],
+        ]
+    ),
+]
+
+# checking that a lone cell of Star Wars (345/2/4) decays through every dying state before dying
+STAR_WARS_RULE: str = "345/2/4"
+STAR_WARS_INIT_GRID: np.ndarray = np.array(
+    [
+        [0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0],
+        [0, 0, 1, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0],
+    ]
+)
+STAR_WARS_EXPECTED_STATES: List[int] = [2, 3, 0]
+# a lone cell of a rule of more than 28 states, whose rule indexes do not fit in one byte, decaying through every dying state
+MANY_STATES_RULE: str = "B3/S23/C40"
+MANY_STATES_EXPECTED_STATES: List[int] = list(range(2, 40)) + [0]
+MANY_STATES_ENGINES: List[str] = ["dense", "parallel", "threaded"]
+
+# checking that cells above the last dying state, or multi-state rules on the engines that cannot handle them, raise expected error
+INCORRECT_MULTI_STATE_INIT_GRID: np.ndarray = np.array(
+    [
+        [0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0],
+        [0, 0, 3, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0],
+    ]
+)
+MULTI_STATE_UNSUPPORTED_ENGINES: List[str] = [
+    "bitpacked",
+    "frontier",
+    "hashlife",
+    "sparse",
+]
+
+# checking that the bands of the parallel engine, and the stripes of the threaded one, see their neighbours with every boundary topology and with a multi-state rule
+PARALLEL_N_WORKERS: int = 3
+PARALLEL_RULES: List[str] = ["B3/S23", "/2/3"]
+
+# checking the threaded engine with a cache small enough to split the soup into many stripes of 3 rows
+THREADED_CACHE_SIZE: int = 3 * ENGINES_SOUP_GRID.shape[1] * 5
+THREADED_STRIPE_HEIGHT: int = 3
+# checking that the threaded engine simulates a board larger than the resolution of the UI (720x480)
+THREADED_LARGE_GRID_DIM: tuple = (1024, 1024)
+
+# checking the statistics of an ensemble of boards : an empty board and a lone cell (extinct), a block and a blinker (stabilized),
+# and a glider turning into a block in the corner of its board
+ENSEMBLE_BOARDS: np.ndarray = np.stack(
+    [
+        np.zeros((6, 6)),
+        np.pad([[1]], ((2, 3), (2, 3))),
+        np.pad([[1, 1], [1, 1]], 2),
+        np.pad([[1, 1, 1]], ((2, 3), (1, 2))),
+        GLIDER_INIT_GRID,
+    ]
+)
+ENSEMBLE_N_TURN: int = 20
+ENSEMBLE_EXPECTED_EXTINCTION_TURNS: List[int] = [0, 1, -1, -1, -1]
+# first turn of the cycle : the block from the start, the blinker from the start too, the glider once it crashed into a block
+ENSEMBLE_EXPECTED_STABILIZATION_TURNS: List[int] = [-1, -1, 0, 0, 15]
+ENSEMBLE_EXPECTED_POPULATIONS: List[int] = [0, 0, 4, 3, 4]
+
+# checking that every board of an ensemble of soups of various densities matches its own dense grid
+ENSEMBLE_SOUP_BOARDS: np.ndarray = (
+    np.random.default_rng(seed=2).random((50, 24, 24))
+    < np.linspace(0.05, 0.6, 50)[:, None, None]
+).astype(np.uint8)
+ENSEMBLE_SOUP_N_TURN: int = 100
+# with the Generations rule too, whose rule indexes need 2 bytes
+ENSEMBLE_SOUP_RULES: List[str] = ["B3/S23", MANY_STATES_RULE]
+
+# checking that the empty boards of an ensemble are not extinct under a B0 rule : every cell is born on the first turn
+ENSEMBLE_B0_RULE: str = "B0/S8"
+ENSEMBLE_B0_BOARDS: np.ndarray = np.zeros((2, 8, 8))
+ENSEMBLE_B0_EXPECTED_POPULATIONS: List[int] = [64, 64]
+
+# size of the table of the fingerprints of the last generations, the cycle detection being off by default
+CYCLE_TABLE_SIZE: int = 4096
+# checking that a still life and a blinker are detected as cycles from the first generation, and that a soup fast-forwarded through its cycle
+# matches the same soup computed turn by turn
+CYCLE_STILL_LIFE_GRID: np.ndarray = np.pad([[1, 1], [1, 1]], 2)
+CYCLE_BLINKER_GRID: np.ndarray = np.pad([[1, 1, 1]], ((2, 3), (1, 2)))
+CYCLE_EXPECTED: Dict[str, tuple] = {"still_life": (0, 1), "blinker": (0, 2)}
+CYCLE_SOUP_N_TURN: int = 1000
+CYCLE_FAST_FORWARD_N_TURN: int = 12345
+# even, so that the blinker is back to its first phase
+CYCLE_LONG_N_TURN: int = 10**9
+# a glider crossing the word boundaries of a wide packed grid, whose states used to share fingerprints, it moves by one cell diagonally every 4 turns
+CYCLE_GLIDER_GRID_DIM: tuple = (2048, 2048)
+CYCLE_GLIDER_N_TURN: int = 600
+CYCLE_GLIDER_EXPECTED_BOUNDING_BOX = (150, 150, 152, 152)
+
+# checking that the packed grid packs a soup taller than a block of rows and narrower than a whole number of words, with a cell out of the states
+# of the rule packed as a dead cell when the validation is off
+PACK_SOUP_GRID: np.ndarray = (
+    np.random.default_rng(seed=4).random((600, 200)) < 0.35
+).astype(np.uint8)
+PACK_INCORRECT_CELL: tuple = (300, 130)
+
+# checking that the statistics collected by every engine match the ones computed from the cell matrices, turn by turn and after a jump of several turns,
+# and that the cells set by hand (growing then shrinking the bounding box) keep them up to date, the soup stays far enough from the border for the plane engines
+STATS_INIT_GRID: np.ndarray = np.pad(
+    (np.random.default_rng(seed=3).random((16, 80)) < 0.35).astype(np.uint8), 12
+)
+STATS_N_TURNS: List[int] = [1, 1, 1, 7]
+STATS_SET_CELLS: List[tuple] = [(0, 0, 1), (39, 103, 1), (0, 0, 0), (39, 103, 0)]
+# checking that the statistics searched around the previous bounding box follow a glider through the border of the grid with every boundary,
+# turn by turn and after jumps of several turns
+STATS_BOUNDARY_INIT_GRID: np.ndarray = np.pad(GLIDER_INIT_GRID, ((0, 4), (0, 4)))
+STATS_BOUNDARY_N_TURNS: List[int] = [1] * 24 + [5, 9]
+
+# checking that a cell buffer released by its owner is adopted by the dense engines without copy, and that only its owner can write it
+CELL_BUFFER_ENGINES: List[str] = ["dense", "frontier", "threaded"]
+
+# checking that the cells set in bulk (the last value of a duplicated cell winning) and the pasted regions give the same grid with every engine,
+# that only the incoming cells are validated with the cheap level, and the whole grid with the full one
+BULK_EDIT_GRID_DIM: tuple = (12, 70)
+BULK_EDIT_COORDS: List[List[int]] = [[0, 0], [5, 66], [11, 69], [0, 0], [6, 7], [5, 66]]
+BULK_EDIT_VALUES: List[int] = [1, 1, 1, 0, 1, 1]
+BULK_EDIT_REGION: np.ndarray = np.array([[1, 1, 0], [0, 1, 1], [1, 0, 1]])
+BULK_EDIT_REGION_CORNER: tuple = (8, 62)
+BULK_EDIT_INCORRECT_EDITS: List[tuple] = [
+    ([[12, 0]], 1),
+    ([[0, -1]], 1),
+    ([[0, 0]], 2),
+    ([[0, 0], [1, 1]], [1, 1, 1]),
+]
+BULK_EDIT_INCORRECT_REGIONS: List[tuple] = [
+    (10, 0, BULK_EDIT_REGION),
+    (0, 68, BULK_EDIT_REGION),
+    (0, 0, BULK_EDIT_REGION * 2),
+]
+VALIDATION_LEVEL_BAD: str = "paranoid"
+
+# checking that the engines keeping a history seek backwards, forwards and through the keyframes to the generations computed turn by turn,
+# that stepping back after cells were set by hand restores the edited generation, and that the oldest generations are evicted to fit in the budget
+HISTORY_N_TURN: int = 30
+HISTORY_KEYFRAME_INTERVALS: List[int] = [0, 4]
+HISTORY_SEEK_TURNS: List[int] = [29, 28, 3, 17, 0, 30, 12]
+HISTORY_SMALL_BUDGET: int = 12000
+# a single copy of the soup grid does not fit in it
+HISTORY_TINY_BUDGET: int = ENGINES_SOUP_GRID.size - 1
+
+# checking that a checkpoint saved by any engine is resumed with the same generation by the dense grid and the other way around, through the bit-packed
+# payload of the Life-like rules (with padding bits, as 200 columns do not fill whole words) and the byte payload of the Generations ones
+CHECKPOINT_N_TURN: int = 25
+CHECKPOINT_FILE_NAME: str = "grid.gol"
+CHECKPOINT_PAYLOAD_ROW_BYTES: int = 32
+# the plane engines save their live bounding box rather than their window, a glider having left the window of 6x6 cells after 40 turns
+CHECKPOINT_PLANE_ENGINES: List[str] = ["hashlife", "sparse"]
+CHECKPOINT_PLANE_N_TURN: int = 40
+
+# checking that a glider written in every pattern format (comments, blank lines and whitespaces included, away from the origin in Life 1.06)
+# is read at the corner given, or centred,
+# that the cells of a grid are written back and read again by small chunks cutting the runs, and the dying cells of a Generations rule in RLE
+PATTERN_GLIDER_FILES: Dict[str, str] = {
+    "glider.rle": "#N Glider\n#C a comment\nx = 3, y = 3, rule = B3/S23\nbo$2b\no$3o!\nbo$ is ignored",
+    "glider.lif": "#Life 1.06\n#D a comment\n1 -1\n2 0\n0 1\n1 1\n2 1\n",
+    "glider_away.lif": "#Life 1.06\n11 9\n12 10\n10 11\n11 11\n12 11\n",
+    "glider.cells": "!Name: Glider\n!\n.O\n..O\r\nOOO",
+}
+PATTERN_CENTRED_CORNER: tuple = (10, 10)
+PATTERN_EXTENSIONS: List[str] = [".rle", ".lif", ".cells"]
+PATTERN_CHUNK_BYTES: int = 7
+PATTERN_INCORRECT_FILES: Dict[str, str] = {
+    "glider.txt": "",
+    "beyond.rle": "x = 3, y = 3\n4o!",
+    "below.rle": "x = 3, y = 3\n3$o!",
+    "bad_character.rle": "x = 3, y = 3\nbzo!",
+    "bad_header.rle": "#C no header\nbo$2bo$3o!",
+    "bad_header.lif": "1 -1\n2 0\n",
+    "too_large.cells": "O" * 30,
+}
+
+# checking that the diffs yielded by every engine, generation by generation and sampled (the last diff spanning the generations left),
+# rebuild the cell matrices computed turn by turn, and that the generations are only computed when the consumer asks for them
+DIFF_N_TURN: int = 10
+DIFF_SAMPLE_EVERY: List[int] = [1, 3]
+DIFF_SENT_SPAN: int = 4
+# the diffs of a plane are in the coordinates of its window, whether they span one generation or several, while a glider leaves the window of 6x6 cells
+DIFF_PLANE_N_TURN: int = 40
+
+# checking that the headless runner computes the generations of a pattern into a grid grown to hold it, saves the last one as a pattern
+# or a checkpoint, and resumes from that checkpoint
+HEADLESS_GRID_DIM: List[int] = [30, 30]
+HEADLESS_N_TURN: int = 12
+
+# checking that the benchmark measures every case, the still lifes of the stable ash staying as is, saves the results,
+# and flags the metrics worse than the baseline by more than the tolerance
+BENCHMARK_SIZES: List[int] = [24, 64]
+BENCHMARK_MIN_TIME: float = 0.01
+BENCHMARK_ASH_N_TURN: int = 4
+BENCHMARK_SLOWDOWN: float = 10.0
+# a config detecting the cycles and recording the history, turned off by the benchmark cases
+BENCHMARK_CYCLE_CONFIG: Dict = {"cycle_table_size": 4096, "history_budget": 1 << 20}
+
+# checking that the phase timer computes the percentiles over its rolling window only, dumps them into the metrics file,
+# and records nothing when it is disabled
+PHASE_TIMER_SMALL_WINDOW: int = 100
+PHASE_TIMER_SAMPLES: np.ndarray = np.arange(1, 151) / 1000
+PHASE_TIMER_EXPECTED_P50: float = 100.5
+PHASE_TIMER_N_TICKS: int = 3
@@ -3,23 +3,143 @@ Tests regarding the CoreGrid functions
 """
 # pylint: disable=unused-variable,unused-argument, redefined-outer-name
 import os
+import tracemalloc
+import numpy as np
 import pytest
 from numpy.testing import assert_array_equal
+from src.core_lib.CellBuffer import CellBuffer
 from src.core_lib.CoreGrid import CoreGrid
+from src.core_lib.EnsembleGrid import EnsembleGrid
+from src.core_lib.EnsembleGrid import NOT_YET
+from src.core_lib.FrontierGrid import FrontierGrid
+from src.core_lib.gridFactory import createGrid
+from src.core_lib.GridHistory import DEFAULT_HISTORY_BUDGET
+from src.core_lib.GridStats import GridStats
+from src.core_lib.HashLifeGrid import HashLifeGrid
+from src.core_lib.ParallelGrid import ParallelGrid
+from src.core_lib.ParallelGrid import _shutdown
+from src.core_lib.SparseGrid import SparseGrid
+from src.core_lib.ThreadedGrid import ThreadedGrid
+from src.utils.checkpointUtils import CHECKPOINT_HEADER_SIZE
+from src.utils.checkpointUtils import readCheckpointHeader
 from src.utils.confUtils import fetch_game_config
+from src.utils.CustomTypes import ALIVE_CELL_STATE
+from src.utils.patternUtils import readPattern
+from src.utils.patternUtils import readPatternHeader
+from src.utils.patternUtils import writePattern
+from tests.core_lib_tests.test_config import ADVANCE_MAX_ALLOCATED_BYTES
+from tests.core_lib_tests.test_config import ADVANCE_N_TURN
+from tests.core_lib_tests.test_config import ADVANCE_SOUP_GRID
+from tests.core_lib_tests.test_config import B0_RULE
+from tests.core_lib_tests.test_config import B0_UNSUPPORTED_ENGINES
+from tests.core_lib_tests.test_config import BAD_BOUNDARY
 from tests.core_lib_tests.test_config import BAD_DIM_GRID_HIGH
 from tests.core_lib_tests.test_config import BAD_DIM_GRID_LOW
 from tests.core_lib_tests.test_config import BAD_DIM_GRID_ODD
+from tests.core_lib_tests.test_config import BAD_RULES
+from tests.core_lib_tests.test_config import BOUNDARY_EXPECTED_GRIDS
+from tests.core_lib_tests.test_config import BOUNDARY_INIT_GRID
+from tests.core_lib_tests.test_config import BRIANS_BRAIN_EXPECTED_GRIDS
+from tests.core_lib_tests.test_config import BRIANS_BRAIN_INIT_GRID
+from tests.core_lib_tests.test_config import BRIANS_BRAIN_RULE
+from tests.core_lib_tests.test_config import BULK_EDIT_COORDS
+from tests.core_lib_tests.test_config import BULK_EDIT_GRID_DIM
+from tests.core_lib_tests.test_config import BULK_EDIT_INCORRECT_EDITS
+from tests.core_lib_tests.test_config import BULK_EDIT_INCORRECT_REGIONS
+from tests.core_lib_tests.test_config import BULK_EDIT_REGION
+from tests.core_lib_tests.test_config import BULK_EDIT_REGION_CORNER
+from tests.core_lib_tests.test_config import BULK_EDIT_VALUES
+from tests.core_lib_tests.test_config import CELL_BUFFER_ENGINES
+from tests.core_lib_tests.test_config import CHECKPOINT_FILE_NAME
+from tests.core_lib_tests.test_config import CHECKPOINT_N_TURN
+from tests.core_lib_tests.test_config import CHECKPOINT_PAYLOAD_ROW_BYTES
+from tests.core_lib_tests.test_config import CHECKPOINT_PLANE_ENGINES
+from tests.core_lib_tests.test_config import CHECKPOINT_PLANE_N_TURN
+from tests.core_lib_tests.test_config import CYCLE_BLINKER_GRID
+from tests.core_lib_tests.test_config import CYCLE_EXPECTED
+from tests.core_lib_tests.test_config import CYCLE_FAST_FORWARD_N_TURN
+from tests.core_lib_tests.test_config import CYCLE_GLIDER_EXPECTED_BOUNDING_BOX
+from tests.core_lib_tests.test_config import CYCLE_GLIDER_GRID_DIM
+from tests.core_lib_tests.test_config import CYCLE_GLIDER_N_TURN
+from tests.core_lib_tests.test_config import CYCLE_LONG_N_TURN
+from tests.core_lib_tests.test_config import CYCLE_SOUP_N_TURN
+from tests.core_lib_tests.test_config import CYCLE_STILL_LIFE_GRID
+from tests.core_lib_tests.test_config import CYCLE_TABLE_SIZE
+from tests.core_lib_tests.test_config import DIFF_N_TURN
+from tests.core_lib_tests.test_config import DIFF_PLANE_N_TURN
+from tests.core_lib_tests.test_config import DIFF_SAMPLE_EVERY
+from tests.core_lib_tests.test_config import DIFF_SENT_SPAN
+from tests.core_lib_tests.test_config import ENGINES
+from tests.core_lib_tests.test_config import ENGINES_SOUP_GRID
+from tests.core_lib_tests.test_config import ENGINES_SOUP_N_TURN
+from tests.core_lib_tests.test_config import ENSEMBLE_B0_BOARDS
+from tests.core_lib_tests.test_config import ENSEMBLE_B0_EXPECTED_POPULATIONS
+from tests.core_lib_tests.test_config import ENSEMBLE_B0_RULE
+from tests.core_lib_tests.test_config import ENSEMBLE_BOARDS
+from tests.core_lib_tests.test_config import ENSEMBLE_EXPECTED_EXTINCTION_TURNS
+from tests.core_lib_tests.test_config import ENSEMBLE_EXPECTED_POPULATIONS
+from tests.core_lib_tests.test_config import ENSEMBLE_EXPECTED_STABILIZATION_TURNS
+from tests.core_lib_tests.test_config import ENSEMBLE_N_TURN
+from tests.core_lib_tests.test_config import ENSEMBLE_SOUP_BOARDS
+from tests.core_lib_tests.test_config import ENSEMBLE_SOUP_N_TURN
+from tests.core_lib_tests.test_config import ENSEMBLE_SOUP_RULES
+from tests.core_lib_tests.test_config import GLIDER_EXPECTED_GRID
+from tests.core_lib_tests.test_config import GLIDER_INIT_GRID
+from tests.core_lib_tests.test_config import GLIDER_N_TURN
+from tests.core_lib_tests.test_config import HASHLIFE_JUMP_POW2
+from tests.core_lib_tests.test_config import HASHLIFE_SMALL_CACHE_SIZE
+from tests.core_lib_tests.test_config import HIGHLIFE_RULE
+from tests.core_lib_tests.test_config import HISTORY_KEYFRAME_INTERVALS
+from tests.core_lib_tests.test_config import HISTORY_N_TURN
+from tests.core_lib_tests.test_config import HISTORY_SEEK_TURNS
+from tests.core_lib_tests.test_config import HISTORY_SMALL_BUDGET
+from tests.core_lib_tests.test_config import HISTORY_TINY_BUDGET
 from tests.core_lib_tests.test_config import INCORRECT_INIT_GRID
+from tests.core_lib_tests.test_config import INCORRECT_MULTI_STATE_INIT_GRID
 from tests.core_lib_tests.test_config import INCORRECT_VALUE_SET_CELL
 from tests.core_lib_tests.test_config import LOAD_TEST_EXPECTED_GRID
 from tests.core_lib_tests.test_config import LOAD_TEST_INIT_GRID
 from tests.core_lib_tests.test_config import LOAD_TEST_N_TURN
+from tests.core_lib_tests.test_config import MANY_STATES_ENGINES
+from tests.core_lib_tests.test_config import MANY_STATES_EXPECTED_STATES
+from tests.core_lib_tests.test_config import MANY_STATES_RULE
+from tests.core_lib_tests.test_config import MULTI_STATE_UNSUPPORTED_ENGINES
 from tests.core_lib_tests.test_config import NO_LIVING_EXPECTED_GRID
 from tests.core_lib_tests.test_config import NO_LIVING_INIT_GRID
 from tests.core_lib_tests.test_config import NORMAL_EXPECTED_GRID
 from tests.core_lib_tests.test_config import NORMAL_INIT_GRID
 from tests.core_lib_tests.test_config import NORMAL_N_TURN
+from tests.core_lib_tests.test_config import PACK_INCORRECT_CELL
+from tests.core_lib_tests.test_config import PACK_SOUP_GRID
+from tests.core_lib_tests.test_config import PARALLEL_N_WORKERS
+from tests.core_lib_tests.test_config import PARALLEL_RULES
+from tests.core_lib_tests.test_config import PATTERN_CENTRED_CORNER
+from tests.core_lib_tests.test_config import PATTERN_CHUNK_BYTES
+from tests.core_lib_tests.test_config import PATTERN_EXTENSIONS
+from tests.core_lib_tests.test_config import PATTERN_GLIDER_FILES
+from tests.core_lib_tests.test_config import PATTERN_INCORRECT_FILES
+from tests.core_lib_tests.test_config import R_PENTOMINO_FINAL_POPULATION
+from tests.core_lib_tests.test_config import R_PENTOMINO_GRID
+from tests.core_lib_tests.test_config import R_PENTOMINO_N_TURN
+from tests.core_lib_tests.test_config import SEEDS_EXPECTED_GRID
+from tests.core_lib_tests.test_config import SEEDS_INIT_GRID
+from tests.core_lib_tests.test_config import SEEDS_RULE
+from tests.core_lib_tests.test_config import SPARSE_GLIDER_EXPECTED_BOUNDING_BOX
+from tests.core_lib_tests.test_config import SPARSE_GLIDER_N_TURN
+from tests.core_lib_tests.test_config import STAR_WARS_EXPECTED_STATES
+from tests.core_lib_tests.test_config import STAR_WARS_INIT_GRID
+from tests.core_lib_tests.test_config import STAR_WARS_RULE
+from tests.core_lib_tests.test_config import STATS_BOUNDARY_INIT_GRID
+from tests.core_lib_tests.test_config import STATS_BOUNDARY_N_TURNS
+from tests.core_lib_tests.test_config import STATS_INIT_GRID
+from tests.core_lib_tests.test_config import STATS_N_TURNS
+from tests.core_lib_tests.test_config import STATS_SET_CELLS
+from tests.core_lib_tests.test_config import STILL_LIFE_INIT_GRID
+from tests.core_lib_tests.test_config import THREADED_CACHE_SIZE
+from tests.core_lib_tests.test_config import THREADED_STRIPE_HEIGHT
+from tests.core_lib_tests.test_config import THREADED_LARGE_GRID_DIM
+from tests.core_lib_tests.test_config import TORUS_GLIDER_N_TURN
+from tests.core_lib_tests.test_config import VALIDATION_LEVEL_BAD
 
 
 @pytest.fixture()
@@ -53,7 +173,6 @@ def test_core_behaviour() -> None:
     )
 
 
-# @pytest.mark.skip(reason="is way too slow")
 def test_load_core_behaviour() -> None:
 
     """checking core grid behaviour with a huge number of turn"""
@@ -68,6 +187,793 @@ def test_load_core_behaviour() -> None:
     )
 
 
+@pytest.mark.parametrize("engine", ENGINES)
+def test_advance_load_behaviour(engine) -> None:
+    """checking core grid behaviour with a huge number of turn, asked in one call"""
+
+    gameConfig = fetch_game_config()
+    gameConfig["simulation"]["engine"] = engine
+    grid = createGrid(gameConfig, LOAD_TEST_INIT_GRID)
+    grid.advance(LOAD_TEST_N_TURN)
+
+    assert grid._turn == LOAD_TEST_N_TURN
+    assert_array_equal(
+        grid.getCellMat(), LOAD_TEST_EXPECTED_GRID, err_msg="Grids aren't matching"
+    )
+
+
+def test_advance_no_allocation() -> None:
+    """checking that advancing n turns in one call swaps the two cell matrices without allocating memory"""
+
+    # the history allocates one diff per call, only the turns themselves are measured here
+    gameConfig = fetch_game_config()
+    gameConfig["simulation"]["history_budget"] = 0
+    grid: CoreGrid = CoreGrid(gameConfig, ADVANCE_SOUP_GRID)
+    reference_grid: CoreGrid = CoreGrid(fetch_game_config(), ADVANCE_SOUP_GRID)
+    buffers_ids = {id(grid.cell_mat), id(grid.old_cell_mat)}
+
+    tracemalloc.start()
+    grid.advance(ADVANCE_N_TURN)
+    _, peak_allocated_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    for _ in range(ADVANCE_N_TURN):
+        reference_grid.applyRules()
+
+    assert peak_allocated_bytes < ADVANCE_MAX_ALLOCATED_BYTES
+    assert {id(grid.cell_mat), id(grid.old_cell_mat)} == buffers_ids
+    assert_array_equal(
+        grid.getCellMat(), reference_grid.getCellMat(), err_msg="Grids aren't matching"
+    )
+
+
+def test_glider_behaviour() -> None:
+    """checking that a glider keeps its shape and moves one cell diagonally every 4 turns"""
+
+    grid: CoreGrid = CoreGrid(fetch_game_config(), GLIDER_INIT_GRID)
+    for _ in range(GLIDER_N_TURN):
+        grid.applyRules()
+
+    assert_array_equal(
+        grid.getCellMat(), GLIDER_EXPECTED_GRID, err_msg="Grids aren't matching"
+    )
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+@pytest.mark.parametrize(
+    "init_grid, expected_grid, n_turn",
+    [
+        (NORMAL_INIT_GRID, NORMAL_EXPECTED_GRID, NORMAL_N_TURN),
+        (LOAD_TEST_INIT_GRID, LOAD_TEST_EXPECTED_GRID, LOAD_TEST_N_TURN),
+        (GLIDER_INIT_GRID, GLIDER_EXPECTED_GRID, GLIDER_N_TURN),
+    ],
+)
+def test_engines_behaviour(engine, init_grid, expected_grid, n_turn) -> None:
+    """checking that every grid engine yields the expected grids after n turns"""
+
+    gameConfig = fetch_game_config()
+    gameConfig["simulation"]["engine"] = engine
+    grid = createGrid(gameConfig, init_grid)
+    for _ in range(n_turn):
+        grid.applyRules()
+
+    assert_array_equal(
+        grid.getCellMat(), expected_grid, err_msg="Grids aren't matching"
+    )
+    assert grid.getAliveCellCount() == expected_grid.sum()
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_engines_soup(engine) -> None:
+    """checking that every grid engine yields the same grids as the dense one on a random soup"""
+
+    gameConfig = fetch_game_config()
+    gameConfig["simulation"]["engine"] = engine
+    grid = createGrid(gameConfig, ENGINES_SOUP_GRID)
+    reference_grid: CoreGrid = CoreGrid(fetch_game_config(), ENGINES_SOUP_GRID)
+    for _ in range(ENGINES_SOUP_N_TURN):
+        grid.applyRules()
+        reference_grid.applyRules()
+
+    assert_array_equal(
+        grid.getCellMat(), reference_grid.getCellMat(), err_msg="Grids aren't matching"
+    )
+
+
+def test_frontier_still_life() -> None:
+    """checking that the frontier of a board settled into still lifes becomes empty, and that edited cells join it"""
+
+    grid: FrontierGrid = FrontierGrid(fetch_game_config(), STILL_LIFE_INIT_GRID)
+    grid.applyRules()
+
+    assert grid.frontier.size == 0
+    assert_array_equal(
+        grid.getCellMat(), STILL_LIFE_INIT_GRID, err_msg="Grids aren't matching"
+    )
+
+    grid.setCell(0, 0, 1)
+    grid.applyRules()
+    assert grid.getCellMat()[0][0] == 0
+
+
+@pytest.mark.parametrize("cache_size", [None, HASHLIFE_SMALL_CACHE_SIZE])
+def test_hashlife_behaviour(cache_size) -> None:
+    """checking that the hashlife engine matches the dense one far from the borders, turn by turn or in one call, even with a tiny results cache"""
+
+    gameConfig = fetch_game_config()
+    if cache_size is not None:
+        gameConfig["simulation"]["hashlife_cache_size"] = cache_size
+
+    reference_grid: CoreGrid = CoreGrid(fetch_game_config(), R_PENTOMINO_GRID)
+    grid: HashLifeGrid = HashLifeGrid(gameConfig, R_PENTOMINO_GRID)
+    stepped_grid: HashLifeGrid = HashLifeGrid(gameConfig, R_PENTOMINO_GRID)
+    for _ in range(R_PENTOMINO_N_TURN):
+        reference_grid.applyRules()
+        stepped_grid.applyRules()
+    grid.advance(R_PENTOMINO_N_TURN)
+
+    assert len(grid._results) <= grid.cache_size
+    for hashlife_grid in [grid, stepped_grid]:
+        assert_array_equal(
+            hashlife_grid.getCellMat(),
+            reference_grid.getCellMat(),
+            err_msg="Grids aren't matching",
+        )
+
+
+def test_hashlife_methuselah() -> None:
+    """checking that the hashlife engine reaches the final population of the R-pentomino in one jump"""
+
+    grid: HashLifeGrid = HashLifeGrid(fetch_game_config(), R_PENTOMINO_GRID)
+    grid.advancePow2(HASHLIFE_JUMP_POW2)
+
+    assert grid.getPlanePopulation() == R_PENTOMINO_FINAL_POPULATION
+
+
+def test_hashlife_jump() -> None:
+    """checking that the hashlife engine can jump 2^k generations, the glider leaves the window but stays on the plane"""
+
+    grid: HashLifeGrid = HashLifeGrid(fetch_game_config(), GLIDER_INIT_GRID)
+    grid.advancePow2(HASHLIFE_JUMP_POW2)
+
+    assert grid._turn == grid.getStats().turn == 1 << HASHLIFE_JUMP_POW2
+    assert (
+        grid.getPlanePopulation()
+        == grid.getStats().population
+        == GLIDER_INIT_GRID.sum()
+    )
+    assert grid.getAliveCellCount() == 0
+
+    grid.resetCellMat()
+    assert_array_equal(
+        grid.getCellMat(), GLIDER_INIT_GRID, err_msg="Grids aren't matching"
+    )
+
+
+def test_sparse_behaviour() -> None:
+    """checking that the sparse engine matches the dense one far from the borders, and that a glider travels on the unbounded plane"""
+
+    reference_grid: CoreGrid = CoreGrid(fetch_game_config(), R_PENTOMINO_GRID)
+    grid: SparseGrid = SparseGrid(fetch_game_config(), R_PENTOMINO_GRID)
+    for _ in range(R_PENTOMINO_N_TURN):
+        reference_grid.applyRules()
+        grid.applyRules()
+
+    assert_array_equal(
+        grid.getCellMat(), reference_grid.getCellMat(), err_msg="Grids aren't matching"
+    )
+
+    glider_grid: SparseGrid = SparseGrid(fetch_game_config(), GLIDER_INIT_GRID)
+    for _ in range(SPARSE_GLIDER_N_TURN):
+        glider_grid.applyRules()
+
+    assert glider_grid.getPlanePopulation() == GLIDER_INIT_GRID.sum()
+    assert glider_grid.getAliveCellCount() == 0
+    assert glider_grid.getBoundingBox() == SPARSE_GLIDER_EXPECTED_BOUNDING_BOX
+    top, left, _, _ = SPARSE_GLIDER_EXPECTED_BOUNDING_BOX
+    assert_array_equal(
+        glider_grid.getWindow(top - 1, left - 1, *GLIDER_EXPECTED_GRID.shape),
+        GLIDER_EXPECTED_GRID,
+        err_msg="Grids aren't matching",
+    )
+
+
+@pytest.mark.parametrize("boundary", list(BOUNDARY_EXPECTED_GRIDS.keys()))
+def test_boundaries(boundary) -> None:
+    """checking every boundary topology with a vertical blinker lying on the left border"""
+
+    gameConfig = fetch_game_config()
+    gameConfig["simulation"]["boundary"] = boundary
+    grid: CoreGrid = CoreGrid(gameConfig, BOUNDARY_INIT_GRID)
+    grid.applyRules()
+
+    assert_array_equal(
+        grid.getCellMat(),
+        BOUNDARY_EXPECTED_GRIDS[boundary],
+        err_msg="Grids aren't matching",
+    )
+
+
+def test_torus_glider() -> None:
+    """checking that a glider on a torus comes back to its initial position, after crossing both borders"""
+
+    gameConfig = fetch_game_config()
+    gameConfig["simulation"]["boundary"] = "torus"
+    grid: CoreGrid = CoreGrid(gameConfig, GLIDER_INIT_GRID)
+    grid.advance(TORUS_GLIDER_N_TURN)
+
+    assert_array_equal(
+        grid.getCellMat(), GLIDER_INIT_GRID, err_msg="Grids aren't matching"
+    )
+
+
+@pytest.mark.parametrize("boundary", list(BOUNDARY_EXPECTED_GRIDS.keys()))
+@pytest.mark.parametrize("rule", PARALLEL_RULES)
+def test_parallel_behaviour(boundary, rule) -> None:
+    """checking that the bands of the parallel engine yield the same grids as the dense one, and that every worker reports its timing"""
+
+    gameConfig = fetch_game_config()
+    gameConfig["simulation"]["boundary"] = boundary
+    gameConfig["simulation"]["rule"] = rule
+    gameConfig["simulation"]["workers"] = PARALLEL_N_WORKERS
+    grid: ParallelGrid = ParallelGrid(gameConfig, ENGINES_SOUP_GRID)
+    reference_grid: CoreGrid = CoreGrid(gameConfig, ENGINES_SOUP_GRID)
+    grid.advance(ENGINES_SOUP_N_TURN)
+    reference_grid.advance(ENGINES_SOUP_N_TURN)
+
+    assert_array_equal(
+        grid.getCellMat(), reference_grid.getCellMat(), err_msg="Grids aren't matching"
+    )
+    assert len(grid.getWorkerTimings()) == PARALLEL_N_WORKERS
+
+    grid.close()
+    assert_array_equal(
+        grid.getCellMat(), reference_grid.getCellMat(), err_msg="Grids aren't matching"
+    )
+
+
+def test_parallel_shutdown() -> None:
+    """checking that the shared memory is only released by the process which created the grid, and that releasing it twice is harmless"""
+
+    gameConfig = fetch_game_config()
+    gameConfig["simulation"]["workers"] = PARALLEL_N_WORKERS
+    grid: ParallelGrid = ParallelGrid(gameConfig, ENGINES_SOUP_GRID)
+    grid.advance(1)
+
+    # as if a copy of the grid were collected in a forked process
+    _shutdown(os.getpid() + 1, grid.processes, grid.connections, grid.shared_buffers)
+    grid.advance(1)
+
+    grid.shared_buffers[0].unlink()
+    grid.close()
+    grid.close()
+
+
+@pytest.mark.parametrize("boundary", list(BOUNDARY_EXPECTED_GRIDS.keys()))
+@pytest.mark.parametrize("rule", PARALLEL_RULES)
+def test_threaded_behaviour(boundary, rule, monkeypatch) -> None:
+    """checking that the stripes of the threaded engine, sized from the cache, yield the same grids as the dense one"""
+
+    monkeypatch.setattr(
+        "src.core_lib.ThreadedGrid.fetchCacheSize", lambda: THREADED_CACHE_SIZE
+    )
+    gameConfig = fetch_game_config()
+    gameConfig["simulation"]["boundary"] = boundary
+    gameConfig["simulation"]["rule"] = rule
+    gameConfig["simulation"]["workers"] = PARALLEL_N_WORKERS
+    grid = ThreadedGrid(gameConfig, ENGINES_SOUP_GRID)
+    reference_grid: CoreGrid = CoreGrid(gameConfig, ENGINES_SOUP_GRID)
+    grid.advance(ENGINES_SOUP_N_TURN)
+    reference_grid.advance(ENGINES_SOUP_N_TURN)
+    grid.close()
+
+    assert grid.stripe_height == THREADED_STRIPE_HEIGHT
+    assert len(grid.stripe_groups) == PARALLEL_N_WORKERS
+    assert_array_equal(
+        grid.getCellMat(), reference_grid.getCellMat(), err_msg="Grids aren't matching"
+    )
+
+
+def test_threaded_large_grid() -> None:
+    """checking that the threaded engine is not bounded by the resolution of the UI, a glider crossing a board larger than it"""
+
+    gameConfig = fetch_game_config()
+    gameConfig["simulation"]["workers"] = PARALLEL_N_WORKERS
+    cell_mat: np.ndarray = np.zeros(THREADED_LARGE_GRID_DIM, dtype=np.uint8)
+    cell_mat[
+        : GLIDER_INIT_GRID.shape[0], : GLIDER_INIT_GRID.shape[1]
+    ] = GLIDER_INIT_GRID
+    grid = ThreadedGrid(gameConfig, cell_mat)
+    grid.advance(GLIDER_N_TURN)
+    grid.close()
+
+    assert_array_equal(
+        grid.getCellMat()[
+            : GLIDER_EXPECTED_GRID.shape[0], : GLIDER_EXPECTED_GRID.shape[1]
+        ],
+        GLIDER_EXPECTED_GRID,
+        err_msg="Grids aren't matching",
+    )
+    assert grid.getAliveCellCount() == np.count_nonzero(GLIDER_EXPECTED_GRID)
+
+
+def test_ensemble_behaviour() -> None:
+    """checking the population, extinction and stabilization of every board of an ensemble, and that every board drops out of the active batch"""
+
+    ensemble: EnsembleGrid = EnsembleGrid(fetch_game_config(), ENSEMBLE_BOARDS)
+    ensemble.advance(ENSEMBLE_N_TURN)
+
+    assert_array_equal(
+        ensemble.getExtinctionTurns(), ENSEMBLE_EXPECTED_EXTINCTION_TURNS
+    )
+    assert_array_equal(
+        ensemble.getStabilizationTurns(), ENSEMBLE_EXPECTED_STABILIZATION_TURNS
+    )
+    assert_array_equal(ensemble.getPopulations(), ENSEMBLE_EXPECTED_POPULATIONS)
+    assert ensemble.getActiveBoards().size == 0
+
+
+def test_ensemble_b0() -> None:
+    """checking that the empty boards of an ensemble are not extinct under a B0 rule, their cells being born on the next turn"""
+
+    gameConfig = fetch_game_config()
+    gameConfig["simulation"]["rule"] = ENSEMBLE_B0_RULE
+    ensemble: EnsembleGrid = EnsembleGrid(gameConfig, ENSEMBLE_B0_BOARDS)
+
+    assert (ensemble.getExtinctionTurns() == NOT_YET).all()
+    assert ensemble.getActiveBoards().size == ENSEMBLE_B0_BOARDS.shape[0]
+
+    ensemble.applyRules()
+    assert_array_equal(ensemble.getPopulations(), ENSEMBLE_B0_EXPECTED_POPULATIONS)
+
+
+@pytest.mark.parametrize("rule", ENSEMBLE_SOUP_RULES)
+@pytest.mark.parametrize("boundary", ["dead", "torus"])
+def test_ensemble_soup(boundary, rule) -> None:
+    """checking that every board of an ensemble matches its own dense grid, advanced until the board dropped out, and that the cycle of the stabilized boards starts on their stabilization turn"""
+
+    gameConfig = fetch_game_config()
+    gameConfig["simulation"]["boundary"] = boundary
+    gameConfig["simulation"]["rule"] = rule
+    ensemble: EnsembleGrid = EnsembleGrid(gameConfig, ENSEMBLE_SOUP_BOARDS)
+    ensemble.advance(ENSEMBLE_SOUP_N_TURN)
+    stop_turns = np.maximum(
+        ensemble.getExtinctionTurns(), ensemble.getStabilizationTurns()
+    )
+
+    for board, stop_turn in enumerate(stop_turns):
+        grid: CoreGrid = CoreGrid(gameConfig, ENSEMBLE_SOUP_BOARDS[board])
+        grid.advance(ENSEMBLE_SOUP_N_TURN if stop_turn == NOT_YET else stop_turn)
+
+        assert_array_equal(
+            ensemble.getCellMats()[board],
+            grid.getCellMat(),
+            err_msg="Grids aren't matching",
+        )
+        assert ensemble.getPopulations()[board] == grid.getAliveCellCount()
+
+        stabilization_turn = ensemble.getStabilizationTurns()[board]
+        if stabilization_turn > 0:
+            # the state of the turn before is not part of the cycle (of period 1 or 2)
+            grid = CoreGrid(gameConfig, ENSEMBLE_SOUP_BOARDS[board])
+            grid.advance(stabilization_turn - 1)
+            before_cycle = grid.getCellMat().copy()
+            for _ in range(2):
+                grid.applyRules()
+                assert not np.array_equal(before_cycle, grid.getCellMat())
+
+
+def test_cycle_detection() -> None:
+    """checking that a still life and a blinker are detected as cycles, and that the cells changed by hand restart the detection"""
+
+    for name, init_grid in [
+        ("still_life", CYCLE_STILL_LIFE_GRID),
+        ("blinker", CYCLE_BLINKER_GRID),
+    ]:
+        gameConfig = fetch_game_config()
+        gameConfig["simulation"]["cycle_table_size"] = CYCLE_TABLE_SIZE
+        grid: CoreGrid = CoreGrid(gameConfig, init_grid)
+        # the cycle found by the fingerprints is confirmed one period later, once the cells came back
+        for _ in range(2 * CYCLE_EXPECTED[name][1]):
+            assert grid.getCycle() is None
+            grid.applyRules()
+        assert grid.getCycle() == CYCLE_EXPECTED[name]
+
+    grid.setCell(0, 0, 1)
+    assert grid.getCycle() is None
+    assert grid.getFingerprint() == grid._computeFingerprint()
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_cycle_fast_forward(engine) -> None:
+    """checking that a soup fast-forwarded through its cycle matches the same soup computed turn by turn, fingerprints included"""
+
+    gameConfig = fetch_game_config()
+    gameConfig["simulation"]["engine"] = engine
+    gameConfig["simulation"]["cycle_table_size"] = CYCLE_TABLE_SIZE
+    grid = createGrid(gameConfig, ENGINES_SOUP_GRID)
+    reference_config = fetch_game_config()
+    reference_config["simulation"]["engine"] = engine
+    reference_config["simulation"]["cycle_table_size"] = 0
+    reference_grid = createGrid(reference_config, ENGINES_SOUP_GRID)
+
+    for _ in range(CYCLE_SOUP_N_TURN):
+        grid.applyRules()
+    assert grid.getCycle() is not None
+    assert grid.getFingerprint() == grid._computeFingerprint()
+
+    grid.advance(CYCLE_FAST_FORWARD_N_TURN)
+    reference_grid.advance(CYCLE_SOUP_N_TURN + CYCLE_FAST_FORWARD_N_TURN)
+
+    assert grid._turn == reference_grid._turn
+    assert grid.getFingerprint() == reference_grid.getFingerprint()
+    assert_array_equal(
+        grid.getCellMat(), reference_grid.getCellMat(), err_msg="Grids aren't matching"
+    )
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_cycle_long_advance(engine) -> None:
+    """checking that a blinker advanced by a huge number of turns in one call is detected as a cycle and fast-forwarded"""
+
+    gameConfig = fetch_game_config()
+    gameConfig["simulation"]["engine"] = engine
+    gameConfig["simulation"]["cycle_table_size"] = CYCLE_TABLE_SIZE
+    grid = createGrid(gameConfig, CYCLE_BLINKER_GRID)
+    grid.advance(CYCLE_LONG_N_TURN)
+
+    assert grid.getCycle() is not None
+    assert grid._turn == grid.getStats().turn == CYCLE_LONG_N_TURN
+    assert_array_equal(
+        grid.getCellMat(), CYCLE_BLINKER_GRID, err_msg="Grids aren't matching"
+    )
+
+    grid.close()
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_fingerprint_updates(engine) -> None:
+    """checking that the fingerprint updated by the steps and the edits matches the one computed from scratch, and that the cycle detection is off by default"""
+
+    gameConfig = fetch_game_config()
+    gameConfig["simulation"]["engine"] = engine
+    grid = createGrid(gameConfig, ENGINES_SOUP_GRID)
+    fingerprint: int = grid.getFingerprint()
+
+    grid.advance(CYCLE_SOUP_N_TURN)
+    assert grid.getCycle() is None
+    assert grid.getFingerprint() != fingerprint
+    assert grid.getFingerprint() == grid._computeFingerprint()
+
+    grid.setCell(1, 1, 1)
+    grid.setCells(BULK_EDIT_COORDS, BULK_EDIT_VALUES)
+    grid.applyRules()
+    assert grid.getFingerprint() == grid._computeFingerprint()
+
+    grid.close()
+
+
+def test_cycle_free_glider() -> None:
+    """checking that a glider crossing a wide packed grid is never taken for a cycle, its states being all different"""
+
+    gameConfig = fetch_game_config()
+    gameConfig["simulation"]["engine"] = "bitpacked"
+    gameConfig["simulation"]["cycle_table_size"] = CYCLE_TABLE_SIZE
+    cell_mat: np.ndarray = np.zeros(CYCLE_GLIDER_GRID_DIM, dtype=np.uint8)
+    cell_mat[
+        : GLIDER_INIT_GRID.shape[0], : GLIDER_INIT_GRID.shape[1]
+    ] = GLIDER_INIT_GRID
+    grid = createGrid(gameConfig, cell_mat)
+    grid.advance(CYCLE_GLIDER_N_TURN)
+
+    assert grid.getCycle() is None
+    assert grid.getStats().bounding_box == CYCLE_GLIDER_EXPECTED_BOUNDING_BOX
+
+
+def test_bitpacked_pack() -> None:
+    """checking that the packed grid packs the cells block of rows by block of rows, and only checks them when the validation is not off"""
+
+    gameConfig = fetch_game_config()
+    gameConfig["simulation"]["engine"] = "bitpacked"
+    grid = createGrid(gameConfig, PACK_SOUP_GRID)
+    assert_array_equal(grid.getCellMat(), PACK_SOUP_GRID)
+
+    cell_mat: np.ndarray = PACK_SOUP_GRID.copy()
+    cell_mat[PACK_INCORRECT_CELL] = INCORRECT_VALUE_SET_CELL
+    with pytest.raises(AssertionError):
+        grid.initCellMat(cell_mat)
+
+    gameConfig["simulation"]["validation"] = "off"
+    grid = createGrid(gameConfig, cell_mat)
+    expected_cell_mat: np.ndarray = PACK_SOUP_GRID.copy()
+    expected_cell_mat[PACK_INCORRECT_CELL] = 0
+    assert_array_equal(grid.getCellMat(), expected_cell_mat)
+
+
+@pytest.mark.parametrize("engine", ENGINES + ["hashlife", "sparse"])
+def test_stats(engine) -> None:
+    """checking that the statistics collected by the engine match the ones computed from the cell matrices"""
+
+    gameConfig = fetch_game_config()
+    gameConfig["simulation"]["engine"] = engine
+    grid = createGrid(gameConfig, STATS_INIT_GRID)
+    reference_grid: CoreGrid = CoreGrid(fetch_game_config(), STATS_INIT_GRID)
+
+    assert vars(grid.getStats()) == vars(
+        GridStats.fromAliveMasks(0, STATS_INIT_GRID == 1)
+    )
+
+    for n_turn in STATS_N_TURNS:
+        grid.advance(n_turn)
+        reference_grid.advance(n_turn - 1)
+        previous_cell_mat = reference_grid.getCellMat().copy()
+        reference_grid.advance(1)
+
+        expected_stats = GridStats.fromAliveMasks(
+            reference_grid._turn,
+            reference_grid.getCellMat() == 1,
+            previous_cell_mat == 1,
+        )
+        if engine == "hashlife":
+            expected_stats.births, expected_stats.deaths = None, None
+        assert vars(grid.getStats()) == vars(expected_stats)
+        assert grid.getAliveCellCount() == expected_stats.population
+
+    for i, j, value in STATS_SET_CELLS:
+        grid.setCell(i, j, value)
+        reference_grid.setCell(i, j, value)
+        assert vars(grid.getStats()) == vars(
+            GridStats.fromAliveMasks(
+                reference_grid._turn, reference_grid.getCellMat() == 1
+            )
+        )
+
+    grid.close()
+
+
+@pytest.mark.parametrize("boundary", list(BOUNDARY_EXPECTED_GRIDS.keys()))
+@pytest.mark.parametrize("engine", ["dense", "threaded"])
+def test_stats_boundaries(engine, boundary) -> None:
+    """checking that the statistics collected around the previous bounding box follow the cells crossing the border of the grid"""
+
+    gameConfig = fetch_game_config()
+    gameConfig["simulation"]["engine"] = engine
+    gameConfig["simulation"]["boundary"] = boundary
+    grid = createGrid(gameConfig, STATS_BOUNDARY_INIT_GRID)
+    reference_grid = createGrid(gameConfig, STATS_BOUNDARY_INIT_GRID)
+
+    for n_turn in STATS_BOUNDARY_N_TURNS:
+        grid.advance(n_turn)
+        reference_grid.advance(n_turn - 1)
+        previous_cell_mat = reference_grid.getCellMat().copy()
+        reference_grid.advance(1)
+
+        assert vars(grid.getStats()) == vars(
+            GridStats.fromAliveMasks(
+                reference_grid._turn,
+                reference_grid.getCellMat() == 1,
+                previous_cell_mat == 1,
+            )
+        )
+
+    grid.close()
+    reference_grid.close()
+
+
+@pytest.mark.parametrize("sample_every", DIFF_SAMPLE_EVERY)
+@pytest.mark.parametrize("engine", ENGINES + ["hashlife", "sparse"])
+def test_generation_diffs(engine, sample_every) -> None:
+    """checking that the cells born and dead yielded by the engine rebuild the generations computed turn by turn"""
+
+    gameConfig = fetch_game_config()
+    gameConfig["simulation"]["engine"] = engine
+    grid = createGrid(gameConfig, STATS_INIT_GRID)
+    reference_grid: CoreGrid = CoreGrid(fetch_game_config(), STATS_INIT_GRID)
+    cells = STATS_INIT_GRID.copy()
+
+    for diff in grid.iterGenerations(DIFF_N_TURN, sample_every):
+        reference_grid.advance(diff.span)
+        assert diff.turn == reference_grid._turn
+        assert diff.span == min(sample_every, DIFF_N_TURN - diff.turn + diff.span)
+        cells[diff.born] = 1
+        cells[diff.died] = 0
+        assert_array_equal(
+            cells, reference_grid.getCellMat(), err_msg="Grids aren't matching"
+        )
+        if sample_every == 1:
+            assert (diff.births, diff.deaths) == (
+                reference_grid.getStats().births,
+                reference_grid.getStats().deaths,
+            )
+    assert reference_grid._turn == DIFF_N_TURN
+
+    grid.close()
+
+
+@pytest.mark.parametrize("engine", ["hashlife", "sparse"])
+def test_plane_counts(engine) -> None:
+    """checking that the counts of a plane cover its window, while its statistics and its population cover the whole plane, as a glider leaves the window"""
+
+    gameConfig = fetch_game_config()
+    gameConfig["simulation"]["engine"] = engine
+    grid = createGrid(gameConfig, GLIDER_INIT_GRID)
+    for n_turn in [0, DIFF_PLANE_N_TURN]:
+        grid.advance(n_turn)
+        window_population: int = int(np.count_nonzero(grid.getCellMat()))
+
+        assert grid.getAliveCellCount() == grid.getWindowPopulation()
+        assert grid.getWindowPopulation() == window_population
+        assert grid.getDeadCellCount() == GLIDER_INIT_GRID.size - window_population
+        assert grid.getPlanePopulation() == grid.getStats().population
+        assert grid.getPlanePopulation() == GLIDER_INIT_GRID.sum()
+    assert grid.getWindowPopulation() == 0
+
+
+@pytest.mark.parametrize("sample_every", DIFF_SAMPLE_EVERY)
+@pytest.mark.parametrize("engine", ["hashlife", "sparse"])
+def test_generation_diffs_plane(engine, sample_every) -> None:
+    """checking that the diffs of a plane only give the cells of its window, while a glider leaves it"""
+
+    gameConfig = fetch_game_config()
+    gameConfig["simulation"]["engine"] = engine
+    grid = createGrid(gameConfig, GLIDER_INIT_GRID)
+    cells = GLIDER_INIT_GRID.copy()
+
+    for diff in grid.iterGenerations(DIFF_PLANE_N_TURN, sample_every):
+        cells[diff.born] = 1
+        cells[diff.died] = 0
+        assert_array_equal(cells, grid.getCellMat(), err_msg="Grids aren't matching")
+    assert not cells.any() and grid.getPlanePopulation() == GLIDER_INIT_GRID.sum()
+
+
+def test_generation_diffs_back_pressure() -> None:
+    """checking that a generation is only computed when its diff is asked for, and that a consumer can ask for a diff spanning several generations"""
+
+    grid: CoreGrid = CoreGrid(fetch_game_config(), GLIDER_INIT_GRID)
+    diffs = grid.iterGenerations()
+    assert grid._turn == 0
+
+    assert next(diffs).turn == 1 and grid._turn == 1
+    diff = diffs.send(DIFF_SENT_SPAN)
+    assert diff.span == DIFF_SENT_SPAN and diff.turn == grid._turn == 1 + DIFF_SENT_SPAN
+    # the glider moved by one cell diagonally
+    assert diff.births == diff.deaths and grid.getAliveCellCount() == 5
+    assert next(diffs).span == 1
+
+    with pytest.raises(AssertionError):
+        next(grid.iterGenerations(sample_every=0))
+
+
+def test_stats_multi_state() -> None:
+    """checking that the dying cells of a Generations rule are counted neither as alive nor as dead"""
+
+    gameConfig = fetch_game_config()
+    gameConfig["simulation"]["rule"] = BRIANS_BRAIN_RULE
+    grid: CoreGrid = CoreGrid(gameConfig, BRIANS_BRAIN_INIT_GRID)
+    grid.applyRules()
+
+    assert grid.getAliveCellCount() == np.count_nonzero(grid.getCellMat() == 1)
+    assert grid.getDeadCellCount() == np.count_nonzero(grid.getCellMat() == 0)
+    assert grid.getStats().deaths == np.count_nonzero(grid.getCellMat() == 2)
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_bad_boundary(engine) -> None:
+    """checking that an unknown boundary, or a boundary not supported by the engine, raises expected error"""
+
+    gameConfig = fetch_game_config()
+    gameConfig["simulation"]["engine"] = engine
+    gameConfig["simulation"]["boundary"] = BAD_BOUNDARY
+    with pytest.raises(AssertionError):
+        grid = createGrid(gameConfig, NORMAL_INIT_GRID)
+
+
+@pytest.mark.parametrize("engine", ENGINES + ["hashlife", "sparse"])
+def test_rules(engine) -> None:
+    """checking a rule other than the Game of Life one on every engine, and that every engine matches the dense one with the HighLife rule"""
+
+    gameConfig = fetch_game_config()
+    gameConfig["simulation"]["engine"] = engine
+    gameConfig["simulation"]["rule"] = SEEDS_RULE
+    grid = createGrid(gameConfig, SEEDS_INIT_GRID)
+    grid.applyRules()
+
+    assert_array_equal(
+        grid.getCellMat(), SEEDS_EXPECTED_GRID, err_msg="Grids aren't matching"
+    )
+
+    gameConfig["simulation"]["rule"] = HIGHLIFE_RULE
+    reference_config = fetch_game_config()
+    reference_config["simulation"]["rule"] = HIGHLIFE_RULE
+    grid = createGrid(gameConfig, R_PENTOMINO_GRID)
+    reference_grid: CoreGrid = CoreGrid(reference_config, R_PENTOMINO_GRID)
+    grid.advance(R_PENTOMINO_N_TURN)
+    reference_grid.advance(R_PENTOMINO_N_TURN)
+
+    assert_array_equal(
+        grid.getCellMat(), reference_grid.getCellMat(), err_msg="Grids aren't matching"
+    )
+
+
+@pytest.mark.parametrize("rule", BAD_RULES)
+def test_bad_rules(rule) -> None:
+    """checking that bad rulestrings raise expected error"""
+
+    gameConfig = fetch_game_config()
+    gameConfig["simulation"]["rule"] = rule
+    with pytest.raises(AssertionError):
+        grid: CoreGrid = CoreGrid(gameConfig, NORMAL_INIT_GRID)
+
+
+@pytest.mark.parametrize("engine", B0_UNSUPPORTED_ENGINES)
+def test_b0_rule_unsupported(engine) -> None:
+    """checking that B0 rules raise expected error on the engines that cannot handle them"""
+
+    gameConfig = fetch_game_config()
+    gameConfig["simulation"]["engine"] = engine
+    gameConfig["simulation"]["rule"] = B0_RULE
+    with pytest.raises(AssertionError):
+        grid = createGrid(gameConfig, NORMAL_INIT_GRID)
+
+
+def test_generations_rules() -> None:
+    """checking the multi-state Generations rules : the births, the decay of the cells which do not survive, and their death after the last dying state"""
+
+    gameConfig = fetch_game_config()
+    gameConfig["simulation"]["rule"] = BRIANS_BRAIN_RULE
+    grid: CoreGrid = CoreGrid(gameConfig, BRIANS_BRAIN_INIT_GRID)
+
+    for expected_grid in BRIANS_BRAIN_EXPECTED_GRIDS:
+        grid.applyRules()
+        assert_array_equal(
+            grid.getCellMat(), expected_grid, err_msg="Grids aren't matching"
+        )
+
+    gameConfig["simulation"]["rule"] = STAR_WARS_RULE
+    grid = CoreGrid(gameConfig, STAR_WARS_INIT_GRID)
+    row, col = STAR_WARS_INIT_GRID.nonzero()
+
+    for expected_state in STAR_WARS_EXPECTED_STATES:
+        grid.applyRules()
+        assert grid.getCellMat()[row[0], col[0]] == expected_state
+
+
+@pytest.mark.parametrize("engine", MANY_STATES_ENGINES)
+def test_generations_many_states(engine) -> None:
+    """checking a Generations rule whose rule indexes need 2 bytes, a lone cell decaying through every dying state"""
+
+    gameConfig = fetch_game_config()
+    gameConfig["simulation"]["engine"] = engine
+    gameConfig["simulation"]["rule"] = MANY_STATES_RULE
+    grid = createGrid(gameConfig, STAR_WARS_INIT_GRID)
+    row, col = STAR_WARS_INIT_GRID.nonzero()
+
+    for expected_state in MANY_STATES_EXPECTED_STATES:
+        grid.applyRules()
+        assert grid.getCellMat()[row[0], col[0]] == expected_state
+    grid.close()
+
+
+def test_incorrect_multi_state_grid() -> None:
+    """checking that cells above the last dying state of the rule raise expected error"""
+
+    gameConfig = fetch_game_config()
+    gameConfig["simulation"]["rule"] = BRIANS_BRAIN_RULE
+    with pytest.raises(AssertionError):
+        grid: CoreGrid = CoreGrid(gameConfig, INCORRECT_MULTI_STATE_INIT_GRID)
+
+
+@pytest.mark.parametrize("engine", MULTI_STATE_UNSUPPORTED_ENGINES)
+def test_multi_state_rule_unsupported(engine) -> None:
+    """checking that multi-state rules raise expected error on the engines that only hold dead or alive cells"""
+
+    gameConfig = fetch_game_config()
+    gameConfig["simulation"]["engine"] = engine
+    gameConfig["simulation"]["rule"] = BRIANS_BRAIN_RULE
+    with pytest.raises(AssertionError):
+        grid = createGrid(gameConfig, NORMAL_INIT_GRID)
+
+
 @pytest.mark.parametrize(
     "test_input_grid_dim", [BAD_DIM_GRID_HIGH, BAD_DIM_GRID_LOW, BAD_DIM_GRID_ODD]
 )
@@ -97,6 +1003,390 @@ def test_no_living_cells() -> None:
     )
 
 
+@pytest.mark.parametrize("engine", CELL_BUFFER_ENGINES)
+def test_cell_buffer_sharing(engine) -> None:
+    """checking that a released cell buffer becomes the initial state of the grid without copy, and that the consumers only get read-only views"""
+
+    editor = object()
+    cells: CellBuffer = CellBuffer(NORMAL_INIT_GRID, owner=editor)
+    cells.writable(editor)[0][0] = 1
+
+    gameConfig = fetch_game_config()
+    gameConfig["simulation"]["engine"] = engine
+    with pytest.raises(AssertionError):
+        createGrid(gameConfig, cells)
+
+    grid = createGrid(gameConfig, cells.release(editor))
+    assert np.shares_memory(grid.initial_cell_mat, cells.view())
+    assert grid.getCellMat()[0][0] == 1
+
+    with pytest.raises(AssertionError):
+        cells.writable(editor)
+    with pytest.raises(ValueError):
+        grid.getCellMat()[0][0] = 0
+
+    grid.applyRules()
+    grid.resetCellMat()
+    assert_array_equal(grid.getCellMat(), cells.view())
+
+
+@pytest.mark.parametrize("engine", ENGINES + ["hashlife", "sparse"])
+def test_reset(engine) -> None:
+    """checking that resetting the grid, or setting it to new cells, starts counting the turns over"""
+
+    gameConfig = fetch_game_config()
+    gameConfig["simulation"]["engine"] = engine
+    grid = createGrid(gameConfig, NORMAL_INIT_GRID)
+    grid.advance(NORMAL_N_TURN)
+
+    grid.resetCellMat()
+    assert grid._turn == 0 and grid.getStats().turn == 0
+    assert_array_equal(
+        grid.getCellMat(), NORMAL_INIT_GRID, err_msg="Grids aren't matching"
+    )
+
+    grid.advance(NORMAL_N_TURN)
+    grid.initCellMat(NORMAL_INIT_GRID)
+    assert grid._turn == 0 and grid.getStats().turn == 0
+    grid.advance(NORMAL_N_TURN)
+    assert_array_equal(
+        grid.getCellMat(), NORMAL_EXPECTED_GRID, err_msg="Grids aren't matching"
+    )
+
+    grid.close()
+
+
+@pytest.mark.parametrize("engine", ENGINES + ["hashlife", "sparse"])
+def test_bulk_edit(engine) -> None:
+    """checking that the cells set in bulk and the pasted regions give the expected grid and statistics, and that the incoming cells are validated"""
+
+    gameConfig = fetch_game_config()
+    gameConfig["simulation"]["engine"] = engine
+    grid = createGrid(gameConfig, np.zeros(BULK_EDIT_GRID_DIM))
+
+    expected_grid: np.ndarray = np.zeros(BULK_EDIT_GRID_DIM, dtype=np.uint8)
+    for (i, j), value in zip(BULK_EDIT_COORDS, BULK_EDIT_VALUES):
+        expected_grid[i][j] = value
+    top, left = BULK_EDIT_REGION_CORNER
+    expected_grid[
+        top : top + BULK_EDIT_REGION.shape[0], left : left + BULK_EDIT_REGION.shape[1]
+    ] = BULK_EDIT_REGION
+
+    grid.setCells(BULK_EDIT_COORDS, BULK_EDIT_VALUES)
+    grid.pasteRegion(top, left, BULK_EDIT_REGION)
+
+    assert_array_equal(
+        grid.getCellMat(), expected_grid, err_msg="Grids aren't matching"
+    )
+    assert vars(grid.getStats()) == vars(
+        GridStats.fromAliveMasks(grid.getStats().turn, expected_grid == 1)
+    )
+
+    for coords, values in BULK_EDIT_INCORRECT_EDITS:
+        with pytest.raises(AssertionError):
+            grid.setCells(coords, values)
+    for top, left, region in BULK_EDIT_INCORRECT_REGIONS:
+        with pytest.raises(AssertionError):
+            grid.pasteRegion(top, left, region)
+    assert_array_equal(
+        grid.getCellMat(), expected_grid, err_msg="Grids aren't matching"
+    )
+
+    grid.close()
+
+
+@pytest.mark.parametrize("keyframe_interval", HISTORY_KEYFRAME_INTERVALS)
+@pytest.mark.parametrize("engine", ENGINES)
+def test_history(engine, keyframe_interval) -> None:
+    """checking that the grid steps back and seeks to the generations it went through, and that the cells set by hand are kept"""
+
+    gameConfig = fetch_game_config()
+    gameConfig["simulation"]["engine"] = engine
+    gameConfig["simulation"]["history_budget"] = DEFAULT_HISTORY_BUDGET
+    gameConfig["simulation"]["history_keyframe_interval"] = keyframe_interval
+    grid = createGrid(gameConfig, ENGINES_SOUP_GRID)
+
+    expected_grids = [np.array(grid.getCellMat())]
+    for _ in range(HISTORY_N_TURN):
+        grid.advance(1)
+        expected_grids.append(np.array(grid.getCellMat()))
+    assert grid.getHistoryTurns() == list(range(HISTORY_N_TURN + 1))
+
+    for turn in HISTORY_SEEK_TURNS:
+        grid.seek(turn)
+        assert_array_equal(
+            grid.getCellMat(), expected_grids[turn], err_msg="Grids aren't matching"
+        )
+        assert vars(grid.getStats()) == vars(
+            GridStats.fromAliveMasks(turn, expected_grids[turn] == 1)
+        )
+
+    # going on from an older generation forgets the newer ones
+    grid.stepBack()
+    grid.advance(1)
+    assert grid.getHistoryTurns() == list(range(HISTORY_SEEK_TURNS[-1] + 1))
+    assert_array_equal(
+        grid.getCellMat(),
+        expected_grids[HISTORY_SEEK_TURNS[-1]],
+        err_msg="Grids aren't matching",
+    )
+
+    grid.setCell(0, 0, 1)
+    edited_grid = np.array(grid.getCellMat())
+    grid.advance(1)
+    grid.stepBack()
+    assert_array_equal(grid.getCellMat(), edited_grid, err_msg="Grids aren't matching")
+
+    grid.seek(0)
+    grid.stepBack()
+    assert_array_equal(
+        grid.getCellMat(), ENGINES_SOUP_GRID, err_msg="Grids aren't matching"
+    )
+    with pytest.raises(AssertionError):
+        grid.seek(HISTORY_N_TURN)
+
+    grid.close()
+
+
+def test_history_budget() -> None:
+    """checking that the oldest generations are evicted to fit in the memory budget, that nothing is kept for a grid larger than the budget,
+    and that the history is disabled by default"""
+
+    gameConfig = fetch_game_config()
+    gameConfig["simulation"]["history_budget"] = HISTORY_SMALL_BUDGET
+    grid: CoreGrid = CoreGrid(gameConfig, ENGINES_SOUP_GRID)
+    for _ in range(HISTORY_N_TURN):
+        grid.advance(1)
+        assert grid.history.bytes <= HISTORY_SMALL_BUDGET
+
+    turns = grid.getHistoryTurns()
+    assert 0 < len(turns) < HISTORY_N_TURN and turns[-1] == HISTORY_N_TURN
+    grid.seek(turns[0])
+    with pytest.raises(AssertionError):
+        grid.seek(turns[0] - 1)
+
+    gameConfig["simulation"]["history_budget"] = HISTORY_TINY_BUDGET
+    grid = CoreGrid(gameConfig, ENGINES_SOUP_GRID)
+    grid.advance(HISTORY_N_TURN)
+    assert grid.getHistoryTurns() == [] and grid.history._cells.size == 0
+
+    # the history is only kept when the config gives it a budget
+    grid = CoreGrid(fetch_game_config(), ENGINES_SOUP_GRID)
+    grid.advance(HISTORY_N_TURN)
+    grid.stepBack()
+    assert grid.getHistoryTurns() == [] and grid._turn == HISTORY_N_TURN
+
+
+@pytest.mark.parametrize("engine", ENGINES + ["hashlife", "sparse"])
+def test_checkpoint(engine, tmp_path) -> None:
+    """checking that a checkpoint saved by the engine resumes the same generation with the dense grid, and the other way around"""
+
+    checkpoint_path = str(tmp_path / CHECKPOINT_FILE_NAME)
+    gameConfig = fetch_game_config()
+    gameConfig["simulation"]["engine"] = engine
+    grid = createGrid(gameConfig, ENGINES_SOUP_GRID)
+    grid.advance(CHECKPOINT_N_TURN)
+    grid.saveCheckpoint(checkpoint_path)
+
+    if engine in CHECKPOINT_PLANE_ENGINES:
+        # the soup grew out of the window of the plane
+        top, left, bottom, right = grid.getStats().bounding_box
+        assert readCheckpointHeader(checkpoint_path)["payload_dim"] == (
+            bottom - top + 1,
+            right - left + 1,
+        )
+    else:
+        assert os.path.getsize(checkpoint_path) == (
+            CHECKPOINT_HEADER_SIZE
+            + ENGINES_SOUP_GRID.shape[0] * CHECKPOINT_PAYLOAD_ROW_BYTES
+        )
+    resumed_grid: CoreGrid = CoreGrid(
+        fetch_game_config(), np.zeros_like(ENGINES_SOUP_GRID)
+    )
+    resumed_grid.loadCheckpoint(checkpoint_path)
+    assert resumed_grid.getStats().turn == CHECKPOINT_N_TURN
+    assert_array_equal(
+        resumed_grid.getCellMat(), grid.getCellMat(), err_msg="Grids aren't matching"
+    )
+
+    resumed_grid.advance(1)
+    resumed_grid.saveCheckpoint(checkpoint_path)
+    grid.loadCheckpoint(checkpoint_path)
+    assert grid.getStats().turn == CHECKPOINT_N_TURN + 1
+    assert_array_equal(
+        grid.getCellMat(), resumed_grid.getCellMat(), err_msg="Grids aren't matching"
+    )
+
+    grid.close()
+
+
+@pytest.mark.parametrize("resumed_engine", CHECKPOINT_PLANE_ENGINES)
+@pytest.mark.parametrize("engine", CHECKPOINT_PLANE_ENGINES)
+def test_checkpoint_plane(engine, resumed_engine, tmp_path) -> None:
+    """checking that the checkpoint of a plane holds the cells which left the window, and that they are resumed at their place"""
+
+    checkpoint_path = str(tmp_path / CHECKPOINT_FILE_NAME)
+    gameConfig = fetch_game_config()
+    gameConfig["simulation"]["engine"] = engine
+    grid = createGrid(gameConfig, GLIDER_INIT_GRID)
+    grid.advance(CHECKPOINT_PLANE_N_TURN)
+    assert grid.getAliveCellCount() == 0
+    grid.saveCheckpoint(checkpoint_path)
+    assert (
+        readCheckpointHeader(checkpoint_path)["origin"]
+        == grid.getStats().bounding_box[:2]
+    )
+
+    gameConfig["simulation"]["engine"] = resumed_engine
+    resumed_grid = createGrid(gameConfig, np.zeros_like(GLIDER_INIT_GRID))
+    resumed_grid.loadCheckpoint(checkpoint_path)
+    assert resumed_grid.getStats().turn == CHECKPOINT_PLANE_N_TURN
+
+    # the glider keeps flying the same way from the cells resumed
+    for plane_grid in [grid, resumed_grid]:
+        plane_grid.advance(CHECKPOINT_PLANE_N_TURN)
+    assert resumed_grid.getPlanePopulation() == grid.getPlanePopulation()
+    assert resumed_grid.getStats().bounding_box == grid.getStats().bounding_box
+
+
+def test_checkpoint_multi_state(tmp_path) -> None:
+    """checking that the dying cells of a Generations rule are saved and resumed"""
+
+    checkpoint_path = str(tmp_path / CHECKPOINT_FILE_NAME)
+    gameConfig = fetch_game_config()
+    gameConfig["simulation"]["rule"] = BRIANS_BRAIN_RULE
+    grid: CoreGrid = CoreGrid(gameConfig, BRIANS_BRAIN_INIT_GRID)
+    grid.advance(1)
+    grid.saveCheckpoint(checkpoint_path)
+
+    resumed_grid: CoreGrid = CoreGrid(gameConfig, np.zeros_like(BRIANS_BRAIN_INIT_GRID))
+    resumed_grid.loadCheckpoint(checkpoint_path)
+    assert_array_equal(
+        resumed_grid.getCellMat(), grid.getCellMat(), err_msg="Grids aren't matching"
+    )
+
+
+def test_incorrect_checkpoint(tmp_path) -> None:
+    """checking that a checkpoint of another grid, or a file which is not a checkpoint, raises expected error"""
+
+    checkpoint_path = str(tmp_path / CHECKPOINT_FILE_NAME)
+    CoreGrid(fetch_game_config(), ENGINES_SOUP_GRID).saveCheckpoint(checkpoint_path)
+
+    with pytest.raises(AssertionError):
+        CoreGrid(fetch_game_config(), np.zeros((24, 24))).loadCheckpoint(
+            checkpoint_path
+        )
+    gameConfig = fetch_game_config()
+    gameConfig["simulation"]["rule"] = HIGHLIFE_RULE
+    with pytest.raises(AssertionError):
+        CoreGrid(gameConfig, ENGINES_SOUP_GRID).loadCheckpoint(checkpoint_path)
+
+    with open(checkpoint_path, "wb") as checkpoint_file:
+        checkpoint_file.write(bytes(CHECKPOINT_HEADER_SIZE))
+    with pytest.raises(AssertionError):
+        CoreGrid(fetch_game_config(), ENGINES_SOUP_GRID).loadCheckpoint(checkpoint_path)
+
+
+@pytest.mark.parametrize("file_name", PATTERN_GLIDER_FILES.keys())
+def test_pattern_glider(file_name, tmp_path) -> None:
+    """checking that a glider is read from every pattern format, at the corner given or centred, and that a grid starting from it matches the expected one"""
+
+    pattern_path = str(tmp_path / file_name)
+    with open(pattern_path, "w", encoding="ascii") as pattern_file:
+        pattern_file.write(PATTERN_GLIDER_FILES[file_name])
+
+    assert readPatternHeader(pattern_path)["grid_dim"] == (3, 3)
+    assert_array_equal(readPattern(pattern_path), GLIDER_INIT_GRID[:3, :3])
+    cells = readPattern(pattern_path, np.zeros_like(GLIDER_INIT_GRID), 0, 0)
+    assert_array_equal(cells, GLIDER_INIT_GRID, err_msg="Grids aren't matching")
+    centred_cells = readPattern(pattern_path, np.zeros((23, 23), dtype=np.uint8))
+    assert_array_equal(np.argwhere(centred_cells).min(axis=0), PATTERN_CENTRED_CORNER)
+
+    grid: CoreGrid = CoreGrid(fetch_game_config(), cells)
+    grid.advance(GLIDER_N_TURN)
+    assert_array_equal(
+        grid.getCellMat(), GLIDER_EXPECTED_GRID, err_msg="Grids aren't matching"
+    )
+
+
+@pytest.mark.parametrize("extension", PATTERN_EXTENSIONS)
+def test_pattern_round_trip(extension, tmp_path, monkeypatch) -> None:
+    """checking that the cells of a grid written into a pattern file are read back, the runs and the rows being cut by the chunks"""
+
+    monkeypatch.setattr(
+        "src.utils.patternUtils.PATTERN_CHUNK_BYTES", PATTERN_CHUNK_BYTES
+    )
+    pattern_path = str(tmp_path / f"soup{extension}")
+    grid: CoreGrid = CoreGrid(fetch_game_config(), ENGINES_SOUP_GRID)
+    grid.advance(CHECKPOINT_N_TURN)
+    writePattern(pattern_path, grid.getCellMat(), grid.rule)
+
+    cells = readPattern(pattern_path, np.zeros_like(ENGINES_SOUP_GRID), 0, 0)
+    assert_array_equal(cells, grid.getCellMat(), err_msg="Grids aren't matching")
+    if extension == ".rle":
+        assert readPatternHeader(pattern_path)["rule"] == grid.rule
+
+
+def test_pattern_multi_state(tmp_path) -> None:
+    """checking that the dying cells of a Generations rule are written and read back in RLE only"""
+
+    gameConfig = fetch_game_config()
+    gameConfig["simulation"]["rule"] = BRIANS_BRAIN_RULE
+    grid: CoreGrid = CoreGrid(gameConfig, BRIANS_BRAIN_INIT_GRID)
+    grid.advance(1)
+
+    writePattern(str(tmp_path / "brain.rle"), grid.getCellMat(), BRIANS_BRAIN_RULE)
+    assert_array_equal(
+        readPattern(
+            str(tmp_path / "brain.rle"), np.zeros_like(BRIANS_BRAIN_INIT_GRID), 0, 0
+        ),
+        grid.getCellMat(),
+        err_msg="Grids aren't matching",
+    )
+    with pytest.raises(AssertionError):
+        writePattern(str(tmp_path / "brain.cells"), grid.getCellMat())
+
+
+@pytest.mark.parametrize("file_name", PATTERN_INCORRECT_FILES.keys())
+def test_incorrect_pattern(file_name, tmp_path) -> None:
+    """checking that an unknown extension, runs beyond the header, a bad character, a missing header or a pattern larger than the grid raises expected error"""
+
+    pattern_path = str(tmp_path / file_name)
+    with open(pattern_path, "w", encoding="ascii") as pattern_file:
+        pattern_file.write(PATTERN_INCORRECT_FILES[file_name])
+
+    with pytest.raises(AssertionError):
+        readPattern(pattern_path, np.zeros((24, 24), dtype=np.uint8))
+
+
+def test_validation_levels() -> None:
+    """checking that the whole grid is only validated with the full level, and that an unknown level raises expected error"""
+
+    for validation in ["off", "cheap", "full"]:
+        gameConfig = fetch_game_config()
+        gameConfig["simulation"]["validation"] = validation
+        grid: CoreGrid = CoreGrid(gameConfig, NORMAL_INIT_GRID)
+        # corrupted behind the back of the grid
+        grid.cell_mat[0][0] = grid.n_states
+
+        if validation == "full":
+            with pytest.raises(AssertionError):
+                grid.setCells([[1, 1]], [1])
+        else:
+            grid.setCells([[1, 1]], [1])
+
+        if validation == "off":
+            grid.setCell(1, 1, INCORRECT_VALUE_SET_CELL)  # type: ignore
+        else:
+            with pytest.raises(AssertionError):
+                grid.setCell(1, 1, INCORRECT_VALUE_SET_CELL)  # type: ignore
+
+    gameConfig = fetch_game_config()
+    gameConfig["simulation"]["validation"] = VALIDATION_LEVEL_BAD
+    with pytest.raises(AssertionError):
+        CoreGrid(gameConfig, NORMAL_INIT_GRID)
+
+
 def test_incorrect_set_cell() -> None:
     """checking if trying to add incorrect value (e.g. not in 0 or 1 to the grid using setCell method raise error) raise expected error"""
 
@@ -105,6 +1395,29 @@ def test_incorrect_set_cell() -> None:
         grid.setCell(0, 0, INCORRECT_VALUE_SET_CELL)  # type: ignore
 
 
+@pytest.mark.parametrize("engine", ENGINES + ["hashlife", "sparse"])
+def test_set_cell_validation(engine) -> None:
+    """checking that every engine checks the value passed to setCell unless the validation is off"""
+
+    for validation in ["off", "cheap"]:
+        gameConfig = fetch_game_config()
+        gameConfig["simulation"]["engine"] = engine
+        gameConfig["simulation"]["validation"] = validation
+        grid = createGrid(gameConfig, NORMAL_INIT_GRID)
+
+        grid.setCell(1, 1, ALIVE_CELL_STATE)
+        assert grid.getCellMat()[1][1] == ALIVE_CELL_STATE
+
+        if validation == "off":
+            # the quadtree only holds leaves of the states of the rule, the state cannot be written unchecked
+            if engine != "hashlife":
+                grid.setCell(1, 1, INCORRECT_VALUE_SET_CELL)
+        else:
+            with pytest.raises(AssertionError):
+                grid.setCell(1, 1, INCORRECT_VALUE_SET_CELL)
+        grid.close()
+
+
 def test_bad_config() -> None:
     """checking if trying to load incorrect config raises expected exception"""
 
@@ -0,0 +1,91 @@
+"""
+Tests regarding the HeadlessRunner
+"""
+# pylint: disable=unused-variable,unused-argument, redefined-outer-name
+import numpy as np
+import pytest
+from numpy.testing import assert_array_equal
+from src.core_lib.CoreGrid import CoreGrid
+from src.HeadlessRunner import HeadlessRunner
+from src.utils.confUtils import fetch_game_config
+from src.utils.patternUtils import readPattern
+from src.utils.patternUtils import writePattern
+from tests.core_lib_tests.test_config import CHECKPOINT_FILE_NAME
+from tests.core_lib_tests.test_config import ENGINES
+from tests.core_lib_tests.test_config import ENGINES_SOUP_GRID
+from tests.core_lib_tests.test_config import GLIDER_INIT_GRID
+from tests.core_lib_tests.test_config import HEADLESS_GRID_DIM
+from tests.core_lib_tests.test_config import HEADLESS_N_TURN
+from tests.core_lib_tests.test_config import HIGHLIFE_RULE
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_headless_runner(engine, tmp_path) -> None:
+    """checking that the headless runner saves the generation computed by the dense grid, as a pattern or as a checkpoint it resumes from"""
+
+    pattern_path = str(tmp_path / "soup.rle")
+    writePattern(pattern_path, ENGINES_SOUP_GRID)
+    reference_grid: CoreGrid = CoreGrid(fetch_game_config(), ENGINES_SOUP_GRID)
+    reference_grid.advance(HEADLESS_N_TURN)
+
+    summary = HeadlessRunner(
+        HEADLESS_N_TURN,
+        str(tmp_path / "output.cells"),
+        pattern_path=pattern_path,
+        engine=engine,
+    ).run()
+    assert summary["grid_dim"] == list(ENGINES_SOUP_GRID.shape)
+    assert summary["population"] == reference_grid.getAliveCellCount()
+    assert_array_equal(
+        readPattern(str(tmp_path / "output.cells")),
+        reference_grid.getCellMat(),
+        err_msg="Grids aren't matching",
+    )
+
+    checkpoint_path = str(tmp_path / CHECKPOINT_FILE_NAME)
+    HeadlessRunner(
+        HEADLESS_N_TURN, checkpoint_path, pattern_path=pattern_path, engine=engine
+    ).run()
+    HeadlessRunner(
+        HEADLESS_N_TURN, checkpoint_path, resume_path=checkpoint_path, engine=engine
+    ).run()
+    reference_grid.advance(HEADLESS_N_TURN)
+    resumed_grid: CoreGrid = CoreGrid(
+        fetch_game_config(), np.zeros_like(ENGINES_SOUP_GRID)
+    )
+    resumed_grid.loadCheckpoint(checkpoint_path)
+    assert resumed_grid.getStats().turn == 2 * HEADLESS_N_TURN
+    assert_array_equal(
+        resumed_grid.getCellMat(),
+        reference_grid.getCellMat(),
+        err_msg="Grids aren't matching",
+    )
+
+
+def test_headless_runner_grid_dim(tmp_path) -> None:
+    """checking that the grid of the config grows to hold a pattern, and that the grid should start from a pattern or a checkpoint"""
+
+    pattern_path = str(tmp_path / "glider.rle")
+    writePattern(pattern_path, GLIDER_INIT_GRID[:3, :3])
+    runner = HeadlessRunner(0, str(tmp_path / "output.rle"), pattern_path=pattern_path)
+    assert (
+        runner.gameConfig["videoSettings"]["grid_dim"]
+        == fetch_game_config()["videoSettings"]["grid_dim"]
+    )
+
+    writePattern(pattern_path, np.ones((25, 27), dtype=np.uint8))
+    runner = HeadlessRunner(
+        0, str(tmp_path / "output.rle"), pattern_path=pattern_path, rule=HIGHLIFE_RULE
+    )
+    assert runner.gameConfig["videoSettings"]["grid_dim"] == [26, 28]
+    assert runner.gameConfig["simulation"]["rule"] == HIGHLIFE_RULE
+    runner = HeadlessRunner(
+        0,
+        str(tmp_path / "output.rle"),
+        pattern_path=pattern_path,
+        grid_dim=HEADLESS_GRID_DIM,
+    )
+    assert runner.run()["grid_dim"] == HEADLESS_GRID_DIM
+
+    with pytest.raises(AssertionError):
+        HeadlessRunner(0, str(tmp_path / "output.rle"))
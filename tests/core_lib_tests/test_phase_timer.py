@@ -0,0 +1,57 @@
+"""
+Tests regarding the PhaseTimer
+"""
+# pylint: disable=unused-variable,unused-argument, redefined-outer-name
+import json
+import pytest
+from src.utils.PhaseTimer import PhaseTimer
+from tests.core_lib_tests.test_config import PHASE_TIMER_EXPECTED_P50
+from tests.core_lib_tests.test_config import PHASE_TIMER_N_TICKS
+from tests.core_lib_tests.test_config import PHASE_TIMER_SAMPLES
+from tests.core_lib_tests.test_config import PHASE_TIMER_SMALL_WINDOW
+
+
+def test_phase_timer(tmp_path) -> None:
+    """checking that the percentiles of a phase are computed over its last samples only, that they are dumped into the metrics file,
+    and that a disabled timer records nothing"""
+
+    metrics_path = str(tmp_path / "metrics.jsonl")
+    timer: PhaseTimer = PhaseTimer(
+        enabled=True,
+        window=PHASE_TIMER_SMALL_WINDOW,
+        metrics_path=metrics_path,
+        dump_interval=0,
+    )
+    for seconds in PHASE_TIMER_SAMPLES:
+        timer.record("step", seconds)
+    with timer.phase("draw"):
+        pass
+
+    percentiles = timer.getPercentiles()
+    assert list(percentiles.keys()) == ["step", "draw"]
+    assert percentiles["step"]["count"] == PHASE_TIMER_SAMPLES.size
+    assert percentiles["step"]["p50"] == pytest.approx(PHASE_TIMER_EXPECTED_P50)
+    assert percentiles["step"]["max"] == pytest.approx(PHASE_TIMER_SAMPLES[-1] * 1000)
+    assert (
+        percentiles["step"]["p50"]
+        <= percentiles["step"]["p95"]
+        <= percentiles["step"]["p99"]
+    )
+    assert len(timer.summaryLines()) == 1 + len(percentiles)
+
+    for _ in range(PHASE_TIMER_N_TICKS):
+        timer.tick()
+    with open(metrics_path, encoding="utf8") as f:
+        dumps = [json.loads(line) for line in f]
+    assert len(dumps) == PHASE_TIMER_N_TICKS
+    assert dumps[-1]["frames"] == PHASE_TIMER_N_TICKS
+    assert dumps[-1]["phases"]["frame"]["count"] == PHASE_TIMER_N_TICKS - 1
+
+    disabled_timer: PhaseTimer = PhaseTimer(metrics_path=metrics_path, dump_interval=0)
+    with disabled_timer.phase("step"):
+        pass
+    disabled_timer.record("step", PHASE_TIMER_SAMPLES[0])
+    disabled_timer.tick()
+    assert disabled_timer.phase("step") is disabled_timer.phase("draw")
+    assert disabled_timer.getPercentiles() == {}
+    assert disabled_timer.frames == 0
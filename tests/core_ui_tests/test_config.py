@@ -19,3 +19,15 @@ BAD_FONT: str = "some_bad_font_name"
 # check if bad colors raises expected error
 BAD_CELL_COLOR: List[int] = [350, 350, 350]
 BAD_TEXT_COLOR: List[int] = [260, 260, 260]
+
+# check that the differential rendering draws the same frames as the full one, repainting only the cells that changed,
+# and nothing at all when the cells did not change
+DIFF_RENDER_PANEL_SIZE: List[int] = [504, 480]
+DIFF_RENDER_GRID_DIM: List[int] = [24, 24]
+DIFF_RENDER_LARGE_GRID_DIM: List[int] = [1000, 1000]
+DIFF_RENDER_N_TURN: int = 8
+
+# check that the grid lines layer is rendered once, again on a colour change or a resize, and that the grid lines are not drawn
+# once the cells are smaller than a few pixels
+GRID_LAYER_NEW_COLOR: List[int] = [0, 255, 0]
+GRID_LAYER_SMALL_CELLS_PANEL_SIZE: List[int] = [72, 72]
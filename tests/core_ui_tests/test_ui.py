@@ -3,7 +3,12 @@ Tests regarding the ui_lib functions
 """
 # pylint: disable=unused-variable
 
+import numpy as np
+import pygame
 import pytest
+from numpy.testing import assert_array_equal
+from src.core_lib.CoreGrid import CoreGrid
+from src.ui_lib.DisplayPanel import DisplayPanel
 from src.ui_lib.UiRunner import UIRunner
 from src.utils.confUtils import fetch_game_config
 from tests.core_ui_tests.test_config import BAD_DIM_HIGH
@@ -15,6 +20,12 @@ from tests.core_ui_tests.test_config import BAD_RES_ODD
 from tests.core_ui_tests.test_config import BAD_FONT
 from tests.core_ui_tests.test_config import BAD_CELL_COLOR
 from tests.core_ui_tests.test_config import BAD_TEXT_COLOR
+from tests.core_ui_tests.test_config import DIFF_RENDER_GRID_DIM
+from tests.core_ui_tests.test_config import DIFF_RENDER_LARGE_GRID_DIM
+from tests.core_ui_tests.test_config import DIFF_RENDER_N_TURN
+from tests.core_ui_tests.test_config import DIFF_RENDER_PANEL_SIZE
+from tests.core_ui_tests.test_config import GRID_LAYER_NEW_COLOR
+from tests.core_ui_tests.test_config import GRID_LAYER_SMALL_CELLS_PANEL_SIZE
 
 
 @pytest.mark.parametrize(
@@ -50,3 +61,74 @@ def test_bad_colors() -> None:
         ui_runner: UIRunner = UIRunner(fetch_game_config(), cell_color=BAD_CELL_COLOR)
     with pytest.raises(AssertionError):
         ui_runner: UIRunner = UIRunner(fetch_game_config(), text_color=BAD_TEXT_COLOR)
+
+
+@pytest.mark.parametrize("grid_dim", [DIFF_RENDER_GRID_DIM, DIFF_RENDER_LARGE_GRID_DIM])
+def test_differential_rendering(grid_dim) -> None:
+    """check that the differential rendering draws the same frames as the full one, repainting only the cells that changed"""
+
+    pygame.font.init()
+    gameConfig = fetch_game_config()
+    gameConfig["videoSettings"]["res"] = [max(grid_dim), max(grid_dim)]
+    cells: np.ndarray = np.zeros(grid_dim, dtype=np.uint8)
+    cells[: DIFF_RENDER_GRID_DIM[0], : DIFF_RENDER_GRID_DIM[1]] = (
+        np.random.default_rng(0).random(DIFF_RENDER_GRID_DIM) < 0.5
+    )
+    grid: CoreGrid = CoreGrid(gameConfig, cells)
+
+    full_panel: DisplayPanel = DisplayPanel(
+        DIFF_RENDER_PANEL_SIZE, grid_dim, 12, {}, differential=False
+    )
+    panel: DisplayPanel = DisplayPanel(DIFF_RENDER_PANEL_SIZE, grid_dim, 12, {})
+    for _ in range(DIFF_RENDER_N_TURN):
+        previous_cells: np.ndarray = np.array(grid.getCellMat())
+        grid.advance(1)
+        for display_panel in [full_panel, panel]:
+            display_panel.setCellMat(grid.getCellMat())
+            display_panel.update()
+
+        if grid.getStats().turn > 1:
+            assert panel.repainted_cells == np.count_nonzero(
+                previous_cells != grid.getCellMat()
+            )
+        assert_array_equal(
+            pygame.surfarray.array3d(panel.surface),
+            pygame.surfarray.array3d(full_panel.surface),
+            err_msg="Frames aren't matching",
+        )
+
+    # nothing is repainted as long as the cells do not change
+    panel.update()
+    assert panel.repainted_cells == 0
+
+
+def test_grid_layer() -> None:
+    """check that the grid lines are rendered once into a layer, again on a colour change or a resize, and not drawn for the small cells"""
+
+    pygame.font.init()
+    panel: DisplayPanel = DisplayPanel(
+        DIFF_RENDER_PANEL_SIZE, DIFF_RENDER_GRID_DIM, 12, {}, differential=False
+    )
+    cells: np.ndarray = np.zeros(DIFF_RENDER_GRID_DIM, dtype=np.uint8)
+    panel.setCellMat(cells)
+    panel.update()
+    grid_layer = panel.grid_layer
+    panel.update()
+    assert panel.grid_layer is grid_layer
+    assert panel.show_grid_lines
+    assert panel.surface.get_at([0, 1])[:3] == tuple(panel.ui_settings["grid_color"])
+
+    panel.setColors(grid_color=GRID_LAYER_NEW_COLOR)
+    panel.update()
+    assert panel.grid_layer is not grid_layer
+    assert panel.surface.get_at([0, 1])[:3] == tuple(GRID_LAYER_NEW_COLOR)
+
+    # the cells fill their whole rectangle once the grid lines are not drawn
+    cells[0, 0] = 1
+    panel.resize(GRID_LAYER_SMALL_CELLS_PANEL_SIZE)
+    panel.update()
+    assert not panel.show_grid_lines
+    assert panel.surface.get_at([0, 0])[:3] == tuple(panel.ui_settings["cell_color"])
+    assert panel.surface.get_at([0, panel.CELL_SHAPE[1]])[:3] == tuple(
+        panel.ui_settings["background_color"]
+    )